@@ -0,0 +1,194 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Benchmark Cases
+
+The hot paths of a request, each timed at several data sizes: JSON-RPC
+dispatch and (de)serialization, the approval token cycle, audit trail
+append and query, skill listing, an MCP tools/call through the bridge and
+COBOL report generation. Everything runs in-process against the simulated
+mainframe, so the suite needs no network or backend.
+"""
+
+import json
+import logging
+from contextlib import AsyncExitStack
+from typing import Any, Callable, Dict, List
+
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+from lep_py.adapter.example_adapter import CustomerDatabaseAdapter
+from lep_py.bridge.lep_mcp_bridge import LEPMCPBridge
+from lep_py.core.jsonrpc import JSONRPCHandler
+from lep_py.models.protocol import OperationType, Skill
+from lep_py.utils.metrics import MetricsRegistry
+
+from .harness import Case
+
+
+def _records(count: int) -> List[Dict[str, Any]]:
+    """Transaction-shaped records, as carried in skill parameters and results."""
+    return [
+        {"transaction_id": f"TXN{i:08d}", "account_id": f"ACC00{i % 3 + 1}", "amount": i * 1.25,
+         "type": "credit" if i % 2 else "debit", "timestamp": "2026-01-01T00:00:00"}
+        for i in range(count)
+    ]
+
+
+async def _cobol_adapter(stack: AsyncExitStack, accounts: int = 0, transactions: int = 0) -> COBOLMainframeAdapter:
+    # Per-call info logging would time the log handler rather than the adapter
+    logging.getLogger("lep_py.adapter.cobol_mainframe_adapter").setLevel(logging.WARNING)
+    adapter = COBOLMainframeAdapter("localhost", 23, "")
+    for i in range(accounts):
+        adapter.accounts[f"ACX{i:06d}"] = {"name": f"Holder {i}", "balance": float(i), "status": "active"}
+    adapter.transactions.extend(_records(transactions))
+    stack.push_async_callback(adapter.close)
+    return adapter
+
+
+def _request(method: str, params: Any, request_id: int = 1) -> str:
+    return json.dumps({"jsonrpc": "2.0", "method": method, "params": params, "id": request_id})
+
+
+async def dispatch(size: int, stack: AsyncExitStack) -> Callable:
+    """handle_request of an echo method through the interceptor chain; size is the params length."""
+    handler = JSONRPCHandler(metrics=MetricsRegistry(), name="bench")
+
+    async def echo(params):
+        return params
+
+    handler.register_method("bench/echo", echo)
+    request = _request("bench/echo", {"items": list(range(size))})
+
+    async def op():
+        await handler.handle_request(request)
+    return op
+
+
+async def serialize_request(size: int, stack: AsyncExitStack) -> Callable:
+    """create_request + serialize_request of a call carrying `size` records."""
+    handler = JSONRPCHandler(tracer=None)
+    params = {"skill_name": "importTransactions", "parameters": {"records": _records(size)}}
+
+    def op():
+        handler.serialize_request(handler.create_request("legacy/callSkill", params))
+    return op
+
+
+async def deserialize_response(size: int, stack: AsyncExitStack) -> Callable:
+    """deserialize_response of a result of `size` records."""
+    handler = JSONRPCHandler(tracer=None)
+    text = json.dumps(handler.create_response(1, _records(size)).__dict__)
+
+    def op():
+        handler.deserialize_response(text)
+    return op
+
+
+async def approval_cycle(size: int, stack: AsyncExitStack) -> Callable:
+    """security/requestApproval then legacy/callSkill with the token; size is tokens already outstanding."""
+    adapter = await _cobol_adapter(stack)
+    for i in range(size):
+        adapter._generate_approval_token(f"held_{i}", "updateAccountBalance", {"account_id": "ACC002"})
+    parameters = {"account_id": "ACC001", "amount": 1.0, "reason": "Benchmark posting"}
+
+    async def op():
+        approval = await adapter.invoke("security/requestApproval", {
+            "skill_name": "updateAccountBalance", "parameters": parameters, "reason": "Benchmark"
+        })
+        await adapter.invoke("legacy/callSkill", {
+            "skill_name": "updateAccountBalance", "parameters": parameters,
+            "approval_token": approval["approval_token"]
+        })
+    return op
+
+
+async def _audited_adapter(size: int, stack: AsyncExitStack) -> COBOLMainframeAdapter:
+    adapter = await _cobol_adapter(stack)
+    parameters = {"account_id": "ACC001", "amount": 1.0}
+    for i in range(size):
+        adapter._log_audit_event("approval_requested", f"decision_{i}", "updateAccountBalance", parameters,
+                                 "approved")
+    return adapter
+
+
+async def audit_append(size: int, stack: AsyncExitStack) -> Callable:
+    """_log_audit_event onto a trail of `size` events."""
+    adapter = await _audited_adapter(size, stack)
+    parameters = {"account_id": "ACC001", "amount": 1.0}
+
+    def op():
+        adapter._log_audit_event("skill_executed", "decision_bench", "updateAccountBalance", parameters, None)
+    return op
+
+
+async def audit_query(size: int, stack: AsyncExitStack) -> Callable:
+    """security/getAuditTrail for the last 10 events of a trail of `size` (a client polling for news)."""
+    adapter = await _audited_adapter(size, stack)
+    params = {"since_decision_id": f"decision_{max(0, size - 11)}"}
+
+    async def op():
+        await adapter.invoke("security/getAuditTrail", params)
+    return op
+
+
+class _CatalogAdapter(CustomerDatabaseAdapter):
+    """An adapter with a catalog of `count` skills."""
+
+    def __init__(self, count: int):
+        super().__init__()
+        self.catalog = [
+            Skill(
+                name=f"skill{i:05d}",
+                description=f"Generated skill {i}",
+                parameters={"record_id": {"type": "string", "description": "Record key", "required": True}},
+                returns={"type": "object"},
+                operation_type=OperationType.READ if i % 4 else OperationType.WRITE
+            )
+            for i in range(count)
+        ]
+
+    def get_skills(self) -> List[Skill]:
+        return self.catalog
+
+
+async def list_skills(size: int, stack: AsyncExitStack) -> Callable:
+    """_handle_list_skills over a catalog of `size` skills."""
+    adapter = _CatalogAdapter(size)
+    stack.push_async_callback(adapter.close)
+
+    async def op():
+        await adapter._handle_list_skills({})
+    return op
+
+
+async def bridge_tools_call(size: int, stack: AsyncExitStack) -> Callable:
+    """MCP tools/call of getAccountInfo through the bridge; size is accounts added to the store."""
+    adapter = await _cobol_adapter(stack, accounts=size)
+    bridge = LEPMCPBridge(adapter)
+    stack.push_async_callback(bridge.shutdown)
+    request = _request("tools/call", {"name": "getAccountInfo", "arguments": {"account_id": "ACC002"}})
+    await bridge.handle_mcp_request(request)  # catalog fetch happens on the first call
+
+    async def op():
+        await bridge.handle_mcp_request(request)
+    return op
+
+
+async def account_report(size: int, stack: AsyncExitStack) -> Callable:
+    """_generate_account_report for one account among `size` transactions (a third of them its own)."""
+    adapter = await _cobol_adapter(stack, transactions=size)
+
+    def op():
+        adapter._generate_account_report("ACC001")
+    return op
+
+
+CASES = [
+    Case("jsonrpc.dispatch", dispatch.__doc__, (1, 100, 1000), dispatch),
+    Case("jsonrpc.serialize_request", serialize_request.__doc__, (1, 100, 1000), serialize_request),
+    Case("jsonrpc.deserialize_response", deserialize_response.__doc__, (1, 100, 1000), deserialize_response),
+    Case("approval.token_cycle", approval_cycle.__doc__, (0, 1000, 10000), approval_cycle),
+    Case("audit.append", audit_append.__doc__, (1000, 10000, 100000), audit_append),
+    Case("audit.query", audit_query.__doc__, (1000, 10000, 100000), audit_query),
+    Case("adapter.list_skills", list_skills.__doc__, (10, 100, 1000), list_skills),
+    Case("bridge.tools_call", bridge_tools_call.__doc__, (0, 1000, 100000), bridge_tools_call),
+    Case("cobol.account_report", account_report.__doc__, (1000, 10000, 100000), account_report),
+]
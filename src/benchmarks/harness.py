@@ -0,0 +1,173 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Benchmark Harness
+
+Times benchmark cases, stores the results as JSON baselines and compares
+a run against a baseline.
+
+A case is an async `setup(size, stack)` returning the operation to time,
+a plain or async callable taking no arguments. Setup registers any clean-up
+on `stack` (an AsyncExitStack). Each case runs at each of its sizes. The
+iteration count is calibrated so that one repeat lasts at least `min_time`,
+and the median of `repeats` repeats is reported per operation, which keeps
+one-off pauses (GC, scheduling) out of the number.
+
+Comparisons use the fastest repeat by default: interference from other
+processes only ever adds time, so the minimum moves least between runs.
+Baselines only compare like with like: record them on the machine (and
+Python) that will check against them.
+"""
+
+import asyncio
+import gc
+import inspect
+import json
+import platform
+import statistics
+import subprocess
+import time
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+
+@dataclass
+class Case:
+    """A named operation to time at several data sizes."""
+    name: str
+    description: str
+    sizes: Sequence[int]
+    setup: Callable[[int, AsyncExitStack], Awaitable[Callable[[], Any]]]
+
+
+def result_key(case: str, size: int) -> str:
+    return f"{case}[{size}]"
+
+
+async def _time(op: Callable[[], Any], is_async: bool, iterations: int) -> float:
+    """Seconds for `iterations` calls of `op`."""
+    if is_async:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await op()
+        return time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(iterations):
+        op()
+    return time.perf_counter() - started
+
+
+async def measure(op: Callable[[], Any], min_time: float = 0.2, repeats: int = 5) -> Dict[str, Any]:
+    """Calibrate, then time `repeats` repeats of `op`; times are per operation, in microseconds."""
+    is_async = inspect.iscoroutinefunction(op)
+    iterations = 1
+    while True:
+        elapsed = await _time(op, is_async, iterations)
+        if elapsed >= min_time / 4 or iterations >= 1 << 20:
+            break
+        iterations *= 2 if elapsed == 0 else max(2, min(16, int(min_time / 4 / elapsed) + 1))
+    iterations = max(1, int(iterations * min_time / max(elapsed, 1e-9)))
+
+    samples = []
+    gc.collect()
+    for _ in range(repeats):
+        samples.append(await _time(op, is_async, iterations) / iterations * 1e6)
+    return {
+        "median_us": round(statistics.median(samples), 3),
+        "min_us": round(min(samples), 3),
+        "max_us": round(max(samples), 3),
+        "iterations": iterations,
+        "repeats": repeats
+    }
+
+
+async def run_cases(cases: Sequence[Case], min_time: float = 0.2, repeats: int = 5,
+                    sizes: Optional[Sequence[int]] = None, report: Optional[Callable[[str, Dict], None]] = None
+                    ) -> Dict[str, Dict[str, Any]]:
+    """Run every case at each of its sizes (or only those in `sizes`); returns key -> timing."""
+    results = {}
+    for case in cases:
+        for size in case.sizes:
+            if sizes is not None and size not in sizes:
+                continue
+            async with AsyncExitStack() as stack:
+                op = await case.setup(size, stack)
+                timing = await measure(op, min_time, repeats)
+            key = result_key(case.name, size)
+            results[key] = timing
+            if report is not None:
+                report(key, timing)
+    return results
+
+
+def environment() -> Dict[str, Any]:
+    """What a baseline was recorded on."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "commit": commit
+    }
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, Any]]):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], threshold: float = 0.25,
+            stat: str = "min_us") -> List[Dict[str, Any]]:
+    """
+    Compare times (`stat`: "min_us" or "median_us") with a baseline. A case
+    more than `threshold` (a fraction) slower is "regressed", more than
+    `threshold` faster is "improved"; cases in only one of the two are
+    "new" or "missing".
+    """
+    previous = baseline.get("results", baseline)
+    rows = []
+    for key in sorted(set(results) | set(previous)):
+        if key not in previous:
+            rows.append({"case": key, "status": "new", "current_us": results[key][stat]})
+            continue
+        if key not in results:
+            rows.append({"case": key, "status": "missing", "baseline_us": previous[key][stat]})
+            continue
+        before, now = previous[key][stat], results[key][stat]
+        change = (now - before) / before if before else 0.0
+        status = "regressed" if change > threshold else "improved" if change < -threshold else "ok"
+        rows.append({"case": key, "status": status, "baseline_us": before, "current_us": now,
+                     "change": round(change, 3)})
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'case':<40} {'baseline':>12} {'current':>12} {'change':>8}  status"]
+    for row in rows:
+        before = f"{row['baseline_us']:.1f}us" if "baseline_us" in row else "-"
+        now = f"{row['current_us']:.1f}us" if "current_us" in row else "-"
+        change = f"{row['change']:+.0%}" if "change" in row else "-"
+        lines.append(f"{row['case']:<40} {before:>12} {now:>12} {change:>8}  {row['status']}")
+    return "\n".join(lines)
+
+
+def format_result(key: str, timing: Dict[str, Any]) -> str:
+    return (f"{key:<40} {timing['median_us']:>12.1f}us  (min {timing['min_us']:.1f}us, "
+            f"{timing['iterations']} x {timing['repeats']})")
+
+
+def run(cases: Sequence[Case], **kwargs) -> Dict[str, Dict[str, Any]]:
+    """Synchronous entry point for run_cases."""
+    return asyncio.run(run_cases(cases, **kwargs))
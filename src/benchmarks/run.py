@@ -0,0 +1,80 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Benchmark Runner
+
+    python -m benchmarks.run                       # run every case
+    python -m benchmarks.run --filter audit        # cases whose name contains "audit"
+    python -m benchmarks.run --save                # record results as the baseline
+    python -m benchmarks.run --compare             # exit 1 if a case regressed
+
+Run from the directory holding lep_py/. The stored baseline
+(benchmarks/baseline.json) was recorded on one machine; re-record it with
+--save before comparing on another.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+from .cases import CASES
+from .harness import compare, format_comparison, format_result, load_baseline, run, save_baseline
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the LEP microbenchmarks")
+    parser.add_argument("--filter", action="append", default=[], metavar="TEXT",
+                        help="Only run cases whose name contains TEXT (repeatable)")
+    parser.add_argument("--sizes", default=None, metavar="N,N,...", help="Only run these data sizes")
+    parser.add_argument("--quick", action="store_true", help="Shorter timing runs, for smoke tests")
+    parser.add_argument("--baseline", default=BASELINE_PATH, metavar="PATH")
+    parser.add_argument("--save", action="store_true", help="Write the results to the baseline file")
+    parser.add_argument("--compare", action="store_true", help="Compare the results with the baseline file")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Slowdown (fraction of the baseline time) that counts as a regression")
+    parser.add_argument("--stat", choices=("min", "median"), default="min",
+                        help="Per-operation time to compare: fastest or median repeat")
+    parser.add_argument("--output", default=None, metavar="PATH", help="Also write the results as JSON")
+    parser.add_argument("--list", action="store_true", help="List the cases and exit")
+    args = parser.parse_args(argv)
+
+    cases = [case for case in CASES if not args.filter or any(text in case.name for text in args.filter)]
+    if args.list:
+        for case in cases:
+            print(f"{case.name:<32} sizes {', '.join(map(str, case.sizes)):<20} {case.description}")
+        return 0
+    if not cases:
+        parser.error("No case matches the filter")
+
+    sizes = [int(size) for size in args.sizes.split(",")] if args.sizes else None
+    timing = {"min_time": 0.05, "repeats": 3} if args.quick else {"min_time": 0.2, "repeats": 5}
+    results = run(cases, sizes=sizes, report=lambda key, t: print(format_result(key, t), flush=True), **timing)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+    if args.compare:
+        baseline = load_baseline(args.baseline)
+        # Cases left out by --filter/--sizes are not "missing"
+        ran = {key: value for key, value in baseline["results"].items()
+               if any(key.startswith(f"{case.name}[") for case in cases)
+               and (sizes is None or int(key[key.rindex("[") + 1:-1]) in sizes)}
+        rows = compare(results, {"results": ran}, args.threshold, f"{args.stat}_us")
+        print()
+        print(f"Against baseline recorded {baseline['environment']['recorded_at']} "
+              f"(Python {baseline['environment']['python']}, {args.stat} time, threshold {args.threshold:.0%}):")
+        print(format_comparison(rows))
+        regressed = [row["case"] for row in rows if row["status"] == "regressed"]
+        if regressed:
+            print(f"\n{len(regressed)} regression(s): {', '.join(regressed)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
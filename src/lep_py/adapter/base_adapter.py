@@ -5,10 +5,12 @@ This module provides the base class for all LEP adapters.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
+import asyncio
 import secrets
 import hashlib
+import time
 
 from ..models.protocol import (
     Skill,
@@ -16,13 +18,24 @@ from ..models.protocol import (
     ApprovalResponse,
     ApprovalState,
     AuditEvent,
+    OperationType,
     InitializeRequest,
     InitializeResponse,
     SessionCapabilities,
     ProgressUpdate,
     LEPErrorCode
 )
+from ..core.admission import AdmissionController
+from ..core.deadline import DeadlineExceeded, deadline_scope, run_with_deadline
 from ..core.jsonrpc import JSONRPCHandler
+from ..core.middleware import CURRENT_CALL
+from ..security.approval_queue import ApprovalQueue, PendingApproval
+from ..security.batch_approval import BATCH_SKILL, BatchApprovalError, BatchGrant
+from ..security.policy import PolicyEngine
+from ..utils.memory import ALLOCATIONS, process_memory, structure_report
+from ..utils.metrics import REGISTRY, MetricsRegistry
+from ..utils.profiling import RequestProfiler
+from ..utils.tracing import TRACER, current_span
 
 
 class BaseLEPAdapter(ABC):
@@ -42,7 +55,8 @@ class BaseLEPAdapter(ABC):
         self.capabilities = SessionCapabilities(
             notifications=True,
             diff_support=False,
-            cancellation=True
+            cancellation=True,
+            progress_coalescing=True
         )
         
         # Session state
@@ -50,10 +64,63 @@ class BaseLEPAdapter(ABC):
         self.audit_trail: List[AuditEvent] = []
         self.active_approvals: Dict[str, Dict[str, Any]] = {}  # token -> approval data
         self.decision_counter = 0
+        self._operation_types: Optional[Dict[str, OperationType]] = None  # skill name -> type
         
-        # JSON-RPC handler
-        self.rpc_handler = JSONRPCHandler()
+        # Asynchronous approvals: requests return a pending decision and a
+        # human decides later via security/decideApproval on the operator API
+        self.async_approvals = False
+        self.approval_queue = ApprovalQueue(timeout=300.0, on_decision=self._on_approval_decided)
+        self.max_approval_wait = 30.0  # cap on security/awaitApproval long-polls
+        
+        # Auto-approval rules checked before escalating to a human (None = always escalate)
+        self.approval_policy: Optional[PolicyEngine] = None
+        
+        # Lifetime of batch approval tokens, which are spent many times
+        self.batch_token_ttl = timedelta(hours=1)
+        
+        # Upper bound on operations in one legacy/callSkills request
+        self.max_operations_per_call = 100
+        
+        # Time limits in seconds. A request may pass its own "timeout" (capped
+        # at max_call_timeout); otherwise the skill's entry in skill_timeouts or
+        # the default applies. Deadlines inherited from the caller always win.
+        self.default_call_timeout: Optional[float] = 30.0
+        self.default_resource_timeout: Optional[float] = 30.0
+        self.max_call_timeout: float = 300.0
+        self.skill_timeouts: Dict[str, float] = {}
+        
+        # JSON-RPC handler. Admission control sheds load beyond 64 requests in
+        # flight; session control, approval requests, long polls and human
+        # decisions are never shed. Tighten per method with
+        # self.admission.set_method_limit().
+        self.admission = AdmissionController(
+            max_in_flight=64,
+            max_queued=256,
+            max_queue_time=5.0,
+            exempt=["session/initialize", "session/shutdown", "security/requestApproval", "security/awaitApproval",
+                    "admin/profiling", "admin/getProfile", "admin/memory"]
+        )
+        # Metrics go to the process-wide registry, labelled with the adapter name
+        self.metrics: MetricsRegistry = REGISTRY
+        self.rpc_handler = JSONRPCHandler(admission=self.admission, metrics=self.metrics, name=adapter_name)
+        
+        # Operator API: human decisions on pending approvals. Never exposed to
+        # the agent; serve it on a separate, authenticated channel.
+        self.operator_handler = JSONRPCHandler(metrics=self.metrics, name=f"{adapter_name}.operator")
+        
+        # Notifications for the client (legacy/update, approval decisions). Off
+        # until a client that accepts notifications initializes the session.
+        self.outbound = self.rpc_handler.outbound
+        self.outbound.enabled = False
+        
+        # Request profiler, attached on demand (enable_profiling or admin/profiling)
+        self.profiler = RequestProfiler(threshold=1.0, max_profiles=20)
+        
+        # Skill calls in flight, by (session, request id), for legacy/cancel
+        self._running_skills: Dict[Tuple[Any, Any], Set[asyncio.Task]] = {}
+        self._cancel_requested: Set[asyncio.Task] = set()
         self._register_methods()
+        self._register_metrics()
 
     def _register_methods(self):
         """Register all LEP protocol methods."""
@@ -62,12 +129,52 @@ class BaseLEPAdapter(ABC):
         self.rpc_handler.register_method("legacy/listSkills", self._handle_list_skills)
         self.rpc_handler.register_method("legacy/getResource", self._handle_get_resource)
         self.rpc_handler.register_method("legacy/callSkill", self._handle_call_skill)
+        self.rpc_handler.register_method("legacy/callSkills", self._handle_call_skills)
+        self.rpc_handler.register_method("legacy/cancel", self._handle_cancel)
         self.rpc_handler.register_method("security/requestApproval", self._handle_request_approval)
+        self.rpc_handler.register_method("security/requestBatchApproval", self._handle_request_batch_approval)
         self.rpc_handler.register_method("security/getAuditTrail", self._handle_get_audit_trail)
+        self.rpc_handler.register_method("security/getApproval", self._handle_get_approval)
+        self.rpc_handler.register_method("security/awaitApproval", self._handle_await_approval)
+        self.rpc_handler.register_method("admin/profiling", self._handle_profiling)
+        self.rpc_handler.register_method("admin/getProfile", self._handle_get_profile)
+        self.rpc_handler.register_method("admin/memory", self._handle_memory)
+        
+        self.operator_handler.register_method("security/decideApproval", self._handle_decide_approval)
+        self.operator_handler.register_method("security/listPendingApprovals", self._handle_list_pending_approvals)
+
+    def _register_metrics(self):
+        """Skill and approval timings, and scrape-time sizes of the adapter's stores."""
+        name = self.adapter_name
+        self._skill_calls = self.metrics.counter(
+            "lep_skill_calls_total", "Skill executions, by outcome", ["adapter", "skill", "outcome"])
+        self._skill_seconds = self.metrics.histogram(
+            "lep_skill_seconds", "Skill execution time", ["adapter", "skill"])
+        self._approval_wait = self.metrics.histogram(
+            "lep_approval_wait_seconds", "Time from approval request to human decision", ["adapter", "state"])
+        self.metrics.gauge("lep_audit_events", "Events in the audit trail", ["adapter"]).set_function(
+            lambda: len(self.audit_trail), name)
+        self.metrics.gauge("lep_approval_tokens", "Unspent approval tokens held", ["adapter"]).set_function(
+            lambda: len(self.active_approvals), name)
+        self.metrics.gauge("lep_approvals_pending", "Approvals waiting for a decision", ["adapter"]).set_function(
+            lambda: len(self.approval_queue.pending()), name)
+        self.metrics.gauge("lep_admission_queued", "Requests waiting for admission", ["adapter"]).set_function(
+            self._admission_queued, name)
+        self.metrics.gauge("lep_outbound_pending", "Notifications waiting to be sent", ["adapter"]).set_function(
+            lambda: len(self.outbound), name)
+
+    def _admission_queued(self) -> int:
+        """Requests waiting at the admission controller's global gate (0 without one)."""
+        admission = self.rpc_handler.admission
+        return admission.global_gate.queued if admission is not None and admission.global_gate else 0
 
     async def _handle_initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle session/initialize request."""
         self.session_initialized = True
+        client_capabilities = params.get("client_capabilities") or {}
+        self.outbound.enabled = bool(client_capabilities.get("notifications")) and self.capabilities.notifications
+        self.outbound.coalesce = bool(client_capabilities.get("progress_coalescing")) and \
+            self.capabilities.progress_coalescing
         self._log_audit_event("session_initialized", None, None, None, None)
         
         return {
@@ -77,7 +184,8 @@ class BaseLEPAdapter(ABC):
             "server_capabilities": {
                 "notifications": self.capabilities.notifications,
                 "diff_support": self.capabilities.diff_support,
-                "cancellation": self.capabilities.cancellation
+                "cancellation": self.capabilities.cancellation,
+                "progress_coalescing": self.capabilities.progress_coalescing
             }
         }
 
@@ -85,6 +193,7 @@ class BaseLEPAdapter(ABC):
         """Handle session/shutdown request."""
         self._log_audit_event("session_shutdown", None, None, None, None)
         self.session_initialized = False
+        self.outbound.enabled = False
         return None
 
     async def _handle_list_skills(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -106,10 +215,18 @@ class BaseLEPAdapter(ABC):
         resource_name = params.get("resource_name")
         resource_params = params.get("parameters", {})
         
-        result = await self.get_resource_impl(resource_name, resource_params)
-        self._log_audit_event("get_resource", None, resource_name, resource_params, result)
+        result = await run_with_deadline(
+            self.get_resource_impl(resource_name, resource_params),
+            self._request_timeout(params, self.default_resource_timeout),
+            f"Resource {resource_name}"
+        )
+        self.audit_resource_read(resource_name, resource_params, result)
         
         return result
+    
+    def audit_resource_read(self, resource_name: str, parameters: Dict[str, Any], result: Any):
+        """Record a resource read, including one a client served from its cache."""
+        self._log_audit_event("get_resource", None, resource_name, parameters, result)
 
     async def _handle_call_skill(self, params: Dict[str, Any]) -> Any:
         """Handle legacy/callSkill request."""
@@ -117,24 +234,226 @@ class BaseLEPAdapter(ABC):
         skill_params = params.get("parameters", {})
         approval_token = params.get("approval_token")
         
-        # Verify approval token
-        if not self._verify_approval_token(approval_token, skill_name, skill_params):
+        # An asynchronously approved request is redeemed by its decision ID,
+        # by the requester only
+        if approval_token is None and params.get("decision_id"):
+            approval = self.approval_queue.get(params["decision_id"])
+            if not approval.is_claimed_by(params.get("claim_token")):
+                raise Exception(f"Approval {approval.decision_id} was not requested with this claim token")
+            if approval.state != ApprovalState.APPROVED:
+                raise Exception(f"Approval {approval.decision_id} is {approval.state.value}")
+            approval_token = approval.approval_token
+        
+        # Read skills may run without a token; writes (and unknown skills) must present one
+        token_required = approval_token is not None or self.get_operation_type(skill_name) != OperationType.READ
+        if token_required and not self._verify_approval_token(approval_token, skill_name, skill_params):
             raise Exception("Invalid or expired approval token")
         
+        approval_data = self.active_approvals.get(approval_token, {})
+        decision_id = approval_data.get("decision_id")
+        
+        # Batch tokens are spent against their grant; a failed execution is refunded
+        grant: Optional[BatchGrant] = approval_data.get("grant")
+        if grant is not None:
+            try:
+                usage = grant.spend(skill_name, skill_params)
+            except BatchApprovalError as e:
+                raise Exception(f"Batch approval refused: {e}")
+        
         # Execute skill
-        result = await self.call_skill_impl(skill_name, skill_params)
+        task = asyncio.current_task()
+        call = CURRENT_CALL.get()
+        request_key = (call.session, call.request_id) if call is not None else (None, None)
+        running = self._running_skills.setdefault(request_key, set())
+        running.add(task)
+        outcome = "error"
+        started = time.perf_counter()
+        try:
+            with TRACER.span("skill.execute", adapter=self.adapter_name, skill=skill_name):
+                result = await run_with_deadline(
+                    self.call_skill_impl(skill_name, skill_params),
+                    self._request_timeout(params, self.get_skill_timeout(skill_name)),
+                    f"Skill {skill_name}"
+                )
+            outcome = "ok"
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            if grant is not None:
+                grant.refund(skill_name, skill_params)
+            if task not in self._cancel_requested:
+                raise
+            # Cancelled by legacy/cancel: fail this call, not the request carrying it
+            self._cancel_requested.discard(task)
+            task.uncancel()
+            self._log_audit_event("skill_cancelled", decision_id, skill_name, skill_params, None)
+            raise Exception(f"Skill {skill_name} cancelled by client")
+        except Exception as e:
+            if grant is not None:
+                grant.refund(skill_name, skill_params)
+            if isinstance(e, DeadlineExceeded):
+                outcome = "deadline"
+                self._log_audit_event("skill_timed_out", decision_id, skill_name, skill_params, str(e))
+            raise
+        finally:
+            running.discard(task)
+            if not running:
+                self._running_skills.pop(request_key, None)
+            self._skill_seconds.labels(self.adapter_name, skill_name).observe(time.perf_counter() - started)
+            self._skill_calls.labels(self.adapter_name, skill_name, outcome).inc()
         
         # Log to audit trail
-        approval_data = self.active_approvals.get(approval_token, {})
-        decision_id = approval_data.get("decision_id")
         self._log_audit_event("skill_executed", decision_id, skill_name, skill_params, result)
         
-        # Invalidate single-use token
-        if approval_token in self.active_approvals:
+        if grant is not None:
+            self._log_audit_event("batch_approval_spent", decision_id, skill_name, skill_params, usage)
+            if grant.exhausted:
+                self.active_approvals.pop(approval_token, None)
+        elif approval_token in self.active_approvals:
+            # Invalidate single-use token
             del self.active_approvals[approval_token]
         
         return result
 
+    async def _handle_cancel(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle legacy/cancel (normally a notification): cancel the request
+        `request_id` sent earlier on the same session. Its skill calls fail
+        with a "cancelled" error and any batch approval they spent is refunded.
+        """
+        request_id = (params or {}).get("request_id")
+        call = CURRENT_CALL.get()
+        session = call.session if call is not None else None
+        tasks = [] if request_id is None else [
+            task for task in self._running_skills.get((session, request_id), ())
+            if task not in self._cancel_requested
+        ]
+        for task in tasks:
+            self._cancel_requested.add(task)
+            task.cancel()
+        return {"request_id": request_id, "cancelled": len(tasks)}
+
+    async def _handle_call_skills(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle legacy/callSkills request: several skill invocations in one round trip.
+        
+        Operations run in stages: consecutive reads run concurrently, and
+        each write runs alone after everything before it. In "best_effort"
+        mode every operation is attempted. In "all_or_nothing" mode the first
+        failure stops the batch and completed writes are undone, newest first,
+        through the adapter's compensation hooks.
+        """
+        operations = params.get("operations") or []
+        mode = params.get("mode", "best_effort")
+        if mode not in ("best_effort", "all_or_nothing"):
+            raise Exception(f"Unknown mode: {mode}")
+        if len(operations) > self.max_operations_per_call:
+            raise Exception(f"Too many operations ({len(operations)} > {self.max_operations_per_call})")
+        
+        ops = [
+            {
+                "id": op.get("id", str(index)),
+                "skill_name": op.get("skill_name"),
+                "call": {k: op[k] for k in ("skill_name", "parameters", "approval_token", "decision_id", "timeout")
+                         if k in op},
+                "write": self.get_operation_type(op.get("skill_name")) != OperationType.READ
+            }
+            for index, op in enumerate(operations)
+        ]
+        if len({op["id"] for op in ops}) != len(ops):
+            raise Exception("Operation ids must be unique")
+        
+        # Group into stages: runs of reads, with every write on its own
+        stages: List[List[Dict[str, Any]]] = []
+        for op in ops:
+            if op["write"] or not stages or stages[-1][0]["write"]:
+                stages.append([op])
+            else:
+                stages[-1].append(op)
+        
+        if mode == "all_or_nothing":
+            # Every write that is not the last operation must be undoable
+            for op in ops[:-1]:
+                if op["write"] and not self.can_compensate(op["skill_name"]):
+                    raise Exception(f"Skill '{op['skill_name']}' cannot be compensated; "
+                                    f"use best_effort or make it the last operation")
+            # Fail before executing anything if a write is missing its approval
+            for op in ops:
+                call = op["call"]
+                if op["write"] and not call.get("decision_id") and not self._verify_approval_token(
+                    call.get("approval_token"), op["skill_name"], call.get("parameters", {})
+                ):
+                    raise Exception(f"Operation '{op['id']}' has no valid approval token")
+        
+        results: Dict[str, Dict[str, Any]] = {op["id"]: {"id": op["id"], "status": "skipped"} for op in ops}
+        completed_writes: List[Tuple[Dict[str, Any], Any]] = []
+        failed = False
+        # A "timeout" for the whole batch caps every operation; compensation is not bound by it
+        batch_timeout = self._request_timeout(params, None)
+        for stage in stages:
+            with deadline_scope(batch_timeout):
+                outcomes = await asyncio.gather(
+                    *(self._handle_call_skill(op["call"]) for op in stage), return_exceptions=True
+                )
+            for op, outcome in zip(stage, outcomes):
+                # CancelledError too: an operation cancelled under us still fails the batch
+                if isinstance(outcome, BaseException):
+                    results[op["id"]] = {"id": op["id"], "status": "error",
+                                         "error": str(outcome) or type(outcome).__name__}
+                    failed = True
+                else:
+                    results[op["id"]] = {"id": op["id"], "status": "ok", "result": outcome}
+                    if op["write"]:
+                        completed_writes.append((op, outcome))
+            if failed and mode == "all_or_nothing":
+                break
+        
+        rolled_back = False
+        if failed and mode == "all_or_nothing":
+            rolled_back = True
+            for op, outcome in reversed(completed_writes):
+                entry = results[op["id"]]
+                try:
+                    await self._compensate(op["call"], outcome)
+                    entry["status"] = "compensated"
+                except Exception as e:
+                    entry["status"] = "compensation_failed"
+                    entry["compensation_error"] = str(e)
+                    rolled_back = False
+        
+        summary = {
+            "mode": mode,
+            "succeeded": not failed,
+            "rolled_back": rolled_back,
+            "results": [results[op["id"]] for op in ops]
+        }
+        self._log_audit_event("skills_batch_executed", None, None, {"operations": [op["id"] for op in ops]},
+                              {"mode": mode, "succeeded": not failed, "rolled_back": rolled_back})
+        return summary
+
+    async def _compensate(self, call: Dict[str, Any], result: Any):
+        """Run the compensating operation for a completed write and audit it."""
+        skill_name = call.get("skill_name")
+        parameters = call.get("parameters", {})
+        compensation = self.compensation_for(skill_name, parameters, result)
+        if compensation is None:
+            raise Exception(f"No compensation available for {skill_name}")
+        comp_skill, comp_params = compensation
+        comp_result = await self.call_skill_impl(comp_skill, comp_params)
+        self._log_audit_event("skill_compensated", None, comp_skill, comp_params,
+                              {"compensates": skill_name, "result": comp_result})
+
+    def can_compensate(self, skill_name: str) -> bool:
+        """Whether a completed call of this write skill can be undone. Override in subclasses."""
+        return False
+
+    def compensation_for(self, skill_name: str, parameters: Dict[str, Any],
+                         result: Any) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Return the (skill_name, parameters) call that undoes a completed write,
+        or None if it cannot be undone. Override in subclasses.
+        """
+        return None
+
     async def _handle_request_approval(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle security/requestApproval request."""
         skill_name = params.get("skill_name")
@@ -142,14 +461,45 @@ class BaseLEPAdapter(ABC):
         reason = params.get("reason")
         estimated_impact = params.get("estimated_impact", {})
         
-        # Generate decision ID
-        self.decision_counter += 1
-        decision_id = f"decision_{self.decision_counter}"
+        decision_id = self._new_decision_id()
+        
+        # Low-risk (or forbidden) requests are decided by policy without a human
+        if self.approval_policy is not None:
+            decision = self.approval_policy.evaluate(skill_name, skill_params)
+            if decision is not None:
+                approval_token = None
+                if decision.state == ApprovalState.APPROVED:
+                    approval_token = self._generate_approval_token(decision_id, skill_name, skill_params)
+                self._log_audit_event("approval_auto_decided", decision_id, skill_name, skill_params,
+                                      {"state": decision.state.value, "rule": decision.rule})
+                return {
+                    "state": decision.state.value,
+                    "decision_id": decision_id,
+                    "approval_token": approval_token,
+                    "rule": decision.rule
+                }
+        
+        # Park the request and answer at once; the decision arrives separately
+        if params.get("async", self.async_approvals):
+            approval = self.approval_queue.submit(decision_id, skill_name, skill_params, reason, estimated_impact)
+            self._log_audit_event("approval_requested", decision_id, skill_name, skill_params,
+                                  ApprovalState.PENDING.value)
+            return {
+                "state": ApprovalState.PENDING.value,
+                "decision_id": decision_id,
+                "approval_token": None,
+                "claim_token": approval.claim_token,
+                "expires_at": approval.expires_at.isoformat()
+            }
         
         # Request approval from human (this is where the UI would be invoked)
-        approval_state = await self.request_human_approval(
-            skill_name, skill_params, reason, estimated_impact
-        )
+        started = time.perf_counter()
+        with TRACER.span("approval.human", skill=skill_name) as span:
+            approval_state = await self.request_human_approval(
+                skill_name, skill_params, reason, estimated_impact
+            )
+            span.set_attribute("state", approval_state.value)
+        self._approval_wait.labels(self.adapter_name, approval_state.value).observe(time.perf_counter() - started)
         
         # Generate approval token if approved
         approval_token = None
@@ -165,6 +515,48 @@ class BaseLEPAdapter(ABC):
             "approval_token": approval_token
         }
 
+    async def _handle_request_batch_approval(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle security/requestBatchApproval request (one approval for many operations)."""
+        scope = {k: params[k] for k in ("operations", "envelope", "max_uses") if params.get(k) is not None}
+        reason = params.get("reason")
+        estimated_impact = params.get("estimated_impact", {})
+        
+        # Validate the scope before bothering a human with it
+        try:
+            BatchGrant.from_request(scope)
+        except (BatchApprovalError, KeyError, TypeError) as e:
+            raise Exception(f"Invalid batch approval request: {e}")
+        
+        decision_id = self._new_decision_id()
+        
+        if params.get("async", self.async_approvals):
+            approval = self.approval_queue.submit(decision_id, BATCH_SKILL, scope, reason, estimated_impact)
+            self._log_audit_event("approval_requested", decision_id, BATCH_SKILL, scope,
+                                  ApprovalState.PENDING.value)
+            return {
+                "state": ApprovalState.PENDING.value,
+                "decision_id": decision_id,
+                "approval_token": None,
+                "claim_token": approval.claim_token,
+                "expires_at": approval.expires_at.isoformat()
+            }
+        
+        started = time.perf_counter()
+        with TRACER.span("approval.human", skill=BATCH_SKILL) as span:
+            approval_state = await self.request_human_approval(BATCH_SKILL, scope, reason, estimated_impact)
+            span.set_attribute("state", approval_state.value)
+        self._approval_wait.labels(self.adapter_name, approval_state.value).observe(time.perf_counter() - started)
+        approval_token = None
+        if approval_state == ApprovalState.APPROVED:
+            approval_token = self._generate_batch_token(decision_id, scope)
+        self._log_audit_event("approval_requested", decision_id, BATCH_SKILL, scope, approval_state.value)
+        
+        return {
+            "state": approval_state.value,
+            "decision_id": decision_id,
+            "approval_token": approval_token
+        }
+
     async def _handle_get_audit_trail(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Handle security/getAuditTrail request."""
         since_decision_id = params.get("since_decision_id")
@@ -194,6 +586,192 @@ class BaseLEPAdapter(ABC):
             for event in filtered_trail
         ]
 
+    async def _handle_get_approval(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle security/getApproval request (poll a pending decision). The
+        approval token is returned only with the requester's claim token.
+        """
+        approval = self.approval_queue.get(params.get("decision_id"))
+        return approval.to_dict(include_token=approval.is_claimed_by(params.get("claim_token")))
+
+    async def _handle_await_approval(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle security/awaitApproval request (long-poll, capped at max_approval_wait)."""
+        timeout = min(float(params.get("timeout", self.max_approval_wait)), self.max_approval_wait)
+        approval = await self.approval_queue.wait(params.get("decision_id"), timeout)
+        return approval.to_dict(include_token=approval.is_claimed_by(params.get("claim_token")))
+
+    async def _handle_decide_approval(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle security/decideApproval request from a human operator (operator API)."""
+        approval = self.approval_queue.decide(
+            params.get("decision_id"),
+            bool(params.get("approved")),
+            decided_by=params.get("decided_by"),
+            comment=params.get("comment")
+        )
+        # The token belongs to the requester, not the operator
+        return approval.to_dict()
+
+    async def _handle_list_pending_approvals(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Handle security/listPendingApprovals request."""
+        return [approval.to_dict() for approval in self.approval_queue.pending()]
+
+    async def _handle_profiling(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle admin/profiling request: turn request profiling on or off
+        ("enabled") and change its settings; returns the status and the
+        saved profiles.
+        """
+        params = dict(params or {})
+        enabled = params.pop("enabled", None)
+        try:
+            self.profiler.configure(**params)
+        except ValueError as e:
+            raise Exception(str(e))
+        if enabled is True:
+            self.enable_profiling()
+        elif enabled is False:
+            self.disable_profiling()
+        return self.profiler.status()
+
+    async def _handle_get_profile(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle admin/getProfile request: a saved profile's metadata and top functions."""
+        try:
+            record = self.profiler.get(params.get("profile_id"))
+        except KeyError as e:
+            raise Exception(e.args[0])
+        return {**record.to_dict(),
+                "summary": record.summary(int(params.get("limit", 20)), params.get("sort", "cumulative"))}
+
+    async def _handle_memory(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle admin/memory request: process memory and the estimated size of
+        each state structure. "allocations" set to "start", "diff" or "stop"
+        controls allocation tracing; "diff" adds the growth since start
+        (or the previous diff, with "rebase").
+        """
+        params = params or {}
+        report = {
+            "adapter": self.adapter_name,
+            "process": process_memory(),
+            "structures": structure_report(self.memory_structures(), int(params.get("sample", 100)))
+        }
+        action = params.get("allocations")
+        if action == "start":
+            ALLOCATIONS.start(int(params.get("frames", 10)))
+        elif action == "diff":
+            try:
+                report["allocations"] = ALLOCATIONS.diff(int(params.get("top", 10)), params.get("group_by", "lineno"),
+                                                         bool(params.get("rebase", False)))
+            except RuntimeError as e:
+                raise Exception(str(e))
+        elif action == "stop":
+            ALLOCATIONS.stop()
+        elif action is not None:
+            raise Exception(f"Unknown allocations action: {action}")
+        report["allocation_tracing"] = ALLOCATIONS.tracing
+        return report
+
+    def memory_structures(self) -> Dict[str, Any]:
+        """
+        The adapter's long-lived state, by name, for admin/memory. Subclasses
+        add their data stores and caches.
+        """
+        return {
+            "audit_trail": self.audit_trail,
+            "active_approvals": self.active_approvals,
+            "approval_queue": self.approval_queue.approvals,
+            "running_skills": self._running_skills,
+            "outbound_queue": self.outbound,
+            "profiles": self.profiler.profiles,
+            "skill_cache": self._operation_types,
+        }
+
+    def _on_approval_decided(self, approval: PendingApproval):
+        """Mint the token for an approved request and audit every outcome."""
+        if approval.state == ApprovalState.APPROVED and approval.skill_name == BATCH_SKILL:
+            approval.approval_token = self._generate_batch_token(approval.decision_id, approval.parameters)
+        elif approval.state == ApprovalState.APPROVED:
+            approval.approval_token = self._generate_approval_token(
+                approval.decision_id, approval.skill_name, approval.parameters
+            )
+        waited = ((approval.decided_at or datetime.now()) - approval.created_at).total_seconds()
+        self._approval_wait.labels(self.adapter_name, approval.state.value).observe(waited)
+        event_type = "approval_expired" if approval.state == ApprovalState.EXPIRED else "approval_decided"
+        self._log_audit_event(event_type, approval.decision_id, approval.skill_name, approval.parameters,
+                              {"state": approval.state.value, "decided_by": approval.decided_by})
+        if self.outbound.enabled:
+            # Without the approval token: the requester fetches it with its claim token
+            self.send_notification("security/approvalDecided", approval.to_dict())
+
+    def list_resources(self) -> List[Dict[str, Any]]:
+        """
+        Describe the resources this adapter serves, for discovery (e.g. MCP
+        resources/list). Each entry has "path" (relative URI, may contain
+        {variables}), "resource_name" (passed to get_resource_impl, with the
+        variables as parameters), "name", and optionally "description",
+        "mime_type" and "cache_ttl" (seconds a result may be reused).
+        Override in subclasses.
+        """
+        return []
+
+    def list_resource_instances(self, resource_name: str,
+                                after: Optional[Dict[str, Any]] = None) -> Iterable[Dict[str, Any]]:
+        """
+        Yield the variable values of each concrete instance of a templated
+        resource, in a stable order, starting after the instance `after` (the
+        last one a previous page ended with). Resume from an index rather than
+        skipping from the start: listings are paged through this.
+        """
+        return []
+
+    def get_operation_type(self, skill_name: str) -> Optional[OperationType]:
+        """Return a skill's operation type, or None for an unknown skill."""
+        if self._operation_types is None:
+            self._operation_types = {skill.name: skill.operation_type for skill in self.get_skills()}
+        return self._operation_types.get(skill_name)
+
+    def get_skill_timeout(self, skill_name: str) -> Optional[float]:
+        """Default time limit for one call of a skill (None: unlimited)."""
+        return self.skill_timeouts.get(skill_name, self.default_call_timeout)
+    
+    def _request_timeout(self, params: Dict[str, Any], default: Optional[float]) -> Optional[float]:
+        timeout = params.get("timeout")
+        if timeout is None:
+            return default
+        try:
+            timeout = float(timeout)
+        except (TypeError, ValueError):
+            raise Exception(f"Invalid timeout: {timeout}")
+        if timeout <= 0:
+            raise Exception("Timeout must be positive")
+        return min(timeout, self.max_call_timeout)
+    
+    def invalidate_skill_cache(self):
+        """Forget cached skill metadata; call after the skill list changes."""
+        self._operation_types = None
+
+    def enable_profiling(self, **options: Any) -> RequestProfiler:
+        """
+        Profile slow or selected requests from now on (see RequestProfiler
+        for the options). Without it the dispatch path has no profiling hook.
+        """
+        self.profiler.configure(**options)
+        self.profiler.attach(self.rpc_handler, self.adapter_name)
+        return self.profiler
+
+    def disable_profiling(self):
+        """Remove the profiling hook; saved profiles are kept."""
+        self.profiler.detach(self.rpc_handler)
+
+    async def close(self):
+        """Release background resources (workers, connections) when the hosting server stops. Override in subclasses."""
+        pass
+
+    def _new_decision_id(self) -> str:
+        """Number a decision; the random suffix keeps other clients from guessing it."""
+        self.decision_counter += 1
+        return f"decision_{self.decision_counter}_{secrets.token_hex(4)}"
+    
     def _generate_approval_token(self, decision_id: str, skill_name: str, params: Dict[str, Any]) -> str:
         """Generate a cryptographically secure approval token."""
         token = secrets.token_urlsafe(32)
@@ -208,6 +786,18 @@ class BaseLEPAdapter(ABC):
         
         return token
 
+    def _generate_batch_token(self, decision_id: str, scope: Dict[str, Any]) -> str:
+        """Generate a token spendable against a batch grant until used up or expired."""
+        token = secrets.token_urlsafe(32)
+        self.active_approvals[token] = {
+            "decision_id": decision_id,
+            "skill_name": BATCH_SKILL,
+            "parameters": scope,
+            "grant": BatchGrant.from_request(scope),
+            "expires_at": datetime.now() + self.batch_token_ttl
+        }
+        return token
+
     def _verify_approval_token(self, token: str, skill_name: str, params: Dict[str, Any]) -> bool:
         """Verify an approval token."""
         if token not in self.active_approvals:
@@ -220,6 +810,10 @@ class BaseLEPAdapter(ABC):
             del self.active_approvals[token]
             return False
         
+        # Batch grants check scope when the token is spent
+        if "grant" in approval_data:
+            return True
+        
         # Verify skill name and parameters match
         if approval_data["skill_name"] != skill_name:
             return False
@@ -250,6 +844,7 @@ class BaseLEPAdapter(ABC):
             user_id="system"  # In production, this would be the actual user ID
         )
         self.audit_trail.append(event)
+        current_span().add_event("audit", event_type=event_type, decision_id=decision_id)
 
     # Abstract methods that subclasses must implement
 
@@ -279,8 +874,51 @@ class BaseLEPAdapter(ABC):
         """Request approval from a human operator. This is where the UI integration happens."""
         pass
 
+    # Notifications
+
+    def send_notification(self, method: str, params: Dict[str, Any],
+                          coalesce_key: Optional[Hashable] = None) -> bool:
+        """
+        Queue a notification for the client; it is dropped at no cost when no
+        client is listening. Returns False if it was not queued in full.
+        """
+        return self.rpc_handler.notify(method, params, coalesce_key)
+
+    def report_progress(self, skill_name: str, percentage: float, message: str,
+                        task_id: Optional[str] = None) -> bool:
+        """
+        Send a legacy/update for a long-running skill. Updates for the same
+        skill (and task, e.g. a batch job) replace each other while they wait,
+        if the client allows coalescing.
+        """
+        if not self.outbound.enabled:
+            return False
+        params = dict(ProgressUpdate(skill_name, round(percentage, 1), message).__dict__)
+        if task_id is not None:
+            params["task_id"] = task_id
+        return self.send_notification("legacy/update", params, ("legacy/update", skill_name, task_id))
+
     # Public API
 
-    async def handle_request(self, request_data: str) -> str:
-        """Handle an incoming JSON-RPC 2.0 request."""
-        return await self.rpc_handler.handle_request(request_data)
+    async def invoke(self, method: str, params: Dict[str, Any]) -> Any:
+        """
+        Call a LEP method in-process, through the same interceptors as a
+        JSON-RPC request. Used by the MCP bridge; errors are raised.
+        """
+        return await self.rpc_handler.call(method, params)
+
+    async def handle_request(self, request_data: str, session: Any = None) -> Optional[str]:
+        """
+        Handle an incoming JSON-RPC 2.0 request. Notifications get no response
+        (None). `session` identifies the client connection; legacy/cancel only
+        reaches requests sent on the same one.
+        """
+        return await self.rpc_handler.handle_request(request_data, session)
+
+    async def invoke_operator(self, method: str, params: Dict[str, Any]) -> Any:
+        """Call an operator API method in-process (e.g. from an operator console); errors are raised."""
+        return await self.operator_handler.call(method, params)
+
+    async def handle_operator_request(self, request_data: str) -> Optional[str]:
+        """Handle a JSON-RPC 2.0 request on the operator API, from an authenticated operator channel."""
+        return await self.operator_handler.handle_request(request_data)
@@ -0,0 +1,333 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Columnar Account Ledger
+
+This module keeps account balances and posted transaction flows in
+array-backed columns so portfolio-wide questions (balance distributions,
+per-period flows, top movers, threshold scans) can be answered in a
+single pass instead of one `getAccountInfo` call per account.
+
+Columns are stored in `array.array` buffers. When NumPy is installed the
+analytics run as vectorized operations over zero-copy views of those
+buffers; otherwise they fall back to pure Python over the same columns.
+"""
+
+import heapq
+from array import array
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+
+def _parse_day(value: Optional[str]) -> Optional[int]:
+    """Convert a YYYY-MM-DD string to a proleptic day ordinal."""
+    if not value:
+        return None
+    return date.fromisoformat(value[:10]).toordinal()
+
+
+def _month_label(month_key: int) -> str:
+    """Format a `year * 12 + month - 1` key as YYYY-MM."""
+    year, month = divmod(month_key, 12)
+    return f"{year:04d}-{month + 1:02d}"
+
+
+class AccountLedger:
+    """
+    Array-backed store of account balances and signed ledger entries.
+
+    Every posted movement becomes one entry per affected account: deposits
+    and incoming transfers are positive amounts, withdrawals and outgoing
+    transfers are negative.
+    """
+
+    def __init__(self, accounts: Optional[Dict[str, Dict[str, Any]]] = None, use_numpy: bool = True):
+        self.use_numpy = use_numpy and np is not None
+
+        # Account columns
+        self.account_ids: List[str] = []
+        self.statuses: List[str] = []
+        self.balances = array("d")
+        self._index: Dict[str, int] = {}
+
+        # Entry columns
+        self.entry_account = array("q")
+        self.entry_amount = array("d")
+        self.entry_day = array("q")
+        self.entry_month = array("q")
+
+        for account_id, account in (accounts or {}).items():
+            self.add_account(account_id, account.get("balance", 0.0), account.get("status", "active"))
+
+    def __len__(self) -> int:
+        return len(self.account_ids)
+
+    def __contains__(self, account_id: object) -> bool:
+        return account_id in self._index
+
+    @property
+    def entry_count(self) -> int:
+        return len(self.entry_amount)
+
+    # Mutation
+
+    def add_account(self, account_id: str, balance: float, status: str = "active"):
+        """Register an account, or refresh its balance and status if it exists."""
+        index = self._index.get(account_id)
+        if index is None:
+            self._index[account_id] = len(self.account_ids)
+            self.account_ids.append(account_id)
+            self.statuses.append(status)
+            self.balances.append(float(balance))
+        else:
+            self.balances[index] = float(balance)
+            self.statuses[index] = status
+
+    def post(self, account_id: str, amount: float, timestamp: Optional[datetime] = None):
+        """Post a signed movement against an account."""
+        self.balances[self._index[account_id]] += amount
+        self.record(account_id, amount, timestamp)
+
+    def record(self, account_id: str, amount: float, timestamp: Optional[datetime] = None):
+        """Add an entry for a movement already reflected in the account's balance."""
+        index = self._index[account_id]
+        when = (timestamp or datetime.now(timezone.utc)).date()
+        self.entry_account.append(index)
+        self.entry_amount.append(float(amount))
+        self.entry_day.append(when.toordinal())
+        self.entry_month.append(when.year * 12 + when.month - 1)
+
+    # Column access
+
+    def _columns(self):
+        """Return the columns as NumPy views when enabled, else the raw arrays."""
+        if self.use_numpy:
+            return (
+                np.frombuffer(self.balances, dtype=np.float64),
+                np.frombuffer(self.entry_account, dtype=np.int64),
+                np.frombuffer(self.entry_amount, dtype=np.float64),
+                np.frombuffer(self.entry_day, dtype=np.int64),
+                np.frombuffer(self.entry_month, dtype=np.int64),
+            )
+        return self.balances, self.entry_account, self.entry_amount, self.entry_day, self.entry_month
+
+    def _entry_mask(self, days, start_date: Optional[str], end_date: Optional[str]):
+        """Build a NumPy boolean mask selecting entries inside a date window."""
+        start, end = _parse_day(start_date), _parse_day(end_date)
+        mask = np.ones(len(days), dtype=bool)
+        if start is not None:
+            mask &= days >= start
+        if end is not None:
+            mask &= days <= end
+        return mask
+
+    def _entries_in_window(self, start_date: Optional[str], end_date: Optional[str]):
+        """Yield entry positions inside a date window (pure Python path)."""
+        start, end = _parse_day(start_date), _parse_day(end_date)
+        for i, day in enumerate(self.entry_day):
+            if (start is None or day >= start) and (end is None or day <= end):
+                yield i
+
+    # Analytics
+
+    def balance_distribution(self, bins: int = 10, percentiles: Tuple[float, ...] = (50, 90, 99)) -> Dict[str, Any]:
+        """Summary statistics and an equal-width histogram of balances."""
+        count = len(self.balances)
+        if count == 0:
+            return {"count": 0, "total": 0.0, "histogram": []}
+        bins = max(1, int(bins))
+
+        if self.use_numpy:
+            balances = self._columns()[0]
+            counts, edges = np.histogram(balances, bins=bins)
+            stats = {
+                "total": float(balances.sum()),
+                "mean": float(balances.mean()),
+                "min": float(balances.min()),
+                "max": float(balances.max()),
+                "std": float(balances.std()),
+            }
+            pct_values = np.percentile(balances, percentiles).tolist()
+            histogram = [
+                (float(edges[i]), float(edges[i + 1]), int(counts[i])) for i in range(bins)
+            ]
+        else:
+            values = sorted(self.balances)
+            total = sum(values)
+            mean = total / count
+            low, high = values[0], values[-1]
+            # Same bin placement as np.histogram, including the degenerate range
+            first_edge, width = (low, (high - low) / bins) if high > low else (low - 0.5, 1.0 / bins)
+            counts = [0] * bins
+            for value in values:
+                counts[min(int((value - first_edge) / width), bins - 1)] += 1
+            stats = {
+                "total": total,
+                "mean": mean,
+                "min": low,
+                "max": high,
+                "std": (sum((v - mean) ** 2 for v in values) / count) ** 0.5,
+            }
+            pct_values = [self._percentile(values, p) for p in percentiles]
+            edges = [first_edge + i * width for i in range(bins + 1)]
+            histogram = [(edges[i], edges[i + 1], counts[i]) for i in range(bins)]
+
+        return {
+            "count": count,
+            **{key: round(value, 2) for key, value in stats.items()},
+            "percentiles": {f"p{p:g}": round(v, 2) for p, v in zip(percentiles, pct_values)},
+            "histogram": [
+                {"lower": round(lower, 2), "upper": round(upper, 2), "count": n}
+                for lower, upper, n in histogram
+            ],
+        }
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], pct: float) -> float:
+        """Linear-interpolated percentile, matching NumPy's default method."""
+        rank = (len(sorted_values) - 1) * pct / 100.0
+        lower = int(rank)
+        upper = min(lower + 1, len(sorted_values) - 1)
+        return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+    def period_flows(
+        self,
+        period: str = "day",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        account_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Inflow, outflow and net movement per day or month."""
+        if period not in ("day", "month"):
+            raise ValueError(f"Unsupported period: {period}")
+        account_index = self._index.get(account_id) if account_id else None
+        if account_id and account_index is None:
+            raise ValueError(f"Account not found: {account_id}")
+
+        if self.use_numpy:
+            _, accounts, amounts, days, months = self._columns()
+            mask = self._entry_mask(days, start_date, end_date)
+            if account_index is not None:
+                mask &= accounts == account_index
+            keys = (days if period == "day" else months)[mask]
+            selected = amounts[mask]
+            if len(keys) == 0:
+                return []
+            unique_keys, inverse = np.unique(keys, return_inverse=True)
+            inflow = np.bincount(inverse, weights=np.where(selected > 0, selected, 0.0))
+            outflow = np.bincount(inverse, weights=np.where(selected < 0, -selected, 0.0))
+            counts = np.bincount(inverse)
+            rows = zip(unique_keys.tolist(), inflow.tolist(), outflow.tolist(), counts.tolist())
+        else:
+            key_column = self.entry_day if period == "day" else self.entry_month
+            buckets: Dict[int, List[float]] = {}
+            for i in self._entries_in_window(start_date, end_date):
+                if account_index is not None and self.entry_account[i] != account_index:
+                    continue
+                bucket = buckets.setdefault(key_column[i], [0.0, 0.0, 0])
+                amount = self.entry_amount[i]
+                if amount > 0:
+                    bucket[0] += amount
+                else:
+                    bucket[1] -= amount
+                bucket[2] += 1
+            rows = ((key, *buckets[key]) for key in sorted(buckets))
+
+        label = (lambda key: date.fromordinal(key).isoformat()) if period == "day" else _month_label
+        return [
+            {
+                "period": label(key),
+                "inflow": round(inflow, 2),
+                "outflow": round(outflow, 2),
+                "net": round(inflow - outflow, 2),
+                "count": int(count),
+            }
+            for key, inflow, outflow, count in rows
+        ]
+
+    def top_movers(
+        self,
+        n: int = 10,
+        by: str = "net",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Accounts with the largest absolute net (or gross) movement in a window."""
+        if by not in ("net", "gross"):
+            raise ValueError(f"Unsupported ranking: {by}")
+        n = max(0, int(n))
+        size = len(self.account_ids)
+
+        if self.use_numpy:
+            balances, accounts, amounts, days, _ = self._columns()
+            mask = self._entry_mask(days, start_date, end_date)
+            selected = amounts[mask]
+            weights = selected if by == "net" else np.abs(selected)
+            movement = np.bincount(accounts[mask], weights=weights, minlength=size)
+            activity = np.bincount(accounts[mask], minlength=size)
+            score = np.abs(movement)
+            candidates = np.flatnonzero(activity)
+            if len(candidates) > n:
+                candidates = candidates[np.argpartition(-score[candidates], n - 1)[:n]] if n else candidates[:0]
+            ranked = sorted(candidates.tolist(), key=lambda i: (-score[i], i))
+            movement, activity = movement.tolist(), activity.tolist()
+        else:
+            movement = [0.0] * size
+            activity = [0] * size
+            for i in self._entries_in_window(start_date, end_date):
+                amount = self.entry_amount[i]
+                movement[self.entry_account[i]] += amount if by == "net" else abs(amount)
+                activity[self.entry_account[i]] += 1
+            ranked = heapq.nsmallest(
+                n, (i for i in range(size) if activity[i]), key=lambda i: (-abs(movement[i]), i)
+            )
+
+        return [
+            {
+                "account_id": self.account_ids[i],
+                by: round(movement[i], 2),
+                "transactions": int(activity[i]),
+                "balance": round(self.balances[i], 2),
+            }
+            for i in ranked
+        ]
+
+    def threshold_scan(
+        self,
+        min_balance: Optional[float] = None,
+        max_balance: Optional[float] = None,
+        status: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Accounts whose balance falls inside [min_balance, max_balance]."""
+        if self.use_numpy:
+            balances = self._columns()[0]
+            mask = np.ones(len(balances), dtype=bool)
+            if min_balance is not None:
+                mask &= balances >= min_balance
+            if max_balance is not None:
+                mask &= balances <= max_balance
+            if status is not None:
+                mask &= np.array(self.statuses, dtype=object) == status
+            matches = np.flatnonzero(mask).tolist()
+        else:
+            matches = [
+                i for i, balance in enumerate(self.balances)
+                if (min_balance is None or balance >= min_balance)
+                and (max_balance is None or balance <= max_balance)
+                and (status is None or self.statuses[i] == status)
+            ]
+
+        if limit is not None:
+            matches = matches[:int(limit)]
+        return [
+            {
+                "account_id": self.account_ids[i],
+                "balance": round(self.balances[i], 2),
+                "status": self.statuses[i],
+            }
+            for i in matches
+        ]
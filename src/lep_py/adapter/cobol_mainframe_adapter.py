@@ -10,18 +10,30 @@ Date: February 6, 2026
 License: MIT
 """
 
+import asyncio
 import hashlib
 import json
 import logging
 import secrets
-from datetime import datetime, timedelta
+from contextlib import nullcontext
+from itertools import islice
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
 
 from dataclasses import dataclass
 from typing import Any
 
+from ..codec.copybook import compile_copybook
 from ..core.jsonrpc import JSONRPCRequest, JSONRPCResponse
+from ..driver.base import BackendDriver, parse_connection_string
+from ..driver.pool import ConnectionPool
+from ..driver.simulator import TCPDriver
+from ..jobs.jcl import parse_jcl
+from ..jobs.queue import FINAL_STATES, Job, JobQueue
+from ..models.protocol import ApprovalState, OperationType, ProgressUpdate
 from .base_adapter import BaseLEPAdapter as BaseAdapter
+from .cobol_ledger import AccountLedger
+from ..storage.record_mapping import KSDSMapping, keys_after
 
 # Define data structures
 @dataclass
@@ -39,6 +51,10 @@ class Skill:
     returns: Dict[str, Any]
     requires_approval: bool
 
+    @property
+    def operation_type(self) -> OperationType:
+        return OperationType.WRITE if self.requires_approval else OperationType.READ
+
 @dataclass
 class Resource:
     uri: str
@@ -54,6 +70,24 @@ class ApprovalRequest:
     rationale: str
     expires_at: str
 
+# Record layout of the ACCTMSTR dataset
+ACCOUNT_RECORD_COPYBOOK = """
+       01  ACCOUNT-RECORD.
+           05  ACCT-ID                 PIC X(8).
+           05  ACCT-NAME               PIC X(30).
+           05  ACCT-BALANCE            PIC S9(11)V99 COMP-3.
+           05  ACCT-STATUS             PIC X(8).
+           05  FILLER                  PIC X(11).
+"""
+ACCOUNT_RECORD_LAYOUT = compile_copybook(ACCOUNT_RECORD_COPYBOOK)
+ACCOUNT_RECORD_FIELDS = {"name": "ACCT-NAME", "balance": "ACCT-BALANCE", "status": "ACCT-STATUS"}
+
+# JES job classes mapped to job queue priority lanes
+JOB_CLASS_LANES = {"A": 0, "B": 1, "C": 2}
+
+# Skills served by the local job queue even when a backend pool is connected
+BATCH_SKILLS = {"submitBatchJob", "getJobStatus", "getJobResult", "cancelBatchJob"}
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -76,7 +110,7 @@ class COBOLMainframeAdapter(BaseAdapter):
     """
     
     def __init__(self, mainframe_host: str, mainframe_port: int, 
-                 connection_string: str):
+                 connection_string: str, account_store_path: Optional[str] = None):
         """
         Initialize the COBOL mainframe adapter.
         
@@ -84,28 +118,65 @@ class COBOLMainframeAdapter(BaseAdapter):
             mainframe_host: Hostname of the mainframe
             mainframe_port: Port number for mainframe connection
             connection_string: Connection string for mainframe access
+            account_store_path: Optional path of a local KSDS stand-in for the
+                ACCTMSTR dataset; accounts are served from it instead of memory
         """
         super().__init__(
-            adapter_id="cobol-mainframe-adapter-001",
             adapter_name="COBOL Mainframe Adapter",
-            adapter_version="1.0.0",
-            system_name="IBM z/OS COBOL Banking System",
-            system_version="5.2"
+            adapter_version="1.0.0"
         )
         
+        self.adapter_id = "cobol-mainframe-adapter-001"
+        self.system_name = "IBM z/OS COBOL Banking System"
+        self.system_version = "5.2"
         self.mainframe_host = mainframe_host
         self.mainframe_port = mainframe_port
         self.connection_string = connection_string
+        self.connection_options = parse_connection_string(connection_string)
+        
+        # Pooled connection to the mainframe gateway; None means the in-process simulation
+        self.backend: Optional[ConnectionPool] = None
         
         # Simulated mainframe data (in production, this would connect to real mainframe)
-        self.accounts = {
-            "ACC001": {"name": "Alice Johnson", "balance": 50000.00, "status": "active"},
-            "ACC002": {"name": "Bob Smith", "balance": 75000.00, "status": "active"},
-            "ACC003": {"name": "Carol Williams", "balance": 120000.00, "status": "active"},
-        }
+        if account_store_path:
+            self.accounts = KSDSMapping.create(
+                account_store_path, ACCOUNT_RECORD_LAYOUT, "ACCT-ID", ACCOUNT_RECORD_FIELDS
+            )
+        else:
+            self.accounts = {
+                "ACC001": {"name": "Alice Johnson", "balance": 50000.00, "status": "active"},
+                "ACC002": {"name": "Bob Smith", "balance": 75000.00, "status": "active"},
+                "ACC003": {"name": "Carol Williams", "balance": 120000.00, "status": "active"},
+            }
         
         self.transactions = []
         
+        # Columnar mirror of balances and flows for portfolio-wide analytics.
+        # Built now for in-memory accounts; a record store is only read into
+        # it when an analytics query first needs it (see `ledger`).
+        self._ledger: Optional[AccountLedger] = None
+        if not isinstance(self.accounts, KSDSMapping):
+            self._ledger = AccountLedger(self.accounts)
+        
+        # Batch jobs run off the request path; accounts are processed in
+        # chunks, with an optional delay standing in for mainframe elapsed time
+        self.job_queue = JobQueue(workers=2, max_queued=100, lanes=len(JOB_CLASS_LANES))
+        self.job_queue.add_progress_listener(self._on_job_progress)
+        self.batch_chunk_size = 500
+        self.batch_chunk_delay = 0.0
+        
+        # Accounts returned per read of cobol://accounts; the rest are paged with a cursor
+        self.account_page_size = 100
+        
+        # Reports and portfolio analytics scan many records; allow them longer
+        self.skill_timeouts.update({
+            "generateAccountReport": 120.0,
+            "getBalanceDistribution": 120.0,
+            "getPeriodFlows": 120.0,
+            "getTopMovers": 120.0,
+            "scanBalanceThreshold": 120.0,
+        })
+        
         logger.info(f"COBOL Mainframe Adapter initialized: {mainframe_host}:{mainframe_port}")
     
     def get_skills(self) -> List[Skill]:
@@ -216,6 +287,197 @@ class COBOLMainframeAdapter(BaseAdapter):
                     "description": "Report content in text format"
                 },
                 requires_approval=False
+            ),
+            Skill(
+                name="getBalanceDistribution",
+                description="Portfolio-wide balance statistics, percentiles and histogram",
+                parameters=[
+                    SkillParameter(
+                        name="bins",
+                        type="integer",
+                        description="Number of equal-width histogram buckets (default 10)",
+                        required=False
+                    )
+                ],
+                returns={
+                    "type": "object",
+                    "description": "Count, total, mean, min, max, std, percentiles and histogram"
+                },
+                requires_approval=False
+            ),
+            Skill(
+                name="getPeriodFlows",
+                description="Inflow, outflow and net movement per day or month",
+                parameters=[
+                    SkillParameter(
+                        name="period",
+                        type="string",
+                        description="Aggregation period: 'day' or 'month' (default 'day')",
+                        required=False
+                    ),
+                    SkillParameter(
+                        name="start_date",
+                        type="string",
+                        description="Window start date (YYYY-MM-DD)",
+                        required=False
+                    ),
+                    SkillParameter(
+                        name="end_date",
+                        type="string",
+                        description="Window end date (YYYY-MM-DD)",
+                        required=False
+                    ),
+                    SkillParameter(
+                        name="account_id",
+                        type="string",
+                        description="Restrict flows to a single account",
+                        required=False
+                    )
+                ],
+                returns={
+                    "type": "array",
+                    "description": "One entry per period with inflow, outflow, net and count"
+                },
+                requires_approval=False
+            ),
+            Skill(
+                name="getTopMovers",
+                description="Accounts with the largest net or gross movement in a window",
+                parameters=[
+                    SkillParameter(
+                        name="n",
+                        type="integer",
+                        description="Number of accounts to return (default 10)",
+                        required=False
+                    ),
+                    SkillParameter(
+                        name="by",
+                        type="string",
+                        description="Ranking: 'net' or 'gross' movement (default 'net')",
+                        required=False
+                    ),
+                    SkillParameter(
+                        name="start_date",
+                        type="string",
+                        description="Window start date (YYYY-MM-DD)",
+                        required=False
+                    ),
+                    SkillParameter(
+                        name="end_date",
+                        type="string",
+                        description="Window end date (YYYY-MM-DD)",
+                        required=False
+                    )
+                ],
+                returns={
+                    "type": "array",
+                    "description": "Ranked accounts with movement, transaction count and balance"
+                },
+                requires_approval=False
+            ),
+            Skill(
+                name="scanBalanceThreshold",
+                description="Find accounts whose balance falls within a range",
+                parameters=[
+                    SkillParameter(
+                        name="min_balance",
+                        type="number",
+                        description="Inclusive lower bound",
+                        required=False
+                    ),
+                    SkillParameter(
+                        name="max_balance",
+                        type="number",
+                        description="Inclusive upper bound",
+                        required=False
+                    ),
+                    SkillParameter(
+                        name="status",
+                        type="string",
+                        description="Only include accounts with this status",
+                        required=False
+                    ),
+                    SkillParameter(
+                        name="limit",
+                        type="integer",
+                        description="Maximum number of accounts to return",
+                        required=False
+                    )
+                ],
+                returns={
+                    "type": "array",
+                    "description": "Matching accounts with balance and status"
+                },
+                requires_approval=False
+            ),
+            Skill(
+                name="submitBatchJob",
+                description="Submit a JCL batch job; returns a job ID immediately (requires approval)",
+                parameters=[
+                    SkillParameter(
+                        name="jcl",
+                        type="string",
+                        description="JCL with a JOB card (CLASS=A/B/C sets priority) and EXEC PGM= steps; "
+                                    "programs: INTCALC (PARM='RATE=n'), STMTGEN",
+                        required=True
+                    )
+                ],
+                returns={
+                    "type": "object",
+                    "description": "Job ID and initial job state"
+                },
+                requires_approval=True
+            ),
+            Skill(
+                name="getJobStatus",
+                description="Get the state and progress of a batch job",
+                parameters=[
+                    SkillParameter(
+                        name="job_id",
+                        type="string",
+                        description="Job ID returned by submitBatchJob",
+                        required=True
+                    )
+                ],
+                returns={
+                    "type": "object",
+                    "description": "Job state, progress percentage and status message"
+                },
+                requires_approval=False
+            ),
+            Skill(
+                name="getJobResult",
+                description="Get the step results of a batch job (null until the job has finished)",
+                parameters=[
+                    SkillParameter(
+                        name="job_id",
+                        type="string",
+                        description="Job ID returned by submitBatchJob",
+                        required=True
+                    )
+                ],
+                returns={
+                    "type": "object",
+                    "description": "Job state, per-step return codes and output, or the failure reason"
+                },
+                requires_approval=False
+            ),
+            Skill(
+                name="cancelBatchJob",
+                description="Cancel a queued or running batch job (requires approval)",
+                parameters=[
+                    SkillParameter(
+                        name="job_id",
+                        type="string",
+                        description="Job ID returned by submitBatchJob",
+                        required=True
+                    )
+                ],
+                returns={
+                    "type": "object",
+                    "description": "Job state after cancellation"
+                },
+                requires_approval=True
             )
         ]
     
@@ -227,7 +489,7 @@ class COBOLMainframeAdapter(BaseAdapter):
             Resource(
                 uri="cobol://accounts",
                 name="Customer Accounts",
-                description="List of all customer accounts",
+                description="Customer accounts in account ID order, a page at a time",
                 mime_type="application/json"
             ),
             Resource(
@@ -265,7 +527,11 @@ class COBOLMainframeAdapter(BaseAdapter):
             if not self.verify_approval_token(approval_token):
                 raise ValueError("Invalid or expired approval token")
         
-        # Execute the skill
+        return self._dispatch_skill(skill_name, parameters, approval_token)
+    
+    def _dispatch_skill(self, skill_name: str, parameters: Dict,
+                        approval_token: Optional[str] = None) -> Any:
+        """Route a skill call to its implementation."""
         if skill_name == "getAccountInfo":
             return self._get_account_info(parameters["account_id"])
         
@@ -292,6 +558,58 @@ class COBOLMainframeAdapter(BaseAdapter):
                 parameters.get("end_date")
             )
         
+        elif skill_name == "getBalanceDistribution":
+            return self._run_analytics(
+                skill_name, self.ledger.balance_distribution,
+                bins=parameters.get("bins", 10)
+            )
+        
+        elif skill_name == "getPeriodFlows":
+            return self._run_analytics(
+                skill_name, self.ledger.period_flows,
+                period=parameters.get("period", "day"),
+                start_date=parameters.get("start_date"),
+                end_date=parameters.get("end_date"),
+                account_id=parameters.get("account_id")
+            )
+        
+        elif skill_name == "getTopMovers":
+            return self._run_analytics(
+                skill_name, self.ledger.top_movers,
+                n=parameters.get("n", 10),
+                by=parameters.get("by", "net"),
+                start_date=parameters.get("start_date"),
+                end_date=parameters.get("end_date")
+            )
+        
+        elif skill_name == "scanBalanceThreshold":
+            return self._run_analytics(
+                skill_name, self.ledger.threshold_scan,
+                min_balance=parameters.get("min_balance"),
+                max_balance=parameters.get("max_balance"),
+                status=parameters.get("status"),
+                limit=parameters.get("limit")
+            )
+        
+        elif skill_name == "submitBatchJob":
+            return self._submit_batch_job(parameters["jcl"])
+        
+        elif skill_name == "getJobStatus":
+            return self.job_queue.get(parameters["job_id"]).to_dict()
+        
+        elif skill_name == "getJobResult":
+            job = self.job_queue.get(parameters["job_id"])
+            return {
+                "job_id": job.job_id,
+                "state": job.state.value,
+                "result": job.result,
+                "error": job.error,
+                "checkpoint": job.checkpoint
+            }
+        
+        elif skill_name == "cancelBatchJob":
+            return self.job_queue.cancel(parameters["job_id"]).to_dict()
+        
         else:
             raise ValueError(f"Skill execution not implemented: {skill_name}")
     
@@ -305,15 +623,298 @@ class COBOLMainframeAdapter(BaseAdapter):
         Returns:
             Resource content as string
         """
+        return json.dumps(self._resource_data(uri), indent=2)
+    
+    def _resource_data(self, uri: str) -> Any:
+        """Return the raw data behind a resource URI."""
         if uri == "cobol://accounts":
-            return json.dumps(self.accounts, indent=2)
+            return self._account_page()
         
         elif uri == "cobol://transactions":
-            return json.dumps(self.transactions, indent=2)
+            return self.transactions
         
         else:
             raise ValueError(f"Unknown resource: {uri}")
     
+    def _account_page(self, cursor: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        One page of accounts in account ID order, starting after `cursor`.
+        Only the page's records are read, so a large KSDS is never loaded
+        whole. `next_cursor` resumes the listing; it is None on the last page.
+        """
+        limit = self.account_page_size if limit is None else max(1, int(limit))
+        keys = list(islice(keys_after(self.accounts, cursor), limit + 1))
+        page = keys[:limit]
+        return {
+            "accounts": {account_id: self.accounts[account_id] for account_id in page},
+            "next_cursor": page[-1] if len(keys) > limit else None
+        }
+    
+    # Record-level import/export
+    
+    def load_account_records(self, buffer: bytes) -> int:
+        """
+        Bulk-load ACCOUNT-RECORD images (e.g. an unloaded VSAM dataset).
+        
+        The whole buffer is decoded column-wise in one pass.
+        
+        Returns:
+            Number of records loaded
+        """
+        columns = ACCOUNT_RECORD_LAYOUT.decode_columns(buffer)
+        balances = columns["ACCT-BALANCE"]
+        if hasattr(balances, "tolist"):
+            balances = balances.tolist()
+        with self._accounts_transaction():
+            for account_id, name, balance, status in zip(
+                columns["ACCT-ID"], columns["ACCT-NAME"], balances, columns["ACCT-STATUS"]
+            ):
+                self.accounts[account_id] = {"name": name, "balance": balance, "status": status}
+                if self._ledger is not None:
+                    self._ledger.add_account(account_id, balance, status)
+        return len(balances)
+    
+    def export_account_records(self) -> bytes:
+        """Encode all accounts as ACCOUNT-RECORD images."""
+        if isinstance(self.accounts, KSDSMapping):
+            return b"".join(self.accounts.store.scan())
+        return ACCOUNT_RECORD_LAYOUT.encode_buffer([
+            {
+                "ACCT-ID": account_id,
+                "ACCT-NAME": account["name"],
+                "ACCT-BALANCE": account["balance"],
+                "ACCT-STATUS": account["status"]
+            }
+            for account_id, account in self.accounts.items()
+        ])
+    
+    @property
+    def ledger(self) -> AccountLedger:
+        """The analytics ledger, built on first use and extended with accounts added since."""
+        if self._ledger is None:
+            self._ledger = self._build_ledger()
+        elif len(self._ledger) < len(self.accounts):
+            for account_id in self.accounts:
+                if account_id not in self._ledger:
+                    account = self.accounts[account_id]
+                    self._ledger.add_account(account_id, account["balance"], account["status"])
+        return self._ledger
+    
+    def _build_ledger(self) -> AccountLedger:
+        """Read current balances from the accounts and entries from the posted transactions."""
+        ledger = AccountLedger(self.accounts)
+        for txn in self.transactions:
+            if txn.get("type") == "balance_update":
+                movements = [(txn["account_id"], txn["amount"])]
+            elif txn.get("type") == "transfer":
+                movements = [(txn["from_account"], -txn["amount"]), (txn["to_account"], txn["amount"])]
+            else:
+                continue
+            timestamp = datetime.fromisoformat(txn["timestamp"])
+            for account_id, amount in movements:
+                if account_id in ledger:
+                    ledger.record(account_id, amount, timestamp)
+        return ledger
+    
+    def _post_to_ledger(self, account_id: str, amount: float, timestamp: datetime):
+        """
+        Post a movement before the account write, so a failure here leaves
+        the store untouched. Until the ledger is built, the transaction log
+        carries the movement instead.
+        """
+        if self._ledger is None:
+            return
+        if account_id not in self._ledger:
+            account = self.accounts[account_id]
+            self._ledger.add_account(account_id, account["balance"], account["status"])
+        self._ledger.post(account_id, amount, timestamp)
+    
+    def _accounts_transaction(self):
+        """Group account writes into one journaled unit when store-backed."""
+        if isinstance(self.accounts, KSDSMapping):
+            return self.accounts.transaction()
+        return nullcontext()
+    
+    # LEP adapter integration
+    
+    async def _handle_list_skills(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Handle legacy/listSkills, flattening SkillParameter lists into a schema."""
+        return [
+            {
+                "name": skill.name,
+                "description": skill.description,
+                "parameters": {
+                    p.name: {"type": p.type, "description": p.description, "required": p.required}
+                    for p in skill.parameters
+                },
+                "returns": skill.returns,
+                "operation_type": skill.operation_type.value
+            }
+            for skill in self.get_skills()
+        ]
+    
+    async def get_resource_impl(self, resource_name: str, parameters: Dict[str, Any]) -> Any:
+        """
+        Serve `cobol://` resources; bare names such as "accounts" are accepted too.
+        
+        "accounts" with an account_id returns that account, and otherwise a
+        page of accounts (see `_account_page`; cursor and limit select it);
+        "transactions" can be filtered by account_id and capped with limit
+        (most recent first).
+        """
+        uri = resource_name if "://" in resource_name else f"cobol://{resource_name}"
+        if uri == "cobol://accounts" and parameters.get("account_id"):
+            return self._get_account_info(parameters["account_id"])
+        if uri == "cobol://accounts":
+            return self._account_page(parameters.get("cursor"), parameters.get("limit"))
+        if uri == "cobol://transactions" and parameters:
+            account_id = parameters.get("account_id")
+            transactions = [
+                t for t in self.transactions
+                if account_id is None or account_id in (
+                    t.get("account_id"), t.get("from_account"), t.get("to_account")
+                )
+            ]
+            if parameters.get("limit") is not None:
+                transactions = transactions[-int(parameters["limit"]):][::-1]
+            return transactions
+        return self._resource_data(uri)
+    
+    def list_resources(self) -> List[Dict[str, Any]]:
+        """Describe the `cobol://` resources for discovery."""
+        descriptors = [
+            {
+                "path": resource.uri.split("://", 1)[1],
+                "resource_name": resource.uri.split("://", 1)[1],
+                "name": resource.name,
+                "description": resource.description,
+                "mime_type": resource.mime_type
+            }
+            for resource in self.get_resources()
+        ]
+        descriptors.append({
+            "path": "accounts/{account_id}",
+            "resource_name": "accounts",
+            "name": "Customer Account",
+            "description": "A single customer account",
+            "cache_ttl": 5.0
+        })
+        return descriptors
+    
+    def list_resource_instances(self, resource_name: str, after: Optional[Dict[str, Any]] = None):
+        if resource_name == "accounts":
+            start = after.get("account_id") if after else None
+            return ({"account_id": account_id} for account_id in keys_after(self.accounts, start))
+        return []
+    
+    async def call_skill_impl(self, skill_name: str, parameters: Dict[str, Any]) -> Any:
+        """Execute a skill; the approval token has already been verified by the base adapter."""
+        if self.backend is not None and skill_name not in BATCH_SKILLS:
+            return await self.backend.execute("CALL", {"skill_name": skill_name, "parameters": parameters})
+        return self._dispatch_skill(skill_name, parameters)
+    
+    def can_compensate(self, skill_name: str) -> bool:
+        return skill_name in ("updateAccountBalance", "transferFunds")
+    
+    def compensation_for(self, skill_name: str, parameters: Dict[str, Any], result: Any):
+        """Undo a posting with an equal and opposite posting."""
+        transaction = result["transaction"]
+        if skill_name == "updateAccountBalance":
+            return skill_name, {
+                "account_id": transaction["account_id"],
+                "amount": -transaction["amount"],
+                "reason": f"Reversal of {transaction['transaction_id']}"
+            }
+        elif skill_name == "transferFunds":
+            return skill_name, {
+                "from_account": transaction["to_account"],
+                "to_account": transaction["from_account"],
+                "amount": transaction["amount"]
+            }
+        return None
+    
+    # Mainframe connectivity
+    
+    async def connect_backend(self, driver: Optional[BackendDriver] = None, **pool_options) -> ConnectionPool:
+        """
+        Open a warmed-up connection pool to the mainframe gateway.
+        
+        Skills are then executed on the mainframe instead of the in-process
+        simulation. Pool sizes default to the POOL_MIN / POOL_MAX entries of
+        the connection string; other entries are sent as handshake credentials.
+        
+        Args:
+            driver: Backend driver; defaults to a TCPDriver for
+                mainframe_host:mainframe_port
+            **pool_options: Overrides for ConnectionPool settings
+        """
+        options = self.connection_options
+        if driver is None:
+            credentials = {k: v for k, v in options.items() if not k.startswith("POOL_")}
+            driver = TCPDriver(self.mainframe_host, self.mainframe_port, credentials)
+        pool_options.setdefault("min_size", int(options.get("POOL_MIN", 1)))
+        pool_options.setdefault("max_size", int(options.get("POOL_MAX", 10)))
+        pool = ConnectionPool(driver, **pool_options)
+        await pool.start()
+        self.backend = pool
+        logger.info(f"Backend pool ready: {pool.size} connection(s) to {self.mainframe_host}:{self.mainframe_port}")
+        return pool
+    
+    async def disconnect_backend(self):
+        """Close the backend pool and fall back to the in-process simulation."""
+        if self.backend is not None:
+            await self.backend.close()
+            self.backend = None
+    
+    async def shutdown_jobs(self):
+        """Cancel running batch jobs and stop the job queue workers."""
+        await self.job_queue.shutdown()
+    
+    async def close(self):
+        """Stop the job queue and close the backend pool."""
+        await self.shutdown_jobs()
+        await self.disconnect_backend()
+    
+    def memory_structures(self) -> Dict[str, Any]:
+        """Adapter state plus the simulated mainframe data and batch jobs."""
+        return {
+            **super().memory_structures(),
+            "accounts": self.accounts,
+            "transactions": self.transactions,
+            "ledger": self._ledger,
+            "jobs": self.job_queue.jobs,
+        }
+    
+    async def request_human_approval(
+        self,
+        skill_name: str,
+        parameters: Dict[str, Any],
+        reason: str,
+        estimated_impact: Dict[str, Any]
+    ) -> ApprovalState:
+        """
+        Request approval from the mainframe operator.
+        
+        In production this would page the operations console; the simulated
+        mainframe approves every request.
+        """
+        logger.info(f"Approval requested for {skill_name}: {reason}")
+        return ApprovalState.APPROVED
+    
+    def verify_approval_token(self, approval_token: str) -> bool:
+        """Check that a token was issued by this adapter and has not expired."""
+        approval_data = self.active_approvals.get(approval_token)
+        return approval_data is not None and datetime.now() <= approval_data["expires_at"]
+    
+    def add_audit_entry(self, action: str, resource: str, details: Dict[str, Any],
+                        approval_token: Optional[str] = None):
+        """Record a mainframe-level audit entry in the LEP audit trail."""
+        decision_id = self.active_approvals.get(approval_token, {}).get("decision_id")
+        self._log_audit_event(
+            f"mainframe_{action}", decision_id, details.get("operation"),
+            {"resource": resource, **details}, None
+        )
+    
     # Private methods for skill implementation
     
     def _get_account_info(self, account_id: str) -> Dict:
@@ -348,13 +949,16 @@ class COBOLMainframeAdapter(BaseAdapter):
         if new_balance < 0:
             raise ValueError("Insufficient funds")
         
-        # Update balance
-        account["balance"] = new_balance
+        # Update balance, ledger first
+        timestamp = datetime.now(timezone.utc)
+        with self._accounts_transaction():
+            self._post_to_ledger(account_id, amount, timestamp)
+            account["balance"] = new_balance
         
         # Record transaction
         transaction = {
             "transaction_id": f"TXN{len(self.transactions) + 1:06d}",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp.isoformat(),
             "account_id": account_id,
             "type": "balance_update",
             "amount": amount,
@@ -393,6 +997,8 @@ class COBOLMainframeAdapter(BaseAdapter):
             raise ValueError(f"Source account not found: {from_account}")
         if to_account not in self.accounts:
             raise ValueError(f"Destination account not found: {to_account}")
+        if from_account == to_account:
+            raise ValueError("Source and destination accounts must differ")
         if amount <= 0:
             raise ValueError("Transfer amount must be positive")
         
@@ -400,14 +1006,18 @@ class COBOLMainframeAdapter(BaseAdapter):
         if self.accounts[from_account]["balance"] < amount:
             raise ValueError("Insufficient funds in source account")
         
-        # Perform transfer
-        self.accounts[from_account]["balance"] -= amount
-        self.accounts[to_account]["balance"] += amount
+        # Perform transfer, ledger first
+        timestamp = datetime.now(timezone.utc)
+        with self._accounts_transaction():
+            self._post_to_ledger(from_account, -amount, timestamp)
+            self._post_to_ledger(to_account, amount, timestamp)
+            self.accounts[from_account]["balance"] -= amount
+            self.accounts[to_account]["balance"] += amount
         
         # Record transaction
         transaction = {
             "transaction_id": f"TXN{len(self.transactions) + 1:06d}",
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp.isoformat(),
             "type": "transfer",
             "from_account": from_account,
             "to_account": to_account,
@@ -460,7 +1070,7 @@ class COBOLMainframeAdapter(BaseAdapter):
         report = f"""
 COBOL MAINFRAME BANKING SYSTEM
 Account Activity Report
-Generated: {datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")}
+Generated: {datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")}
 
 Account ID: {account_id}
 Account Holder: {account["name"]}
@@ -493,6 +1103,148 @@ Transaction History:
         )
         
         return report
+    
+    # Batch jobs
+    
+    def _submit_batch_job(self, jcl: str) -> Dict:
+        """Parse JCL and queue the job; the job runs after this call returns."""
+        definition = parse_jcl(jcl)
+        lane = JOB_CLASS_LANES.get(definition.job_class, len(JOB_CLASS_LANES) - 1)
+        job = self.job_queue.submit(
+            definition.name,
+            self._run_batch_job,
+            lane=lane,
+            metadata={"definition": definition}
+        )
+        self.add_audit_entry(
+            action="submit",
+            resource=f"job:{job.job_id}",
+            details={
+                "operation": "submitBatchJob",
+                "job_name": definition.name,
+                "job_class": definition.job_class,
+                "programs": [step.program for step in definition.steps]
+            }
+        )
+        return {"job_id": job.job_id, "job_name": job.name, "state": job.state.value}
+    
+    async def _run_batch_job(self, job: Job) -> Dict:
+        """
+        Run each EXEC step of a job in order. The job's checkpoint names the
+        steps completed, the step running and what that step has committed.
+        """
+        definition = job.metadata["definition"]
+        steps = []
+        job.checkpoint.update({"completed_steps": [], "step": None, "committed": None})
+        for index, step in enumerate(definition.steps):
+            program = {"INTCALC": self._batch_intcalc, "STMTGEN": self._batch_stmtgen}.get(step.program)
+            if program is None:
+                raise ValueError(f"ABEND S806: program {step.program} not found (step {step.name})")
+            
+            def step_progress(fraction: float, step=step, index=index):
+                overall = (index + fraction) / len(definition.steps) * 100
+                job.report_progress(overall, f"{step.name} ({step.program}) {fraction:.0%}")
+            
+            job.checkpoint.update({"step": step.name, "committed": None})
+            output = await program(job, step.parm, step_progress)
+            steps.append({"step": step.name, "program": step.program, "return_code": 0, "output": output})
+            job.checkpoint["completed_steps"].append(step.name)
+        job.checkpoint["step"] = None
+        return {
+            "job_id": job.job_id,
+            "job_name": definition.name,
+            "max_return_code": max(s["return_code"] for s in steps),
+            "steps": steps
+        }
+    
+    async def _account_chunks(self, progress, after: Optional[str] = None):
+        """
+        Yield account IDs (those after `after`, if given) in key order and in
+        chunks, yielding to the event loop between chunks.
+        """
+        account_ids = list(keys_after(self.accounts, after))
+        total = len(account_ids) or 1
+        for start in range(0, len(account_ids), self.batch_chunk_size):
+            yield account_ids[start:start + self.batch_chunk_size]
+            progress(min(start + self.batch_chunk_size, total) / total)
+            await asyncio.sleep(self.batch_chunk_delay)
+    
+    async def _batch_intcalc(self, job: Job, parm: Dict[str, str], progress) -> Dict:
+        """
+        INTCALC: post interest at RATE to every active account with a positive
+        balance (after account AFTER, when resuming an interrupted run).
+        
+        Each chunk is posted in one transaction and then recorded in the job's
+        checkpoint, so a job cancelled or failed part way reports exactly
+        which accounts were posted: resubmit with AFTER=<last_account_id> to
+        finish the run.
+        """
+        rate = float(parm.get("RATE", "0.01"))
+        posted = 0
+        total_interest = 0.0
+        async for chunk in self._account_chunks(progress, parm.get("AFTER")):
+            with self._accounts_transaction():
+                for account_id in chunk:
+                    account = self.accounts[account_id]
+                    if account["status"] != "active" or account["balance"] <= 0:
+                        continue
+                    interest = round(account["balance"] * rate, 2)
+                    if interest:
+                        self._update_account_balance(account_id, interest, f"Interest {job.job_id}", None)
+                        posted += 1
+                        total_interest += interest
+            job.checkpoint["committed"] = {
+                "last_account_id": chunk[-1],
+                "accounts_posted": posted,
+                "total_interest": round(total_interest, 2),
+                "rate": rate
+            }
+        return {"accounts_posted": posted, "total_interest": round(total_interest, 2), "rate": rate}
+    
+    async def _batch_stmtgen(self, job: Job, parm: Dict[str, str], progress) -> Dict:
+        """STMTGEN: summarise closing balances and activity for every account."""
+        activity: Dict[str, int] = {}
+        for txn in self.transactions:
+            for key in ("account_id", "from_account", "to_account"):
+                if txn.get(key):
+                    activity[txn[key]] = activity.get(txn[key], 0) + 1
+        statements = 0
+        total_balance = 0.0
+        with_activity = 0
+        async for chunk in self._account_chunks(progress):
+            for account_id in chunk:
+                statements += 1
+                total_balance += self.accounts[account_id]["balance"]
+                if activity.get(account_id):
+                    with_activity += 1
+        return {
+            "statements": statements,
+            "accounts_with_activity": with_activity,
+            "total_balance": round(total_balance, 2)
+        }
+    
+    def _on_job_progress(self, job: Job, update: ProgressUpdate):
+        """Job queue listener: log progress, forward it to the client and audit every finished job."""
+        logger.debug(f"{job.job_id} {job.name}: {update.progress_percentage:.0f}% {update.status_message}")
+        self.report_progress("submitBatchJob", update.progress_percentage,
+                             f"{job.state.value}: {update.status_message}", task_id=job.job_id)
+        if job.state in FINAL_STATES:
+            self.add_audit_entry(
+                action=f"job_{job.state.value}",
+                resource=f"job:{job.job_id}",
+                details={"operation": "submitBatchJob", "job_name": job.name, "error": job.error,
+                         "checkpoint": job.checkpoint}
+            )
+    
+    def _run_analytics(self, skill_name: str, query, **kwargs) -> Any:
+        """Run a ledger-wide analytics query and audit it as a single read."""
+        result = query(**kwargs)
+        self.add_audit_entry(
+            action="read",
+            resource="accounts:*",
+            details={"operation": skill_name, **{k: v for k, v in kwargs.items() if v is not None}}
+        )
+        return result
 
 
 # Example usage
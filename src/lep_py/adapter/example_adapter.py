@@ -5,11 +5,29 @@ This is a simple example adapter that simulates a legacy "Customer Database" sys
 It demonstrates how to implement the LEP protocol for a real legacy system.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+from ..codec.copybook import compile_copybook
 from ..models.protocol import Skill, OperationType, ApprovalState
+from ..storage.record_mapping import KSDSMapping, keys_after
 from .base_adapter import BaseLEPAdapter
 
 
+# Record layout used when customers are served from a keyed record store
+CUSTOMER_RECORD_LAYOUT = compile_copybook("""
+       01  CUSTOMER-RECORD.
+           05  CUST-ID                 PIC X(8).
+           05  CUST-NAME               PIC X(40).
+           05  CUST-BALANCE            PIC S9(13)V99 COMP-3.
+           05  CUST-STATUS             PIC X(10).
+""")
+CUSTOMER_RECORD_FIELDS = {
+    "id": "CUST-ID",
+    "name": "CUST-NAME",
+    "balance": "CUST-BALANCE",
+    "status": "CUST-STATUS"
+}
+
+
 class CustomerDatabaseAdapter(BaseLEPAdapter):
     """
     Example adapter for a simulated legacy customer database.
@@ -19,12 +37,19 @@ class CustomerDatabaseAdapter(BaseLEPAdapter):
     - Write operations: Update customer information
     """
 
-    def __init__(self):
+    def __init__(self, customer_store_path: Optional[str] = None):
         super().__init__(
             adapter_name="CustomerDatabaseAdapter",
             adapter_version="1.0.0"
         )
         
+        # Customers can be served from a local KSDS stand-in instead of memory
+        if customer_store_path:
+            self.customers = KSDSMapping.create(
+                customer_store_path, CUSTOMER_RECORD_LAYOUT, "CUST-ID", CUSTOMER_RECORD_FIELDS
+            )
+            return
+        
         # Simulated database
         self.customers = {
             "CUST001": {
@@ -92,6 +117,34 @@ class CustomerDatabaseAdapter(BaseLEPAdapter):
         else:
             raise Exception(f"Unknown resource: {resource_name}")
 
+    def list_resources(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "path": "customer/{customer_id}",
+                "resource_name": "customer",
+                "name": "Customer",
+                "description": "Customer record by ID",
+                "cache_ttl": 10.0
+            }
+        ]
+
+    def list_resource_instances(self, resource_name: str, after: Optional[Dict[str, Any]] = None):
+        if resource_name == "customer":
+            start = after.get("customer_id") if after else None
+            return ({"customer_id": customer_id} for customer_id in keys_after(self.customers, start))
+        return []
+
+    def can_compensate(self, skill_name: str) -> bool:
+        return skill_name in ("updateCustomerBalance", "updateCustomerStatus")
+
+    def compensation_for(self, skill_name: str, parameters: Dict[str, Any], result: Any):
+        """Undo a balance or status update by restoring the previous value."""
+        if skill_name == "updateCustomerBalance":
+            return skill_name, {"customer_id": result["customer_id"], "new_balance": result["old_balance"]}
+        elif skill_name == "updateCustomerStatus":
+            return skill_name, {"customer_id": result["customer_id"], "new_status": result["old_status"]}
+        return None
+
     async def call_skill_impl(self, skill_name: str, parameters: Dict[str, Any]) -> Any:
         """Implement skill execution on the legacy system."""
         if skill_name == "getCustomerInfo":
@@ -138,6 +191,10 @@ class CustomerDatabaseAdapter(BaseLEPAdapter):
         else:
             raise Exception(f"Unknown skill: {skill_name}")
 
+    def memory_structures(self) -> Dict[str, Any]:
+        """Adapter state plus the customer store."""
+        return {**super().memory_structures(), "customers": self.customers}
+
     async def request_human_approval(
         self,
         skill_name: str,
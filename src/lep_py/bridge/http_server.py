@@ -0,0 +1,562 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - MCP Streamable HTTP Server
+
+Serves one `LEPMCPBridge` to many remote MCP clients from a single
+process, using the MCP streamable HTTP transport on plain asyncio:
+
+    POST   /mcp   one JSON-RPC message, answered with JSON, or with an SSE
+                  stream of the request's notifications followed by its
+                  response (tools/call, when the client accepts SSE)
+    GET    /mcp   SSE stream of the session's other notifications
+    DELETE /mcp   end the session
+    GET    /metrics  Prometheus metrics of the bridge and adapters
+
+Requests whose `Origin` header is not allowed get 403, so a web page
+cannot reach a local server through DNS rebinding. By default only
+localhost origins are allowed; clients that send no Origin (anything but
+a browser) are not affected.
+
+`initialize` opens a session. Its ID comes back in the `Mcp-Session-Id`
+header and must accompany every later request. Sessions share the bridge
+and its adapters, and with them one LEP session per adapter: the first
+`initialize` runs the LEP handshake, later ones join it, and it ends
+with `session/shutdown` when the server stops. Approval decisions and spilled results are scoped to the session that
+created them: their IDs are random and another session can neither redeem
+nor read them. Notifications are routed to the
+session whose request caused them (including batch jobs and approvals it
+submitted): to the request's SSE stream while that is open, else to the
+session's GET stream, where a bounded queue holds them until a client
+listens.
+
+Connections are kept alive between requests. At most `max_concurrency`
+requests are processed at once; a request that cannot start within
+`queue_timeout` is answered with a "Server busy" JSON-RPC error carrying
+`retry_after`, and a connection beyond `max_connections` gets 503 with
+Retry-After.
+
+    python -m lep_py.bridge.http_server --adapter cobol=cobol --adapter crm=example --port 8080
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import logging
+import secrets
+import signal
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from ..models.protocol import LEPErrorCode
+from ..core.notifications import OutboundQueue, notification
+from .lep_mcp_bridge import CALLER, LEPMCPBridge, coalesce_key
+from ..utils.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsServer, dump_on_signal
+from ..utils.tracing import configure_tracing
+from ..utils.watchdog import LoopWatchdog
+from .payloads import encode_payload
+from .stdio_server import add_adapter_arguments, load_adapters, start_profiling, start_tracing
+
+logger = logging.getLogger(__name__)
+
+SESSION_HEADER = "Mcp-Session-Id"
+
+LOCAL_HOSTS = frozenset({"localhost", "127.0.0.1", "::1"})
+
+REASONS = {
+    200: "OK", 202: "Accepted", 400: "Bad Request", 403: "Forbidden", 404: "Not Found", 405: "Method Not Allowed",
+    406: "Not Acceptable", 409: "Conflict", 411: "Length Required", 413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    """An HTTP error response to send instead of processing the request."""
+
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class EventStream(OutboundQueue):
+    """
+    Notifications bound for one open SSE response or a session's GET stream.
+    Progress notifications still waiting are replaced by newer ones.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        super().__init__(maxsize or None, coalesce=True)
+
+    def push(self, message: Dict[str, Any]) -> bool:
+        """Queue a message, dropping the oldest if full. Returns False if one was dropped."""
+        return self.put(message, coalesce_key(message["method"], message["params"]))
+
+
+@dataclass
+class MCPSession:
+    """A client session and the notifications waiting for it."""
+    session_id: str
+    client_info: Dict[str, Any]
+    notifications: EventStream
+    created_at: float = field(default_factory=time.monotonic)
+    last_seen: float = field(default_factory=time.monotonic)
+    in_flight: Dict[Any, asyncio.Task] = field(default_factory=dict)
+    listening: bool = False
+    closed: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+# The session (and, for SSE responses, the stream) a request's notifications go to
+_route: contextvars.ContextVar[Optional[Tuple[MCPSession, Optional[EventStream]]]] = \
+    contextvars.ContextVar("mcp_route", default=None)
+
+
+@dataclass
+class HTTPRequest:
+    method: str
+    path: str
+    version: str
+    headers: Dict[str, str]
+    body: bytes
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def accepts(self, media_type: str) -> bool:
+        return media_type in self.headers.get("accept", "")
+
+
+class HTTPMCPServer:
+    """
+    Streamable HTTP transport for a bridge.
+
+    Args:
+        bridge: The bridge to serve
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        path: Endpoint path
+        max_concurrency: Requests processed at the same time
+        queue_timeout: Seconds a request may wait for a processing slot
+        max_connections: Open connections accepted at once
+        keepalive_timeout: Seconds an idle connection is kept open
+        sse_ping_interval: Seconds between keep-alive comments on GET streams
+        session_ttl: Seconds a session may sit unused before it is dropped
+        max_queued_notifications: Notifications held per session for its GET stream
+        max_body_bytes: Largest accepted request body
+        shutdown_timeout: Seconds in-flight requests get to finish at shutdown
+        metrics_path: Path serving the bridge's metrics registry (None: not served)
+        allowed_origins: Origins browsers may call from, e.g. "https://app.example.com"
+            (None: any localhost origin)
+    """
+
+    def __init__(
+        self,
+        bridge: LEPMCPBridge,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        path: str = "/mcp",
+        max_concurrency: int = 64,
+        queue_timeout: float = 5.0,
+        max_connections: int = 1000,
+        keepalive_timeout: float = 30.0,
+        sse_ping_interval: float = 15.0,
+        session_ttl: float = 1800.0,
+        max_queued_notifications: int = 1000,
+        max_body_bytes: int = 4 * 1024 * 1024,
+        shutdown_timeout: float = 30.0,
+        metrics_path: Optional[str] = "/metrics",
+        allowed_origins: Optional[Iterable[str]] = None
+    ):
+        self.bridge = bridge
+        self.host = host
+        self.port = port
+        self.path = path
+        self.max_concurrency = max(1, max_concurrency)
+        self.queue_timeout = queue_timeout
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.sse_ping_interval = sse_ping_interval
+        self.session_ttl = session_ttl
+        self.max_queued_notifications = max_queued_notifications
+        self.max_body_bytes = max_body_bytes
+        self.shutdown_timeout = shutdown_timeout
+        self.metrics_path = metrics_path
+        self.allowed_origins = frozenset(o.rstrip("/") for o in allowed_origins) if allowed_origins is not None else None
+        self.sessions: Dict[str, MCPSession] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._connections: Set[asyncio.Task] = set()
+        self._requests: Set[asyncio.Task] = set()
+        self._stopping = False
+        self.stats = {
+            "connections": 0, "requests": 0, "rejected": 0, "sessions_opened": 0,
+            "sessions_expired": 0, "notifications_sent": 0, "notifications_dropped": 0,
+        }
+        bridge.add_notification_listener(self._on_notification)
+
+    # Lifecycle
+
+    async def start(self):
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._server = await asyncio.start_server(self._serve_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"MCP HTTP server listening on http://{self.host}:{self.port}{self.path}")
+
+    async def stop(self):
+        """Stop accepting, let in-flight requests finish, end the sessions and shut the bridge down."""
+        self._stopping = True
+        if self._server is not None:
+            self._server.close()
+        if self._requests:
+            _, unfinished = await asyncio.wait(set(self._requests), timeout=self.shutdown_timeout)
+            for task in unfinished:
+                task.cancel()
+        for session in list(self.sessions.values()):
+            self._close_session(session)
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+        await self.bridge.shutdown()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    # Sessions and notifications
+
+    def _open_session(self, client_info: Dict[str, Any]) -> MCPSession:
+        now = time.monotonic()
+        for stale in [s for s in self.sessions.values()
+                      if not s.listening and not s.in_flight and now - s.last_seen > self.session_ttl]:
+            self.stats["sessions_expired"] += 1
+            self._close_session(stale)
+        session = MCPSession(
+            session_id=secrets.token_urlsafe(24),
+            client_info=client_info,
+            notifications=EventStream(self.max_queued_notifications)
+        )
+        self.sessions[session.session_id] = session
+        self.stats["sessions_opened"] += 1
+        return session
+
+    def _close_session(self, session: MCPSession):
+        self.sessions.pop(session.session_id, None)
+        for task in session.in_flight.values():
+            task.cancel()
+        session.closed.set()
+
+    def _on_notification(self, method: str, params: Dict[str, Any]):
+        route = _route.get()
+        if route is None or route[0].closed.is_set():
+            self.stats["notifications_dropped"] += 1
+            return
+        session, stream = route
+        message = notification(method, params)
+        target = stream if stream is not None and not stream.closed else session.notifications
+        if not target.push(message):
+            self.stats["notifications_dropped"] += 1
+
+    # HTTP
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats["connections"] += 1
+        if len(self._connections) >= self.max_connections or self._stopping:
+            self.stats["rejected"] += 1
+            await self._send(writer, 503, b"Server busy", "text/plain", {"Retry-After": "1"}, keep_alive=False)
+            writer.close()
+            return
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while not self._stopping:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.keepalive_timeout)
+                except HTTPError as e:
+                    await self._send(writer, e.status, str(e).encode(), "text/plain", e.headers, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                self.stats["requests"] += 1
+                try:
+                    await self._dispatch(request, writer)
+                except HTTPError as e:
+                    await self._send(writer, e.status, str(e).encode(), "text/plain", e.headers, request.keep_alive)
+                if not request.keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[HTTPRequest]:
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, path, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if "chunked" in headers.get("transfer-encoding", ""):
+            raise HTTPError(411, "Chunked request bodies are not supported")
+        length = headers.get("content-length") or "0"
+        if not (length.isascii() and length.isdigit()):
+            raise HTTPError(400, "Invalid Content-Length")
+        length = int(length)
+        if length > self.max_body_bytes:
+            raise HTTPError(413, f"Request body exceeds {self.max_body_bytes} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return HTTPRequest(method, path.split("?", 1)[0], version, headers, body)
+
+    def _head(self, status: int, content_type: str, headers: Dict[str, str], keep_alive: bool,
+              length: Optional[int] = None) -> bytes:
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}", f"Content-Type: {content_type}"]
+        lines.append(f"Content-Length: {length}" if length is not None else "Transfer-Encoding: chunked")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _send(self, writer: asyncio.StreamWriter, status: int, body: bytes, content_type: str,
+                    headers: Optional[Dict[str, str]] = None, keep_alive: bool = True):
+        writer.write(self._head(status, content_type, headers or {}, keep_alive, len(body)) + body)
+        await writer.drain()
+
+    async def _send_event(self, writer: asyncio.StreamWriter, data: Optional[str]):
+        """Write one SSE event (or a keep-alive comment when data is None) as a chunk."""
+        event = (f"event: message\ndata: {data}\n\n" if data is not None else ": keep-alive\n\n").encode()
+        writer.write(f"{len(event):x}\r\n".encode() + event + b"\r\n")
+        await writer.drain()
+
+    async def _dispatch(self, request: HTTPRequest, writer: asyncio.StreamWriter):
+        if self.metrics_path and request.path == self.metrics_path and request.method == "GET":
+            await self._send(writer, 200, self.bridge.metrics.render().encode(), METRICS_CONTENT_TYPE,
+                             keep_alive=request.keep_alive)
+            return
+        if request.path != self.path:
+            raise HTTPError(404, f"No endpoint at {request.path}")
+        origin = request.headers.get("origin")
+        if origin is not None and not self._origin_allowed(origin):
+            raise HTTPError(403, f"Origin {origin} is not allowed")
+        if request.method == "POST":
+            await self._handle_post(request, writer)
+        elif request.method == "GET":
+            await self._handle_get(request, writer)
+        elif request.method == "DELETE":
+            session = self._session_for(request)
+            self._close_session(session)
+            await self._send(writer, 200, b"", "text/plain", keep_alive=request.keep_alive)
+        else:
+            raise HTTPError(405, f"Method {request.method} not allowed", {"Allow": "GET, POST, DELETE"})
+
+    def _origin_allowed(self, origin: str) -> bool:
+        if self.allowed_origins is not None:
+            return origin.rstrip("/") in self.allowed_origins
+        try:
+            return urlsplit(origin).hostname in LOCAL_HOSTS
+        except ValueError:
+            return False
+
+    def _session_for(self, request: HTTPRequest) -> MCPSession:
+        session_id = request.headers.get(SESSION_HEADER.lower())
+        if not session_id:
+            raise HTTPError(400, f"Missing {SESSION_HEADER} header")
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(404, "Unknown or expired session")
+        session.last_seen = time.monotonic()
+        return session
+
+    async def _handle_post(self, request: HTTPRequest, writer: asyncio.StreamWriter):
+        try:
+            message = json.loads(request.body)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            body = encode_payload({"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Invalid JSON"}})
+            await self._send(writer, 400, body.encode(), "application/json", keep_alive=request.keep_alive)
+            return
+        if not isinstance(message, dict):
+            raise HTTPError(400, "Send one JSON-RPC message per request")
+
+        if message.get("method") == "initialize":
+            session = self._open_session((message.get("params") or {}).get("clientInfo", {}))
+        else:
+            session = self._session_for(request)
+        headers = {SESSION_HEADER: session.session_id}
+
+        if "id" not in message or "method" not in message:
+            # Notifications (and responses) are accepted without a reply
+            if message.get("method") == "notifications/cancelled":
+                task = session.in_flight.get((message.get("params") or {}).get("requestId"))
+                if task is not None:
+                    task.cancel()
+            await self._send(writer, 202, b"", "text/plain", headers, request.keep_alive)
+            return
+
+        stream = None
+        if message["method"] == "tools/call" and request.accepts("text/event-stream"):
+            stream = EventStream()
+        context = contextvars.copy_context()
+        context.run(_route.set, (session, stream))
+        context.run(CALLER.set, session.session_id)
+        task = asyncio.create_task(self._process(request.body.decode(), message["id"]), context=context)
+        self._requests.add(task)
+        session.in_flight[message["id"]] = task
+        task.add_done_callback(self._requests.discard)
+        task.add_done_callback(lambda _: session.in_flight.pop(message["id"], None))
+
+        if stream is None:
+            response = await task
+            await self._send(writer, 200, response.encode(), "application/json", headers, request.keep_alive)
+            return
+
+        writer.write(self._head(200, "text/event-stream", {**headers, "Cache-Control": "no-cache"},
+                                request.keep_alive))
+        while not task.done():
+            getter = asyncio.ensure_future(stream.get())
+            await asyncio.wait({task, getter}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                await self._send_notification(writer, getter.result())
+            else:
+                getter.cancel()
+        stream.close()
+        for message in stream.drain():
+            await self._send_notification(writer, message)
+        await self._send_event(writer, task.result())
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _process(self, text: str, request_id: Any) -> str:
+        """Run one request through the bridge under the concurrency limit."""
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.stats["rejected"] += 1
+            return encode_payload({"jsonrpc": "2.0", "id": request_id, "error": {
+                "code": LEPErrorCode.SERVER_BUSY, "message": "Server busy",
+                "data": {"retry_after": 1, "reason": "timeout"}
+            }})
+        try:
+            return await self.bridge.handle_mcp_request(text)
+        except asyncio.CancelledError:
+            return encode_payload({"jsonrpc": "2.0", "id": request_id, "error": {
+                "code": -32800, "message": "Request cancelled"
+            }})
+        finally:
+            self._semaphore.release()
+
+    async def _send_notification(self, writer: asyncio.StreamWriter, message: Dict[str, Any]):
+        self.stats["notifications_sent"] += 1
+        await self._send_event(writer, encode_payload(message))
+
+    async def _handle_get(self, request: HTTPRequest, writer: asyncio.StreamWriter):
+        if not request.accepts("text/event-stream"):
+            raise HTTPError(406, "GET requires Accept: text/event-stream")
+        session = self._session_for(request)
+        if session.listening:
+            raise HTTPError(409, "This session already has a notification stream open")
+        session.listening = True
+        writer.write(self._head(200, "text/event-stream",
+                                {SESSION_HEADER: session.session_id, "Cache-Control": "no-cache"},
+                                request.keep_alive))
+        closed = asyncio.ensure_future(session.closed.wait())
+        try:
+            while not session.closed.is_set():
+                getter = asyncio.ensure_future(session.notifications.get())
+                done, _ = await asyncio.wait({getter, closed}, timeout=self.sse_ping_interval,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    await self._send_notification(writer, getter.result())
+                    continue
+                getter.cancel()
+                if not done:
+                    await self._send_event(writer, None)
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        finally:
+            closed.cancel()
+            session.listening = False
+            session.last_seen = time.monotonic()
+
+
+async def _run(server: HTTPMCPServer, metrics_port: Optional[int] = None, block_threshold: Optional[float] = None):
+    await server.start()
+    metrics_server = None
+    if metrics_port is not None:
+        metrics_server = MetricsServer(server.bridge.metrics, port=metrics_port)
+        await metrics_server.start()
+    watchdog = None
+    if block_threshold:
+        watchdog = LoopWatchdog(block_threshold, registry=server.bridge.metrics)
+        await watchdog.start()
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stopped.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # not supported on this platform
+    await stopped.wait()
+    await server.stop()
+    if watchdog is not None:
+        await watchdog.stop()
+    if metrics_server is not None:
+        await metrics_server.stop()
+    logger.info(f"MCP HTTP server stopped: {json.dumps(server.stats)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve LEP adapters to MCP clients over HTTP")
+    add_adapter_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--path", default="/mcp")
+    parser.add_argument("--max-connections", type=int, default=1000)
+    parser.add_argument("--allowed-origin", action="append", dest="allowed_origins", metavar="ORIGIN",
+                        help="Origin browsers may call from (repeatable; default: localhost origins)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(stream=sys.stderr, level=args.log_level.upper(),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    try:
+        adapters = load_adapters(args.adapter)
+    except ValueError as e:
+        parser.error(str(e))
+    bridge = LEPMCPBridge(adapters, compact=not args.pretty, max_result_bytes=args.max_result_bytes or None)
+    server = HTTPMCPServer(
+        bridge, args.host, args.port, args.path,
+        max_concurrency=args.max_concurrency,
+        max_connections=args.max_connections,
+        shutdown_timeout=args.shutdown_timeout,
+        allowed_origins=args.allowed_origins
+    )
+    dump_on_signal(bridge.metrics)
+    start_tracing(args)
+    start_profiling(args, bridge)
+    try:
+        asyncio.run(_run(server, args.metrics_port, args.block_threshold))
+    finally:
+        configure_tracing(None)  # writes out buffered spans
+
+
+if __name__ == "__main__":
+    main()
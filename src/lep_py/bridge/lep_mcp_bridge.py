@@ -3,12 +3,54 @@ LegacyEvolve Protocol (LEP) v2.0 - MCP Bridge
 
 This module provides a bridge between LEP adapters and MCP (Model Context Protocol) clients,
 enabling LEP adapters to be used with MCP-enabled applications like Claude Desktop.
+
+One bridge can host several adapters. Their tools are then namespaced
+(`cobol__getAccountInfo`) and resources addressed as `lep://cobol/...`.
+
+Results are encoded compactly; a tool result larger than
+`max_result_bytes` is returned as resource links to its pages, read back
+through `lep://_results/<result_id>/<page>`.
+
+Transports serving several clients from one bridge set `CALLER` to the
+client a request comes from. Spilled results and pending approval decisions
+are then scoped to it: another client can neither read the pages nor
+redeem the decision.
 """
 
+import asyncio
+import base64
+import contextvars
+import itertools
 import json
-from typing import Any, Dict, List
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from ..adapter.base_adapter import BaseLEPAdapter
+from ..core.deadline import run_with_deadline
 from ..core.jsonrpc import JSONRPCHandler
+from ..models.protocol import OperationType
+from ..utils.memory import process_memory, structure_report
+from ..utils.metrics import REGISTRY, MetricsRegistry
+from ..utils.tracing import current_span
+from .payloads import PayloadStats, SpillStore, encode_payload
+from .resources import ResourceEntry, ResourceRegistry
+
+logger = logging.getLogger(__name__)
+
+# A routed tool: (namespace, adapter, skill name, is a read)
+ToolRoute = Tuple[str, BaseLEPAdapter, str, bool]
+
+SPILL_URI_PREFIX = "lep://_results/"
+
+# The client a request comes from (e.g. an HTTP session ID); None for single-client transports
+CALLER: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("lep_bridge_caller", default=None)
+
+
+def coalesce_key(method: str, params: Dict[str, Any]) -> Optional[Tuple[str, Any]]:
+    """Key under which a waiting notification may be replaced by a newer one: progress, per token."""
+    if method == "notifications/progress":
+        return ("progress", params.get("progressToken"))
+    return None
 
 
 class LEPMCPBridge:
@@ -19,38 +61,248 @@ class LEPMCPBridge:
     enabling LEP adapters to be used with MCP-enabled applications.
     """
     
-    def __init__(self, lep_adapter: BaseLEPAdapter):
+    def __init__(
+        self,
+        lep_adapter: Union[BaseLEPAdapter, Dict[str, BaseLEPAdapter]],
+        adapter_timeout: float = 10.0,
+        separator: str = "__",
+        compact: bool = True,
+        max_result_bytes: Optional[int] = 64 * 1024
+    ):
         """
         Initialize the bridge with an LEP adapter.
         
         Args:
-            lep_adapter: The LEP adapter to wrap
+            lep_adapter: The LEP adapter to wrap, or a dict of namespace ->
+                adapter to host several behind namespaced tool names
+            adapter_timeout: Seconds each adapter gets during initialize and
+                catalog fan-out before it is left out of the reply
+            separator: Separator between namespace and skill in tool names
+            compact: Encode results without indentation or spaces
+            max_result_bytes: Tool results whose encoding exceeds this are
+                spilled into paginated resource links (None disables)
         """
-        self.lep_adapter = lep_adapter
-        self.mcp_handler = JSONRPCHandler()
+        if isinstance(lep_adapter, dict):
+            if not lep_adapter:
+                raise ValueError("At least one adapter is required")
+            if any(not ns or separator in ns or "/" in ns or ns == "_results" for ns in lep_adapter):
+                raise ValueError(f"Namespaces must be non-empty, not '_results' and not contain '{separator}' or '/'")
+            self.adapters: Dict[str, BaseLEPAdapter] = dict(lep_adapter)
+            self.namespaced = True
+        else:
+            self.adapters = {"": lep_adapter}
+            self.namespaced = False
+        self.lep_adapter = next(iter(self.adapters.values()))
+        self.adapter_timeout = adapter_timeout
+        self.separator = separator
+        
+        # Per-adapter catalogs (last successful fetch) and the routing table built from them
+        self._catalogs: Dict[str, List[Dict[str, Any]]] = {}
+        self._tool_routes: Dict[str, ToolRoute] = {}
+        self.adapter_errors: Dict[str, str] = {}
+        
+        # session/initialize responses of the adapters whose LEP session is
+        # open. MCP clients share these sessions; they end at shutdown().
+        self._lep_sessions: Dict[str, Dict[str, Any]] = {}
+        
+        # Resource templates of every adapter, compiled on first use
+        self.resources = ResourceRegistry()
+        self._resources_built = False
+        self.resource_page_size = 50
+        
+        # Overall time limit for one tools/call (None leaves it to the adapters' skill timeouts)
+        self.call_timeout: Optional[float] = None
+        
+        # Result encoding, oversized results awaiting paginated reads, and response sizes
+        self.compact = compact
+        self.max_result_bytes = max_result_bytes
+        self.spill = SpillStore()
+        
+        # (namespace, decision ID) -> (caller, claim token), for decisions handed out as pending approvals
+        self._decision_owners: "OrderedDict[Tuple[str, str], Tuple[Optional[str], str]]" = OrderedDict()
+        self.max_decision_owners = 10000
+        self.metrics: MetricsRegistry = REGISTRY
+        self.payload_stats = PayloadStats(self.metrics)
+        self.metrics.gauge("lep_mcp_spilled_results", "Spilled results held for paginated reads").set_function(
+            lambda: len(self.spill))
+        
+        # Callbacks (method, params) for server-to-client notifications
+        self._notification_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+        self._watch_adapters()
+        
+        self.mcp_handler = JSONRPCHandler(metrics=self.metrics, name="mcp")
         self._register_mcp_methods()
     
     def _register_mcp_methods(self):
         """Register MCP protocol methods."""
         self.mcp_handler.register_method("initialize", self._handle_mcp_initialize)
+        self.mcp_handler.register_method("ping", self._handle_mcp_ping)
         self.mcp_handler.register_method("tools/list", self._handle_mcp_tools_list)
         self.mcp_handler.register_method("tools/call", self._handle_mcp_tools_call)
         self.mcp_handler.register_method("resources/list", self._handle_mcp_resources_list)
+        self.mcp_handler.register_method("resources/templates/list", self._handle_mcp_resource_templates_list)
         self.mcp_handler.register_method("resources/read", self._handle_mcp_resources_read)
     
+    def add_notification_listener(self, listener: Callable[[str, Dict[str, Any]], None]):
+        """Register a callback (method, params) for notifications to send to the client."""
+        self._notification_listeners.append(listener)
+    
+    def _emit(self, method: str, params: Dict[str, Any]):
+        for listener in self._notification_listeners:
+            try:
+                listener(method, params)
+            except Exception as e:
+                logger.warning(f"Notification listener failed: {e}")
+    
+    def _watch_adapters(self):
+        """Turn approval decisions and batch job progress into log notifications."""
+        for ns, adapter in self.adapters.items():
+            source = ns or adapter.adapter_name
+            adapter.approval_queue.add_listener(
+                lambda approval, source=source: self._emit("notifications/message", {
+                    "level": "info",
+                    "logger": f"{source}.approvals",
+                    "data": approval.to_dict()
+                })
+            )
+            job_queue = getattr(adapter, "job_queue", None)
+            if job_queue is not None:
+                job_queue.add_progress_listener(
+                    lambda job, update, source=source: self._emit("notifications/message", {
+                        "level": "error" if job.error else "info",
+                        "logger": f"{source}.jobs",
+                        "data": job.to_dict()
+                    })
+                )
+    
+    def memory_structures(self) -> Dict[str, Any]:
+        """Every hosted adapter's state (prefixed with its namespace) and the bridge's own caches."""
+        structures: Dict[str, Any] = {}
+        for ns, adapter in self.adapters.items():
+            prefix = f"{ns or adapter.adapter_name}."
+            structures.update({prefix + name: obj for name, obj in adapter.memory_structures().items()})
+        structures.update({
+            "bridge.tool_routes": self._tool_routes,
+            "bridge.catalogs": self._catalogs,
+            "bridge.resource_cache": self.resources._cache,
+            "bridge.spilled_results": self.spill._results,
+            "bridge.decision_owners": self._decision_owners,
+        })
+        return structures
+    
+    def memory_report(self, sample: int = 100) -> Dict[str, Any]:
+        """Process memory and the estimated size of each structure in `memory_structures`."""
+        return {"process": process_memory(), "structures": structure_report(self.memory_structures(), sample)}
+    
+    async def shutdown(self):
+        """End every LEP session and release the adapters' background resources."""
+        async def stop(ns: str, adapter: BaseLEPAdapter):
+            if self._lep_sessions.pop(ns, None) is not None:
+                await adapter.invoke("session/shutdown", {})
+            await adapter.close()
+        await self._fan_out(stop)
+    
+    async def _fan_out(
+        self, call: Callable[[str, BaseLEPAdapter], Awaitable[Any]]
+    ) -> Dict[str, Any]:
+        """
+        Run `call` against every adapter concurrently, each under
+        `adapter_timeout`. Returns namespace -> result, or the exception an
+        adapter raised; one adapter's failure or slowness does not affect the others.
+        """
+        namespaces = list(self.adapters)
+        results = await asyncio.gather(
+            *(asyncio.wait_for(call(ns, self.adapters[ns]), self.adapter_timeout) for ns in namespaces),
+            return_exceptions=True
+        )
+        outcomes = {}
+        for ns, result in zip(namespaces, results):
+            if isinstance(result, asyncio.TimeoutError):
+                result = TimeoutError(f"Adapter '{ns}' did not answer within {self.adapter_timeout}s")
+            if isinstance(result, Exception):
+                self.adapter_errors[ns] = str(result)
+                logger.warning(f"Adapter '{ns or self.lep_adapter.adapter_name}' failed: {result}")
+            else:
+                self.adapter_errors.pop(ns, None)
+            outcomes[ns] = result
+        return outcomes
+    
+    def _tool_name(self, namespace: str, skill_name: str) -> str:
+        return f"{namespace}{self.separator}{skill_name}" if self.namespaced else skill_name
+    
+    async def _refresh_catalogs(self):
+        """Fetch every adapter's skills in parallel and rebuild the routing table."""
+        outcomes = await self._fan_out(lambda ns, adapter: adapter.invoke("legacy/listSkills", {}))
+        for ns, skills in outcomes.items():
+            if not isinstance(skills, Exception):
+                self._catalogs[ns] = skills
+        self._build_routes()
+    
+    def _build_routes(self):
+        """Precompute tool name -> route for every catalogued skill."""
+        routes = {}
+        for ns, skills in self._catalogs.items():
+            adapter = self.adapters[ns]
+            for skill in skills:
+                routes[self._tool_name(ns, skill["name"])] = (
+                    ns, adapter, skill["name"], skill["operation_type"] == OperationType.READ.value
+                )
+        self._tool_routes = routes
+    
+    async def _route_tool(self, tool_name: str) -> ToolRoute:
+        route = self._tool_routes.get(tool_name)
+        if route is None:
+            if len(self._catalogs) < len(self.adapters):
+                await self._refresh_catalogs()
+                route = self._tool_routes.get(tool_name)
+            if route is None and not self.namespaced:
+                # Let the adapter report unknown skills as it always has
+                is_read = self.lep_adapter.get_operation_type(tool_name) == OperationType.READ
+                route = ("", self.lep_adapter, tool_name, is_read)
+            if route is None:
+                raise Exception(f"Unknown tool: {tool_name}")
+        return route
+    
     async def _handle_mcp_initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle MCP initialize request."""
-        # Initialize LEP session
-        lep_response = await self.lep_adapter._handle_initialize({
+        """
+        Handle MCP initialize request. The LEP handshake runs once per
+        adapter: later clients join the open LEP session, and only adapters
+        that have not initialized yet are tried again.
+        """
+        lep_params = {
             "client_name": params.get("clientInfo", {}).get("name", "MCP Client"),
             "client_version": params.get("clientInfo", {}).get("version", "1.0.0"),
             "supported_lep_versions": ["2.0"],
             "client_capabilities": {
-                "notifications": True,
+                # The bridge watches the adapters' approval and job queues itself
+                # instead of reading their outbound notifications
+                "notifications": False,
                 "diff_support": False,
                 "cancellation": True
             }
-        })
+        }
+        
+        # Initialize the LEP sessions not yet open and fetch their catalogs in parallel
+        async def start(ns: str, adapter: BaseLEPAdapter):
+            if ns in self._lep_sessions:
+                return self._lep_sessions[ns]
+            response = await adapter.invoke("session/initialize", lep_params)
+            self._catalogs[ns] = await adapter.invoke("legacy/listSkills", {})
+            self._lep_sessions[ns] = response
+            return response
+        outcomes = await self._fan_out(start)
+        self._build_routes()
+        
+        if not self.namespaced:
+            lep_response = outcomes[""]
+            if isinstance(lep_response, Exception):
+                raise lep_response
+        else:
+            ready = [ns for ns, r in outcomes.items() if not isinstance(r, Exception)]
+            lep_response = {
+                "server_name": f"LEP Bridge ({', '.join(ready) or 'no adapters ready'})",
+                "server_version": "2.0"
+            }
         
         # Return MCP-formatted response
         return {
@@ -66,53 +318,125 @@ class LEPMCPBridge:
             }
         }
     
+    async def _handle_mcp_ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle MCP ping request."""
+        return {}
+    
     async def _handle_mcp_tools_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle MCP tools/list request."""
-        # Get LEP skills
-        lep_skills = await self.lep_adapter._handle_list_skills({})
+        # Get LEP skills from every adapter; an adapter that fails keeps its last catalog
+        await self._refresh_catalogs()
         
         # Convert to MCP tools
         mcp_tools = []
-        for skill in lep_skills:
-            mcp_tool = {
-                "name": skill["name"],
-                "description": skill["description"],
-                "inputSchema": {
-                    "type": "object",
-                    "properties": skill["parameters"],
-                    "required": [
-                        k for k, v in skill["parameters"].items()
-                        if v.get("required", False)
-                    ]
-                }
-            }
-            
-            # Add approval warning for write operations
-            if skill["operation_type"] == "write":
-                mcp_tool["description"] += " (requires human approval)"
-            
-            mcp_tools.append(mcp_tool)
+        for ns, lep_skills in self._catalogs.items():
+            mcp_tools.extend(self._to_mcp_tool(ns, skill) for skill in lep_skills)
         
         return {"tools": mcp_tools}
     
+    def _to_mcp_tool(self, namespace: str, skill: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert an LEP skill description to an MCP tool."""
+        mcp_tool = {
+            "name": self._tool_name(namespace, skill["name"]),
+            "description": skill["description"],
+            "inputSchema": {
+                "type": "object",
+                "properties": skill["parameters"],
+                "required": [
+                    k for k, v in skill["parameters"].items()
+                    if v.get("required", False)
+                ]
+            }
+        }
+        
+        # Add approval warning for write operations
+        if skill["operation_type"] == "write":
+            mcp_tool["description"] += " (requires human approval)"
+        
+        return mcp_tool
+    
     async def _handle_mcp_tools_call(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle MCP tools/call request."""
+        """
+        Handle MCP tools/call request, within `_meta.timeout` seconds or
+        `call_timeout`. The deadline covers approval and execution and is
+        inherited by the adapter and its backend calls. A write approved
+        asynchronously is redeemed with `_meta.decision_id`, a batch grant with
+        `_meta.approval_token`. When the call is traced, the result's
+        `_meta.traceparent` names its trace.
+        """
+        timeout = (params.get("_meta") or {}).get("timeout", self.call_timeout)
+        span = current_span()
+        span.set_attribute("tool", params.get("name"))
+        result = await run_with_deadline(self._call_tool(params), timeout, f"Tool {params.get('name')}")
+        if span.sampled:
+            result.setdefault("_meta", {})["traceparent"] = span.traceparent
+        return result
+    
+    async def _call_tool(self, params: Dict[str, Any]) -> Dict[str, Any]:
         tool_name = params.get("name")
         arguments = params.get("arguments", {})
+        namespace, adapter, skill_name, is_read = await self._route_tool(tool_name)
+        
+        # Read skills skip the approval round trip
+        if is_read:
+            result = await adapter.invoke("legacy/callSkill", {
+                "skill_name": skill_name,
+                "parameters": arguments
+            })
+            return self._tool_result(result)
+        
+        # A call repeated with the decision ID of an asynchronous approval, or
+        # carrying a batch approval token, is executed without a new approval.
+        # Both travel in the request's _meta, never among the tool arguments.
+        meta = params.get("_meta") or {}
+        if meta.get("decision_id") or meta.get("approval_token"):
+            decision_key = (namespace, meta["decision_id"]) if meta.get("decision_id") else None
+            claim_token = meta.get("claim_token")
+            if decision_key is not None:
+                claim_token = self._check_decision_owner(decision_key) or claim_token
+            try:
+                result = await adapter.invoke("legacy/callSkill", {
+                    "skill_name": skill_name,
+                    "parameters": arguments,
+                    "decision_id": meta.get("decision_id"),
+                    "claim_token": claim_token,
+                    "approval_token": meta.get("approval_token")
+                })
+            finally:
+                self.resources.invalidate(namespace)
+            if decision_key is not None:
+                self._decision_owners.pop(decision_key, None)
+            return self._tool_result(result)
         
         # Step 1: Request approval from LEP adapter
-        approval_response = await self.lep_adapter._handle_request_approval({
-            "skill_name": tool_name,
+        self._report_progress(params, 0, 2, f"Requesting approval for {skill_name}")
+        approval_response = await adapter.invoke("security/requestApproval", {
+            "skill_name": skill_name,
             "parameters": arguments,
             "reason": "MCP client requested operation",
             "estimated_impact": {
-                "description": f"Executing {tool_name}",
+                "description": f"Executing {skill_name}",
                 "risk_level": "medium"
             }
         })
         
         approval_token = approval_response.get("approval_token")
         
+        if approval_response.get("state") == "pending":
+            # Do not hold the call open for a human; the client calls again
+            # with the decision ID once the approval has been granted
+            self._decision_owners[(namespace, approval_response["decision_id"])] = (
+                CALLER.get(), approval_response["claim_token"])
+            while len(self._decision_owners) > self.max_decision_owners:
+                self._decision_owners.popitem(last=False)
+            return self._tool_result({
+                "status": "pending_approval",
+                "decision_id": approval_response["decision_id"],
+                "expires_at": approval_response["expires_at"],
+                "message": ("Once approved, call this tool again with the same arguments "
+                            "and this decision_id in the request's _meta.decision_id")
+            })
+        
         if not approval_token:
             # Approval was rejected
             return {
@@ -126,28 +450,178 @@ class LEPMCPBridge:
             }
         
         # Step 2: Execute skill with approval token
-        result = await self.lep_adapter._handle_call_skill({
-            "skill_name": tool_name,
-            "parameters": arguments,
-            "approval_token": approval_token
-        })
+        self._report_progress(params, 1, 2, f"Executing {skill_name}")
+        try:
+            result = await adapter.invoke("legacy/callSkill", {
+                "skill_name": skill_name,
+                "parameters": arguments,
+                "approval_token": approval_token
+            })
+        finally:
+            # Writes (even failed ones) may change what cached resources of
+            # this adapter would return; reads started meanwhile are not cached
+            self.resources.invalidate(namespace)
         
         # Step 3: Return MCP-formatted result
+        return self._tool_result(result)
+    
+    def _check_decision_owner(self, key: Tuple[str, str]) -> Optional[str]:
+        """
+        Only the caller a pending decision was handed to may redeem it.
+        Returns the claim token kept for it, if the bridge requested it.
+        """
+        caller = CALLER.get()
+        owner, claim_token = self._decision_owners.get(key, (None, None))
+        # Decisions not handed out here are only redeemable without a caller scope
+        allowed = owner == caller if key in self._decision_owners else caller is None
+        if not allowed:
+            raise Exception(f"Unknown decision: {key[1]}")
+        return claim_token
+    
+    def _report_progress(self, params: Dict[str, Any], progress: int, total: int, message: str):
+        """Send a progress notification if the client asked for them with a progress token."""
+        token = (params.get("_meta") or {}).get("progressToken")
+        if token is not None:
+            self._emit("notifications/progress", {
+                "progressToken": token, "progress": progress, "total": total, "message": message
+            })
+    
+    def _tool_result(self, result: Any) -> Dict[str, Any]:
+        """Format a skill result as MCP tool content, spilling it if oversized."""
+        text = encode_payload(result, self.compact)
+        if self.max_result_bytes is None or len(text) <= self.max_result_bytes:
+            self.payload_stats.record("tools/call", len(text))
+            return {"content": [{"type": "text", "text": text}]}
+        
+        spilled = self.spill.put(result, self.max_result_bytes, self.compact, owner=CALLER.get())
+        summary = encode_payload({
+            "status": "spilled",
+            "result_id": spilled.result_id,
+            "kind": spilled.kind,
+            "pages": len(spilled.pages),
+            "total_bytes": spilled.total_bytes,
+            "message": "Result exceeds the size limit; read each page resource "
+                       + ("and concatenate the arrays" if spilled.kind == "array" else "and join the text")
+        }, self.compact)
+        self.payload_stats.record("tools/call", len(summary), spilled=True)
         return {
-            "content": [
+            "content": [{"type": "text", "text": summary}] + [
                 {
-                    "type": "text",
-                    "text": json.dumps(result, indent=2)
+                    "type": "resource_link",
+                    "uri": f"{SPILL_URI_PREFIX}{spilled.result_id}/{page}",
+                    "name": f"{spilled.result_id} page {page + 1} of {len(spilled.pages)}",
+                    "mimeType": "application/json"
                 }
+                for page in range(len(spilled.pages))
             ]
         }
     
+    def _build_resources(self):
+        """Register every adapter's resource descriptors under lep://[namespace/]path."""
+        for ns, adapter in self.adapters.items():
+            try:
+                descriptors = adapter.list_resources()
+            except Exception as e:
+                self.adapter_errors[ns] = str(e)
+                logger.warning(f"Adapter '{ns or adapter.adapter_name}' resource listing failed: {e}")
+                continue
+            base = f"lep://{ns}/" if self.namespaced else "lep://"
+            for descriptor in descriptors:
+                self.resources.register(
+                    ns, adapter, base + descriptor["path"],
+                    resource_name=descriptor["resource_name"],
+                    name=descriptor.get("name", descriptor["resource_name"]),
+                    description=descriptor.get("description", ""),
+                    mime_type=descriptor.get("mime_type", "application/json"),
+                    cache_ttl=descriptor.get("cache_ttl", 0.0)
+                )
+        self._resources_built = True
+    
+    def _iter_resources(self, position: int = 0, after: Optional[Dict[str, Any]] = None):
+        """
+        Every concrete resource: plain entries, then each instance of each
+        template. Yields (uri, name, entry, resume point), where the resume
+        point (position, last instance) continues the listing after the item.
+        """
+        ordered = [e for e in self.resources.entries if not e.is_template] + \
+                  [e for e in self.resources.entries if e.is_template]
+        for index in range(position, len(ordered)):
+            entry = ordered[index]
+            if not entry.is_template:
+                yield entry.uri_template, entry.name, entry, (index + 1, None)
+                continue
+            instances = entry.adapter.list_resource_instances(entry.resource_name, after if index == position else None)
+            for values in instances:
+                yield (entry.expand(values), f"{entry.name} {' '.join(map(str, values.values()))}", entry,
+                       (index, values))
+    
+    @staticmethod
+    def _encode_cursor(position: int, after: Optional[Dict[str, Any]]) -> str:
+        return base64.urlsafe_b64encode(json.dumps([position, after]).encode()).decode()
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[int, Optional[Dict[str, Any]]]:
+        try:
+            position, after = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(position, int) or position < 0 or not (after is None or isinstance(after, dict)):
+                raise ValueError(cursor)
+        except (ValueError, TypeError):
+            raise Exception(f"Invalid cursor: {cursor}")
+        return position, after
+    
     async def _handle_mcp_resources_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle MCP resources/list request."""
-        # LEP doesn't have a native resource list method
-        # Return empty list for now
-        # In a production system, you could enumerate available resources
-        return {"resources": []}
+        """
+        Handle MCP resources/list request, one page per call. The cursor
+        names the last item listed, so each page resumes from the adapter's
+        index instead of re-walking the earlier pages.
+        """
+        if not self._resources_built:
+            self._build_resources()
+        cursor = params.get("cursor")
+        position, after = self._decode_cursor(cursor) if cursor else (0, None)
+        page = list(itertools.islice(self._iter_resources(position, after), self.resource_page_size + 1))
+        response: Dict[str, Any] = {
+            "resources": [
+                {"uri": uri, "name": name, "description": entry.description, "mimeType": entry.mime_type}
+                for uri, name, entry, _ in page[:self.resource_page_size]
+            ]
+        }
+        if len(page) > self.resource_page_size:
+            response["nextCursor"] = self._encode_cursor(*page[self.resource_page_size - 1][3])
+        return response
+    
+    async def _handle_mcp_resource_templates_list(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle MCP resources/templates/list request."""
+        if not self._resources_built:
+            self._build_resources()
+        return {
+            "resourceTemplates": [
+                {
+                    "uriTemplate": entry.uri_template,
+                    "name": entry.name,
+                    "description": entry.description,
+                    "mimeType": entry.mime_type
+                }
+                for entry in self.resources.entries if entry.is_template
+            ]
+        }
+    
+    async def _read_registered(self, entry: ResourceEntry, uri: str, parameters: Dict[str, Any]) -> str:
+        """Read a registered resource as JSON text, from the cache when allowed."""
+        cached = self.resources.cached(uri) if entry.cache_ttl > 0 else None
+        if cached is not None:
+            # The adapter did not see this read, but its audit trail must
+            result, text = cached
+            entry.adapter.audit_resource_read(entry.resource_name, parameters, result)
+            return text
+        generation = self.resources.generation(entry.namespace)
+        result = await entry.adapter.invoke("legacy/getResource", {
+            "resource_name": entry.resource_name,
+            "parameters": parameters
+        })
+        text = encode_payload(result, self.compact)
+        self.resources.store(entry, uri, (result, text), generation)
+        return text
     
     async def _handle_mcp_resources_read(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle MCP resources/read request."""
@@ -157,7 +631,30 @@ class LEPMCPBridge:
         if not uri.startswith("lep://"):
             raise Exception(f"Invalid LEP URI: {uri}")
         
+        if uri.startswith(SPILL_URI_PREFIX):
+            result_id, _, page = uri[len(SPILL_URI_PREFIX):].partition("/")
+            try:
+                _, text = self.spill.page(result_id, int(page or 0), owner=CALLER.get())
+            except ValueError:
+                raise Exception(f"Invalid page in URI: {uri}")
+            return self._resource_contents(uri, "application/json", text)
+        
+        # Registered resources resolve through the compiled templates
+        if not self._resources_built:
+            self._build_resources()
+        matched = self.resources.match(uri)
+        if matched is not None:
+            entry, parameters = matched
+            return self._resource_contents(uri, entry.mime_type, await self._read_registered(entry, uri, parameters))
+        
         parts = uri[6:].split("/")
+        adapter = self.lep_adapter
+        if self.namespaced:
+            # lep://namespace/resource_name/param
+            adapter = self.adapters.get(parts[0])
+            if adapter is None or len(parts) < 2:
+                raise Exception(f"Unknown adapter in URI: {uri}")
+            parts = parts[1:]
         resource_name = parts[0]
         resource_params = {}
         
@@ -166,23 +663,20 @@ class LEPMCPBridge:
             resource_params["id"] = parts[1]
         
         # Call LEP getResource
-        result = await self.lep_adapter._handle_get_resource({
+        result = await adapter.invoke("legacy/getResource", {
             "resource_name": resource_name,
             "parameters": resource_params
         })
         
         # Return MCP-formatted result
-        return {
-            "contents": [
-                {
-                    "uri": uri,
-                    "mimeType": "application/json",
-                    "text": json.dumps(result, indent=2)
-                }
-            ]
-        }
+        return self._resource_contents(uri, "application/json", encode_payload(result, self.compact))
+    
+    def _resource_contents(self, uri: str, mime_type: str, text: str) -> Dict[str, Any]:
+        """Format resource text as MCP contents and record its size."""
+        self.payload_stats.record("resources/read", len(text))
+        return {"contents": [{"uri": uri, "mimeType": mime_type, "text": text}]}
     
-    async def handle_mcp_request(self, request_data: str) -> str:
+    async def handle_mcp_request(self, request_data: str) -> Optional[str]:
         """
         Handle an incoming MCP request.
         
@@ -190,6 +684,9 @@ class LEPMCPBridge:
             request_data: JSON-RPC 2.0 request string
             
         Returns:
-            JSON-RPC 2.0 response string
+            JSON-RPC 2.0 response string, or None for a notification
         """
-        return await self.mcp_handler.handle_request(request_data)
+        response = await self.mcp_handler.handle_request(request_data)
+        if response is not None:
+            self.payload_stats.record("response", len(response))
+        return response
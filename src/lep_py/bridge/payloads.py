@@ -0,0 +1,149 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - MCP Payload Encoding
+
+Tool results travel as JSON text inside a JSON-RPC response, so every byte
+of the inner encoding is paid for twice once quotes and newlines are
+escaped. Results are therefore encoded compactly unless pretty output is
+asked for, and results larger than the bridge's size cap are spilled:
+the result is split into pages kept in a `SpillStore`, and the tool
+returns a short summary with one resource link per page.
+
+`PayloadStats` records the size of every response the bridge produces,
+and mirrors it into a metrics registry when given one.
+"""
+
+import json
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.metrics import SIZE_BUCKETS, MetricsRegistry
+
+COMPACT_SEPARATORS = (",", ":")
+
+
+def encode_payload(value: Any, compact: bool = True) -> str:
+    """Encode a result as JSON text, compact by default."""
+    if compact:
+        return json.dumps(value, separators=COMPACT_SEPARATORS, default=str)
+    return json.dumps(value, indent=2, default=str)
+
+
+def paginate_payload(value: Any, max_bytes: int, compact: bool = True) -> List[str]:
+    """
+    Split a result into encoded pages of at most about `max_bytes` each.
+
+    Lists are split between items, so every page is itself a valid JSON
+    array; an item larger than the cap gets a page of its own. Any other
+    value is split into chunks of its encoded text, to be joined by the
+    reader before decoding.
+    """
+    if not isinstance(value, list):
+        text = encode_payload(value, compact)
+        return [text[i:i + max_bytes] for i in range(0, len(text), max_bytes)] or [text]
+    pages: List[str] = []
+    current: List[str] = []
+    size = 2
+    for item in value:
+        encoded = encode_payload(item, compact)
+        if current and size + len(encoded) + 1 > max_bytes:
+            pages.append("[" + ",".join(current) + "]")
+            current, size = [], 2
+        current.append(encoded)
+        size += len(encoded) + 1
+    pages.append("[" + ",".join(current) + "]")
+    return pages
+
+
+@dataclass
+class SpilledResult:
+    """An oversized result kept for paginated reading."""
+    result_id: str
+    pages: List[str]
+    kind: str
+    total_bytes: int
+    expires_at: float
+    owner: Optional[str] = None  # the client it was spilled for; only it may read the pages
+
+
+class SpillStore:
+    """
+    Bounded store of spilled results, evicted oldest first and by TTL.
+    Result IDs are random, and a result is only readable by the owner it
+    was spilled for.
+
+    Args:
+        ttl: Seconds a spilled result stays readable
+        max_results: Spilled results kept at once
+    """
+
+    def __init__(self, ttl: float = 600.0, max_results: int = 100):
+        self.ttl = ttl
+        self.max_results = max_results
+        self._results: "OrderedDict[str, SpilledResult]" = OrderedDict()
+
+    def put(self, value: Any, max_bytes: int, compact: bool = True, owner: Optional[str] = None) -> SpilledResult:
+        pages = paginate_payload(value, max_bytes, compact)
+        spilled = SpilledResult(
+            result_id=f"R{secrets.token_hex(8)}",
+            pages=pages,
+            kind="array" if isinstance(value, list) else "text",
+            total_bytes=sum(len(page) for page in pages),
+            expires_at=time.monotonic() + self.ttl,
+            owner=owner
+        )
+        self._results[spilled.result_id] = spilled
+        while len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+        return spilled
+
+    def page(self, result_id: str, page: int, owner: Optional[str] = None) -> Tuple[SpilledResult, str]:
+        spilled = self._results.get(result_id)
+        if spilled is not None and spilled.expires_at < time.monotonic():
+            self._results.pop(result_id, None)
+            spilled = None
+        if spilled is None or spilled.owner != owner:
+            raise Exception(f"Spilled result not found or expired: {result_id}")
+        if not 0 <= page < len(spilled.pages):
+            raise Exception(f"Page {page} out of range for {result_id} ({len(spilled.pages)} pages)")
+        return spilled, spilled.pages[page]
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+class PayloadStats:
+    """Response counts and sizes in bytes, per MCP method."""
+
+    def __init__(self, metrics: Optional[MetricsRegistry] = None):
+        self.methods: Dict[str, Dict[str, int]] = {}
+        self._sizes = self._spilled = None
+        if metrics is not None:
+            self._sizes = metrics.histogram("lep_mcp_payload_bytes", "Encoded MCP payload size", ["method"],
+                                            buckets=SIZE_BUCKETS)
+            self._spilled = metrics.counter("lep_mcp_spilled_total", "Results spilled to pages", ["method"])
+
+    def record(self, method: str, size: int, spilled: bool = False):
+        stats = self.methods.get(method)
+        if stats is None:
+            stats = self.methods[method] = {"responses": 0, "bytes": 0, "max_bytes": 0, "spilled": 0}
+        stats["responses"] += 1
+        stats["bytes"] += size
+        if size > stats["max_bytes"]:
+            stats["max_bytes"] = size
+        if spilled:
+            stats["spilled"] += 1
+        if self._sizes is not None:
+            self._sizes.labels(method).observe(size)
+            if spilled:
+                self._spilled.labels(method).inc()
+
+    def snapshot(self, method: Optional[str] = None) -> Dict[str, Any]:
+        if method is not None:
+            return dict(self.methods.get(method, {}))
+        return {
+            name: {**stats, "avg_bytes": stats["bytes"] // stats["responses"]}
+            for name, stats in self.methods.items()
+        }
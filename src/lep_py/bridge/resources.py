@@ -0,0 +1,155 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - MCP Resource Registry
+
+Maps `lep://` URIs onto adapter resources. Adapters describe their
+resources with URI templates (`customer/{customer_id}`); the registry
+compiles each template to a regular expression and buckets them by their
+literal prefix, so resolving a URI is a few dict lookups and one match.
+
+Query strings supply extra parameters (`lep://cobol/transactions?limit=5`).
+Results of resources that declare a `cache_ttl` are cached per URI, with
+their serialized text, until the TTL runs out or the owning adapter is
+invalidated. A read served from the cache is still audited by its adapter.
+Writers invalidate once their write has finished; a read that started
+before an invalidation is not cached, so it cannot bring back pre-write
+data.
+"""
+
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, quote, unquote
+
+_VARIABLE = re.compile(r"\{(\w+)\}")
+
+
+@dataclass
+class ResourceEntry:
+    """A registered resource or resource template."""
+    namespace: str
+    adapter: Any
+    uri_template: str
+    resource_name: str
+    name: str
+    description: str = ""
+    mime_type: str = "application/json"
+    cache_ttl: float = 0.0
+    variables: Tuple[str, ...] = field(default_factory=tuple)
+    pattern: Optional[re.Pattern] = field(default=None, repr=False)
+
+    @property
+    def is_template(self) -> bool:
+        return bool(self.variables)
+
+    def expand(self, values: Dict[str, Any]) -> str:
+        return _VARIABLE.sub(lambda m: quote(str(values[m.group(1)]), safe=""), self.uri_template)
+
+
+class ResourceRegistry:
+    """
+    Compiled URI template matcher with a small result cache.
+
+    Args:
+        cache_size: Maximum cached resource results
+    """
+
+    def __init__(self, cache_size: int = 1024):
+        self.entries: List[ResourceEntry] = []
+        self._exact: Dict[str, ResourceEntry] = {}
+        self._by_prefix: Dict[str, List[ResourceEntry]] = {}
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[float, str, Any]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # Invalidations so far, per namespace and in total
+        self._generations: Dict[str, int] = {}
+        self._all_generation = 0
+
+    def register(self, namespace: str, adapter: Any, uri_template: str, resource_name: str,
+                 name: str, description: str = "", mime_type: str = "application/json",
+                 cache_ttl: float = 0.0) -> ResourceEntry:
+        entry = ResourceEntry(
+            namespace=namespace,
+            adapter=adapter,
+            uri_template=uri_template,
+            resource_name=resource_name,
+            name=name,
+            description=description,
+            mime_type=mime_type,
+            cache_ttl=cache_ttl,
+            variables=tuple(_VARIABLE.findall(uri_template))
+        )
+        if not entry.variables:
+            self._exact[uri_template] = entry
+        else:
+            literal = uri_template[:uri_template.index("{")]
+            prefix = literal[:literal.rfind("/") + 1]
+            regex = ""
+            position = 0
+            for match in _VARIABLE.finditer(uri_template):
+                regex += re.escape(uri_template[position:match.start()]) + f"(?P<{match.group(1)}>[^/?#]+)"
+                position = match.end()
+            regex += re.escape(uri_template[position:])
+            entry.pattern = re.compile(regex)
+            self._by_prefix.setdefault(prefix, []).append(entry)
+        self.entries.append(entry)
+        return entry
+
+    def match(self, uri: str) -> Optional[Tuple[ResourceEntry, Dict[str, Any]]]:
+        """Resolve a URI to its entry and parameters (template variables plus query string)."""
+        path, _, query = uri.partition("?")
+        parameters: Dict[str, Any] = dict(parse_qsl(query)) if query else {}
+        entry = self._exact.get(path)
+        if entry is not None:
+            return entry, parameters
+        # Try the literal prefixes of the path, longest first
+        end = len(path)
+        while True:
+            end = path.rfind("/", 0, end)
+            if end < 0:
+                return None
+            for entry in self._by_prefix.get(path[:end + 1], ()):
+                matched = entry.pattern.fullmatch(path)
+                if matched:
+                    parameters.update({k: unquote(v) for k, v in matched.groupdict().items()})
+                    return entry, parameters
+
+    # Cache
+
+    def cached(self, uri: str) -> Optional[Any]:
+        hit = self._cache.get(uri)
+        if hit is None or hit[0] < time.monotonic():
+            if hit is not None:
+                del self._cache[uri]
+            self.cache_misses += 1
+            return None
+        self._cache.move_to_end(uri)
+        self.cache_hits += 1
+        return hit[2]
+
+    def generation(self, namespace: str) -> Tuple[int, int]:
+        """Token to pass to `store` for a read starting now."""
+        return self._all_generation, self._generations.get(namespace, 0)
+
+    def store(self, entry: ResourceEntry, uri: str, result: Any, generation: Optional[Tuple[int, int]] = None):
+        """Cache a result, unless its namespace was invalidated since `generation` was taken."""
+        if entry.cache_ttl <= 0:
+            return
+        if generation is not None and generation != self.generation(entry.namespace):
+            return
+        self._cache[uri] = (time.monotonic() + entry.cache_ttl, entry.namespace, result)
+        self._cache.move_to_end(uri)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def invalidate(self, namespace: Optional[str] = None):
+        """Drop cached results, for one adapter's namespace or all of them."""
+        if namespace is None:
+            self._all_generation += 1
+            self._cache.clear()
+            return
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        for uri in [u for u, (_, ns, _) in self._cache.items() if ns == namespace]:
+            del self._cache[uri]
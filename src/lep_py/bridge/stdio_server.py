@@ -0,0 +1,414 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - MCP stdio Server
+
+Runs an `LEPMCPBridge` as an MCP server over stdin/stdout, the transport
+MCP clients use for local servers: one JSON-RPC message per line in each
+direction, logs on stderr.
+
+Requests are handled concurrently (up to `max_concurrency` at a time), so
+a slow tool call does not hold up the ones behind it, and responses are
+written as they complete. The requests of a batch (a JSON array) run the
+same way and are answered with one array. `notifications/cancelled` cancels an in-flight
+request; notifications raised by the adapters (approval decisions, batch
+job progress) are forwarded to the client. Responses and notifications
+share one outbound queue drained by a writer task; progress notifications
+still waiting when a newer one for the same token arrives are replaced by
+it, so a slow client is not flooded. On end of input, SIGINT or
+SIGTERM the server stops reading, lets in-flight calls finish (up to
+`shutdown_timeout`), then shuts the adapters down.
+
+    python -m lep_py.bridge.stdio_server --adapter cobol
+    python -m lep_py.bridge.stdio_server --adapter cobol=cobol --adapter crm=example
+    python -m lep_py.bridge.stdio_server --adapter mypackage.adapters:MyAdapter
+
+Adapter modules are imported only when named, so a server hosting the
+example adapter never loads the COBOL adapter's dependencies.
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import os
+import signal
+import sys
+import time
+from typing import Any, Awaitable, Dict, List, Optional, Set
+
+from ..core.notifications import OutboundQueue, notification
+from ..utils.metrics import MetricsServer, dump_on_signal
+from ..utils.profiling import RequestProfiler, toggle_on_signal
+from ..utils.tracing import JSONLExporter, configure_tracing
+from ..utils.watchdog import LoopWatchdog
+from .lep_mcp_bridge import LEPMCPBridge, coalesce_key
+from .payloads import encode_payload
+
+logger = logging.getLogger(__name__)
+
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+# Reader threads feeding redirected stdin, kept referenced while they run
+_feeders = set()
+
+
+def _cobol_adapter():
+    from ..adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+    return COBOLMainframeAdapter(
+        mainframe_host=os.environ.get("LEP_MAINFRAME_HOST", "localhost"),
+        mainframe_port=int(os.environ.get("LEP_MAINFRAME_PORT", "23")),
+        connection_string=os.environ.get("LEP_CONNECTION_STRING", "")
+    )
+
+
+def _example_adapter():
+    from ..adapter.example_adapter import CustomerDatabaseAdapter
+    return CustomerDatabaseAdapter()
+
+
+BUILTIN_ADAPTERS = {
+    "cobol": _cobol_adapter,
+    "example": _example_adapter,
+}
+
+
+def load_adapter(spec: str):
+    """Create an adapter from a built-in name or a `module:Class` path (constructed without arguments)."""
+    if spec in BUILTIN_ADAPTERS:
+        return BUILTIN_ADAPTERS[spec]()
+    module_name, _, class_name = spec.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown adapter '{spec}'; use one of {sorted(BUILTIN_ADAPTERS)} or module:Class")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def load_adapters(specs: List[str]):
+    """
+    Create the adapters named by `[NAMESPACE=]SPEC` arguments: a single
+    un-namespaced spec gives one adapter, otherwise a namespace -> adapter dict.
+    """
+    specs = specs or ["example"]
+    if len(specs) == 1 and "=" not in specs[0]:
+        return load_adapter(specs[0])
+    adapters = {}
+    for spec in specs:
+        namespace, _, target = spec.partition("=")
+        if not target:
+            raise ValueError(f"Give every adapter a namespace when hosting several: {spec}")
+        adapters[namespace] = load_adapter(target)
+    return adapters
+
+
+def add_adapter_arguments(parser: argparse.ArgumentParser):
+    """Command line options shared by the MCP server entry points."""
+    parser.add_argument("--adapter", action="append", default=[], metavar="[NAMESPACE=]SPEC",
+                        help="Adapter to host: 'cobol', 'example' or module:Class. "
+                             "Give a namespace to host several (repeatable).")
+    parser.add_argument("--max-concurrency", type=int, default=16)
+    parser.add_argument("--shutdown-timeout", type=float, default=30.0)
+    parser.add_argument("--max-result-bytes", type=int, default=64 * 1024)
+    parser.add_argument("--pretty", action="store_true", help="Indent JSON results")
+    parser.add_argument("--log-level", default="INFO")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve Prometheus metrics at http://127.0.0.1:PORT/metrics "
+                             "(they are also written to stderr on SIGUSR1)")
+    parser.add_argument("--trace-file", default=None, metavar="PATH",
+                        help="Append request trace spans to PATH as JSON lines")
+    parser.add_argument("--trace-sample-rate", type=float, default=1.0,
+                        help="Fraction of requests traced when --trace-file is given")
+    parser.add_argument("--block-threshold", type=float, default=0.5, metavar="SECONDS",
+                        help="Log the stack of any call that blocks the event loop this long "
+                             "(0 disables the watchdog)")
+    parser.add_argument("--profile-threshold", type=float, default=None, metavar="SECONDS",
+                        help="Profile adapter requests still running after SECONDS "
+                             "(SIGUSR2 toggles profiling, at 1s unless given)")
+    parser.add_argument("--profile-dir", default=None, metavar="PATH",
+                        help="Also write saved request profiles to PATH")
+
+
+def start_profiling(args: argparse.Namespace, bridge: LEPMCPBridge) -> RequestProfiler:
+    """
+    Share one request profiler among the hosted adapters, on from the start
+    with --profile-threshold and toggled by SIGUSR2.
+    """
+    profiler = RequestProfiler(threshold=args.profile_threshold or 1.0, directory=args.profile_dir)
+    handlers = {}
+    for ns, adapter in bridge.adapters.items():
+        adapter.profiler = profiler
+        handlers[ns or adapter.adapter_name] = adapter.rpc_handler
+        if args.profile_threshold is not None:
+            adapter.enable_profiling()
+    toggle_on_signal(profiler, handlers)
+    return profiler
+
+
+def start_tracing(args: argparse.Namespace):
+    """Send spans to the --trace-file, if one was given."""
+    if args.trace_file:
+        configure_tracing(JSONLExporter(args.trace_file), args.trace_sample_rate)
+
+
+class StdioMCPServer:
+    """
+    Serves a bridge over a pair of line-oriented streams.
+
+    Args:
+        bridge: The bridge to serve
+        max_concurrency: Requests handled at the same time; later ones wait
+        shutdown_timeout: Seconds in-flight requests get to finish at shutdown
+        max_queued_notifications: Notifications held for a slow client before the oldest is dropped
+    """
+
+    def __init__(self, bridge: LEPMCPBridge, max_concurrency: int = 16, shutdown_timeout: float = 30.0,
+                 max_queued_notifications: int = 1000):
+        self.bridge = bridge
+        self.max_concurrency = max(1, max_concurrency)
+        self.shutdown_timeout = shutdown_timeout
+        self._in_flight: Dict[Any, asyncio.Task] = {}
+        self._batches: Set[asyncio.Task] = set()
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self.outbound = OutboundQueue(max_queued_notifications, coalesce=True)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self.stats = {"requests": 0, "notifications_in": 0, "notifications_out": 0, "cancelled": 0, "parse_errors": 0}
+        bridge.add_notification_listener(self.send_notification)
+
+    def _write(self, message: str):
+        """Queue a response; responses are never dropped or merged."""
+        self.outbound.put(message, droppable=False)
+
+    def send_notification(self, method: str, params: Dict[str, Any]):
+        """Queue a notification for the client."""
+        self.stats["notifications_out"] += 1
+        self.outbound.put(encode_payload(notification(method, params)), coalesce_key(method, params))
+
+    async def _write_loop(self, writer: asyncio.StreamWriter):
+        while True:
+            message = await self.outbound.get()
+            if message is None:
+                return
+            if writer.is_closing():
+                continue
+            writer.write(message.encode() + b"\n")
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    def stop(self):
+        """Stop reading requests and begin a graceful shutdown."""
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve until end of input or `stop()`, then shut down gracefully."""
+        self._writer = writer
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._stopping = asyncio.Event()
+        write_task = asyncio.create_task(self._write_loop(writer))
+        read_task = asyncio.create_task(self._read_loop(reader))
+        stop_task = asyncio.create_task(self._stopping.wait())
+        await asyncio.wait({read_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+        for task in (read_task, stop_task):
+            task.cancel()
+        await asyncio.gather(read_task, stop_task, return_exceptions=True)
+
+        if self._in_flight or self._batches:
+            logger.info(f"Waiting for {len(self._in_flight)} in-flight request(s)")
+            pending = set(self._in_flight.values()) | self._batches
+            _, unfinished = await asyncio.wait(pending, timeout=self.shutdown_timeout)
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+        await self.bridge.shutdown()
+        self.outbound.close()
+        await write_task
+
+    async def _read_loop(self, reader: asyncio.StreamReader):
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            line = line.strip()
+            if line:
+                self._dispatch(line.decode())
+
+    def _dispatch(self, text: str):
+        try:
+            message = json.loads(text)
+        except json.JSONDecodeError:
+            self.stats["parse_errors"] += 1
+            self._write(encode_payload({
+                "jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Invalid JSON"}
+            }))
+            return
+        if isinstance(message, list):
+            self._dispatch_batch(message)
+            return
+        if isinstance(message, dict) and "id" not in message:
+            self._handle_notification(message)
+            return
+        if isinstance(message, dict) and "method" not in message:
+            return  # a response; the server sends no requests of its own
+        self._start_request(message, self._handle_request(text))
+
+    def _dispatch_batch(self, batch: List[Any]):
+        """
+        Handle a JSON-RPC batch: its requests run concurrently like single
+        ones, and their responses are written together as one array.
+        """
+        if not batch:
+            self._write(encode_payload({
+                "jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid Request"}
+            }))
+            return
+        requests = []
+        for message in batch:
+            if isinstance(message, dict) and "id" not in message:
+                self._handle_notification(message)
+            elif not isinstance(message, dict) or "method" in message:
+                requests.append(self._start_request(message, self._run_request(json.dumps(message))))
+        if requests:
+            task = asyncio.create_task(self._answer_batch(requests))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    def _start_request(self, message: Any, handler: Awaitable[Any]) -> asyncio.Task:
+        request_id = message.get("id") if isinstance(message, dict) else None
+        self.stats["requests"] += 1
+        task = asyncio.create_task(handler)
+        if request_id is not None:
+            self._in_flight[request_id] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(request_id, None))
+        return task
+
+    async def _answer_batch(self, requests: List[asyncio.Task]):
+        outcomes = await asyncio.gather(*requests, return_exceptions=True)
+        responses = [response for response in outcomes if isinstance(response, str)]
+        if responses:
+            self._write("[" + ",".join(responses) + "]")
+
+    def _handle_notification(self, message: Dict[str, Any]):
+        self.stats["notifications_in"] += 1
+        if message.get("method") == "notifications/cancelled":
+            task = self._in_flight.get((message.get("params") or {}).get("requestId"))
+            if task is not None:
+                self.stats["cancelled"] += 1
+                task.cancel()
+
+    async def _run_request(self, text: str) -> Optional[str]:
+        async with self._semaphore:
+            return await self.bridge.handle_mcp_request(text)
+
+    async def _handle_request(self, text: str):
+        response = await self._run_request(text)
+        if response is not None:
+            self._write(response)
+
+
+class _FileWriter:
+    """Blocking stand-in for StreamWriter when stdout is a regular file."""
+
+    def __init__(self, file):
+        self._file = file
+
+    def write(self, data: bytes):
+        self._file.write(data)
+
+    async def drain(self):
+        pass
+
+    def is_closing(self) -> bool:
+        return self._file.closed
+
+
+async def _feed_from_file(reader: asyncio.StreamReader, stdin):
+    loop = asyncio.get_running_loop()
+    while True:
+        data = await loop.run_in_executor(None, stdin.buffer.read1, 65536)
+        if not data:
+            reader.feed_eof()
+            return
+        reader.feed_data(data)
+
+
+async def open_stdio(stdin, stdout, limit: int = MAX_MESSAGE_BYTES):
+    """
+    Wrap stdin and stdout in an asyncio reader and writer. Pipes and
+    terminals are read and written asynchronously; redirected regular
+    files, which the event loop cannot watch, fall back to a reader thread
+    and blocking writes.
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=limit)
+    try:
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), stdin)
+    except ValueError:
+        feeder = asyncio.ensure_future(_feed_from_file(reader, stdin))
+        _feeders.add(feeder)
+        feeder.add_done_callback(_feeders.discard)
+    try:
+        transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, stdout)
+        writer = asyncio.StreamWriter(transport, protocol, None, loop)
+    except ValueError:
+        writer = _FileWriter(stdout)
+    return reader, writer
+
+
+async def _run(server: StdioMCPServer, stdout, started: float, metrics_port: Optional[int] = None,
+               block_threshold: Optional[float] = None):
+    reader, writer = await open_stdio(sys.stdin, stdout)
+    metrics_server = None
+    if metrics_port is not None:
+        metrics_server = MetricsServer(server.bridge.metrics, port=metrics_port)
+        await metrics_server.start()
+        logger.info(f"Metrics at http://127.0.0.1:{metrics_server.port}/metrics")
+    watchdog = None
+    if block_threshold:
+        watchdog = LoopWatchdog(block_threshold, registry=server.bridge.metrics)
+        await watchdog.start()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, server.stop)
+        except (NotImplementedError, RuntimeError):
+            pass  # not supported on this platform
+    logger.info(f"MCP stdio server ready in {(time.perf_counter() - started) * 1000:.0f}ms")
+    await server.serve(reader, writer)
+    if watchdog is not None:
+        await watchdog.stop()
+    if metrics_server is not None:
+        await metrics_server.stop()
+    logger.info(f"MCP stdio server stopped: {json.dumps({**server.stats, 'outbound': server.outbound.stats})}")
+
+
+def main(argv: Optional[List[str]] = None):
+    started = time.perf_counter()
+    parser = argparse.ArgumentParser(description="Serve LEP adapters to MCP clients over stdio")
+    add_adapter_arguments(parser)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(stream=sys.stderr, level=args.log_level.upper(),
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    # stdout carries the protocol; anything else printed goes to stderr
+    stdout = os.fdopen(os.dup(sys.stdout.fileno()), "wb", buffering=0)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+
+    try:
+        adapters = load_adapters(args.adapter)
+    except ValueError as e:
+        parser.error(str(e))
+    bridge = LEPMCPBridge(adapters, compact=not args.pretty, max_result_bytes=args.max_result_bytes or None)
+    server = StdioMCPServer(bridge, args.max_concurrency, args.shutdown_timeout)
+    dump_on_signal(bridge.metrics)
+    start_tracing(args)
+    start_profiling(args, bridge)
+    try:
+        asyncio.run(_run(server, stdout, started, args.metrics_port, args.block_threshold))
+    finally:
+        configure_tracing(None)  # writes out buffered spans
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,506 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - COBOL Copybook Record Codec
+
+This module compiles a COBOL copybook into a fixed-width record layout that
+can decode and encode EBCDIC records. Supported clauses:
+
+- PIC / PICTURE with X, A, 9, S, V and repeat counts, e.g. S9(11)V99
+- USAGE DISPLAY (zoned), COMP-3 / PACKED-DECIMAL, COMP / COMP-4 / BINARY
+- OCCURS n [TIMES] on groups and elementary items
+- REDEFINES
+
+Single records decode through a precompiled list of field converters.
+Whole buffers decode column by column: alphanumeric fields are converted
+from EBCDIC in one codec call over the buffer, and numeric fields are
+decoded for every record at once with NumPy when it is installed.
+
+Fields under a REDEFINES are alternate views of the same bytes, and only
+one of them usually holds valid data in a given record. They are left out
+of decoding unless asked for by name, as "*" for all, or by a selector that
+picks them per record. `lenient` decodes the views that do not hold valid
+data as None instead of raising.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from . import numeric
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+DEFAULT_CODEPAGE = "cp037"
+
+ALPHANUMERIC = "alphanumeric"
+ZONED = "zoned"
+PACKED = "packed"
+BINARY = "binary"
+
+_USAGES = {
+    "DISPLAY": ZONED,
+    "COMP-3": PACKED,
+    "COMPUTATIONAL-3": PACKED,
+    "PACKED-DECIMAL": PACKED,
+    "COMP": BINARY,
+    "COMP-4": BINARY,
+    "COMPUTATIONAL": BINARY,
+    "COMPUTATIONAL-4": BINARY,
+    "BINARY": BINARY,
+}
+
+# REDEFINES views to decode: None, "*" for all, field names, or a selector
+# called with the rest of the decoded record that returns field names
+Redefines = Union[None, str, Iterable[str], Callable[[Dict[str, Any]], Iterable[str]]]
+
+_REPEAT = re.compile(r"(.)\((\d+)\)")
+_TERMINATOR = re.compile(r"\.(?=\s|$)")
+
+
+class CopybookError(Exception):
+    """Raised when a copybook cannot be parsed or compiled."""
+    pass
+
+
+@dataclass
+class FieldSpec:
+    """An elementary field at a fixed offset inside a record."""
+    name: str
+    offset: int
+    length: int
+    kind: str
+    digits: int = 0
+    scale: int = 0
+    signed: bool = False
+    redefined: bool = False
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+
+@dataclass
+class _Item:
+    """A parsed copybook entry before offsets are assigned."""
+    level: int
+    name: str
+    picture: Optional[str] = None
+    usage: str = ZONED
+    occurs: int = 1
+    redefines: Optional[str] = None
+    children: List["_Item"] = field(default_factory=list)
+
+
+def parse_picture(picture: str) -> Tuple[str, int, int, bool]:
+    """
+    Parse a PIC string.
+
+    Returns:
+        (category, digits_or_length, scale, signed) where category is
+        "alphanumeric" or "numeric"
+    """
+    expanded = _REPEAT.sub(lambda m: m.group(1) * int(m.group(2)), picture.upper())
+    if set(expanded) <= {"X", "A"}:
+        return ALPHANUMERIC, len(expanded), 0, False
+
+    signed = expanded.startswith("S")
+    body = expanded[1:] if signed else expanded
+    integer, _, fraction = body.partition("V")
+    if not set(integer + fraction) <= {"9"} or not integer + fraction:
+        raise CopybookError(f"Unsupported PICTURE clause: {picture}")
+    return "numeric", len(integer) + len(fraction), len(fraction), signed
+
+
+def _statements(text: str) -> List[str]:
+    """Strip comments and sequence areas and split the copybook into statements."""
+    lines = []
+    for line in text.splitlines():
+        # Fixed-format source: columns 1-6 are a sequence area, 7 an indicator
+        if len(line) > 6 and (line[:6].isdigit() or (line[:6].isspace() and line[6:7] in "*/")):
+            if line[6:7] in "*/":
+                continue
+            line = line[7:72]
+        if line.strip().startswith("*"):
+            continue
+        lines.append(line)
+    return [s.strip() for s in _TERMINATOR.split(" ".join(lines)) if s.strip()]
+
+
+def _parse_items(text: str) -> List[_Item]:
+    """Parse copybook text into a tree of items."""
+    roots: List[_Item] = []
+    stack: List[_Item] = []
+
+    for statement in _statements(text):
+        tokens = statement.split()
+        try:
+            level = int(tokens[0])
+        except ValueError:
+            raise CopybookError(f"Expected level number: {statement}")
+        if level == 88:
+            continue  # condition names carry no storage
+        if level in (66, 77):
+            raise CopybookError(f"Level {level} entries are not supported: {statement}")
+
+        item = _Item(level=level, name=tokens[1].upper() if len(tokens) > 1 else "FILLER")
+        i = 2
+        while i < len(tokens):
+            token = tokens[i].upper()
+            if token in ("PIC", "PICTURE"):
+                i += 1
+                if i < len(tokens) and tokens[i].upper() == "IS":
+                    i += 1
+                item.picture = tokens[i]
+            elif token in ("USAGE", "IS"):
+                pass
+            elif token in _USAGES:
+                item.usage = _USAGES[token]
+            elif token == "OCCURS":
+                i += 1
+                item.occurs = int(tokens[i])
+                if i + 1 < len(tokens) and tokens[i + 1].upper() == "TIMES":
+                    i += 1
+            elif token == "REDEFINES":
+                i += 1
+                item.redefines = tokens[i].upper()
+            elif token == "VALUE":
+                break  # initial values do not affect layout
+            else:
+                raise CopybookError(f"Unsupported clause '{tokens[i]}' in: {statement}")
+            i += 1
+
+        while stack and stack[-1].level >= level:
+            stack.pop()
+        (stack[-1].children if stack else roots).append(item)
+        stack.append(item)
+
+    if not roots:
+        raise CopybookError("Copybook contains no data items")
+    return roots
+
+
+class RecordLayout:
+    """
+    A compiled copybook: field offsets plus record decoders and encoders.
+
+    OCCURS fields are flattened with COBOL subscripts, e.g. HIST-AMOUNT(1).
+    FILLER fields occupy space but are not decoded, and REDEFINES views
+    only when requested.
+    """
+
+    def __init__(self, fields: List[FieldSpec], record_length: int, codepage: str = DEFAULT_CODEPAGE):
+        self.fields = fields
+        self.record_length = record_length
+        self.codepage = codepage
+        self.field_names = [f.name for f in fields]
+        self._by_name = {f.name: f for f in fields}
+        self._space = " ".encode(codepage)
+        self._decoders = [(f.name, f.offset, f.end, self._scalar_decoder(f)) for f in fields]
+        self._base_decoders = [entry for entry, f in zip(self._decoders, fields) if not f.redefined]
+        self._view_decoders = {entry[0]: entry for entry, f in zip(self._decoders, fields) if f.redefined}
+        # Fields outside REDEFINES are written first so redefining views win
+        self._encode_order = [f for f in fields if not f.redefined] + [f for f in fields if f.redefined]
+
+    def __getitem__(self, name: str) -> FieldSpec:
+        return self._by_name[name]
+
+    # Single records
+
+    def _scalar_decoder(self, spec: FieldSpec) -> Callable[[bytes], Any]:
+        codepage, scale, signed = self.codepage, spec.scale, spec.signed
+        if spec.kind == ALPHANUMERIC:
+            return lambda data: data.decode(codepage).rstrip()
+        if spec.kind == PACKED:
+            return lambda data: numeric.scale_value(numeric.decode_packed(data), scale)
+        if spec.kind == ZONED:
+            return lambda data: numeric.scale_value(numeric.decode_zoned(data, signed), scale)
+        return lambda data: numeric.scale_value(numeric.decode_binary(data, signed), scale)
+
+    def decode(self, record: bytes, redefines: Redefines = None, lenient: bool = False) -> Dict[str, Any]:
+        """
+        Decode one record into a dict keyed by field name.
+
+        Args:
+            record: The record bytes
+            redefines: REDEFINES views to include (see the module docstring)
+            lenient: Decode views holding invalid data as None
+        """
+        if len(record) != self.record_length:
+            raise ValueError(f"Record is {len(record)} bytes, layout expects {self.record_length}")
+        values = {name: decode(record[start:end]) for name, start, end, decode in self._base_decoders}
+        if redefines is not None:
+            names = redefines(values) if callable(redefines) else self._view_names(redefines)
+            for name in names:
+                values[name] = self._decode_view(self._view(name), record, lenient)
+        return values
+
+    def _view_names(self, redefines: Union[str, Iterable[str]]) -> List[str]:
+        if redefines == "*":
+            return list(self._view_decoders)
+        return [redefines] if isinstance(redefines, str) else list(redefines)
+
+    def _view(self, name: str) -> Tuple[str, int, int, Callable[[bytes], Any]]:
+        entry = self._view_decoders.get(name)
+        if entry is None:
+            raise KeyError(f"{name} is not a REDEFINES field")
+        return entry
+
+    @staticmethod
+    def _decode_view(entry: Tuple[str, int, int, Callable[[bytes], Any]], record: bytes, lenient: bool) -> Any:
+        _, start, end, decode = entry
+        try:
+            return decode(record[start:end])
+        except (ValueError, UnicodeDecodeError):
+            if lenient:
+                return None
+            raise
+
+    def field_decoder(self, names: List[str]) -> Callable[[bytes], Dict[str, Any]]:
+        """Compile a decoder that only converts the named fields."""
+        wanted = set(names)
+        decoders = [entry for entry in self._decoders if entry[0] in wanted]
+        return lambda record: {name: decode(record[start:end]) for name, start, end, decode in decoders}
+
+    def encode(self, values: Dict[str, Any]) -> bytes:
+        """
+        Encode a dict into one record.
+
+        Missing alphanumeric fields are space-filled and missing numeric
+        fields are zero. Unknown keys raise `KeyError`.
+        """
+        unknown = set(values) - set(self._by_name)
+        if unknown:
+            raise KeyError(f"Unknown fields: {sorted(unknown)}")
+        record = bytearray(self._space * self.record_length)
+        for spec in self._encode_order:
+            if spec.name in values:
+                value = values[spec.name]
+            elif spec.redefined:
+                continue
+            else:
+                value = "" if spec.kind == ALPHANUMERIC else 0
+            record[spec.offset:spec.end] = self._encode_field(spec, value)
+        return bytes(record)
+
+    def encode_field(self, name: str, value: Any) -> bytes:
+        """Encode a single field value to its storage bytes."""
+        return self._encode_field(self._by_name[name], value)
+
+    def _encode_field(self, spec: FieldSpec, value: Any) -> bytes:
+        if spec.kind == ALPHANUMERIC:
+            encoded = str(value).encode(self.codepage)
+            if len(encoded) > spec.length:
+                raise ValueError(f"{spec.name}: '{value}' exceeds {spec.length} bytes")
+            return encoded.ljust(spec.length, self._space)
+        unscaled = numeric.unscale_value(value, spec.scale)
+        if spec.kind == PACKED:
+            return numeric.encode_packed(unscaled, spec.digits, spec.signed)
+        if spec.kind == ZONED:
+            return numeric.encode_zoned(unscaled, spec.digits, spec.signed)
+        return numeric.encode_binary(unscaled, spec.length, spec.signed)
+
+    # Whole buffers
+
+    def record_count(self, buffer: bytes) -> int:
+        if len(buffer) % self.record_length:
+            raise ValueError(
+                f"Buffer of {len(buffer)} bytes is not a multiple of the {self.record_length}-byte record"
+            )
+        return len(buffer) // self.record_length
+
+    def iter_records(self, buffer: bytes, redefines: Redefines = None, lenient: bool = False):
+        """Yield decoded dicts for each record in a buffer."""
+        view = memoryview(buffer)
+        for start in range(0, self.record_count(buffer) * self.record_length, self.record_length):
+            yield self.decode(bytes(view[start:start + self.record_length]), redefines, lenient)
+
+    def decode_columns(
+        self,
+        buffer: bytes,
+        fields: Optional[List[str]] = None,
+        use_numpy: bool = True,
+        lenient: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Decode every record in a buffer into per-field columns.
+
+        Numeric columns are NumPy arrays when NumPy is available (int64, or
+        float64 for fields with an implied decimal point) and lists
+        otherwise. Alphanumeric columns are always lists of str.
+
+        `fields` defaults to every field outside a REDEFINES; views named in
+        it are decoded too. With `lenient`, a view column holding invalid
+        data is a list with None for those records.
+        """
+        count = self.record_count(buffer)
+        specs = [self._by_name[name] for name in fields] if fields else [f for f in self.fields if not f.redefined]
+        width = self.record_length
+        vectorized = use_numpy and np is not None
+
+        # One codec call converts every alphanumeric byte in the buffer
+        text = bytes(buffer).decode(self.codepage) if any(s.kind == ALPHANUMERIC for s in specs) else ""
+        matrix = np.frombuffer(buffer, dtype=np.uint8).reshape(count, width) if vectorized and count else None
+
+        columns: Dict[str, Any] = {}
+        for spec in specs:
+            if spec.kind == ALPHANUMERIC:
+                start, end = spec.offset, spec.end
+                columns[spec.name] = [
+                    text[base + start:base + end].rstrip() for base in range(0, count * width, width)
+                ]
+            elif matrix is not None and spec.digits <= numeric.MAX_VECTOR_DIGITS:
+                block = matrix[:, spec.offset:spec.end]
+                try:
+                    if spec.kind == PACKED:
+                        values = numeric.decode_packed_array(block)
+                    elif spec.kind == ZONED:
+                        values = numeric.decode_zoned_array(block, spec.signed)
+                    else:
+                        values = numeric.decode_binary_array(block, spec.signed)
+                except OverflowError:
+                    # A non-zero pad nibble: valid data, too wide for int64
+                    columns[spec.name] = self._scalar_column(spec, buffer, count, lenient and spec.redefined)
+                except ValueError:
+                    if not (lenient and spec.redefined):
+                        raise
+                    columns[spec.name] = self._scalar_column(spec, buffer, count, lenient)
+                else:
+                    columns[spec.name] = numeric.scale_array(values, spec.scale)
+            else:
+                columns[spec.name] = self._scalar_column(spec, buffer, count, lenient and spec.redefined)
+        return columns
+
+    def _scalar_column(self, spec: FieldSpec, buffer: bytes, count: int, lenient: bool) -> List[Any]:
+        """Decode one field of every record with the scalar decoder."""
+        entry = (spec.name, spec.offset, spec.end, self._scalar_decoder(spec))
+        view = memoryview(buffer)
+        width = self.record_length
+        return [self._decode_view(entry, bytes(view[base:base + width]), lenient)
+                for base in range(0, count * width, width)]
+
+    def decode_buffer(
+        self,
+        buffer: bytes,
+        use_numpy: bool = True,
+        redefines: Redefines = None,
+        lenient: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Decode every record in a buffer into a list of dicts (column-wise
+        under the hood). REDEFINES views named, or "*", are decoded as
+        columns; a selector is applied record by record.
+        """
+        fields = [f.name for f in self.fields if not f.redefined]
+        if redefines is not None and not callable(redefines):
+            fields += [self._view(name)[0] for name in self._view_names(redefines)]
+        columns = self.decode_columns(buffer, fields, use_numpy=use_numpy, lenient=lenient)
+        names = list(columns)
+        values = [c.tolist() if hasattr(c, "tolist") else c for c in columns.values()]
+        rows = [dict(zip(names, row)) for row in zip(*values)]
+        if callable(redefines):
+            view = memoryview(buffer)
+            width = self.record_length
+            for index, row in enumerate(rows):
+                record = bytes(view[index * width:(index + 1) * width])
+                for name in redefines(row):
+                    row[name] = self._decode_view(self._view(name), record, lenient)
+        return rows
+
+    def encode_buffer(self, records: List[Dict[str, Any]]) -> bytes:
+        """Encode a sequence of dicts into one contiguous buffer."""
+        return b"".join(self.encode(record) for record in records)
+
+
+def _item_size(item: _Item) -> int:
+    """Storage size of one occurrence of an item."""
+    if item.picture is not None:
+        category, digits, _, _ = parse_picture(item.picture)
+        if category == ALPHANUMERIC:
+            return digits
+        if item.usage == PACKED:
+            return numeric.packed_length(digits)
+        if item.usage == BINARY:
+            return numeric.binary_length(digits)
+        return digits
+    size = 0
+    offsets: Dict[str, int] = {}
+    for child in item.children:
+        child_size = _item_size(child) * child.occurs
+        if child.redefines:
+            if child.redefines not in offsets:
+                raise CopybookError(f"{child.name} REDEFINES unknown item {child.redefines}")
+            size = max(size, offsets[child.redefines] + child_size)
+        else:
+            offsets[child.name] = size
+            size += child_size
+    return size
+
+
+def _layout_fields(
+    item: _Item,
+    offset: int,
+    suffix: str,
+    redefined: bool,
+    fields: List[FieldSpec]
+):
+    """Assign offsets to one occurrence of an item and its descendants."""
+    if item.picture is not None:
+        if item.name == "FILLER":
+            return
+        category, digits, scale, signed = parse_picture(item.picture)
+        if category == ALPHANUMERIC:
+            spec = FieldSpec(item.name + suffix, offset, digits, ALPHANUMERIC, redefined=redefined)
+        else:
+            spec = FieldSpec(
+                item.name + suffix, offset, _item_size(item), item.usage,
+                digits=digits, scale=scale, signed=signed, redefined=redefined
+            )
+        fields.append(spec)
+        return
+
+    cursor = offset
+    offsets: Dict[str, int] = {}
+    for child in item.children:
+        child_size = _item_size(child)
+        if child.redefines:
+            start = offsets[child.redefines]
+            child_redefined = True
+        else:
+            start = cursor
+            offsets[child.name] = start
+            cursor += child_size * child.occurs
+            child_redefined = redefined
+        for index in range(child.occurs):
+            child_suffix = f"{suffix}({index + 1})" if child.occurs > 1 else suffix
+            _layout_fields(child, start + index * child_size, child_suffix, child_redefined, fields)
+
+
+def compile_copybook(text: str, record: Optional[str] = None, codepage: str = DEFAULT_CODEPAGE) -> RecordLayout:
+    """
+    Compile a copybook into a `RecordLayout`.
+
+    Args:
+        text: Copybook source (fixed or free format)
+        record: Name of the 01-level record to compile; defaults to the first
+        codepage: EBCDIC code page used for alphanumeric fields
+    """
+    roots = _parse_items(text)
+    if record is None:
+        root = roots[0]
+    else:
+        root = next((r for r in roots if r.name == record.upper()), None)
+        if root is None:
+            raise CopybookError(f"Record {record} not found in copybook")
+
+    fields: List[FieldSpec] = []
+    for index in range(root.occurs):
+        suffix = f"({index + 1})" if root.occurs > 1 else ""
+        _layout_fields(root, index * _item_size(root), suffix, False, fields)
+
+    duplicates = {name for name, count in Counter(f.name for f in fields).items() if count > 1}
+    if duplicates:
+        raise CopybookError(f"Duplicate field names: {sorted(duplicates)}")
+    return RecordLayout(fields, _item_size(root) * root.occurs, codepage)
@@ -0,0 +1,178 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - COBOL Numeric Field Codecs
+
+Scalar and vectorized conversions for COBOL numeric storage formats:
+
+- Packed decimal (COMP-3): two digits per byte, sign in the final nibble
+- Zoned decimal (DISPLAY): one EBCDIC digit per byte, sign overpunched in
+  the zone of the final byte
+- Binary (COMP / BINARY / COMP-4): big-endian two's complement
+
+The vectorized variants take a 2-D NumPy uint8 array holding the same
+field from many records (one row per record) and decode every row at once.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# Sign nibbles
+POSITIVE_SIGNS = (0xA, 0xC, 0xE, 0xF)
+NEGATIVE_SIGNS = (0xB, 0xD)
+UNSIGNED_SIGN = 0xF
+
+# Widest field the vectorized int64 path can hold without overflow
+MAX_VECTOR_DIGITS = 18
+
+
+def packed_length(digits: int) -> int:
+    """Number of bytes a COMP-3 field with `digits` digits occupies."""
+    return digits // 2 + 1
+
+
+def binary_length(digits: int) -> int:
+    """Number of bytes a COMP/BINARY field with `digits` digits occupies."""
+    if digits <= 4:
+        return 2
+    if digits <= 9:
+        return 4
+    return 8
+
+
+# Scalar codecs
+
+def decode_packed(data: bytes) -> int:
+    """Decode a packed-decimal field to an unscaled integer."""
+    nibbles = data.hex()
+    sign = int(nibbles[-1], 16)
+    digits = nibbles[:-1]
+    if not digits.isdigit() or sign < 0xA:
+        raise ValueError(f"Invalid packed decimal: {nibbles}")
+    value = int(digits)
+    return -value if sign in NEGATIVE_SIGNS else value
+
+
+def encode_packed(value: int, digits: int, signed: bool = True) -> bytes:
+    """Encode an unscaled integer as a packed-decimal field."""
+    magnitude = abs(value)
+    text = str(magnitude)
+    if len(text) > digits:
+        raise ValueError(f"Value {value} does not fit in {digits} packed digits")
+    if not signed:
+        if value < 0:
+            raise ValueError(f"Negative value {value} for unsigned field")
+        sign = "f"
+    else:
+        sign = "d" if value < 0 else "c"
+    width = packed_length(digits) * 2 - 1
+    return bytes.fromhex(text.rjust(width, "0") + sign)
+
+
+def decode_zoned(data: bytes, signed: bool = True) -> int:
+    """Decode an EBCDIC zoned-decimal field to an unscaled integer."""
+    value = 0
+    for byte in data:
+        digit = byte & 0x0F
+        if digit > 9:
+            raise ValueError(f"Invalid zoned decimal: {data.hex()}")
+        value = value * 10 + digit
+    if signed and (data[-1] >> 4) in NEGATIVE_SIGNS:
+        return -value
+    return value
+
+
+def encode_zoned(value: int, digits: int, signed: bool = True) -> bytes:
+    """Encode an unscaled integer as an EBCDIC zoned-decimal field."""
+    text = str(abs(value))
+    if len(text) > digits:
+        raise ValueError(f"Value {value} does not fit in {digits} zoned digits")
+    if value < 0 and not signed:
+        raise ValueError(f"Negative value {value} for unsigned field")
+    encoded = bytearray(0xF0 | int(c) for c in text.rjust(digits, "0"))
+    if signed:
+        zone = 0xD0 if value < 0 else 0xC0
+        encoded[-1] = zone | (encoded[-1] & 0x0F)
+    return bytes(encoded)
+
+
+def decode_binary(data: bytes, signed: bool = True) -> int:
+    """Decode a big-endian binary field."""
+    return int.from_bytes(data, "big", signed=signed)
+
+
+def encode_binary(value: int, length: int, signed: bool = True) -> bytes:
+    """Encode an integer as a big-endian binary field."""
+    return value.to_bytes(length, "big", signed=signed)
+
+
+def scale_value(value: int, scale: int) -> Any:
+    """Apply an implied decimal point (PIC ...V99) to an unscaled integer."""
+    return value / 10 ** scale if scale else value
+
+
+def unscale_value(value: Any, scale: int) -> int:
+    """Inverse of `scale_value`, rounding half away from zero."""
+    if isinstance(value, int):
+        return value * 10 ** scale
+    # Go through the shortest decimal repr so 0.285 scales to 28.5, not 28.4999...
+    exact = Decimal(value if isinstance(value, Decimal) else repr(float(value)))
+    return int((exact.scaleb(scale)).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+# Vectorized codecs
+
+def _digits_to_int(digits):
+    """Collapse a (rows, n) array of decimal digits into int64 values."""
+    width = digits.shape[1]
+    if width > MAX_VECTOR_DIGITS:
+        raise ValueError(f"{width}-digit fields exceed the vectorized int64 range")
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    return digits.astype(np.int64) @ powers
+
+
+def decode_packed_array(columns) -> Any:
+    """Decode a (rows, bytes) uint8 array of packed-decimal fields."""
+    high = columns >> 4
+    low = columns & 0x0F
+    nibbles = np.empty((columns.shape[0], columns.shape[1] * 2), dtype=np.uint8)
+    nibbles[:, 0::2] = high
+    nibbles[:, 1::2] = low
+    digits, signs = nibbles[:, :-1], nibbles[:, -1]
+    if (digits > 9).any() or (signs < 0xA).any():
+        raise ValueError("Invalid packed decimal in buffer")
+    # An even digit count leaves a leading pad nibble (19 nibbles for
+    # S9(18)); drop leading nibbles beyond the int64 range when all are zero
+    excess = digits.shape[1] - MAX_VECTOR_DIGITS
+    if excess > 0:
+        if digits[:, :excess].any():
+            raise OverflowError("Packed decimal exceeds the vectorized int64 range")
+        digits = digits[:, excess:]
+    values = _digits_to_int(digits)
+    return np.where((signs == 0xB) | (signs == 0xD), -values, values)
+
+
+def decode_zoned_array(columns, signed: bool = True) -> Any:
+    """Decode a (rows, bytes) uint8 array of zoned-decimal fields."""
+    digits = columns & 0x0F
+    if (digits > 9).any():
+        raise ValueError("Invalid zoned decimal in buffer")
+    values = _digits_to_int(digits)
+    if not signed:
+        return values
+    zones = columns[:, -1] >> 4
+    return np.where((zones == 0xB) | (zones == 0xD), -values, values)
+
+
+def decode_binary_array(columns, signed: bool = True) -> Any:
+    """Decode a (rows, bytes) uint8 array of big-endian binary fields."""
+    dtype = np.dtype(f">{'i' if signed else 'u'}{columns.shape[1]}")
+    return np.ascontiguousarray(columns).view(dtype).ravel().astype(np.int64)
+
+
+def scale_array(values, scale: int) -> Any:
+    """Vectorized `scale_value`."""
+    return values / float(10 ** scale) if scale else values
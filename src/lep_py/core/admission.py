@@ -0,0 +1,205 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Admission Control
+
+Bounds the work a `JSONRPCHandler` accepts so that overload sheds requests
+early instead of queueing them without limit in front of the backend.
+
+Each gate (one global, plus optional per-method gates) admits up to
+`max_in_flight` requests at once and parks the rest in a bounded FIFO
+queue. A request is rejected when the queue is full, when it has waited
+`max_queue_time` seconds, or up front when the wait it can expect (queue
+length times the recent service time, spread over the slots) already
+exceeds that limit. Rejections carry a retry-after hint derived from the
+same estimate.
+
+`AdmissionController.intercept` is the interceptor a `JSONRPCHandler`
+installs for its `admission` controller; shed requests are answered with
+a SERVER_BUSY error.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from ..models.protocol import LEPErrorCode
+from .middleware import Handler, RPCCall, RPCError
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed; carries a retry-after hint in seconds."""
+
+    def __init__(self, message: str, reason: str, retry_after: float):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionGate:
+    """
+    One concurrency limit with a bounded wait queue.
+
+    Args:
+        name: Name used in metrics and errors
+        max_in_flight: Requests running at once
+        max_queued: Requests waiting for a slot; further ones are rejected
+        max_queue_time: Seconds a request may wait before it is rejected
+    """
+
+    # Weight of the newest sample in the service time average
+    SMOOTHING = 0.2
+
+    def __init__(self, name: str, max_in_flight: int, max_queued: int = 100, max_queue_time: float = 1.0):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.max_queue_time = max_queue_time
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self.service_time = 0.0
+        self.stats = {
+            "admitted": 0, "queued": 0, "rejected_queue_full": 0, "rejected_wait": 0,
+            "rejected_timeout": 0, "total_wait": 0.0, "max_wait": 0.0,
+        }
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def expected_wait(self) -> float:
+        return (len(self._waiters) + 1) * self.service_time / self.max_in_flight
+
+    def _reject(self, reason: str, message: str):
+        self.stats[f"rejected_{reason}"] += 1
+        raise AdmissionRejected(
+            f"Server busy: {message}", reason,
+            round(max(0.1, min(self.expected_wait(), 60.0)), 2)
+        )
+
+    async def acquire(self):
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            self.stats["admitted"] += 1
+            return
+        if len(self._waiters) >= self.max_queued:
+            self._reject("queue_full", f"{self.name} queue is full ({self.max_queued} waiting)")
+        if self.service_time and self.expected_wait() > self.max_queue_time:
+            self._reject("wait", f"{self.name} expected wait exceeds {self.max_queue_time}s")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.stats["queued"] += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, self.max_queue_time)
+        except asyncio.TimeoutError:
+            self._reject("timeout", f"waited {self.max_queue_time}s for {self.name}")
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # the slot was handed over just as we were cancelled
+            raise
+        finally:
+            if not waiter.done() or waiter.cancelled():
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+        waited = time.monotonic() - started
+        self.stats["admitted"] += 1
+        self.stats["total_wait"] += waited
+        self.stats["max_wait"] = max(self.stats["max_wait"], waited)
+
+    def release(self, service_time: Optional[float] = None):
+        if service_time is not None:
+            self.service_time += self.SMOOTHING * (service_time - self.service_time)
+        # Hand the slot straight to the next live waiter
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "queued_now": self.queued,
+            "max_in_flight": self.max_in_flight,
+            "service_time": round(self.service_time, 6),
+            **{k: round(v, 6) if isinstance(v, float) else v for k, v in self.stats.items()},
+        }
+
+
+class AdmissionController:
+    """
+    Global and per-method admission gates for a JSON-RPC handler.
+
+    Args:
+        max_in_flight: Global cap on requests running at once (None: no global cap)
+        max_queued: Global wait queue bound
+        max_queue_time: Seconds a request may wait for the global gate
+        method_limits: method -> {"max_in_flight", "max_queued", "max_queue_time"}
+            for methods with their own tighter limits
+        exempt: Methods admitted without any gate (e.g. health checks)
+    """
+
+    def __init__(
+        self,
+        max_in_flight: Optional[int] = 64,
+        max_queued: int = 256,
+        max_queue_time: float = 5.0,
+        method_limits: Optional[Dict[str, Dict[str, Any]]] = None,
+        exempt: Optional[List[str]] = None
+    ):
+        self.global_gate = (AdmissionGate("server", max_in_flight, max_queued, max_queue_time)
+                            if max_in_flight else None)
+        self.method_gates: Dict[str, AdmissionGate] = {}
+        for method, limits in (method_limits or {}).items():
+            self.set_method_limit(method, **limits)
+        self.exempt = set(exempt or ())
+
+    def set_method_limit(self, method: str, max_in_flight: int, max_queued: int = 100,
+                         max_queue_time: float = 1.0):
+        self.method_gates[method] = AdmissionGate(method, max_in_flight, max_queued, max_queue_time)
+
+    async def acquire(self, method: str) -> List[AdmissionGate]:
+        """Pass the method's gate, then the global gate. Returns the gates held."""
+        if method in self.exempt:
+            return []
+        held = []
+        try:
+            for gate in (self.method_gates.get(method), self.global_gate):
+                if gate is not None:
+                    await gate.acquire()
+                    held.append(gate)
+        except BaseException:
+            for gate in held:
+                gate.release()
+            raise
+        return held
+
+    def release(self, held: List[AdmissionGate], service_time: Optional[float] = None):
+        for gate in held:
+            gate.release(service_time)
+
+    async def intercept(self, call: RPCCall, call_next: Handler) -> Any:
+        """Interceptor: hold the call's gates while it runs. Notifications are never shed."""
+        if call.notification:
+            return await call_next(call)
+        try:
+            held = await self.acquire(call.method)
+        except AdmissionRejected as e:
+            raise RPCError(LEPErrorCode.SERVER_BUSY, str(e), {"retry_after": e.retry_after, "reason": e.reason})
+        started = time.monotonic()
+        try:
+            return await call_next(call)
+        finally:
+            self.release(held, time.monotonic() - started)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "global": self.global_gate.snapshot() if self.global_gate else None,
+            "methods": {method: gate.snapshot() for method, gate in self.method_gates.items()},
+        }
@@ -0,0 +1,84 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Request Deadlines
+
+A deadline is the point on the event loop clock by which a request must be
+done. It is kept in a context variable, so it follows the request through
+the bridge, the adapter, the connection pool and the backend driver without
+being passed around; each layer can only tighten it. Work still running at
+the deadline is cancelled and reported as `DeadlineExceeded`.
+"""
+
+import asyncio
+import contextvars
+import inspect
+from contextlib import contextmanager
+from typing import Any, Awaitable, Iterator, Optional
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("lep_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request runs past its deadline."""
+    pass
+
+
+def current_deadline() -> Optional[float]:
+    """The active deadline in event loop time, or None."""
+    return _deadline.get()
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the active deadline (never negative), or None without one."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - asyncio.get_running_loop().time())
+
+
+@contextmanager
+def deadline_scope(timeout: Optional[float]) -> Iterator[Optional[float]]:
+    """
+    Tighten the deadline for the enclosed block without enforcing it
+    there; `run_with_deadline` calls inside enforce it. Work after the block
+    (clean-up, compensation) is not bound by it.
+    """
+    deadline = _deadline.get()
+    if timeout is not None and timeout > 0:
+        candidate = asyncio.get_running_loop().time() + timeout
+        if deadline is None or candidate < deadline:
+            deadline = candidate
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+async def run_with_deadline(awaitable: Awaitable[Any], timeout: Optional[float], what: str = "Request") -> Any:
+    """
+    Await `awaitable` under a deadline `timeout` seconds from now, or the
+    inherited deadline if that is sooner. Without either it simply awaits.
+    """
+    loop = asyncio.get_running_loop()
+    now = loop.time()
+    inherited = _deadline.get()
+    deadline = inherited
+    if timeout is not None and timeout > 0 and (deadline is None or now + timeout < deadline):
+        deadline = now + timeout
+    if deadline is None:
+        return await awaitable
+    if deadline <= now:
+        if inspect.iscoroutine(awaitable):
+            awaitable.close()
+        raise DeadlineExceeded(f"{what} not started: deadline already passed")
+
+    token = _deadline.set(deadline)
+    try:
+        async with asyncio.timeout_at(deadline):
+            return await awaitable
+    except TimeoutError:
+        if loop.time() >= deadline:
+            raise DeadlineExceeded(f"{what} exceeded its deadline of {deadline - now:.3g}s")
+        raise
+    finally:
+        _deadline.reset(token)
@@ -4,26 +4,115 @@ LegacyEvolve Protocol (LEP) v2.0 - JSON-RPC 2.0 Transport Layer
 This module provides the core JSON-RPC 2.0 communication primitives.
 """
 
+import asyncio
 import json
-from typing import Any, Dict, Optional, Callable
+import logging
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set
 from ..models.protocol import (
     JSONRPCRequest,
     JSONRPCResponse,
     JSONRPCError,
     LEPErrorCode
 )
+from .admission import AdmissionController
+from .deadline import DeadlineExceeded
+from .middleware import Handler, Interceptor, InterceptorEntry, RPCCall, RPCError, compose, interceptor_entry
+from .notifications import OutboundQueue, notification
+from ..utils.metrics import MethodMetrics, MetricsRegistry
+from ..utils.tracing import TRACER, Tracer
 
+logger = logging.getLogger(__name__)
 
-class JSONRPCHandler:
-    """Handles JSON-RPC 2.0 request/response processing."""
 
-    def __init__(self):
+class JSONRPCHandler:
+    """
+    Handles JSON-RPC 2.0 request/response processing.
+
+    Each method runs inside a chain of interceptors (see core/middleware.py),
+    composed whenever a method or interceptor is registered: metrics and
+    tracing (if any) outermost, then the interceptors in the order added,
+    then admission control (if any) next to the handler.
+
+    Args:
+        admission: Admission controller; requests it sheds get SERVER_BUSY
+        metrics: Registry to record per-method counts and latency into
+        name: Handler name used as the metrics label and span attribute
+        tracer: Tracer giving each call a span (idle until it has an exporter)
+    """
+
+    def __init__(self, admission: Optional[AdmissionController] = None,
+                 metrics: Optional[MetricsRegistry] = None, name: str = "jsonrpc",
+                 tracer: Optional[Tracer] = TRACER):
         self.methods: Dict[str, Callable] = {}
+        self._interceptors: List[InterceptorEntry] = []
+        self._chains: Dict[str, Handler] = {}
         self.request_id_counter = 0
+        self.method_metrics = MethodMetrics(metrics, name) if metrics is not None else None
+        self._trace = tracer.interceptor(name) if tracer is not None else None
+        self._admission: Optional[AdmissionController] = None
+        self.admission = admission
+        # Server-to-client messages, taken off by the connection's writer
+        self.outbound = OutboundQueue()
+        # Notifications being handled; held so their tasks are not collected mid-run
+        self._notification_tasks: Set[asyncio.Task] = set()
+
+    @property
+    def admission(self) -> Optional[AdmissionController]:
+        return self._admission
+
+    @admission.setter
+    def admission(self, admission: Optional[AdmissionController]):
+        self._admission = admission
+        self._rebuild()
 
     def register_method(self, name: str, handler: Callable):
         """Register a method handler."""
         self.methods[name] = handler
+        self._chains[name] = compose(handler, self.interceptors_for(name))
+
+    def add_interceptor(self, interceptor: Interceptor, methods: Optional[Iterable[str]] = None,
+                        exclude: Optional[Iterable[str]] = None):
+        """
+        Add an interceptor around the given methods (default: all, less
+        `exclude`), inside the ones added before it.
+        """
+        self._interceptors.append(interceptor_entry(interceptor, methods, exclude))
+        self._rebuild()
+
+    def remove_interceptor(self, interceptor: Interceptor):
+        """Remove an interceptor from every chain."""
+        self._interceptors = [entry for entry in self._interceptors if entry.interceptor != interceptor]
+        self._rebuild()
+
+    def interceptors_for(self, method: str) -> List[Interceptor]:
+        """The interceptors a call of `method` passes through, outermost first."""
+        chain = [entry.interceptor for entry in self._interceptors if entry.applies_to(method)]
+        if self._trace is not None:
+            chain.insert(0, self._trace)
+        if self.method_metrics is not None:
+            chain.insert(0, self.method_metrics.intercept)
+        if self._admission is not None and method not in self._admission.exempt:
+            chain.append(self._admission.intercept)
+        return chain
+
+    def _rebuild(self):
+        for name, handler in self.methods.items():
+            self._chains[name] = compose(handler, self.interceptors_for(name))
+
+    async def call(self, method: str, params: Any = None) -> Any:
+        """
+        Call a registered method in-process, through its interceptors, without
+        JSON encoding. Errors are raised rather than turned into responses.
+        """
+        chain = self._chains.get(method)
+        if chain is None:
+            raise Exception(f"Method '{method}' not found")
+        return await chain(RPCCall(method, params if params is not None else {}))
+
+    def notify(self, method: str, params: Optional[Dict[str, Any]] = None,
+               coalesce_key: Optional[Hashable] = None) -> bool:
+        """Queue a notification for the client. See OutboundQueue.put()."""
+        return self.outbound.put(notification(method, params), coalesce_key)
 
     def create_request(self, method: str, params: Optional[Dict[str, Any]] = None) -> JSONRPCRequest:
         """Create a JSON-RPC 2.0 request."""
@@ -52,8 +141,12 @@ class JSONRPCHandler:
             id=request_id
         )
 
-    async def handle_request(self, request_data: str) -> str:
-        """Handle an incoming JSON-RPC 2.0 request."""
+    async def handle_request(self, request_data: str, session: Any = None) -> Optional[str]:
+        """
+        Handle an incoming JSON-RPC 2.0 request. Notifications (messages
+        without an id) get no response, and None is returned. `session`
+        identifies the connection the request came in on.
+        """
         try:
             request_dict = json.loads(request_data)
         except json.JSONDecodeError:
@@ -67,7 +160,7 @@ class JSONRPCHandler:
         # Validate request structure
         if not isinstance(request_dict, dict) or request_dict.get("jsonrpc") != "2.0":
             response = self.create_error_response(
-                request_dict.get("id"),
+                request_dict.get("id") if isinstance(request_dict, dict) else None,
                 LEPErrorCode.INVALID_REQUEST,
                 "Invalid Request"
             )
@@ -77,8 +170,14 @@ class JSONRPCHandler:
         params = request_dict.get("params", {})
         request_id = request_dict.get("id")
 
+        chain = self._chains.get(method)
+        if "id" not in request_dict:
+            if chain is not None:
+                self._handle_notification(chain, RPCCall(method, params, notification=True, session=session))
+            return None
+
         # Check if method exists
-        if method not in self.methods:
+        if chain is None:
             response = self.create_error_response(
                 request_id,
                 LEPErrorCode.METHOD_NOT_FOUND,
@@ -88,10 +187,24 @@ class JSONRPCHandler:
 
         # Execute method
         try:
-            handler = self.methods[method]
-            result = await handler(params)
+            result = await chain(RPCCall(method, params, request_id, session=session))
             response = self.create_response(request_id, result)
             return json.dumps(response.__dict__)
+        except RPCError as e:
+            response = self.create_error_response(
+                request_id,
+                e.code,
+                str(e),
+                e.data
+            )
+            return json.dumps(response.__dict__)
+        except DeadlineExceeded as e:
+            response = self.create_error_response(
+                request_id,
+                LEPErrorCode.DEADLINE_EXCEEDED,
+                str(e)
+            )
+            return json.dumps(response.__dict__)
         except Exception as e:
             response = self.create_error_response(
                 request_id,
@@ -100,6 +213,22 @@ class JSONRPCHandler:
             )
             return json.dumps(response.__dict__)
 
+    def _handle_notification(self, chain: Handler, call: RPCCall):
+        """
+        Run a notification through its method's chain in its own task, so
+        the reader goes on to the next message at once. No response is built
+        and errors are only logged. Notifications carry control traffic such
+        as cancellation, so admission control never sheds them.
+        """
+        task = asyncio.create_task(chain(call))
+        self._notification_tasks.add(task)
+        task.add_done_callback(lambda done: self._notification_done(call, done))
+
+    def _notification_done(self, call: RPCCall, task: asyncio.Task):
+        self._notification_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Notification {call.method} failed: {task.exception()}")
+
     def serialize_request(self, request: JSONRPCRequest) -> str:
         """Serialize a request to JSON."""
         return json.dumps({
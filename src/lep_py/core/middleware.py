@@ -0,0 +1,99 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Method Interceptors
+
+Cross-cutting layers (admission control, metrics, caching, auth, tracing)
+wrap method calls as interceptors instead of being patched into every
+handler. An interceptor is an async callable
+
+    async def interceptor(call: RPCCall, call_next: Handler) -> Any
+
+that may inspect or rewrite the call, await `call_next(call)` to run the
+rest of the chain, look at the result or the exception it raises, time
+it, or return (or raise) without calling on, which short-circuits the
+call. Raising `RPCError` answers with a specific JSON-RPC error.
+
+Chains are composed when methods and interceptors are registered, so a
+call only runs the interceptors that apply to its method and never walks
+a list.
+"""
+
+import contextvars
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+
+@dataclass
+class RPCCall:
+    """One method call on its way through the interceptor chain."""
+    method: str
+    params: Any
+    request_id: Any = None
+    notification: bool = False
+    # The connection or client the call came in on; request ids are unique within it
+    session: Any = None
+    started: float = field(default_factory=time.monotonic)
+    # Scratch space for interceptors to pass data along the chain
+    context: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the call entered the chain."""
+        return time.monotonic() - self.started
+
+
+# The call whose handler is running, for handlers that need its id or session
+CURRENT_CALL: contextvars.ContextVar[Optional[RPCCall]] = contextvars.ContextVar("lep_rpc_call", default=None)
+
+Handler = Callable[[RPCCall], Awaitable[Any]]
+Interceptor = Callable[[RPCCall, Handler], Awaitable[Any]]
+
+
+class RPCError(Exception):
+    """Raised by handlers or interceptors to answer with a given JSON-RPC error."""
+
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = int(code)
+        self.data = data
+
+
+@dataclass
+class InterceptorEntry:
+    """A registered interceptor and the methods it applies to."""
+    interceptor: Interceptor
+    methods: Optional[frozenset] = None  # None: every method
+    exclude: frozenset = frozenset()
+
+    def applies_to(self, method: str) -> bool:
+        return method not in self.exclude and (self.methods is None or method in self.methods)
+
+
+def interceptor_entry(interceptor: Interceptor, methods: Optional[Iterable[str]] = None,
+                      exclude: Optional[Iterable[str]] = None) -> InterceptorEntry:
+    return InterceptorEntry(
+        interceptor,
+        frozenset(methods) if methods is not None else None,
+        frozenset(exclude or ())
+    )
+
+
+def compose(handler: Callable[[Any], Awaitable[Any]], interceptors: List[Interceptor]) -> Handler:
+    """Wrap a method handler in interceptors, the first one outermost."""
+    async def call_handler(call: RPCCall) -> Any:
+        token = CURRENT_CALL.set(call)
+        try:
+            return await handler(call.params)
+        finally:
+            CURRENT_CALL.reset(token)
+
+    chain: Handler = call_handler
+    for interceptor in reversed(interceptors):
+        chain = _link(interceptor, chain)
+    return chain
+
+
+def _link(interceptor: Interceptor, call_next: Handler) -> Handler:
+    async def link(call: RPCCall) -> Any:
+        return await interceptor(call, call_next)
+    return link
@@ -0,0 +1,119 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Outbound Messages
+
+Messages from the server to the client (`legacy/update` progress, approval
+decisions, MCP notifications, responses written by a transport) are put on
+a per-connection queue instead of being written by the code that raises
+them, so a handler never waits on a slow client. The connection's writer
+takes them off in order.
+
+Progress makes up most of this traffic and only its latest value matters,
+so a message may carry a coalescing key: while an earlier message with the
+same key is still waiting, the new one replaces it and keeps its place in
+line. A client that keeps up sees every update; one that falls behind sees
+fewer, always ending with the newest. Coalescing is only done for clients
+that allow it.
+
+Up to `max_pending` droppable messages are held; beyond that the oldest is
+dropped. Messages queued with `droppable=False` (responses) are never
+dropped and do not count against the bound.
+"""
+
+import asyncio
+import itertools
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+def notification(method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """A JSON-RPC 2.0 notification message."""
+    return {"jsonrpc": "2.0", "method": method, "params": params}
+
+
+class OutboundQueue:
+    """
+    Ordered, bounded queue of messages for one connection.
+
+    Args:
+        max_pending: Droppable messages held before the oldest is dropped (None: unbounded)
+        coalesce: Merge messages that share a coalescing key while they wait
+    """
+
+    def __init__(self, max_pending: Optional[int] = 1000, coalesce: bool = False):
+        self.max_pending = max_pending
+        self.coalesce = coalesce
+        # A queue nobody reads is disabled; put() then costs nothing
+        self.enabled = True
+        self.closed = False
+        self._pending: "OrderedDict[Hashable, Tuple[Any, bool]]" = OrderedDict()
+        self._droppable = 0
+        self._sequence = itertools.count()
+        self._ready = asyncio.Event()
+        self.stats = {"queued": 0, "sent": 0, "coalesced": 0, "dropped": 0}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put(self, message: Any, coalesce_key: Optional[Hashable] = None, droppable: bool = True) -> bool:
+        """
+        Queue a message. Returns False if it was refused (queue disabled or
+        closed) or the oldest waiting message was dropped to make room.
+        """
+        if not self.enabled or self.closed:
+            return False
+        if coalesce_key is not None and self.coalesce:
+            key = ("coalesce", coalesce_key)
+            if key in self._pending:
+                self._pending[key] = (message, self._pending[key][1])
+                self.stats["coalesced"] += 1
+                return True
+        else:
+            key = next(self._sequence)
+
+        accepted = True
+        if droppable and self.max_pending is not None and self._droppable >= self.max_pending:
+            for oldest, (_, can_drop) in self._pending.items():
+                if can_drop:
+                    del self._pending[oldest]
+                    self._droppable -= 1
+                    self.stats["dropped"] += 1
+                    accepted = False
+                    break
+        self._pending[key] = (message, droppable)
+        if droppable:
+            self._droppable += 1
+        self.stats["queued"] += 1
+        self._ready.set()
+        return accepted
+
+    def get_nowait(self) -> Any:
+        """Take the next message. Raises asyncio.QueueEmpty if none is waiting."""
+        if not self._pending:
+            raise asyncio.QueueEmpty()
+        _, (message, droppable) = self._pending.popitem(last=False)
+        if droppable:
+            self._droppable -= 1
+        if not self._pending:
+            self._ready.clear()
+        self.stats["sent"] += 1
+        return message
+
+    async def get(self) -> Optional[Any]:
+        """Wait for the next message. Returns None once the queue is closed and empty."""
+        while not self._pending:
+            if self.closed:
+                return None
+            await self._ready.wait()
+        return self.get_nowait()
+
+    def drain(self) -> List[Any]:
+        """Take every waiting message."""
+        messages = []
+        while self._pending:
+            messages.append(self.get_nowait())
+        return messages
+
+    def close(self):
+        """Refuse further messages; readers get what is left, then None."""
+        self.closed = True
+        self._ready.set()
@@ -0,0 +1,65 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Backend Driver Interface
+
+A backend driver knows how to open connections to a legacy system. The
+connection pool in `pool.py` manages those connections; adapters only ever
+talk to the pool.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+
+class BackendError(Exception):
+    """Raised when the legacy backend rejects or fails a command."""
+
+    def __init__(self, message: str, code: Optional[str] = None):
+        super().__init__(message)
+        self.code = code
+
+
+class BackendConnectionError(BackendError):
+    """Raised when a backend connection is lost or cannot be established."""
+    pass
+
+
+class BackendConnection(ABC):
+    """A single authenticated session with a legacy backend."""
+
+    @abstractmethod
+    async def execute(self, command: str, payload: Optional[Dict[str, Any]] = None) -> Any:
+        """Run a command on the backend and return its result."""
+        pass
+
+    @abstractmethod
+    async def ping(self) -> bool:
+        """Return True if the connection is healthy."""
+        pass
+
+    @abstractmethod
+    async def close(self):
+        """Close the connection."""
+        pass
+
+    @property
+    def closed(self) -> bool:
+        return False
+
+
+class BackendDriver(ABC):
+    """Factory for backend connections."""
+
+    @abstractmethod
+    async def connect(self) -> BackendConnection:
+        """Open and authenticate a new connection (the expensive handshake)."""
+        pass
+
+
+def parse_connection_string(connection_string: str) -> Dict[str, str]:
+    """Parse a `KEY=VALUE;KEY=VALUE` connection string into a dict."""
+    options = {}
+    for part in (connection_string or "").split(";"):
+        if "=" in part:
+            key, value = part.split("=", 1)
+            options[key.strip().upper()] = value.strip()
+    return options
@@ -0,0 +1,293 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Backend Connection Pool
+
+An asyncio connection pool for backend drivers. Connections are opened up
+front (warm-up) so the first requests do not pay for a handshake, shared
+by up to `max_concurrency_per_connection` concurrent commands each,
+health-checked in the background, and reaped when idle beyond the
+configured minimum size. Waiting for a connection never outlasts the
+request's deadline, and commands are not started once it has passed.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+from ..core.deadline import DeadlineExceeded, remaining as request_time_left
+from ..utils.tracing import TRACER
+from .base import BackendConnection, BackendConnectionError, BackendDriver
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within `acquire_timeout`."""
+    pass
+
+
+class PoolClosedError(Exception):
+    """Raised when acquiring from a pool that has been closed."""
+    pass
+
+
+class PooledConnection:
+    """Pool bookkeeping around a driver connection."""
+
+    def __init__(self, connection: BackendConnection):
+        self.connection = connection
+        self.in_flight = 0
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.broken = False
+
+
+class ConnectionPool:
+    """
+    Async connection pool with warm-up, health checks and idle reaping.
+
+    Args:
+        driver: Driver used to open connections
+        min_size: Connections opened at start and kept open while idle
+        max_size: Upper bound on open connections
+        max_concurrency_per_connection: Commands a connection may run at once
+        acquire_timeout: Seconds to wait for capacity before failing
+        max_idle_time: Seconds after which connections above min_size are closed
+        health_check_interval: Seconds between background health checks
+            (0 disables the maintenance task)
+        health_check_timeout: Seconds a health-check ping may take before the
+            connection counts as unhealthy
+    """
+
+    def __init__(
+        self,
+        driver: BackendDriver,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_concurrency_per_connection: int = 1,
+        acquire_timeout: float = 10.0,
+        max_idle_time: float = 300.0,
+        health_check_interval: float = 30.0,
+        health_check_timeout: float = 5.0
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size, max_size >= 1")
+        self.driver = driver
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_concurrency_per_connection = max(1, max_concurrency_per_connection)
+        self.acquire_timeout = acquire_timeout
+        self.max_idle_time = max_idle_time
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+
+        self._connections: List[PooledConnection] = []
+        self._opening = 0
+        self._condition = asyncio.Condition()
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._closed = False
+        self.stats_counters = {
+            "opened": 0,
+            "closed": 0,
+            "open_failures": 0,
+            "health_failures": 0,
+            "reaped": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "commands": 0,
+        }
+
+    @property
+    def size(self) -> int:
+        return len(self._connections)
+
+    async def start(self):
+        """Warm the pool up to `min_size` connections and start maintenance."""
+        await self._fill_to_minimum()
+        if self.health_check_interval > 0 and self._maintenance_task is None:
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop())
+
+    async def _fill_to_minimum(self):
+        missing = self.min_size - self.size - self._opening
+        if missing <= 0:
+            return
+        self._opening += missing
+        results = await asyncio.gather(*(self._open() for _ in range(missing)), return_exceptions=True)
+        self._opening -= missing
+        async with self._condition:
+            for result in results:
+                if isinstance(result, PooledConnection):
+                    self._connections.append(result)
+            self._condition.notify_all()
+        failures = [r for r in results if isinstance(r, BaseException)]
+        if failures and not self._connections:
+            raise failures[0]
+
+    async def _open(self) -> PooledConnection:
+        try:
+            connection = await self.driver.connect()
+        except Exception:
+            self.stats_counters["open_failures"] += 1
+            raise
+        self.stats_counters["opened"] += 1
+        return PooledConnection(connection)
+
+    async def _discard(self, pooled: PooledConnection):
+        if pooled in self._connections:
+            self._connections.remove(pooled)
+            self.stats_counters["closed"] += 1
+        try:
+            await pooled.connection.close()
+        except Exception as e:
+            logger.debug(f"Error closing backend connection: {e}")
+
+    def _available(self) -> Optional[PooledConnection]:
+        """The least-loaded healthy connection with spare capacity."""
+        best = None
+        for pooled in self._connections:
+            if pooled.broken or pooled.in_flight >= self.max_concurrency_per_connection:
+                continue
+            if best is None or pooled.in_flight < best.in_flight:
+                best = pooled
+                if best.in_flight == 0:
+                    break
+        return best
+
+    async def _checkout(self) -> PooledConnection:
+        left = request_time_left()
+        bounded_by_request = left is not None and left < self.acquire_timeout
+        deadline = time.monotonic() + (left if bounded_by_request else self.acquire_timeout)
+        waited = False
+        async with self._condition:
+            while True:
+                if self._closed:
+                    raise PoolClosedError("Connection pool is closed")
+                pooled = self._available()
+                if pooled is not None:
+                    pooled.in_flight += 1
+                    return pooled
+                if self.size + self._opening < self.max_size:
+                    self._opening += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats_counters["timeouts"] += 1
+                    if bounded_by_request:
+                        raise DeadlineExceeded("Deadline passed while waiting for a backend connection")
+                    raise PoolTimeoutError(f"No backend connection available within {self.acquire_timeout}s")
+                if not waited:
+                    self.stats_counters["waits"] += 1
+                    waited = True
+                try:
+                    await asyncio.wait_for(self._condition.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+        # Open outside the lock so other callers are not blocked by the handshake
+        try:
+            pooled = await self._open()
+        except BaseException:
+            async with self._condition:
+                self._opening -= 1
+                self._condition.notify()
+            raise
+        async with self._condition:
+            self._opening -= 1
+            pooled.in_flight += 1
+            self._connections.append(pooled)
+            return pooled
+
+    async def _checkin(self, pooled: PooledConnection):
+        async with self._condition:
+            pooled.in_flight -= 1
+            pooled.last_used = time.monotonic()
+            self._condition.notify()
+        if pooled.broken and pooled.in_flight == 0:
+            await self._discard(pooled)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Check out a connection slot for the duration of the block."""
+        pooled = await self._checkout()
+        try:
+            yield pooled.connection
+        except BackendConnectionError:
+            pooled.broken = True
+            raise
+        finally:
+            await self._checkin(pooled)
+
+    async def execute(self, command: str, payload: Optional[Dict[str, Any]] = None) -> Any:
+        """Run one command on a pooled connection."""
+        if request_time_left() == 0:
+            raise DeadlineExceeded(f"Deadline passed before {command} was sent to the backend")
+        self.stats_counters["commands"] += 1
+        with TRACER.span("backend.execute", command=command) as span:
+            started = time.perf_counter()
+            async with self.acquire() as connection:
+                span.set_attribute("pool_wait_ms", round((time.perf_counter() - started) * 1000, 3))
+                return await connection.execute(command, payload)
+
+    # Maintenance
+
+    async def _maintenance_loop(self):
+        while not self._closed:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                await self.run_maintenance()
+            except Exception as e:
+                logger.warning(f"Connection pool maintenance failed: {e}")
+
+    async def run_maintenance(self):
+        """Reap idle connections, ping the rest and refill to `min_size`."""
+        now = time.monotonic()
+        idle = [p for p in self._connections if p.in_flight == 0]
+        for pooled in idle:
+            if self.size > self.min_size and now - pooled.last_used > self.max_idle_time:
+                self.stats_counters["reaped"] += 1
+                await self._discard(pooled)
+
+        # A hung connection must not stall maintenance, so each ping is bounded
+        checks = [p for p in self._connections if p.in_flight == 0]
+        results = await asyncio.gather(
+            *(asyncio.wait_for(p.connection.ping(), self.health_check_timeout) for p in checks),
+            return_exceptions=True
+        )
+        for pooled, healthy in zip(checks, results):
+            if healthy is True:
+                continue
+            self.stats_counters["health_failures"] += 1
+            if pooled.in_flight == 0:
+                await self._discard(pooled)
+            else:
+                # Checked out while being pinged; discarded at check-in
+                pooled.broken = True
+
+        try:
+            await self._fill_to_minimum()
+        except Exception as e:
+            logger.warning(f"Could not refill connection pool: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "in_flight": sum(p.in_flight for p in self._connections),
+            "idle": sum(1 for p in self._connections if p.in_flight == 0),
+            **self.stats_counters,
+        }
+
+    async def close(self):
+        """Stop maintenance and close every connection."""
+        self._closed = True
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            try:
+                await self._maintenance_task
+            except asyncio.CancelledError:
+                pass
+            self._maintenance_task = None
+        async with self._condition:
+            self._condition.notify_all()
+        for pooled in list(self._connections):
+            await self._discard(pooled)
@@ -0,0 +1,301 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Mainframe Simulator and TCP Driver
+
+`MainframeSimulator` is a local asyncio TCP server that stands in for a
+mainframe transaction gateway. It speaks newline-delimited JSON, charges a
+configurable handshake cost per connection, and injects latency, jitter,
+errors, dropped connections and hung commands per command so pool
+behaviour can be exercised without a real host. Commands carrying a
+`timeout` are abandoned with a time-limit abend when it runs out, and a
+`cancel` message stops a command the client has given up on.
+
+`TCPDriver` is the matching client driver. Each connection multiplexes
+concurrent commands by request ID, so it can be shared by several callers
+when the pool allows more than one command per connection.
+
+Wire format (one JSON object per line):
+
+    -> {"type": "hello", "credentials": {...}}
+    <- {"type": "welcome", "session": "..."}
+    -> {"type": "request", "id": 1, "command": "CALL", "payload": {...}, "timeout": 2.5}
+    -> {"type": "cancel", "id": 1}
+    <- {"type": "response", "id": 1, "result": ...}
+    <- {"type": "response", "id": 1, "error": {"code": "...", "message": "..."}}
+"""
+
+import asyncio
+import inspect
+import itertools
+import json
+import logging
+import random
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from ..core.deadline import DeadlineExceeded, remaining
+from .base import BackendConnection, BackendConnectionError, BackendDriver, BackendError
+
+logger = logging.getLogger(__name__)
+
+CommandHandler = Callable[[str, Dict[str, Any]], Union[Any, Awaitable[Any]]]
+
+
+class MainframeSimulator:
+    """
+    Local mainframe stand-in with fault and latency injection.
+
+    Args:
+        handler: Callable (command, payload) -> result, sync or async. The
+            default echoes the payload back.
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        handshake_latency: Seconds spent on each connection handshake
+        latency: Base seconds added to every command
+        jitter: Extra uniformly distributed seconds added to every command
+        error_rate: Probability a command fails with a simulated abend
+        disconnect_rate: Probability a command drops the connection
+        hang_rate: Probability a command never completes (a stuck session)
+        credentials: If set, the hello must present exactly these credentials
+        seed: Seed for the fault injection RNG
+    """
+
+    def __init__(
+        self,
+        handler: Optional[CommandHandler] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        handshake_latency: float = 0.05,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        disconnect_rate: float = 0.0,
+        hang_rate: float = 0.0,
+        credentials: Optional[Dict[str, str]] = None,
+        seed: Optional[int] = None
+    ):
+        self.handler = handler or (lambda command, payload: payload)
+        self.host = host
+        self.port = port
+        self.handshake_latency = handshake_latency
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.disconnect_rate = disconnect_rate
+        self.hang_rate = hang_rate
+        self.credentials = credentials
+        self._random = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._sessions = itertools.count(1)
+        self.stats = {"connections": 0, "handshakes": 0, "commands": 0, "errors": 0, "disconnects": 0,
+                      "hung": 0, "timed_out": 0, "cancelled": 0}
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Mainframe simulator listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats["connections"] += 1
+        tasks: Dict[Any, asyncio.Task] = {}
+        try:
+            hello = json.loads(await reader.readline() or b"{}")
+            await asyncio.sleep(self.handshake_latency)
+            if hello.get("type") != "hello" or (
+                self.credentials is not None and hello.get("credentials") != self.credentials
+            ):
+                writer.write(b'{"type": "rejected", "message": "Authentication failed"}\n')
+                await writer.drain()
+                return
+            self.stats["handshakes"] += 1
+            writer.write(json.dumps({"type": "welcome", "session": f"S{next(self._sessions):06d}"}).encode() + b"\n")
+            await writer.drain()
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if message.get("type") == "cancel":
+                    task = tasks.get(message.get("id"))
+                    if task is not None:
+                        self.stats["cancelled"] += 1
+                        task.cancel()
+                    continue
+                if message.get("type") != "request":
+                    continue
+                if self._random.random() < self.disconnect_rate:
+                    self.stats["disconnects"] += 1
+                    break
+                request_id = message.get("id")
+                task = asyncio.create_task(self._run_command(message, writer))
+                tasks[request_id] = task
+                task.add_done_callback(lambda _, request_id=request_id: tasks.pop(request_id, None))
+        except (ConnectionError, json.JSONDecodeError):
+            pass
+        finally:
+            for task in list(tasks.values()):
+                task.cancel()
+            writer.close()
+
+    async def _run_command(self, message: Dict[str, Any], writer: asyncio.StreamWriter):
+        self.stats["commands"] += 1
+        response: Dict[str, Any] = {"type": "response", "id": message.get("id")}
+        try:
+            await asyncio.wait_for(self._execute(message, response), message.get("timeout"))
+        except asyncio.TimeoutError:
+            self.stats["timed_out"] += 1
+            response.pop("result", None)
+            response["error"] = {"code": "S322", "message": "Time limit exceeded"}
+        try:
+            writer.write(json.dumps(response, default=str).encode() + b"\n")
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def _execute(self, message: Dict[str, Any], response: Dict[str, Any]):
+        command = message.get("command", "")
+        if command != "PING" and self._random.random() < self.hang_rate:
+            self.stats["hung"] += 1
+            await asyncio.Event().wait()
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if command == "PING":
+            response["result"] = "PONG"
+        elif self._random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            response["error"] = {"code": "S0C7", "message": "Simulated abend: data exception"}
+        else:
+            try:
+                result = self.handler(command, message.get("payload") or {})
+                if inspect.isawaitable(result):
+                    result = await result
+                response["result"] = result
+            except Exception as e:
+                self.stats["errors"] += 1
+                response["error"] = {"code": "APPL", "message": str(e)}
+
+
+class TCPConnection(BackendConnection):
+    """A multiplexed newline-delimited JSON connection."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, session: str):
+        self.session = session
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._closed = False
+        self._reader_task = asyncio.create_task(self._read_responses())
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def _read_responses(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                future = self._pending.pop(message.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    error = message["error"]
+                    future.set_exception(BackendError(error.get("message", "Backend error"), error.get("code")))
+                else:
+                    future.set_result(message.get("result"))
+        except (ConnectionError, json.JSONDecodeError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._closed = True
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(BackendConnectionError(f"Connection {self.session} lost"))
+            self._pending.clear()
+
+    async def execute(self, command: str, payload: Optional[Dict[str, Any]] = None) -> Any:
+        if self._closed:
+            raise BackendConnectionError(f"Connection {self.session} is closed")
+        request = {"type": "request", "id": next(self._ids), "command": command, "payload": payload}
+        # The host gets the time left so it can abandon the command itself
+        timeout = remaining()
+        if timeout == 0:
+            raise DeadlineExceeded(f"Deadline passed before {command} was sent to the backend")
+        if timeout is not None:
+            request["timeout"] = round(timeout, 3)
+        request_id = request["id"]
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._writer.write(json.dumps(request).encode() + b"\n")
+            await self._writer.drain()
+        except ConnectionError as e:
+            self._pending.pop(request_id, None)
+            raise BackendConnectionError(str(e))
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # Tell the host to stop work nobody is waiting for any more
+            if not self._closed and not self._writer.is_closing():
+                self._writer.write(json.dumps({"type": "cancel", "id": request_id}).encode() + b"\n")
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def ping(self) -> bool:
+        try:
+            return await self.execute("PING") == "PONG"
+        except BackendError:
+            return False
+
+    async def close(self):
+        if not self._writer.is_closing():
+            self._writer.close()
+        self._reader_task.cancel()
+        try:
+            await self._reader_task
+        except asyncio.CancelledError:
+            pass
+        self._closed = True
+
+
+class TCPDriver(BackendDriver):
+    """Driver for `MainframeSimulator` (or any gateway speaking its wire format)."""
+
+    def __init__(self, host: str, port: int, credentials: Optional[Dict[str, str]] = None,
+                 connect_timeout: float = 10.0):
+        self.host = host
+        self.port = port
+        self.credentials = credentials or {}
+        self.connect_timeout = connect_timeout
+
+    async def connect(self) -> TCPConnection:
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.connect_timeout
+            )
+            writer.write(json.dumps({"type": "hello", "credentials": self.credentials}).encode() + b"\n")
+            await writer.drain()
+            reply = json.loads(await asyncio.wait_for(reader.readline(), self.connect_timeout) or b"{}")
+        except (OSError, asyncio.TimeoutError, json.JSONDecodeError) as e:
+            raise BackendConnectionError(f"Cannot connect to {self.host}:{self.port}: {e}")
+        if reply.get("type") != "welcome":
+            writer.close()
+            raise BackendConnectionError(reply.get("message", "Handshake rejected"))
+        return TCPConnection(reader, writer, reply["session"])
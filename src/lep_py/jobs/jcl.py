@@ -0,0 +1,96 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Minimal JCL Parser
+
+Parses the subset of z/OS JCL needed to describe a batch job to an LEP
+adapter: a JOB card (name and CLASS) followed by EXEC PGM= steps with an
+optional PARM string.
+
+    //EODJOB   JOB (ACCT),'END OF DAY',CLASS=A
+    //STEP1    EXEC PGM=INTCALC,PARM='RATE=0.0125'
+    //STEP2    EXEC PGM=STMTGEN
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+_CARD = re.compile(r"^//(\S*)\s+(\S+)\s*(.*)$")
+_KEYWORD = re.compile(r"(\w+)=('(?:[^']|'')*'|\([^)]*\)|[^,\s]+)")
+
+
+class JCLError(Exception):
+    """Raised for JCL that cannot be parsed."""
+    pass
+
+
+@dataclass
+class JobStep:
+    """One EXEC step of a job."""
+    name: str
+    program: str
+    parm: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class JobDefinition:
+    """A parsed JOB card and its steps."""
+    name: str
+    job_class: str
+    steps: List[JobStep]
+
+
+def _keywords(operands: str) -> Dict[str, str]:
+    values = {}
+    for key, value in _KEYWORD.findall(operands):
+        if value.startswith("'") and value.endswith("'"):
+            value = value[1:-1].replace("''", "'")
+        values[key.upper()] = value
+    return values
+
+
+def _parse_parm(parm: str) -> Dict[str, str]:
+    """Split a PARM string of the form KEY=VALUE,KEY=VALUE into a dict."""
+    values = {}
+    for part in parm.split(","):
+        if "=" in part:
+            key, value = part.split("=", 1)
+            values[key.strip().upper()] = value.strip()
+        elif part.strip():
+            values[part.strip().upper()] = ""
+    return values
+
+
+def parse_jcl(text: str) -> JobDefinition:
+    """Parse JCL text into a `JobDefinition`."""
+    job = None
+    steps: List[JobStep] = []
+    for line in text.strip().splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("//*") or line == "//":
+            continue
+        match = _CARD.match(line)
+        if not match:
+            raise JCLError(f"Not a JCL statement: {line}")
+        name, operation, operands = match.groups()
+        operation = operation.upper()
+        keywords = _keywords(operands)
+        if operation == "JOB":
+            if job is not None:
+                raise JCLError("Only one JOB card is allowed")
+            job = JobDefinition(name=name.upper(), job_class=keywords.get("CLASS", "A").upper(), steps=steps)
+        elif operation == "EXEC":
+            if job is None:
+                raise JCLError("EXEC before JOB card")
+            if "PGM" not in keywords:
+                raise JCLError(f"EXEC without PGM=: {line}")
+            steps.append(JobStep(
+                name=(name or f"STEP{len(steps) + 1}").upper(),
+                program=keywords["PGM"].upper(),
+                parm=_parse_parm(keywords.get("PARM", ""))
+            ))
+        # DD and other statements do not affect simulated execution
+    if job is None:
+        raise JCLError("Missing JOB card")
+    if not steps:
+        raise JCLError(f"Job {job.name} has no EXEC steps")
+    return job
@@ -0,0 +1,251 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Asynchronous Job Queue
+
+A bounded asyncio job queue with priority lanes, used for long-running
+batch work that should not hold a `legacy/callSkill` request open.
+Submitting returns a job ID at once; a fixed set of workers runs jobs in
+lane order (lane 0 first, FIFO within a lane), and callers poll status,
+fetch results, subscribe to progress or cancel.
+
+A job runs, and its progress listeners are called, in a copy of the
+context it was submitted from, so context variables set by the caller
+(for example the client session a transport is serving) follow the job.
+"""
+
+import asyncio
+import contextvars
+import itertools
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..models.protocol import ProgressUpdate
+
+logger = logging.getLogger(__name__)
+
+
+class JobState(str, Enum):
+    """Lifecycle state of a queued job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINAL_STATES = (JobState.COMPLETED, JobState.FAILED, JobState.CANCELLED)
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at capacity."""
+    pass
+
+
+class JobNotFoundError(Exception):
+    """Raised for an unknown or already-purged job ID."""
+    pass
+
+
+@dataclass
+class Job:
+    """A unit of queued work and its observable state."""
+    job_id: str
+    name: str
+    lane: int
+    runner: Callable[["Job"], Awaitable[Any]]
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    state: JobState = JobState.QUEUED
+    progress_percentage: float = 0.0
+    status_message: str = "Waiting for initiator"
+    result: Any = None
+    error: Optional[str] = None
+    # Work the runner has committed so far; kept when the job is cancelled or
+    # fails, so it can be resumed or compensated
+    checkpoint: Dict[str, Any] = field(default_factory=dict)
+    submitted_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    _queue: Optional["JobQueue"] = field(default=None, repr=False)
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+    _done: Optional[asyncio.Event] = field(default=None, repr=False)
+    _context: Optional[contextvars.Context] = field(default=None, repr=False)
+
+    def report_progress(self, percentage: float, message: str):
+        """Record progress and notify listeners. Called by the job runner."""
+        self.progress_percentage = max(0.0, min(100.0, percentage))
+        self.status_message = message
+        if self._queue is not None:
+            self._queue._notify(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "name": self.name,
+            "lane": self.lane,
+            "state": self.state.value,
+            "progress_percentage": round(self.progress_percentage, 1),
+            "status_message": self.status_message,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "checkpoint": self.checkpoint,
+        }
+
+
+class JobQueue:
+    """
+    Bounded priority job queue served by a fixed pool of async workers.
+
+    Args:
+        workers: Number of jobs that may run concurrently
+        max_queued: Maximum jobs waiting to start; further submits fail
+        lanes: Number of priority lanes (0 is served first)
+        retain_finished: Finished jobs kept for status/result queries
+    """
+
+    def __init__(self, workers: int = 2, max_queued: int = 100, lanes: int = 3, retain_finished: int = 1000):
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.lanes = lanes
+        self.retain_finished = retain_finished
+        self.jobs: Dict[str, Job] = {}
+        self._finished: deque = deque()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._sequence = itertools.count(1)
+        self._listeners: List[Callable[[Job, ProgressUpdate], None]] = []
+        self.queued = 0
+
+    def add_progress_listener(self, listener: Callable[[Job, ProgressUpdate], None]):
+        """Register a callback invoked on every progress report and state change."""
+        self._listeners.append(listener)
+
+    def _notify(self, job: Job):
+        update = ProgressUpdate(
+            skill_name=job.name,
+            progress_percentage=job.progress_percentage,
+            status_message=job.status_message
+        )
+        for listener in self._listeners:
+            try:
+                if job._context is not None:
+                    job._context.copy().run(listener, job, update)
+                else:
+                    listener(job, update)
+            except Exception as e:
+                logger.warning(f"Job progress listener failed: {e}")
+
+    def _ensure_workers(self):
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        if not self._worker_tasks:
+            self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    def submit(
+        self,
+        name: str,
+        runner: Callable[[Job], Awaitable[Any]],
+        lane: int = 0,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Job:
+        """Queue a job and return it immediately. Must be called from the event loop."""
+        if self.queued >= self.max_queued:
+            raise QueueFullError(f"Job queue is full ({self.max_queued} jobs waiting)")
+        if not 0 <= lane < self.lanes:
+            raise ValueError(f"Lane must be between 0 and {self.lanes - 1}")
+        self._ensure_workers()
+        sequence = next(self._sequence)
+        job = Job(
+            job_id=f"JOB{sequence:05d}",
+            name=name,
+            lane=lane,
+            runner=runner,
+            metadata=metadata or {},
+            _queue=self,
+            _done=asyncio.Event(),
+            _context=contextvars.copy_context()
+        )
+        self.jobs[job.job_id] = job
+        self.queued += 1
+        self._queue.put_nowait((lane, sequence, job.job_id))
+        return job
+
+    def get(self, job_id: str) -> Job:
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise JobNotFoundError(f"Job not found: {job_id}")
+        return job
+
+    def cancel(self, job_id: str) -> Job:
+        """Cancel a queued or running job; finished jobs are left unchanged."""
+        job = self.get(job_id)
+        if job.state == JobState.QUEUED:
+            self.queued -= 1
+            self._finish(job, JobState.CANCELLED, status_message="Cancelled before start")
+        elif job.state == JobState.RUNNING and job._task is not None:
+            job._task.cancel()
+        return job
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Job:
+        """Wait for a job to reach a final state."""
+        job = self.get(job_id)
+        await asyncio.wait_for(job._done.wait(), timeout)
+        return job
+
+    def _finish(self, job: Job, state: JobState, result: Any = None, error: Optional[str] = None,
+                status_message: Optional[str] = None):
+        job.state = state
+        job.result = result
+        job.error = error
+        job.finished_at = datetime.now().isoformat()
+        if state == JobState.COMPLETED:
+            job.progress_percentage = 100.0
+        job.status_message = status_message or state.value.capitalize()
+        job._done.set()
+        self._notify(job)
+        self._finished.append(job.job_id)
+        while len(self._finished) > self.retain_finished:
+            self.jobs.pop(self._finished.popleft(), None)
+
+    async def _worker(self):
+        while True:
+            _, _, job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            if job is None or job.state != JobState.QUEUED:
+                continue  # cancelled while waiting
+            self.queued -= 1
+            job.state = JobState.RUNNING
+            job.started_at = datetime.now().isoformat()
+            job.status_message = "Running"
+            self._notify(job)
+            task = job._task = asyncio.create_task(job.runner(job), context=job._context.copy())
+            try:
+                # wait() rather than awaiting the task, so cancelling the job
+                # and cancelling this worker can be told apart
+                await asyncio.wait({task})
+            except asyncio.CancelledError:
+                task.cancel()
+                self._finish(job, JobState.CANCELLED, status_message="Cancelled at shutdown")
+                raise
+            finally:
+                job._task = None
+            if task.cancelled():
+                self._finish(job, JobState.CANCELLED, status_message="Cancelled while running")
+            elif task.exception() is not None:
+                self._finish(job, JobState.FAILED, error=str(task.exception()))
+            else:
+                self._finish(job, JobState.COMPLETED, result=task.result())
+
+    async def shutdown(self):
+        """Cancel running jobs and stop the workers."""
+        for job in self.jobs.values():
+            if job.state == JobState.RUNNING and job._task is not None:
+                job._task.cancel()
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
@@ -19,6 +19,8 @@ class ApprovalState(str, Enum):
     """State of an approval request."""
     APPROVED = "approved"
     REJECTED = "rejected"
+    PENDING = "pending"
+    EXPIRED = "expired"
 
 
 @dataclass
@@ -66,6 +68,7 @@ class SessionCapabilities:
     notifications: bool = False
     diff_support: bool = False
     cancellation: bool = False
+    progress_coalescing: bool = False
 
 
 @dataclass
@@ -132,3 +135,5 @@ class LEPErrorCode(int, Enum):
     APPROVAL_EXPIRED = -32001
     SKILL_EXECUTION_ERROR = -32002
     RESOURCE_NOT_FOUND = -32003
+    SERVER_BUSY = -32004
+    DEADLINE_EXCEEDED = -32005
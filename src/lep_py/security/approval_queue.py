@@ -0,0 +1,213 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Approval Queue
+
+Parks approval requests until a human decides them, without holding an
+RPC (or a coroutine) open per request. `submit` returns a pending decision
+at once; decisions arrive separately through `decide`, typically from an
+operator console calling `security/decideApproval` on the adapter's
+operator API. Callers can poll with `get`, long-poll with `wait`, or
+register a listener to be told when a decision is made or expires.
+Listeners run in a copy of the context the request was submitted from.
+
+Each request carries a random claim token, handed only to the requester.
+The approval token minted on approval is disclosed, and the decision
+redeemed, only against that claim.
+"""
+
+import asyncio
+import contextvars
+import logging
+import secrets
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from ..models.protocol import ApprovalState
+
+logger = logging.getLogger(__name__)
+
+
+class ApprovalNotFoundError(Exception):
+    """Raised for an unknown or already-purged decision ID."""
+    pass
+
+
+class ApprovalQueueFullError(Exception):
+    """Raised when too many approvals are awaiting a decision."""
+    pass
+
+
+@dataclass
+class PendingApproval:
+    """An approval request and, once made, its decision."""
+    decision_id: str
+    skill_name: str
+    parameters: Dict[str, Any]
+    reason: Optional[str]
+    estimated_impact: Dict[str, Any]
+    expires_at: datetime
+    state: ApprovalState = ApprovalState.PENDING
+    created_at: datetime = field(default_factory=datetime.now)
+    decided_at: Optional[datetime] = None
+    decided_by: Optional[str] = None
+    comment: Optional[str] = None
+    approval_token: Optional[str] = None
+    claim_token: str = field(default_factory=lambda: secrets.token_urlsafe(16), repr=False)
+    _done: Optional[asyncio.Event] = field(default=None, repr=False)
+    _timer: Optional[asyncio.TimerHandle] = field(default=None, repr=False)
+    _context: Optional[contextvars.Context] = field(default=None, repr=False)
+
+    def is_claimed_by(self, claim_token: Optional[str]) -> bool:
+        """Whether `claim_token` identifies the requester."""
+        return isinstance(claim_token, str) and secrets.compare_digest(claim_token, self.claim_token)
+
+    def to_dict(self, include_token: bool = False) -> Dict[str, Any]:
+        """The request and its decision; the approval token only with `include_token`."""
+        return {
+            "decision_id": self.decision_id,
+            "state": self.state.value,
+            "skill_name": self.skill_name,
+            "parameters": self.parameters,
+            "reason": self.reason,
+            "created_at": self.created_at.isoformat(),
+            "expires_at": self.expires_at.isoformat(),
+            "decided_at": self.decided_at.isoformat() if self.decided_at else None,
+            "decided_by": self.decided_by,
+            "comment": self.comment,
+            "approval_token": self.approval_token if include_token else None,
+        }
+
+
+class ApprovalQueue:
+    """
+    Queue of approvals awaiting a human decision.
+
+    Args:
+        timeout: Seconds a request may wait for a decision before it expires
+        max_pending: Maximum undecided requests; further submits fail
+        retain_decided: Decided or expired requests kept for polling
+        on_decision: Called with each request when it is decided or expires,
+            before waiters and listeners are notified (the adapter uses this
+            to mint the approval token)
+    """
+
+    def __init__(
+        self,
+        timeout: float = 300.0,
+        max_pending: int = 1000,
+        retain_decided: int = 1000,
+        on_decision: Optional[Callable[[PendingApproval], None]] = None
+    ):
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.retain_decided = retain_decided
+        self.on_decision = on_decision
+        self.approvals: Dict[str, PendingApproval] = {}
+        self._decided: deque = deque()
+        self._listeners: List[Callable[[PendingApproval], None]] = []
+        self.pending_count = 0
+
+    def add_listener(self, listener: Callable[[PendingApproval], None]):
+        """Register a callback invoked whenever a request is decided or expires."""
+        self._listeners.append(listener)
+
+    def submit(
+        self,
+        decision_id: str,
+        skill_name: str,
+        parameters: Dict[str, Any],
+        reason: Optional[str] = None,
+        estimated_impact: Optional[Dict[str, Any]] = None
+    ) -> PendingApproval:
+        """Park a request for a human decision and return it immediately."""
+        self.expire_stale()
+        if self.pending_count >= self.max_pending:
+            raise ApprovalQueueFullError(f"Too many pending approvals ({self.max_pending})")
+        approval = PendingApproval(
+            decision_id=decision_id,
+            skill_name=skill_name,
+            parameters=parameters,
+            reason=reason,
+            estimated_impact=estimated_impact or {},
+            expires_at=datetime.now() + timedelta(seconds=self.timeout),
+            _context=contextvars.copy_context()
+        )
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None  # expiry is then applied lazily on access
+        if loop is not None:
+            approval._done = asyncio.Event()
+            approval._timer = loop.call_later(self.timeout, self._expire, approval)
+        self.approvals[decision_id] = approval
+        self.pending_count += 1
+        return approval
+
+    def get(self, decision_id: str) -> PendingApproval:
+        approval = self.approvals.get(decision_id)
+        if approval is None:
+            raise ApprovalNotFoundError(f"Approval not found: {decision_id}")
+        if approval.state == ApprovalState.PENDING and datetime.now() > approval.expires_at:
+            self._expire(approval)
+        return approval
+
+    def pending(self) -> List[PendingApproval]:
+        """Undecided requests, oldest first."""
+        self.expire_stale()
+        return [a for a in self.approvals.values() if a.state == ApprovalState.PENDING]
+
+    def decide(self, decision_id: str, approved: bool, decided_by: Optional[str] = None,
+               comment: Optional[str] = None) -> PendingApproval:
+        """Record a human decision. Deciding twice, or after expiry, is an error."""
+        approval = self.get(decision_id)
+        if approval.state != ApprovalState.PENDING:
+            raise Exception(f"Approval {decision_id} is already {approval.state.value}")
+        approval.decided_by = decided_by
+        approval.comment = comment
+        self._resolve(approval, ApprovalState.APPROVED if approved else ApprovalState.REJECTED)
+        return approval
+
+    async def wait(self, decision_id: str, timeout: Optional[float] = None) -> PendingApproval:
+        """
+        Wait up to `timeout` seconds for a decision and return the request in
+        whatever state it is then in (still pending if no decision was made).
+        """
+        approval = self.get(decision_id)
+        if approval.state == ApprovalState.PENDING and approval._done is not None:
+            try:
+                await asyncio.wait_for(approval._done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return approval
+
+    def expire_stale(self):
+        """Expire every pending request past its deadline."""
+        now = datetime.now()
+        for approval in [a for a in self.approvals.values()
+                         if a.state == ApprovalState.PENDING and now > a.expires_at]:
+            self._expire(approval)
+
+    def _expire(self, approval: PendingApproval):
+        if approval.state == ApprovalState.PENDING:
+            self._resolve(approval, ApprovalState.EXPIRED)
+
+    def _resolve(self, approval: PendingApproval, state: ApprovalState):
+        approval.state = state
+        approval.decided_at = datetime.now()
+        self.pending_count -= 1
+        if approval._timer is not None:
+            approval._timer.cancel()
+            approval._timer = None
+        if self.on_decision is not None:
+            self.on_decision(approval)
+        if approval._done is not None:
+            approval._done.set()
+        for listener in self._listeners:
+            try:
+                approval._context.copy().run(listener, approval)
+            except Exception as e:
+                logger.warning(f"Approval listener failed: {e}")
+        self._decided.append(approval.decision_id)
+        while len(self._decided) > self.retain_decided:
+            self.approvals.pop(self._decided.popleft(), None)
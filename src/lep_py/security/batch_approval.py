@@ -0,0 +1,149 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Batch Approval Grants
+
+A batch grant lets one human approval cover many write operations. It is
+either an explicit list of operations, each of which may be executed once,
+or an envelope: a set of skills, accounts and a total amount that any
+number of operations (up to `max_uses`) may draw on.
+
+    {"operations": [{"skill_name": "updateAccountBalance",
+                     "parameters": {"account_id": "ACC001", "amount": 5.0, ...}}, ...]}
+
+    {"envelope": {"skills": ["updateAccountBalance"], "accounts": ["ACC001", "ACC002"],
+                  "max_total_amount": 25000, "max_uses": 10000}}
+"""
+
+import json
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Pseudo skill name under which batch requests travel through the approval flow
+BATCH_SKILL = "security/batch"
+
+DEFAULT_ACCOUNT_FIELDS = ("account_id", "from_account", "to_account", "customer_id")
+
+
+class BatchApprovalError(Exception):
+    """Raised when an operation falls outside a batch grant."""
+    pass
+
+
+def _operation_key(skill_name: str, parameters: Dict[str, Any]) -> Tuple[str, str]:
+    return skill_name, json.dumps(parameters, sort_keys=True, default=str)
+
+
+class BatchGrant:
+    """
+    Spendable scope of a batch approval.
+
+    Args:
+        operations: Explicit operations, each spendable once
+        skills: Skills the envelope covers
+        accounts: Accounts every operation must be confined to
+        account_fields: Parameters that name accounts
+        max_total_amount: Cap on the summed absolute `amount_field` values
+        amount_field: Parameter holding the amount of an operation
+        max_uses: Cap on the number of operations
+    """
+
+    def __init__(
+        self,
+        operations: Optional[List[Dict[str, Any]]] = None,
+        skills: Optional[Iterable[str]] = None,
+        accounts: Optional[Iterable[str]] = None,
+        account_fields: Iterable[str] = DEFAULT_ACCOUNT_FIELDS,
+        max_total_amount: Optional[float] = None,
+        amount_field: str = "amount",
+        max_uses: Optional[int] = None
+    ):
+        self._operations: Optional[Counter] = None
+        if operations is not None:
+            self._operations = Counter(
+                _operation_key(op["skill_name"], op.get("parameters", {})) for op in operations
+            )
+            skills = {op["skill_name"] for op in operations}
+            max_uses = len(operations) if max_uses is None else min(max_uses, len(operations))
+        if not skills:
+            raise BatchApprovalError("A batch approval must name its skills or operations")
+        self.skills = frozenset(skills)
+        self.accounts = frozenset(accounts) if accounts is not None else None
+        self.account_fields = tuple(account_fields)
+        self.max_total_amount = max_total_amount
+        self.amount_field = amount_field
+        self.max_uses = max_uses
+        self.uses = 0
+        self.total_amount = 0.0
+
+    @classmethod
+    def from_request(cls, params: Dict[str, Any]) -> "BatchGrant":
+        """Build a grant from security/requestBatchApproval parameters."""
+        if params.get("operations") is not None:
+            return cls(operations=params["operations"], max_uses=params.get("max_uses"))
+        envelope = params.get("envelope") or {}
+        return cls(
+            skills=envelope.get("skills"),
+            accounts=envelope.get("accounts"),
+            account_fields=envelope.get("account_fields", DEFAULT_ACCOUNT_FIELDS),
+            max_total_amount=envelope.get("max_total_amount"),
+            amount_field=envelope.get("amount_field", "amount"),
+            max_uses=envelope.get("max_uses")
+        )
+
+    @property
+    def exhausted(self) -> bool:
+        if self.max_uses is not None and self.uses >= self.max_uses:
+            return True
+        return self._operations is not None and not +self._operations
+
+    def _amount(self, parameters: Dict[str, Any]) -> float:
+        value = parameters.get(self.amount_field)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise BatchApprovalError(f"Operation has no numeric '{self.amount_field}'")
+        return abs(value)
+
+    def check(self, skill_name: str, parameters: Dict[str, Any]):
+        """Raise BatchApprovalError unless the operation fits in what is left of the grant."""
+        if skill_name not in self.skills:
+            raise BatchApprovalError(f"Skill '{skill_name}' is not covered by this batch approval")
+        if self.max_uses is not None and self.uses >= self.max_uses:
+            raise BatchApprovalError(f"Batch approval is used up ({self.max_uses} operations)")
+        if self._operations is not None and self._operations[_operation_key(skill_name, parameters)] <= 0:
+            raise BatchApprovalError("Operation is not in the approved batch (or was already executed)")
+        if self.accounts is not None:
+            named = [parameters[f] for f in self.account_fields if f in parameters]
+            if not named:
+                raise BatchApprovalError("Operation names no account")
+            outside = [a for a in named if a not in self.accounts]
+            if outside:
+                raise BatchApprovalError(f"Accounts outside the approved set: {', '.join(map(str, outside))}")
+        if self.max_total_amount is not None:
+            if self.total_amount + self._amount(parameters) > self.max_total_amount + 1e-9:
+                raise BatchApprovalError(
+                    f"Operation would exceed the approved total of {self.max_total_amount}"
+                )
+
+    def spend(self, skill_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Check and record one operation; returns the usage after the spend."""
+        self.check(skill_name, parameters)
+        self.uses += 1
+        if self.max_total_amount is not None:
+            self.total_amount += self._amount(parameters)
+        if self._operations is not None:
+            self._operations[_operation_key(skill_name, parameters)] -= 1
+        return self.usage()
+
+    def refund(self, skill_name: str, parameters: Dict[str, Any]):
+        """Give back a spend whose operation failed."""
+        self.uses -= 1
+        if self.max_total_amount is not None:
+            self.total_amount -= self._amount(parameters)
+        if self._operations is not None:
+            self._operations[_operation_key(skill_name, parameters)] += 1
+
+    def usage(self) -> Dict[str, Any]:
+        return {
+            "uses": self.uses,
+            "max_uses": self.max_uses,
+            "total_amount": round(self.total_amount, 2),
+            "max_total_amount": self.max_total_amount,
+        }
@@ -0,0 +1,212 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Auto-Approval Policy Engine
+
+Declarative rules evaluated before an approval request is escalated to a
+human. Rules are compiled once into predicate closures indexed by skill
+name, so evaluating a request costs a dict lookup plus a few comparisons.
+
+A policy is a list of rules, checked in order; the first rule that matches
+decides. Requests no rule matches go to a human as before.
+
+    [
+        {
+            "name": "small-transfers",
+            "skills": ["transferFunds"],
+            "conditions": {
+                "amount": {"min": 0, "max": 500},
+                "from_account": {"in": ["ACC001", "ACC002"]}
+            },
+            "rate_limit": {"count": 20, "window": 3600, "key": "from_account"}
+        },
+        {
+            "name": "block-large-corrections",
+            "skills": ["updateAccountBalance"],
+            "conditions": {"amount": {"abs_min": 1000000}},
+            "decision": "reject"
+        }
+    ]
+
+Condition operators: equals, in, not_in, min, max, abs_min, abs_max,
+matches (regular expression). A parameter missing from the request never
+satisfies a condition. "skills" may be omitted or contain "*" to apply a
+rule to every skill.
+"""
+
+import json
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..models.protocol import ApprovalState
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+class PolicyError(Exception):
+    """Raised for a policy that cannot be compiled."""
+    pass
+
+
+@dataclass
+class PolicyDecision:
+    """The outcome of a rule that matched a request."""
+    rule: str
+    state: ApprovalState
+
+
+def _number(parameters: Dict[str, Any], name: str) -> Optional[float]:
+    value = parameters.get(name)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+
+def _compile_condition(name: str, operator: str, operand: Any) -> Predicate:
+    if operator == "equals":
+        return lambda p: name in p and p[name] == operand
+    if operator in ("in", "not_in"):
+        members = frozenset(operand)
+        wanted = operator == "in"
+
+        def member(p: Dict[str, Any]) -> bool:
+            if name not in p:
+                return False
+            try:
+                return (p[name] in members) == wanted
+            except TypeError:  # unhashable value, e.g. a list
+                return False
+        return member
+    if operator == "matches":
+        pattern = re.compile(operand)
+        return lambda p: isinstance(p.get(name), str) and pattern.search(p[name]) is not None
+    if operator in ("min", "max", "abs_min", "abs_max"):
+        bound = float(operand)
+        absolute = operator.startswith("abs_")
+        below = operator.endswith("max")
+
+        def check(p: Dict[str, Any]) -> bool:
+            value = _number(p, name)
+            if value is None:
+                return False
+            if absolute:
+                value = abs(value)
+            return value <= bound if below else value >= bound
+        return check
+    raise PolicyError(f"Unknown condition operator '{operator}' for parameter '{name}'")
+
+
+class RateWindow:
+    """Sliding-window counter of decisions per key."""
+
+    def __init__(self, count: int, window: float, key: Optional[str] = None):
+        self.count = count
+        self.window = window
+        self.key = key
+        self._hits: Dict[Any, deque] = {}
+
+    def try_acquire(self, parameters: Dict[str, Any], now: float) -> bool:
+        """Record a hit unless the window for this request's key is full."""
+        key = parameters.get(self.key) if self.key else None
+        try:
+            hash(key)
+        except TypeError:
+            # Lists and dicts count under their canonical JSON form; anything
+            # else unhashable leaves the rule unmatched, so the request escalates
+            try:
+                key = ("json", json.dumps(key, sort_keys=True))
+            except (TypeError, ValueError):
+                return False
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = self._hits[key] = deque()
+        while hits and now - hits[0] >= self.window:
+            hits.popleft()
+        if len(hits) >= self.count:
+            return False
+        hits.append(now)
+        return True
+
+
+@dataclass
+class CompiledRule:
+    name: str
+    state: ApprovalState
+    predicates: Tuple[Predicate, ...]
+    rate: Optional[RateWindow] = None
+
+    def matches(self, parameters: Dict[str, Any]) -> bool:
+        for predicate in self.predicates:
+            if not predicate(parameters):
+                return False
+        return self.rate is None or self.rate.try_acquire(parameters, time.monotonic())
+
+
+def compile_rule(rule: Dict[str, Any]) -> CompiledRule:
+    """Compile one declarative rule."""
+    name = rule.get("name")
+    if not name:
+        raise PolicyError("Every policy rule needs a name")
+    decision = rule.get("decision", "approve")
+    if decision not in ("approve", "reject"):
+        raise PolicyError(f"Rule '{name}': decision must be 'approve' or 'reject'")
+    predicates = []
+    for parameter, operators in (rule.get("conditions") or {}).items():
+        if not isinstance(operators, dict):
+            operators = {"equals": operators}
+        for operator, operand in operators.items():
+            predicates.append(_compile_condition(parameter, operator, operand))
+    rate = None
+    if rule.get("rate_limit"):
+        limit = rule["rate_limit"]
+        rate = RateWindow(int(limit["count"]), float(limit["window"]), limit.get("key"))
+    return CompiledRule(
+        name=name,
+        state=ApprovalState.APPROVED if decision == "approve" else ApprovalState.REJECTED,
+        predicates=tuple(predicates),
+        rate=rate
+    )
+
+
+class PolicyEngine:
+    """
+    Compiled auto-approval policy.
+
+    Args:
+        rules: Declarative rules (see module docstring), in priority order
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]]):
+        self.rules = [compile_rule(rule) for rule in rules]
+        self._wildcard: List[Tuple[int, CompiledRule]] = []
+        by_skill: Dict[str, List[Tuple[int, CompiledRule]]] = {}
+        for order, (source, compiled) in enumerate(zip(rules, self.rules)):
+            skills = source.get("skills") or ["*"]
+            for skill in skills:
+                if skill == "*":
+                    self._wildcard.append((order, compiled))
+                else:
+                    by_skill.setdefault(skill, []).append((order, compiled))
+        # Merge wildcard rules into each skill's list, keeping policy order
+        self._by_skill = {
+            skill: [rule for _, rule in sorted(entries + self._wildcard, key=lambda e: e[0])]
+            for skill, entries in by_skill.items()
+        }
+        self._default = [rule for _, rule in self._wildcard]
+
+    @classmethod
+    def from_json(cls, text: str) -> "PolicyEngine":
+        return cls(json.loads(text))
+
+    @classmethod
+    def from_file(cls, path: str) -> "PolicyEngine":
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def evaluate(self, skill_name: str, parameters: Dict[str, Any]) -> Optional[PolicyDecision]:
+        """Return the decision of the first matching rule, or None to escalate to a human."""
+        for rule in self._by_skill.get(skill_name, self._default):
+            if rule.matches(parameters):
+                return PolicyDecision(rule=rule.name, state=rule.state)
+        return None
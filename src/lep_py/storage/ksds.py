@@ -0,0 +1,382 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Memory-Mapped Keyed Record Store
+
+A local stand-in for a VSAM key-sequenced dataset (KSDS). Fixed-length
+records live in a memory-mapped data file and are located through a sorted
+in-memory key index, so point lookups are a binary search plus one slice of
+the map and range scans walk the index in key order. Record payloads stay
+in the page cache rather than on the Python heap.
+
+File layout:
+
+    [header][slot 0][slot 1]...      slot = 1 status byte + record bytes
+
+Writes are applied in place under a redo journal (`<path>.jnl`): the full
+record image for every change in a transaction is appended to the journal,
+followed by a commit marker, before the data file is touched. On open,
+committed journal groups are replayed and torn tails are discarded.
+"""
+
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+MAGIC = b"LEPKSDS1"
+HEADER = struct.Struct("<8sIIIIQQ")
+HEADER_SIZE = 64
+SLOT_COUNT_OFFSET = 24
+CAPACITY_OFFSET = 32
+
+JOURNAL_MAGIC = b"JRNL"
+JOURNAL_ENTRY = struct.Struct("<4sBQI")
+
+OP_PUT = 1
+OP_DELETE = 2
+OP_COMMIT = 3
+
+SLOT_FREE = 0
+SLOT_LIVE = 1
+
+Key = Union[bytes, bytearray, memoryview]
+
+
+class KeyedRecordStore:
+    """
+    Fixed-length record store with a sorted key index and a redo journal.
+
+    The record key is the byte range `[key_offset, key_offset + key_length)`
+    of each record and is compared bytewise, as VSAM does. Deleted slots are
+    reused by later inserts.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        record_length: Optional[int] = None,
+        key_offset: int = 0,
+        key_length: Optional[int] = None,
+        initial_capacity: int = 1024,
+        durable: bool = True,
+        checkpoint_bytes: int = 4 * 1024 * 1024
+    ):
+        """
+        Open an existing store, or create one when `record_length` is given
+        and `path` does not exist.
+
+        Args:
+            path: Data file path; the journal is written next to it
+            record_length: Record size in bytes (required to create)
+            key_offset: Offset of the key inside each record
+            key_length: Key size in bytes (required to create)
+            initial_capacity: Slots to preallocate for a new store
+            durable: fsync the journal on every commit
+            checkpoint_bytes: Journal size that triggers a checkpoint
+        """
+        self.path = path
+        self.journal_path = path + ".jnl"
+        self.durable = durable
+        self.checkpoint_bytes = checkpoint_bytes
+
+        if not os.path.exists(path):
+            if record_length is None or key_length is None:
+                raise FileNotFoundError(f"Store {path} does not exist and no record layout was given")
+            self._create(record_length, key_offset, key_length, max(1, initial_capacity))
+
+        self._file = open(path, "r+b")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, _, self.record_length, self.key_offset, self.key_length, self._slot_count, self._capacity = \
+            HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a keyed record store")
+        if record_length is not None and record_length != self.record_length:
+            raise ValueError(f"{path} holds {self.record_length}-byte records, not {record_length}")
+        self.slot_size = self.record_length + 1
+        self._stored_count = self._slot_count
+
+        self._journal = open(self.journal_path, "a+b")
+        self._pending: Optional[List[Tuple[int, int, bytes]]] = None
+        # Record images written in the open transaction, by slot; reads see them before commit
+        self._pending_images: Dict[int, bytes] = {}
+        self._replay_journal()
+        self._build_index()
+
+    def _create(self, record_length: int, key_offset: int, key_length: int, capacity: int):
+        if key_offset + key_length > record_length:
+            raise ValueError("Key extends past the end of the record")
+        with open(self.path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, 1, record_length, key_offset, key_length, 0, capacity).ljust(HEADER_SIZE, b"\0"))
+            f.truncate(HEADER_SIZE + capacity * (record_length + 1))
+
+    # Index
+
+    def _build_index(self):
+        """Scan the live slots and build the sorted key index."""
+        self._free: List[int] = []
+        start = HEADER_SIZE + 1 + self.key_offset
+        if np is not None and self._slot_count:
+            slots = np.frombuffer(
+                self._map, dtype=np.uint8, count=self._slot_count * self.slot_size, offset=HEADER_SIZE
+            ).reshape(self._slot_count, self.slot_size)
+            live = np.flatnonzero(slots[:, 0] == SLOT_LIVE)
+            key_bytes = np.ascontiguousarray(slots[live, 1 + self.key_offset:1 + self.key_offset + self.key_length])
+            keys = [key_bytes[i].tobytes() for i in range(len(live))]
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            self._keys = [keys[i] for i in order]
+            self._slots = array("q", live[order].tolist() if order else [])
+            self._free = np.flatnonzero(slots[:, 0] != SLOT_LIVE).tolist()[::-1]
+            del slots, key_bytes  # release the buffer export so the map can be resized
+        else:
+            entries = []
+            for slot in range(self._slot_count):
+                if self._map[HEADER_SIZE + slot * self.slot_size] == SLOT_LIVE:
+                    key_start = start + slot * self.slot_size
+                    entries.append((self._map[key_start:key_start + self.key_length], slot))
+                else:
+                    self._free.append(slot)
+            entries.sort()
+            self._free.reverse()
+            self._keys = [key for key, _ in entries]
+            self._slots = array("q", (slot for _, slot in entries))
+
+    def _key_of(self, record: bytes) -> bytes:
+        return bytes(record[self.key_offset:self.key_offset + self.key_length])
+
+    def _find(self, key: Key) -> Tuple[int, bool]:
+        key = bytes(key)
+        position = bisect_left(self._keys, key)
+        return position, position < len(self._keys) and self._keys[position] == key
+
+    # Reads
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Key) -> bool:
+        return self._find(key)[1]
+
+    def _read_slot(self, slot: int) -> bytes:
+        image = self._pending_images.get(slot)
+        if image is not None:
+            return image
+        base = HEADER_SIZE + slot * self.slot_size + 1
+        return self._map[base:base + self.record_length]
+
+    def get(self, key: Key) -> Optional[bytes]:
+        """Point lookup; returns the record bytes or None."""
+        position, found = self._find(key)
+        return self._read_slot(self._slots[position]) if found else None
+
+    def scan(
+        self,
+        start_key: Optional[Key] = None,
+        end_key: Optional[Key] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """
+        Yield records in key order with start_key <= key < end_key.
+
+        The index is snapshotted when the scan starts; records are read from
+        the map as the iterator advances.
+        """
+        low = bisect_left(self._keys, bytes(start_key)) if start_key is not None else 0
+        high = bisect_left(self._keys, bytes(end_key)) if end_key is not None else len(self._keys)
+        if limit is not None:
+            high = min(high, low + limit)
+        for slot in self._slots[low:high]:
+            yield self._read_slot(slot)
+
+    def keys(self, start_key: Optional[Key] = None, end_key: Optional[Key] = None) -> List[bytes]:
+        """Keys in order within [start_key, end_key)."""
+        low = bisect_left(self._keys, bytes(start_key)) if start_key is not None else 0
+        high = bisect_left(self._keys, bytes(end_key)) if end_key is not None else len(self._keys)
+        return self._keys[low:high]
+
+    def prefix_scan(self, prefix: Key, limit: Optional[int] = None) -> Iterator[bytes]:
+        """Yield records whose key starts with `prefix` (a VSAM generic key browse)."""
+        prefix = bytes(prefix)
+        low = bisect_left(self._keys, prefix)
+        high = bisect_right(self._keys, prefix + b"\xff" * (self.key_length - len(prefix)))
+        if limit is not None:
+            high = min(high, low + limit)
+        for slot in self._slots[low:high]:
+            yield self._read_slot(slot)
+
+    # Writes
+
+    def put(self, record: bytes):
+        """Insert a record, or replace the record with the same key."""
+        if len(record) != self.record_length:
+            raise ValueError(f"Record is {len(record)} bytes, store expects {self.record_length}")
+        position, found = self._find(self._key_of(record))
+        if found:
+            slot = self._slots[position]
+        else:
+            slot = self._allocate_slot()
+            insort(self._keys, self._key_of(record))
+            self._slots.insert(position, slot)
+        self._write(OP_PUT, slot, bytes(record))
+
+    def delete(self, key: Key) -> bool:
+        """Remove the record with `key`; returns False if it did not exist."""
+        position, found = self._find(key)
+        if not found:
+            return False
+        slot = self._slots[position]
+        del self._keys[position]
+        del self._slots[position]
+        self._free.append(slot)
+        self._write(OP_DELETE, slot, b"")
+        return True
+
+    def _allocate_slot(self) -> int:
+        if self._free:
+            return self._free.pop()
+        slot = self._slot_count
+        self._slot_count += 1
+        return slot
+
+    def _write(self, op: int, slot: int, payload: bytes):
+        if self._pending is not None:
+            self._pending.append((op, slot, payload))
+            if op == OP_PUT:
+                self._pending_images[slot] = payload
+            else:
+                self._pending_images.pop(slot, None)
+        else:
+            self._commit([(op, slot, payload)])
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group writes so they are journaled, synced and applied atomically.
+        Reads inside the block see its writes.
+
+        If the block raises, nothing is written and the index is rebuilt
+        from the data file.
+        """
+        if self._pending is not None:
+            yield self
+            return
+        self._pending = []
+        try:
+            yield self
+        except BaseException:
+            self._pending = None
+            self._pending_images = {}
+            self._slot_count = self._stored_count
+            self._build_index()
+            raise
+        pending, self._pending = self._pending, None
+        try:
+            if pending:
+                self._commit(pending)
+        finally:
+            self._pending_images = {}
+
+    def _commit(self, entries: List[Tuple[int, int, bytes]]):
+        """Journal a group of entries, then apply them to the data file."""
+        chunks = [self._journal_entry(op, slot, payload) for op, slot, payload in entries]
+        chunks.append(self._journal_entry(OP_COMMIT, 0, b""))
+        self._journal.write(b"".join(chunks))
+        self._journal.flush()
+        if self.durable:
+            os.fsync(self._journal.fileno())
+        for op, slot, payload in entries:
+            self._apply(op, slot, payload)
+        if self._journal.tell() >= self.checkpoint_bytes:
+            self.checkpoint()
+
+    @staticmethod
+    def _journal_entry(op: int, slot: int, payload: bytes) -> bytes:
+        checksum = zlib.crc32(payload, zlib.crc32(struct.pack("<BQ", op, slot)))
+        return JOURNAL_ENTRY.pack(JOURNAL_MAGIC, op, slot, checksum) + payload
+
+    def _apply(self, op: int, slot: int, payload: bytes):
+        """Apply one journaled change to the mapped data file."""
+        if slot >= self._capacity:
+            self._grow(slot + 1)
+        base = HEADER_SIZE + slot * self.slot_size
+        if op == OP_PUT:
+            self._map[base + 1:base + self.slot_size] = payload
+            self._map[base] = SLOT_LIVE
+        else:
+            self._map[base] = SLOT_FREE
+        if slot >= self._stored_count:
+            self._stored_count = slot + 1
+            self._slot_count = max(self._slot_count, self._stored_count)
+            struct.pack_into("<Q", self._map, SLOT_COUNT_OFFSET, self._stored_count)
+
+    def _grow(self, min_slots: int):
+        """Double the data file until it holds `min_slots` slots, then remap it."""
+        capacity = self._capacity
+        while capacity < min_slots:
+            capacity *= 2
+        self._map.flush()
+        self._map.close()
+        self._file.truncate(HEADER_SIZE + capacity * self.slot_size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._capacity = capacity
+        struct.pack_into("<Q", self._map, CAPACITY_OFFSET, capacity)
+
+    # Journal maintenance
+
+    def _replay_journal(self) -> None:
+        """Redo committed journal groups left by a crash, then checkpoint."""
+        self._journal.seek(0)
+        data = self._journal.read()
+        offset, group, applied = 0, [], 0
+        payload_sizes = {OP_PUT: self.record_length, OP_DELETE: 0, OP_COMMIT: 0}
+        while offset + JOURNAL_ENTRY.size <= len(data):
+            magic, op, slot, checksum = JOURNAL_ENTRY.unpack_from(data, offset)
+            size = payload_sizes.get(op)
+            end = offset + JOURNAL_ENTRY.size + (size or 0)
+            if magic != JOURNAL_MAGIC or size is None or end > len(data):
+                break
+            payload = data[offset + JOURNAL_ENTRY.size:end]
+            if zlib.crc32(payload, zlib.crc32(struct.pack("<BQ", op, slot))) != checksum:
+                break
+            if op == OP_COMMIT:
+                for entry in group:
+                    self._apply(*entry)
+                applied += len(group)
+                group = []
+            else:
+                group.append((op, slot, payload))
+            offset = end
+        self.recovered_entries = applied
+        if data:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Flush the data file and truncate the journal."""
+        self._map.flush()
+        os.fsync(self._file.fileno())
+        self._journal.seek(0)
+        self._journal.truncate()
+        self._journal.flush()
+        if self.durable:
+            os.fsync(self._journal.fileno())
+
+    def close(self):
+        if self._map.closed:
+            return
+        self.checkpoint()
+        self._map.close()
+        self._file.close()
+        self._journal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
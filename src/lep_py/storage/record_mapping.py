@@ -0,0 +1,165 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Record Store Mapping
+
+This module exposes a `KeyedRecordStore` as a dict-like mapping of decoded
+records, so adapters written against in-memory dicts (e.g.
+`COBOLMainframeAdapter.accounts`, `CustomerDatabaseAdapter.customers`) can
+be pointed at a KSDS stand-in without changing their skill code.
+"""
+
+from bisect import bisect_right
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+from ..codec.copybook import RecordLayout
+from .ksds import KeyedRecordStore
+
+
+class RecordView(dict):
+    """
+    A decoded record. Assigning a field writes the whole record back to the
+    store, so `accounts[id]["balance"] -= amount` behaves like it does on a
+    plain dict.
+    """
+
+    __slots__ = ("_owner", "_key")
+
+    def __init__(self, owner: "KSDSMapping", key: str, values: Dict[str, Any]):
+        super().__init__(values)
+        self._owner = owner
+        self._key = key
+
+    def __setitem__(self, name: str, value: Any):
+        super().__setitem__(name, value)
+        self._owner[self._key] = self
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._owner[self._key] = self
+
+
+class KSDSMapping(MutableMapping):
+    """
+    Dict-like view of a keyed record store.
+
+    Args:
+        store: The underlying record store
+        layout: Compiled copybook describing each record
+        key_field: Copybook field that holds the record key
+        fields: Mapping of dict key -> copybook field name for the values
+            exposed on each record
+    """
+
+    def __init__(self, store: KeyedRecordStore, layout: RecordLayout, key_field: str, fields: Dict[str, str]):
+        key_spec = layout[key_field]
+        if (key_spec.offset, key_spec.length) != (store.key_offset, store.key_length):
+            raise ValueError(f"Store key does not match copybook field {key_field}")
+        if layout.record_length != store.record_length:
+            raise ValueError("Store record length does not match the copybook")
+
+        self.store = store
+        self.layout = layout
+        self.key_field = key_field
+        self.fields = fields
+        self._decode = layout.field_decoder(list(fields.values()))
+        self._names = list(fields.items())
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        layout: RecordLayout,
+        key_field: str,
+        fields: Dict[str, str],
+        **store_options
+    ) -> "KSDSMapping":
+        """Open (or create) the store at `path` with its key taken from the copybook."""
+        key_spec = layout[key_field]
+        store = KeyedRecordStore(
+            path,
+            record_length=layout.record_length,
+            key_offset=key_spec.offset,
+            key_length=key_spec.length,
+            **store_options
+        )
+        return cls(store, layout, key_field, fields)
+
+    def _encode_key(self, key: str) -> bytes:
+        return self.layout.encode_field(self.key_field, key)
+
+    def _view(self, key: str, record: bytes) -> RecordView:
+        decoded = self._decode(record)
+        return RecordView(self, key, {name: decoded[field] for name, field in self._names})
+
+    def __getitem__(self, key: str) -> RecordView:
+        record = self.store.get(self._encode_key(key))
+        if record is None:
+            raise KeyError(key)
+        return self._view(key, record)
+
+    def __setitem__(self, key: str, value: Dict[str, Any]):
+        values = {field: value[name] for name, field in self._names if name in value}
+        values[self.key_field] = key
+        self.store.put(self.layout.encode(values))
+
+    def __delitem__(self, key: str):
+        if not self.store.delete(self._encode_key(key)):
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._encode_key(key) in self.store
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_keys()
+
+    def iter_keys(self, start_key: Optional[str] = None) -> Iterator[str]:
+        """Keys in order from start_key (inclusive), found by a search of the index."""
+        decode_key = self.layout.field_decoder([self.key_field])
+        for record in self.store.scan(self._encode_key(start_key) if start_key is not None else None):
+            yield decode_key(record)[self.key_field]
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def scan(
+        self,
+        start_key: Optional[str] = None,
+        end_key: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[Tuple[str, RecordView]]:
+        """Yield (key, record) pairs in key order with start_key <= key < end_key."""
+        decode_key = self.layout.field_decoder([self.key_field])
+        records = self.store.scan(
+            self._encode_key(start_key) if start_key is not None else None,
+            self._encode_key(end_key) if end_key is not None else None,
+            limit
+        )
+        for record in records:
+            key = decode_key(record)[self.key_field]
+            yield key, self._view(key, record)
+
+    def items(self) -> Iterator[Tuple[str, RecordView]]:
+        """Stream records in key order instead of materializing an ItemsView."""
+        return self.scan()
+
+    @contextmanager
+    def transaction(self):
+        """Apply every write inside the block as one journaled unit."""
+        with self.store.transaction():
+            yield self
+
+
+def keys_after(mapping: Mapping[str, Any], after: Optional[str] = None) -> Iterator[str]:
+    """
+    Keys of a KSDSMapping or dict in key order, starting after `after`, for
+    paging. A KSDSMapping resumes through its index; a dict is sorted.
+    """
+    if isinstance(mapping, KSDSMapping):
+        keys = mapping.iter_keys(after)
+        for key in keys:
+            if key != after:
+                yield key
+        return
+    ordered = sorted(mapping)
+    yield from ordered[bisect_right(ordered, after) if after is not None else 0:]
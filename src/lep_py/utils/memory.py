@@ -0,0 +1,194 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Memory Accounting
+
+Attributes a process's memory to the structures that hold it: each
+adapter names its long-lived state (audit trail, approval tokens, queues,
+caches, data stores) and `structure_report` estimates the size and entry
+count of each. Growth the report cannot place, such as in a library or in
+the interpreter's own caches, is found with `AllocationTracker`, which diffs
+tracemalloc snapshots against a baseline.
+
+Sizes are estimates: `estimate_size` follows containers and plain objects'
+attributes but not functions, classes, modules, tasks or open files, counts
+an object shared between structures once (for the first structure listed),
+and extrapolates large containers from a sample of their items, so a
+report over millions of records stays quick.
+"""
+
+import asyncio
+import functools
+import io
+import itertools
+import sys
+import tracemalloc
+import types
+from array import array
+from collections import deque
+from typing import Any, Dict, List, Optional, Set
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Followed item by item (sampled when large)
+_CONTAINERS = (list, tuple, set, frozenset, deque)
+# Not followed: shared program state rather than data, or reached back into the adapter
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.MethodType, types.BuiltinFunctionType,
+           functools.partial, asyncio.Future, asyncio.AbstractEventLoop, io.IOBase)
+
+
+def estimate_size(obj: Any, sample: int = 100, _seen: Optional[Set[int]] = None) -> int:
+    """
+    Estimated bytes held by `obj` and everything it refers to. Containers
+    with more than `sample` items are measured on an even sample and scaled up.
+    """
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen or isinstance(obj, _OPAQUE):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, array)) or obj is None:
+        return size
+
+    if isinstance(obj, dict):
+        items = list(itertools.islice(obj.items(), sample)) if len(obj) > sample else list(obj.items())
+        measured = sum(estimate_size(k, sample, seen) + estimate_size(v, sample, seen) for k, v in items)
+        return size + _scale(measured, len(items), len(obj))
+    if isinstance(obj, _CONTAINERS):
+        if len(obj) > sample and isinstance(obj, (list, tuple, deque)):
+            step = len(obj) // sample
+            items = [obj[i] for i in range(0, len(obj), step)][:sample]
+        else:
+            items = list(itertools.islice(obj, sample))
+        measured = sum(estimate_size(item, sample, seen) for item in items)
+        return size + _scale(measured, len(items), len(obj))
+
+    # Plain objects: their attributes
+    attributes = getattr(obj, "__dict__", None)
+    if isinstance(attributes, dict):
+        size += estimate_size(attributes, sample, seen)
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if name not in ("__dict__", "__weakref__"):
+                size += estimate_size(getattr(obj, name, None), sample, seen)
+    return size
+
+
+def _scale(measured: int, sampled: int, total: int) -> int:
+    return measured if sampled >= total or not sampled else int(measured * total / sampled)
+
+
+def count_of(obj: Any) -> Optional[int]:
+    """Entries in a structure, if it has a length."""
+    try:
+        return len(obj)
+    except TypeError:
+        return None
+
+
+def structure_report(structures: Dict[str, Any], sample: int = 100) -> List[Dict[str, Any]]:
+    """Type, entry count and estimated bytes of each named structure, largest first."""
+    seen: Set[int] = set()
+    report = [
+        {
+            "name": name,
+            "type": type(obj).__name__,
+            "count": count_of(obj),
+            "bytes": estimate_size(obj, sample, seen)
+        }
+        for name, obj in structures.items()
+    ]
+    report.sort(key=lambda entry: entry["bytes"], reverse=True)
+    return report
+
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """Resident set size of the process now and at its peak, in bytes, where the platform reports them."""
+    rss = None
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * _page_size()
+    except (OSError, ValueError, IndexError):
+        pass
+    peak = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak *= 1 if sys.platform == "darwin" else 1024  # bytes on macOS, KiB elsewhere
+    return {"rss_bytes": rss, "peak_rss_bytes": peak}
+
+
+def _page_size() -> int:
+    if resource is not None:
+        return resource.getpagesize()
+    return 4096
+
+
+class AllocationTracker:
+    """
+    Finds where memory grows: start tracing, let the process run, then diff
+    a snapshot against the baseline taken at start (or at the last rebase).
+    Tracing slows allocation-heavy code down, so it is only on while in use.
+    """
+
+    def __init__(self):
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._started_here = False
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 10):
+        """Start tracing allocations, keeping `frames` frames of traceback, and take the baseline."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self._started_here = True
+        self._baseline = self._snapshot()
+
+    def stop(self):
+        """Stop tracing (if it was started here) and forget the baseline."""
+        self._baseline = None
+        if self._started_here:
+            tracemalloc.stop()
+            self._started_here = False
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    def diff(self, top: int = 10, group_by: str = "lineno", rebase: bool = False) -> Dict[str, Any]:
+        """
+        Allocation growth since the baseline, largest first, grouped by
+        "lineno", "filename" or "traceback". `rebase` makes this snapshot
+        the new baseline.
+        """
+        if self._baseline is None:
+            raise RuntimeError("Allocation tracing is not started")
+        snapshot = self._snapshot()
+        stats = snapshot.compare_to(self._baseline, group_by)
+        current, peak = tracemalloc.get_traced_memory()
+        if rebase:
+            self._baseline = snapshot
+        return {
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "growth_bytes": sum(stat.size_diff for stat in stats),
+            "top": [
+                {
+                    "location": str(stat.traceback[0]) if group_by != "traceback" else stat.traceback.format(),
+                    "size_diff": stat.size_diff,
+                    "size": stat.size,
+                    "count_diff": stat.count_diff,
+                    "count": stat.count
+                }
+                for stat in stats[:top]
+            ]
+        }
+
+
+# Process-wide tracker; tracemalloc itself is process-wide
+ALLOCATIONS = AllocationTracker()
@@ -0,0 +1,346 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Metrics
+
+A small metrics registry with Prometheus text exposition, cheap enough to
+leave on in production:
+
+- Counters and gauges are plain attributes updated in place. Everything
+  runs on the event loop thread, so no locks are taken.
+- Histograms have fixed buckets; an observation is one binary search and
+  two additions. Cumulative bucket counts are only computed when scraped.
+- Gauges for sizes that already exist elsewhere (audit trail, token
+  store, queue depth) read them through a function at scrape time, so
+  they cost nothing between scrapes.
+
+`JSONRPCHandler`, `BaseLEPAdapter` and `LEPMCPBridge` record into the
+process-wide `REGISTRY` unless given their own. Expose it with
+`MetricsServer` (GET /metrics on a local port) or `dump_on_signal`.
+"""
+
+import asyncio
+import bisect
+import logging
+import math
+import signal
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..core.deadline import DeadlineExceeded
+from ..core.middleware import Handler, RPCCall, RPCError
+from ..models.protocol import LEPErrorCode
+
+logger = logging.getLogger(__name__)
+
+# Seconds; from sub-millisecond in-memory reads to long mainframe reports
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+                   60.0, 300.0)
+# Bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+
+class GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+
+class HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # the last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metric:
+    """A named metric and its children, one per combination of label values."""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+
+    def labels(self, *values: str):
+        """The child for these label values, created on first use."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} takes labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def remove(self, *values: str):
+        self._children.pop(values, None)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        """(name suffix, rendered labels, value) for every child."""
+        for values, child in list(self._children.items()):
+            yield "", _labels(self.labelnames, values), child.value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{self.name}{suffix}{labels} {_format_value(value)}"
+                     for suffix, labels, value in self.samples())
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return CounterChild()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._functions: Dict[Tuple[str, ...], Callable[[], float]] = {}
+
+    def _new_child(self):
+        return GaugeChild()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], float], *values: str):
+        """Read this child's value from `function` at scrape time."""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {values}")
+        self._functions[values] = function
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        yield from super().samples()
+        for values, function in list(self._functions.items()):
+            try:
+                value = function()
+            except Exception as e:
+                logger.debug(f"Gauge {self.name}{values} failed: {e}")
+                continue
+            yield "", _labels(self.labelnames, values), value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        if "le" in self.labelnames:
+            raise ValueError("'le' is reserved for histogram buckets")
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        for values, child in list(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), child.counts):
+                cumulative += count
+                yield "_bucket", _labels(self.labelnames, values, f'le="{_format_value(bound)}"'), cumulative
+            yield "_sum", _labels(self.labelnames, values), child.sum
+            yield "_count", _labels(self.labelnames, values), child.count
+
+
+class MetricsRegistry:
+    """Named metrics, created on first request and rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def _get_or_create(self, cls, name: str, help: str, labelnames: Sequence[str], **kwargs) -> Any:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+        elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {name} is already registered as a different {metric.kind}")
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """The registry in Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide default registry
+REGISTRY = MetricsRegistry()
+
+
+class MethodMetrics:
+    """
+    Interceptor recording request counts by outcome, latency and requests in
+    flight for one JSON-RPC handler.
+    """
+
+    def __init__(self, registry: MetricsRegistry, handler: str):
+        self.handler = handler
+        self.requests = registry.counter("lep_rpc_requests_total", "JSON-RPC calls handled, by outcome",
+                                         ["handler", "method", "outcome"])
+        self.latency = registry.histogram("lep_rpc_request_seconds", "JSON-RPC call latency",
+                                          ["handler", "method"])
+        self.in_flight = registry.gauge("lep_rpc_in_flight", "JSON-RPC calls running", ["handler"]).labels(handler)
+
+    async def intercept(self, call: RPCCall, call_next: Handler) -> Any:
+        started = time.perf_counter()
+        self.in_flight.value += 1
+        outcome = "error"
+        try:
+            result = await call_next(call)
+            outcome = "ok"
+            return result
+        except RPCError as e:
+            outcome = "busy" if e.code == LEPErrorCode.SERVER_BUSY else "rejected"
+            raise
+        except DeadlineExceeded:
+            outcome = "deadline"
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            self.in_flight.value -= 1
+            self.latency.labels(self.handler, call.method).observe(time.perf_counter() - started)
+            self.requests.labels(self.handler, call.method, outcome).inc()
+
+
+class MetricsServer:
+    """
+    Serves a registry as GET /metrics on a local port.
+
+    Args:
+        registry: The registry to expose
+        host: Interface to bind (keep it local; there is no authentication)
+        port: Port to bind (0 picks a free port)
+    """
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY, host: str = "127.0.0.1", port: int = 9464):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), 10.0)
+            while (await asyncio.wait_for(reader.readline(), 10.0)).strip():
+                pass  # headers are not needed
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, content_type, body = "200 OK", CONTENT_TYPE, self.registry.render().encode()
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", b"Not found\n"
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                         f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def dump_on_signal(registry: MetricsRegistry = REGISTRY, signum: int = getattr(signal, "SIGUSR1", 0),
+                   stream=None) -> bool:
+    """
+    Write the registry to `stream` (default stderr) whenever the process
+    receives `signum`. Returns False where the signal is not available.
+    """
+    if not signum:
+        return False
+
+    def dump(received, frame):
+        target = stream or sys.stderr
+        target.write(registry.render())
+        target.flush()
+    try:
+        signal.signal(signum, dump)
+    except (ValueError, OSError):
+        return False  # not the main thread, or not supported here
+    return True
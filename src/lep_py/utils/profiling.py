@@ -0,0 +1,333 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Request Profiling
+
+Captures cProfile profiles of individual requests in a running adapter,
+so a slow `call_skill_impl` can be examined where it is slow instead of
+under a profiler started by hand.
+
+A request is profiled when its method or skill is named, when it is
+picked by the sample rate, or when it is still running after the latency
+threshold; in the last case the profile covers the rest of the request,
+and the longest uninterrupted step is recorded either way, which exposes
+blocking calls that finish before the threshold timer can fire.
+
+The profiler is switched on only while the request's own task is running
+(per step, between awaits), so requests interleaved with it on the event
+loop do not show up in its profile. It is attached to a handler as an
+interceptor and detached again when profiling is turned off, so a
+handler without it pays nothing.
+
+The newest `max_profiles` profiles are kept, optionally also as `.prof`
+files (readable with `pstats` or snakeviz) next to a `.json` metadata file.
+"""
+
+import asyncio
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import signal
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+from ..core.middleware import Handler, RPCCall
+
+logger = logging.getLogger(__name__)
+
+# Set while a request is being profiled, so calls nested in it are not profiled twice
+_profiling: ContextVar[bool] = ContextVar("lep_profiling", default=False)
+
+
+@dataclass
+class ProfileRecord:
+    """A saved profile and the request it was taken from."""
+    profile_id: str
+    handler: str
+    method: str
+    skill: Optional[str]
+    request_id: Any
+    reason: str  # "method", "skill", "sampled" or "threshold"
+    started_at: str
+    duration_ms: float
+    steps: int
+    longest_step_ms: float
+    error: Optional[str] = None
+    path: Optional[str] = None
+    stats: Optional[pstats.Stats] = field(default=None, repr=False)
+
+    def summary(self, limit: int = 20, sort: str = "cumulative") -> str:
+        """The top functions of the profile as text."""
+        if self.stats is None:
+            return "No profile: the request finished before profiling started (see longest_step_ms)\n"
+        out = io.StringIO()
+        self.stats.stream = out
+        self.stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "profile_id": self.profile_id,
+            "handler": self.handler,
+            "method": self.method,
+            "skill": self.skill,
+            "request_id": self.request_id,
+            "reason": self.reason,
+            "started_at": self.started_at,
+            "duration_ms": self.duration_ms,
+            "steps": self.steps,
+            "longest_step_ms": self.longest_step_ms,
+            "error": self.error,
+            "path": self.path,
+        }
+
+
+class _ProfiledRun:
+    """
+    Awaits a coroutine step by step, with `profile` enabled only while the
+    coroutine itself runs. The profile may be started part way through.
+    """
+
+    __slots__ = ("coro", "profile", "steps", "longest_step")
+
+    def __init__(self, coro, profile: Optional[cProfile.Profile]):
+        self.coro = coro
+        self.profile = profile
+        self.steps = 0
+        self.longest_step = 0.0
+
+    def start(self):
+        if self.profile is None:
+            self.profile = cProfile.Profile()
+
+    def __await__(self):
+        coro = self.coro
+        value, error = None, None
+        while True:
+            profile = self.profile
+            started = time.perf_counter()
+            if profile is not None:
+                profile.enable()
+            try:
+                if error is None:
+                    yielded = coro.send(value)
+                else:
+                    yielded = coro.throw(error)
+            except StopIteration as stop:
+                return stop.value
+            finally:
+                if profile is not None:
+                    profile.disable()
+                step = time.perf_counter() - started
+                self.steps += 1
+                if step > self.longest_step:
+                    self.longest_step = step
+            try:
+                value, error = (yield yielded), None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as e:
+                value, error = None, e
+
+
+class RequestProfiler:
+    """
+    Profiles selected requests on the handlers it is attached to.
+
+    Args:
+        threshold: Seconds after which a still-running request is profiled (None: never)
+        sample_rate: Fraction of all requests profiled from the start
+        methods: Methods always profiled
+        skills: Skills (`skill_name`, or the MCP tool `name`) always profiled
+        max_profiles: Profiles kept; the oldest is discarded beyond this
+        directory: Also write each profile there as <id>.prof and <id>.json
+    """
+
+    def __init__(self, threshold: Optional[float] = 1.0, sample_rate: float = 0.0,
+                 methods: Optional[Iterable[str]] = None, skills: Optional[Iterable[str]] = None,
+                 max_profiles: int = 20, directory: Optional[str] = None):
+        self.threshold = threshold
+        self.sample_rate = sample_rate
+        self.methods = set(methods or ())
+        self.skills = set(skills or ())
+        self.max_profiles = max_profiles
+        self.directory = directory
+        self.profiles: Deque[ProfileRecord] = deque()
+        self.stats = {"requests": 0, "profiled": 0, "saved": 0, "discarded": 0}
+        self._handlers: Dict[int, Tuple[Any, Handler]] = {}
+        self._counter = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def attached(self) -> bool:
+        return bool(self._handlers)
+
+    def configure(self, **options: Any):
+        """Change the selection settings in place (threshold, sample_rate, methods, skills, max_profiles)."""
+        for key, value in options.items():
+            if key not in ("threshold", "sample_rate", "methods", "skills", "max_profiles"):
+                raise ValueError(f"Unknown profiling option: {key}")
+            if key in ("methods", "skills"):
+                value = set(value or ())
+            setattr(self, key, value)
+        self._trim()
+
+    def attach(self, handler, name: str = "", exclude: Optional[Iterable[str]] = None):
+        """Start profiling requests on a JSON-RPC handler."""
+        if id(handler) not in self._handlers:
+            interceptor = functools.partial(self.intercept, name)
+            handler.add_interceptor(interceptor, exclude=exclude)
+            self._handlers[id(handler)] = (handler, interceptor)
+
+    def detach(self, handler):
+        """Stop profiling on a handler; it runs without the interceptor again."""
+        entry = self._handlers.pop(id(handler), None)
+        if entry is not None:
+            handler.remove_interceptor(entry[1])
+
+    def detach_all(self):
+        for handler, _ in list(self._handlers.values()):
+            self.detach(handler)
+
+    def _select(self, call: RPCCall) -> Optional[str]:
+        if call.method in self.methods:
+            return "method"
+        if self.skills and isinstance(call.params, dict):
+            skill = call.params.get("skill_name") or call.params.get("name")
+            if skill in self.skills:
+                return "skill"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    async def intercept(self, handler: str, call: RPCCall, call_next: Handler) -> Any:
+        if _profiling.get():
+            return await call_next(call)
+        self.stats["requests"] += 1
+        reason = self._select(call)
+        if reason is None and self.threshold is None:
+            return await call_next(call)
+
+        token = _profiling.set(True)
+        run = _ProfiledRun(call_next(call), cProfile.Profile() if reason else None)
+        timer = None
+        if reason is None:
+            # Profile the rest of the request if it is still running at the threshold
+            timer = asyncio.get_running_loop().call_later(self.threshold, run.start)
+        started_at = datetime.now().isoformat()
+        started = time.perf_counter()
+        error = None
+        try:
+            return await run
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _profiling.reset(token)
+            duration = time.perf_counter() - started
+            if timer is not None:
+                timer.cancel()
+                if duration >= self.threshold:
+                    reason = "threshold"
+            if reason is not None:
+                self._save(handler, call, reason, started_at, duration, run, error)
+
+    def _save(self, handler: str, call: RPCCall, reason: str, started_at: str, duration: float, run: _ProfiledRun,
+              error: Optional[str]):
+        self._counter += 1
+        stats = None
+        if run.profile is not None:
+            self.stats["profiled"] += 1
+            stats = pstats.Stats(run.profile)
+        params = call.params if isinstance(call.params, dict) else {}
+        record = ProfileRecord(
+            profile_id=f"profile_{int(time.time())}_{self._counter}",
+            handler=handler,
+            method=call.method,
+            skill=params.get("skill_name") or params.get("name"),
+            request_id=call.request_id,
+            reason=reason,
+            started_at=started_at,
+            duration_ms=round(duration * 1000, 3),
+            steps=run.steps,
+            longest_step_ms=round(run.longest_step * 1000, 3),
+            error=error,
+            stats=stats
+        )
+        if self.directory:
+            try:
+                base = os.path.join(self.directory, record.profile_id)
+                if stats is not None:
+                    stats.dump_stats(base + ".prof")
+                    record.path = base + ".prof"
+                with open(base + ".json", "w", encoding="utf-8") as f:
+                    json.dump(record.to_dict(), f, indent=2, default=str)
+            except OSError as e:
+                logger.warning(f"Could not write profile {record.profile_id}: {e}")
+        self.profiles.append(record)
+        self.stats["saved"] += 1
+        self._trim()
+        logger.info(f"Saved {reason} profile {record.profile_id} of {call.method} ({record.duration_ms}ms)")
+
+    def _trim(self):
+        while len(self.profiles) > max(0, self.max_profiles):
+            record = self.profiles.popleft()
+            self.stats["discarded"] += 1
+            if self.directory:
+                for suffix in (".prof", ".json"):
+                    try:
+                        os.remove(os.path.join(self.directory, record.profile_id + suffix))
+                    except OSError:
+                        pass
+
+    def get(self, profile_id: str) -> ProfileRecord:
+        for record in self.profiles:
+            if record.profile_id == profile_id:
+                return record
+        raise KeyError(f"Unknown profile: {profile_id}")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.attached,
+            "threshold": self.threshold,
+            "sample_rate": self.sample_rate,
+            "methods": sorted(self.methods),
+            "skills": sorted(self.skills),
+            "max_profiles": self.max_profiles,
+            "directory": self.directory,
+            "stats": dict(self.stats),
+            "profiles": [record.to_dict() for record in self.profiles],
+        }
+
+
+def toggle_on_signal(profiler: RequestProfiler, handlers: Dict[str, Any],
+                     signum: int = getattr(signal, "SIGUSR2", 0)) -> bool:
+    """
+    Attach `profiler` to `handlers` (name -> handler), or detach it, whenever the process
+    receives `signum`. Returns False where the signal is not available.
+    """
+    if not signum:
+        return False
+
+    def toggle(received, frame):
+        if profiler.attached:
+            profiler.detach_all()
+            logger.warning("Request profiling off")
+        else:
+            for name, handler in handlers.items():
+                profiler.attach(handler, name)
+            logger.warning(f"Request profiling on (threshold {profiler.threshold}s)")
+    try:
+        signal.signal(signum, toggle)
+    except (ValueError, OSError):
+        return False  # not the main thread, or not supported here
+    return True
@@ -0,0 +1,305 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Tracing
+
+Lightweight spans that time the stages of a request: the MCP `tools/call`,
+the LEP methods the bridge invokes, the human approval, the skill, the
+backend call. The active span lives in a context variable, so it follows
+the request into every task spawned for it, and spans started there
+become its children without any plumbing.
+
+Traces cross process boundaries in JSON-RPC metadata: a request whose
+params carry `_meta.traceparent` (W3C trace context format,
+`00-<trace id>-<span id>-<flags>`) continues the caller's trace, and MCP
+tool results report theirs the same way.
+
+The tracer is off until an exporter is configured; a span then costs one
+attribute check. Sampling is decided once per trace, at its root (or by
+the caller's sampled flag), so a trace is recorded whole or not at all.
+
+    configure_tracing(JSONLExporter("traces.jsonl"), sample_rate=0.1)
+"""
+
+import json
+import logging
+import random
+import secrets
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.middleware import Handler, Interceptor, RPCCall
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """A timed operation within a trace. Use as a context manager."""
+
+    __slots__ = ("tracer", "name", "trace_id", "span_id", "parent_id", "start_time", "_started",
+                 "duration", "attributes", "events", "status", "error", "_token")
+
+    sampled = True
+
+    def __init__(self, tracer: "Tracer", name: str, trace_id: str, parent_id: Optional[str],
+                 attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.events: List[Dict[str, Any]] = []
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.duration: Optional[float] = None
+        self.start_time = 0.0
+        self._started = 0.0
+        self._token = None
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def add_event(self, name: str, **attributes: Any):
+        """Record a point-in-time event, for steps too small to be spans."""
+        self.events.append({"name": name, "offset_ms": round((time.perf_counter() - self._started) * 1000, 3),
+                            **attributes})
+
+    def record_error(self, error: BaseException):
+        self.status = "error"
+        self.error = f"{type(error).__name__}: {error}"
+
+    def __enter__(self) -> "Span":
+        self.start_time = time.time()
+        self._started = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._started
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.record_error(exc)
+        self.tracer._finish(self)
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_ms": round(self.duration * 1000, 3) if self.duration is not None else None,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+            "events": self.events,
+        }
+
+
+class NonRecordingSpan:
+    """Stands in for a span when tracing is off or the trace is not sampled."""
+
+    sampled = False
+    trace_id = None
+    span_id = None
+    traceparent = None
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def add_event(self, name: str, **attributes: Any):
+        pass
+
+    def record_error(self, error: BaseException):
+        pass
+
+    def __enter__(self) -> "NonRecordingSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = NonRecordingSpan()
+_current_span: ContextVar[Optional[Any]] = ContextVar("lep_span", default=None)
+
+
+class _UnsampledRoot(NonRecordingSpan):
+    """Marks a trace as unsampled for everything started inside it."""
+
+    __slots__ = ("_token",)
+
+    def __enter__(self) -> NonRecordingSpan:
+        self._token = _current_span.set(_NOOP)
+        return _NOOP
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_span.reset(self._token)
+        return False
+
+
+def current_span():
+    """The active span, or a non-recording stand-in."""
+    return _current_span.get() or _NOOP
+
+
+def parse_traceparent(value: Any) -> Optional[Tuple[str, str, bool]]:
+    """(trace id, parent span id, sampled) from a traceparent header, or None if malformed."""
+    if not isinstance(value, str):
+        return None
+    parts = value.split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+        flags = int(parts[3], 16)
+    except ValueError:
+        return None
+    return parts[1], parts[2], bool(flags & 1)
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to the exporter.
+
+    Args:
+        exporter: Receives finished spans; None turns tracing off
+        sample_rate: Fraction of new traces recorded
+    """
+
+    def __init__(self, exporter: Optional["SpanExporter"] = None, sample_rate: float = 1.0):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self.stats = {"traces": 0, "sampled": 0, "spans": 0, "export_errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def span(self, name: str, traceparent: Optional[str] = None, **attributes: Any):
+        """
+        Start a span as a child of the active one. `traceparent` continues a
+        trace from another process when there is no active span.
+        """
+        if self.exporter is None:
+            return _NOOP
+        parent = _current_span.get()
+        if parent is _NOOP:
+            return _NOOP
+        if parent is not None:
+            return Span(self, name, parent.trace_id, parent.span_id, attributes)
+
+        remote = parse_traceparent(traceparent)
+        self.stats["traces"] += 1
+        sampled = remote[2] if remote else random.random() < self.sample_rate
+        if not sampled:
+            return _UnsampledRoot()
+        self.stats["sampled"] += 1
+        if remote:
+            return Span(self, name, remote[0], remote[1], attributes)
+        return Span(self, name, secrets.token_hex(16), None, attributes)
+
+    def _finish(self, span: Span):
+        self.stats["spans"] += 1
+        try:
+            self.exporter.export(span)
+        except Exception as e:
+            self.stats["export_errors"] += 1
+            logger.debug(f"Span export failed: {e}")
+
+    def flush(self):
+        if self.exporter is not None:
+            self.exporter.flush()
+
+    def interceptor(self, handler: str) -> Interceptor:
+        """
+        Interceptor for a JSON-RPC handler: one span per call, continuing the
+        caller's trace from `_meta.traceparent` when there is no active span.
+        """
+        async def trace(call: RPCCall, call_next: Handler) -> Any:
+            if self.exporter is None:
+                return await call_next(call)
+            meta = call.params.get("_meta") if isinstance(call.params, dict) else None
+            with self.span(call.method, meta.get("traceparent") if isinstance(meta, dict) else None,
+                           handler=handler):
+                return await call_next(call)
+        return trace
+
+
+class SpanExporter:
+    """Receives finished spans. Subclass to ship them elsewhere."""
+
+    def export(self, span: Span):
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps the most recent finished spans in memory."""
+
+    def __init__(self, max_spans: int = 10000):
+        self.max_spans = max_spans
+        self.spans: List[Span] = []
+
+    def export(self, span: Span):
+        self.spans.append(span)
+        if len(self.spans) > self.max_spans:
+            del self.spans[:len(self.spans) - self.max_spans]
+
+    def trace(self, trace_id: str) -> List[Span]:
+        """The spans of one trace, in start order."""
+        return sorted((s for s in self.spans if s.trace_id == trace_id), key=lambda s: s.start_time)
+
+
+class JSONLExporter(SpanExporter):
+    """
+    Appends spans to a file, one JSON object per line, written in batches.
+
+    Args:
+        path: File to append to
+        batch_size: Spans buffered before a write
+    """
+
+    def __init__(self, path: str, batch_size: int = 100):
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer: List[str] = []
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, span: Span):
+        self._buffer.append(json.dumps(span.to_dict(), separators=(",", ":"), default=str))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer and not self._file.closed:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._file.flush()
+            self._buffer.clear()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+# Process-wide tracer, off until configured
+TRACER = Tracer()
+
+
+def configure_tracing(exporter: Optional[SpanExporter], sample_rate: float = 1.0) -> Tracer:
+    """Point the process-wide tracer at an exporter (None turns tracing off)."""
+    if TRACER.exporter is not None and TRACER.exporter is not exporter:
+        TRACER.exporter.close()
+    TRACER.exporter = exporter
+    TRACER.sample_rate = sample_rate
+    return TRACER
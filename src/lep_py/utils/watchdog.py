@@ -0,0 +1,195 @@
+"""
+LegacyEvolve Protocol (LEP) v2.0 - Event Loop Watchdog
+
+Every session shares one event loop, so one synchronous call that runs
+long (a report built over every transaction, `json.dumps` of a huge
+resource) stalls them all. The watchdog makes that visible:
+
+- A heartbeat task sleeps for `interval` and records how late it woke up
+  in the `lep_event_loop_lag_seconds` histogram. That is the delay every
+  other callback on the loop saw at the same moment.
+- A monitor thread watches the heartbeat. When the loop has not come back
+  for `threshold` seconds, it captures the loop thread's stack (and the
+  task running) while the blocking call is still on it. The stall is
+  recorded with its duration once the loop recovers, counted in
+  `lep_event_loop_blocked_total` and logged as a warning with the stack.
+
+The heartbeat costs one timer per `interval`; the thread wakes up at the
+same rate and only reads a timestamp unless the loop is stuck.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from .metrics import REGISTRY, MetricsRegistry
+
+logger = logging.getLogger(__name__)
+
+# Seconds; from the scheduling noise of a healthy loop to multi-second stalls
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class BlockedLoop:
+    """One stall of the event loop past the threshold."""
+    detected_at: str
+    task: Optional[str]
+    stack: List[str]
+    duration: Optional[float] = None  # set once the loop recovers
+    samples: List[List[str]] = field(default_factory=list)  # later stacks, if it moved on while blocked
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "detected_at": self.detected_at,
+            "duration_ms": round(self.duration * 1000, 1) if self.duration is not None else None,
+            "task": self.task,
+            "stack": self.stack,
+            "later_stacks": len(self.samples),
+        }
+
+
+class LoopWatchdog:
+    """
+    Measures event loop lag and captures the stack of calls that block it.
+
+    Args:
+        threshold: Seconds without a heartbeat before the loop counts as blocked
+        interval: Seconds between heartbeats
+        registry: Metrics registry for the lag histogram and stall counter
+        max_events: Stalls kept in `events`, newest last
+        max_samples: Further stacks captured during one long stall
+    """
+
+    def __init__(self, threshold: float = 0.25, interval: float = 0.05,
+                 registry: Optional[MetricsRegistry] = REGISTRY, max_events: int = 50, max_samples: int = 3):
+        self.threshold = threshold
+        self.interval = interval
+        self.max_samples = max_samples
+        self.events: Deque[BlockedLoop] = deque(maxlen=max_events)
+        self.stats = {"beats": 0, "blocked": 0, "max_lag": 0.0}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._last_beat = 0.0
+        self._current: Optional[BlockedLoop] = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lag = self._blocked = self._blocked_seconds = None
+        if registry is not None:
+            self._lag = registry.histogram("lep_event_loop_lag_seconds", "Event loop scheduling delay",
+                                           buckets=LAG_BUCKETS).labels()
+            self._blocked = registry.counter("lep_event_loop_blocked_total",
+                                             "Event loop stalls past the watchdog threshold").labels()
+            self._blocked_seconds = registry.histogram("lep_event_loop_blocked_seconds", "Event loop stall length",
+                                                       buckets=LAG_BUCKETS).labels()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def start(self):
+        """Start watching the running loop."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._heartbeat(), name="lep-loop-watchdog")
+        self._thread = threading.Thread(target=self._monitor, name="lep-loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._thread.join(timeout=1.0)
+        self._thread = None
+
+    async def _heartbeat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            with self._lock:
+                # The stall may have begun before this beat was scheduled
+                stalled_for = now - self._last_beat - self.interval
+                self._last_beat = now
+                stalled, self._current = self._current, None
+            self.stats["beats"] += 1
+            if lag > self.stats["max_lag"]:
+                self.stats["max_lag"] = lag
+            if self._lag is not None:
+                self._lag.observe(lag)
+            if stalled is not None:
+                self._recovered(stalled, stalled_for)
+
+    def _recovered(self, stalled: BlockedLoop, duration: float):
+        stalled.duration = duration
+        self.events.append(stalled)
+        self.stats["blocked"] += 1
+        if self._blocked is not None:
+            self._blocked.inc()
+            self._blocked_seconds.observe(duration)
+        logger.warning(
+            f"Event loop blocked for {duration * 1000:.0f}ms (task {stalled.task}):\n" + "".join(stalled.stack)
+        )
+
+    def _monitor(self):
+        check = min(self.interval, self.threshold / 2)
+        while not self._stopped.wait(check):
+            with self._lock:
+                since = time.monotonic() - self._last_beat - self.interval
+                if since < self.threshold:
+                    continue
+                current = self._current
+                if current is not None and len(current.samples) >= self.max_samples:
+                    continue
+            stack = self._loop_stack()
+            if stack is None:
+                continue
+            with self._lock:
+                if time.monotonic() - self._last_beat - self.interval < self.threshold:
+                    continue  # recovered while the stack was taken
+                if self._current is None and current is None:
+                    self._current = BlockedLoop(datetime.now().isoformat(), self._running_task(), stack)
+                elif self._current is current and current is not None and stack != current.stack:
+                    current.samples.append(stack)
+
+    def _loop_stack(self) -> Optional[List[str]]:
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return None
+        return traceback.format_stack(frame)
+
+    def _running_task(self) -> Optional[str]:
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            return None
+        return task.get_name() if task is not None else None
+
+    def report(self, limit: int = 10) -> Dict[str, Any]:
+        """Lag statistics and the most recent stalls."""
+        return {
+            "threshold": self.threshold,
+            "interval": self.interval,
+            "stats": dict(self.stats),
+            "blocked": [event.to_dict() for event in list(self.events)[-limit:]],
+        }
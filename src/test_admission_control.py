@@ -0,0 +1,161 @@
+"""
+Test script for admission control in the JSON-RPC handler.
+
+This script demonstrates:
+1. An overload burst without admission control
+2. The same burst with a global in-flight cap and bounded queue
+3. Per-method limits alongside the global gate
+4. Exempt methods under overload
+5. Admission metrics
+"""
+
+import asyncio
+import json
+import time
+from lep_py.adapter.example_adapter import CustomerDatabaseAdapter
+from lep_py.core.admission import AdmissionController
+
+
+class MainframeBoundAdapter(CustomerDatabaseAdapter):
+    """Customer adapter in front of a host that runs 8 transactions at a time, 20ms each."""
+
+    def __init__(self):
+        super().__init__()
+        self.host_capacity = asyncio.Semaphore(8)
+
+    async def get_resource_impl(self, resource_name, parameters):
+        async with self.host_capacity:
+            await asyncio.sleep(0.02)
+        return await super().get_resource_impl(resource_name, parameters)
+
+    async def call_skill_impl(self, skill_name, parameters):
+        async with self.host_capacity:
+            await asyncio.sleep(0.02)
+        return await super().call_skill_impl(skill_name, parameters)
+
+
+def read_request(i, method="legacy/getResource"):
+    return json.dumps({
+        "jsonrpc": "2.0",
+        "method": method,
+        "params": {"resource_name": "customer", "parameters": {"customer_id": "CUST001"}},
+        "id": i
+    })
+
+
+async def burst(adapter, count, method="legacy/getResource"):
+    """Send `count` requests at once; return (latencies of served requests, busy errors)."""
+    async def one(i):
+        started = time.perf_counter()
+        response = json.loads(await adapter.handle_request(read_request(i, method)))
+        return time.perf_counter() - started, response.get("error")
+    results = await asyncio.gather(*(one(i) for i in range(count)))
+    served = sorted(latency for latency, error in results if not error)
+    busy = [error for _, error in results if error and error["code"] == -32004]
+    return served, busy
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0.0
+
+
+async def main():
+    print("=" * 60)
+    print("Admission Control - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    # Test 1: No admission control
+    print("Test 1: Overload Without Admission Control")
+    print("-" * 60)
+    adapter = MainframeBoundAdapter()
+    adapter.rpc_handler.admission = None
+    served, busy = await burst(adapter, 400)
+    print(f"400 requests: {len(served)} served, p50 {percentile(served, 0.5) * 1000:.0f}ms, "
+          f"p99 {percentile(served, 0.99) * 1000:.0f}ms")
+    assert len(served) == 400 and not busy
+    print()
+
+    # Test 2: Global cap
+    print("Test 2: Global In-flight Cap and Bounded Queue")
+    print("-" * 60)
+    adapter = MainframeBoundAdapter()
+    adapter.rpc_handler.admission = admission = AdmissionController(
+        max_in_flight=8, max_queued=32, max_queue_time=0.1, exempt=["session/initialize"]
+    )
+    await burst(adapter, 8)  # learn the service time
+    served, busy = await burst(adapter, 400)
+    print(f"400 requests: {len(served)} served, {len(busy)} shed, p50 {percentile(served, 0.5) * 1000:.0f}ms, "
+          f"p99 {percentile(served, 0.99) * 1000:.0f}ms")
+    reasons = {}
+    for error in busy:
+        reasons[error["data"]["reason"]] = reasons.get(error["data"]["reason"], 0) + 1
+    print(f"Shed by reason: {reasons}, retry_after hint: {busy[0]['data']['retry_after']}s")
+    assert len(served) + len(busy) == 400 and len(served) >= 8 and busy
+    assert set(reasons) <= {"queue_full", "wait", "timeout"} and busy[0]["data"]["retry_after"] > 0
+    print()
+
+    # Test 3: Per-method limit
+    print("Test 3: Per-method Limit")
+    print("-" * 60)
+    admission.set_method_limit("legacy/callSkill", max_in_flight=1, max_queued=2, max_queue_time=0.05)
+    calls = [adapter.handle_request(json.dumps({
+        "jsonrpc": "2.0", "method": "legacy/callSkill",
+        "params": {"skill_name": "getCustomerInfo", "parameters": {"customer_id": "CUST001"}}, "id": i
+    })) for i in range(10)]
+    reads = burst(adapter, 8)
+    responses, (served, busy_reads) = await asyncio.gather(asyncio.gather(*calls), reads)
+    shed_calls = sum(1 for r in responses if (json.loads(r).get("error") or {}).get("code") == -32004)
+    print(f"10 callSkill requests: {10 - shed_calls} admitted, {shed_calls} shed by the method gate")
+    print(f"8 concurrent reads alongside: {len(served)} served, {len(busy_reads)} shed")
+    assert 1 <= 10 - shed_calls < 10 and len(served) == 8
+    print()
+
+    # Test 4: Exempt methods
+    print("Test 4: Exempt Methods Under Overload")
+    print("-" * 60)
+    overload = asyncio.ensure_future(burst(adapter, 400))
+    await asyncio.sleep(0)
+    response = json.loads(await adapter.handle_request(json.dumps({
+        "jsonrpc": "2.0", "method": "session/initialize",
+        "params": {"client_name": "Operator", "client_version": "1.0", "supported_lep_versions": ["2.0"]}, "id": 1
+    })))
+    await overload
+    print(f"session/initialize during a burst: {'ok' if 'result' in response and response['result'] else response}")
+    assert response.get("result")
+    adapter = MainframeBoundAdapter()  # default admission control
+    overload = asyncio.ensure_future(burst(adapter, 400))
+    await asyncio.sleep(0)
+    response = json.loads(await adapter.handle_request(json.dumps({
+        "jsonrpc": "2.0", "method": "security/requestApproval", "params": {
+            "skill_name": "updateCustomerBalance",
+            "parameters": {"customer_id": "CUST001", "new_balance": 51000.00},
+            "reason": "Correction"
+        }, "id": 2
+    })))
+    served, busy = await overload
+    print(f"security/requestApproval during a burst ({len(busy)} reads shed): "
+          f"{response['result']['state'] if 'result' in response else response}")
+    assert busy and response["result"]["state"] == "approved"
+    print()
+
+    # Test 5: Metrics
+    print("Test 5: Admission Metrics")
+    print("-" * 60)
+    snapshot = admission.snapshot()
+    print(f"Global: {json.dumps(snapshot['global'])}")
+    for method, stats in snapshot["methods"].items():
+        print(f"{method}: {json.dumps(stats)}")
+    assert snapshot["global"]["max_in_flight"] == 8 and snapshot["global"]["in_flight"] == 0
+    assert snapshot["global"]["rejected_queue_full"] > 0
+    assert snapshot["methods"]["legacy/callSkill"]["max_in_flight"] == 1
+    assert snapshot["methods"]["legacy/callSkill"]["admitted"] == 10 - shed_calls
+    print()
+
+    print("=" * 60)
+    print("All admission control tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+"""
+Test script for the auto-approval policy engine.
+
+This script demonstrates:
+1. Compiling a declarative policy for the COBOL adapter
+2. Small transfers approved by policy, large ones escalated to a human
+3. Automatic rejection rules
+4. Rate windows that send bursts back to a human
+5. Auto-decisions in the audit trail, with the rule that fired
+"""
+
+import asyncio
+import json
+import time
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+from lep_py.security.policy import PolicyEngine
+
+POLICY = [
+    {
+        "name": "block-huge-corrections",
+        "skills": ["updateAccountBalance"],
+        "conditions": {"amount": {"abs_min": 1000000}},
+        "decision": "reject"
+    },
+    {
+        "name": "small-corrections",
+        "skills": ["updateAccountBalance"],
+        "conditions": {"amount": {"abs_max": 10}, "reason": {"matches": "(?i)correction"}}
+    },
+    {
+        "name": "small-internal-transfers",
+        "skills": ["transferFunds"],
+        "conditions": {
+            "amount": {"min": 0, "max": 500},
+            "from_account": {"in": ["ACC001", "ACC002", "ACC003"]},
+            "to_account": {"in": ["ACC001", "ACC002", "ACC003"]}
+        },
+        "rate_limit": {"count": 5, "window": 60, "key": "from_account"}
+    }
+]
+
+
+async def request(adapter, skill_name, parameters, reason="Routine operation"):
+    response = json.loads(await adapter.handle_request(json.dumps({
+        "jsonrpc": "2.0",
+        "method": "security/requestApproval",
+        "params": {"skill_name": skill_name, "parameters": parameters, "reason": reason},
+        "id": 1
+    })))
+    return response["result"]
+
+
+async def main():
+    print("=" * 60)
+    print("Auto-Approval Policy - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    adapter = COBOLMainframeAdapter("localhost", 23, "USER=ADMIN")
+    human_requests = []
+    original = adapter.request_human_approval
+
+    async def tracking_approval(skill_name, parameters, reason, estimated_impact):
+        human_requests.append(skill_name)
+        return await original(skill_name, parameters, reason, estimated_impact)
+    adapter.request_human_approval = tracking_approval
+
+    # Test 1: Compile
+    print("Test 1: Compile Policy")
+    print("-" * 60)
+    adapter.approval_policy = PolicyEngine(POLICY)
+    print(f"Compiled {len(adapter.approval_policy.rules)} rules")
+    assert len(adapter.approval_policy.rules) == len(POLICY)
+    print()
+
+    # Test 2: Approve small, escalate large
+    print("Test 2: Auto-approve vs Escalate")
+    print("-" * 60)
+    small = await request(adapter, "updateAccountBalance",
+                          {"account_id": "ACC001", "amount": 5.0, "reason": "Rounding correction"},
+                          reason="Rounding correction")
+    print(f"$5 correction: state={small['state']}, rule={small.get('rule')}")
+    assert (small["state"], small.get("rule")) == ("approved", "small-corrections") and not human_requests
+    large = await request(adapter, "updateAccountBalance",
+                          {"account_id": "ACC001", "amount": 5000.0, "reason": "Bonus"})
+    print(f"$5000 bonus: state={large['state']}, rule={large.get('rule')}, human requests={len(human_requests)}")
+    assert large.get("rule") is None and human_requests == ["updateAccountBalance"]
+    print()
+
+    # Test 3: Reject
+    print("Test 3: Automatic Rejection")
+    print("-" * 60)
+    huge = await request(adapter, "updateAccountBalance",
+                         {"account_id": "ACC002", "amount": -2500000.0, "reason": "Correction"})
+    print(f"-$2.5M correction: state={huge['state']}, rule={huge.get('rule')}, token={huge['approval_token']}")
+    assert (huge["state"], huge.get("rule"), huge["approval_token"]) == ("rejected", "block-huge-corrections", None)
+    print()
+
+    # Test 4: Rate window
+    print("Test 4: Rate Window")
+    print("-" * 60)
+    states = []
+    for _ in range(7):
+        decision = await request(adapter, "transferFunds",
+                                 {"from_account": "ACC001", "to_account": "ACC002", "amount": 100.0})
+        states.append(decision.get("rule") or "human")
+    print(f"7 transfers from ACC001: {states}")
+    assert states == ["small-internal-transfers"] * 5 + ["human"] * 2
+    other = await request(adapter, "transferFunds",
+                          {"from_account": "ACC003", "to_account": "ACC002", "amount": 100.0})
+    print(f"Transfer from ACC003: {other.get('rule') or 'human'}")
+    assert other.get("rule") == "small-internal-transfers"
+    batches = PolicyEngine([{
+        "name": "small-batches", "skills": ["importTransactions"],
+        "rate_limit": {"count": 2, "window": 60, "key": "accounts"}
+    }])
+    outcomes = [batches.evaluate("importTransactions", {"accounts": accounts})
+                for accounts in (["ACC001", "ACC002"], ["ACC001", "ACC002"], ["ACC001", "ACC002"], ["ACC003"],
+                                 {"from": "ACC001"}, {1, 2})]
+    print(f"Rate window keyed on list, dict and set values: "
+          f"{[outcome.rule if outcome else 'human' for outcome in outcomes]}")
+    assert [outcome.rule if outcome else "human" for outcome in outcomes] == \
+        ["small-batches", "small-batches", "human", "small-batches", "small-batches", "human"]
+    print()
+
+    # Test 5: Throughput and audit
+    print("Test 5: Throughput and Audit")
+    print("-" * 60)
+    started = time.perf_counter()
+    for i in range(1000):
+        await request(adapter, "updateAccountBalance",
+                      {"account_id": "ACC003", "amount": 1.0, "reason": f"Correction {i}"})
+    elapsed = time.perf_counter() - started
+    print(f"1000 auto-approved requests in {elapsed * 1000:.1f}ms ({elapsed:.3f}ms each)")
+    auto = [e for e in adapter.audit_trail if e.event_type == "approval_auto_decided"]
+    rules = [e.result["rule"] for e in auto]
+    print(f"Auto-decisions audited: {json.dumps({r: rules.count(r) for r in sorted(set(rules))})}")
+    assert rules.count("small-corrections") == 1001 and rules.count("block-huge-corrections") == 1
+    print()
+
+    print("=" * 60)
+    print("All approval policy tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
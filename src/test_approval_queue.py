@@ -0,0 +1,202 @@
+"""
+Test script for asynchronous approvals.
+
+This script demonstrates:
+1. Requesting approval without waiting for a human
+2. Polling, long-polling and listening for the decision
+3. Redeeming an approved decision with legacy/callSkill, by the requester only
+4. Rejection and expiry, and no self-approval over the agent API
+5. Pending approvals through the MCP bridge
+6. Many pending approvals without parked coroutines
+"""
+
+import asyncio
+import json
+from lep_py.adapter.example_adapter import CustomerDatabaseAdapter
+from lep_py.bridge.lep_mcp_bridge import LEPMCPBridge
+
+
+async def operator_call(adapter, method, params, request_id=1):
+    """Send a request to the adapter's operator API, as an operator console would."""
+    response = json.loads(await adapter.handle_operator_request(json.dumps({
+        "jsonrpc": "2.0", "method": method, "params": params, "id": request_id
+    })))
+    if response.get("error"):
+        raise Exception(response["error"]["message"])
+    return response["result"]
+
+
+async def call(adapter, method, params, request_id=1):
+    response = json.loads(await adapter.handle_request(json.dumps({
+        "jsonrpc": "2.0", "method": method, "params": params, "id": request_id
+    })))
+    if response.get("error"):
+        raise Exception(response["error"]["message"])
+    return response["result"]
+
+
+async def main():
+    print("=" * 60)
+    print("Asynchronous Approval Queue - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    adapter = CustomerDatabaseAdapter()
+    adapter.async_approvals = True
+    decisions = []
+    adapter.approval_queue.add_listener(lambda approval: decisions.append((approval.decision_id, approval.state.value)))
+    update = {"customer_id": "CUST001", "new_balance": 55000.00}
+
+    # Test 1: Request returns a pending decision at once
+    print("Test 1: Request Approval")
+    print("-" * 60)
+    pending = await call(adapter, "security/requestApproval", {
+        "skill_name": "updateCustomerBalance",
+        "parameters": update,
+        "reason": "Balance correction"
+    })
+    print(f"Response: {json.dumps(pending)}")
+    queue = await operator_call(adapter, "security/listPendingApprovals", {})
+    print(f"Pending approvals: {[a['decision_id'] for a in queue]}")
+    assert pending["state"] == "pending" and pending["approval_token"] is None
+    assert [a["decision_id"] for a in queue] == [pending["decision_id"]]
+    print()
+
+    # Test 2: Long-poll while an operator decides on another channel
+    print("Test 2: Await Decision")
+    print("-" * 60)
+    decision_id = pending["decision_id"]
+    polled = await call(adapter, "security/getApproval", {"decision_id": decision_id})
+    print(f"Poll before decision: {polled['state']}")
+    assert polled["state"] == "pending"
+
+    async def operator():
+        await asyncio.sleep(0.05)
+        return await operator_call(adapter, "security/decideApproval", {
+            "decision_id": decision_id, "approved": True, "decided_by": "ops-supervisor"
+        })
+
+    awaited, decided = await asyncio.gather(
+        call(adapter, "security/awaitApproval", {"decision_id": decision_id, "claim_token": pending["claim_token"],
+                                                 "timeout": 5}),
+        operator()
+    )
+    print(f"Operator saw: state={decided['state']}, token={decided['approval_token']}")
+    print(f"Requester saw: state={awaited['state']}, token issued={awaited['approval_token'] is not None}")
+    assert decided["approval_token"] is None and awaited["approval_token"] is not None
+    other = await call(adapter, "security/getApproval", {"decision_id": decision_id})
+    print(f"Poll without the claim token: state={other['state']}, token={other['approval_token']}")
+    assert other["approval_token"] is None
+    print(f"Listener notifications: {decisions}")
+    assert decisions == [(decision_id, "approved")]
+    print()
+
+    # Test 3: Redeem by decision ID
+    print("Test 3: Execute With Decision ID")
+    print("-" * 60)
+    try:
+        await call(adapter, "legacy/callSkill", {
+            "skill_name": "updateCustomerBalance", "parameters": update, "decision_id": decision_id
+        })
+        raise AssertionError("decision redeemed without the claim token")
+    except Exception as e:
+        print(f"Without the claim token: {e}")
+        assert "claim token" in str(e)
+    result = await call(adapter, "legacy/callSkill", {
+        "skill_name": "updateCustomerBalance",
+        "parameters": update,
+        "decision_id": decision_id,
+        "claim_token": pending["claim_token"]
+    })
+    print(f"Result: {json.dumps(result)}")
+    assert result["new_balance"] == update["new_balance"]
+    print()
+
+    # Test 4: Rejection and expiry
+    print("Test 4: Rejection and Expiry")
+    print("-" * 60)
+    rejected = await call(adapter, "security/requestApproval", {
+        "skill_name": "deleteCustomer", "parameters": {"customer_id": "CUST002"}, "reason": "Cleanup"
+    })
+    await operator_call(adapter, "security/decideApproval", {
+        "decision_id": rejected["decision_id"], "approved": False, "comment": "Customer still active"
+    })
+    try:
+        await call(adapter, "legacy/callSkill", {
+            "skill_name": "deleteCustomer",
+            "parameters": {"customer_id": "CUST002"},
+            "decision_id": rejected["decision_id"],
+            "claim_token": rejected["claim_token"]
+        })
+        raise AssertionError("rejected decision executed")
+    except Exception as e:
+        print(f"Rejected decision refused: {e}")
+        assert "rejected" in str(e)
+    try:
+        await call(adapter, "security/decideApproval", {"decision_id": rejected["decision_id"], "approved": True})
+        raise AssertionError("agent API accepted a decision")
+    except Exception as e:
+        print(f"Agent deciding over the agent API: {e}")
+        assert "not found" in str(e)
+    adapter.approval_queue.timeout = 0.05
+    expiring = await call(adapter, "security/requestApproval", {
+        "skill_name": "deleteCustomer", "parameters": {"customer_id": "CUST002"}, "reason": "Cleanup"
+    })
+    await asyncio.sleep(0.1)
+    expired = await call(adapter, "security/getApproval", {"decision_id": expiring["decision_id"]})
+    print(f"Undecided request after timeout: {expired['state']}")
+    assert expired["state"] == "expired"
+    adapter.approval_queue.timeout = 300.0
+    print()
+
+    # Test 5: MCP bridge returns instead of blocking
+    print("Test 5: MCP Bridge tools/call")
+    print("-" * 60)
+    bridge = LEPMCPBridge(adapter)
+    tool_call = {"name": "updateCustomerBalance", "arguments": {"customer_id": "CUST001", "new_balance": 56000.00}}
+    response = json.loads(await bridge.handle_mcp_request(json.dumps({
+        "jsonrpc": "2.0", "method": "tools/call", "params": tool_call, "id": 1
+    })))
+    pending = json.loads(response["result"]["content"][0]["text"])
+    print(f"First call: {pending['status']} ({pending['decision_id']})")
+    assert "_meta.decision_id" in pending["message"]
+    await operator_call(adapter, "security/decideApproval", {"decision_id": pending["decision_id"], "approved": True})
+    response = json.loads(await bridge.handle_mcp_request(json.dumps({
+        "jsonrpc": "2.0", "method": "tools/call", "params": {**tool_call, "decision_id": pending["decision_id"]}, "id": 2
+    })))
+    top_level = json.loads(response["result"]["content"][0]["text"])
+    print(f"decision_id outside _meta: {top_level['status']}")
+    assert top_level["status"] == "pending_approval"
+    response = json.loads(await bridge.handle_mcp_request(json.dumps({
+        "jsonrpc": "2.0", "method": "tools/call", "params": {**tool_call, "_meta": {"decision_id": pending["decision_id"]}}, "id": 2
+    })))
+    print(f"Second call: {response['result']['content'][0]['text']}")
+    assert json.loads(response["result"]["content"][0]["text"])["new_balance"] == 56000.00
+    print()
+
+    # Test 6: Many pending approvals, no parked coroutines
+    print("Test 6: Pending Approvals at Scale")
+    print("-" * 60)
+    tasks_before = len(asyncio.all_tasks())
+    for i in range(500):
+        await call(adapter, "security/requestApproval", {
+            "skill_name": "updateCustomerBalance",
+            "parameters": {"customer_id": "CUST001", "new_balance": float(i)},
+            "reason": "Bulk review"
+        })
+    print(f"Pending: {adapter.approval_queue.pending_count}, "
+          f"extra tasks: {len(asyncio.all_tasks()) - tasks_before}")
+    assert adapter.approval_queue.pending_count >= 500 and len(asyncio.all_tasks()) == tasks_before
+    print()
+
+    events = [e.event_type for e in adapter.audit_trail]
+    print(f"Audit: {json.dumps({t: events.count(t) for t in sorted(set(events))})}")
+    print()
+
+    print("=" * 60)
+    print("All approval queue tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
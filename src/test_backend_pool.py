@@ -0,0 +1,133 @@
+"""
+Test script for the backend driver, connection pool and mainframe simulator.
+
+This script demonstrates:
+1. Starting a local mainframe simulator with latency and error injection
+2. Warming up a connection pool through the COBOL adapter
+3. Concurrent skill execution over pooled connections
+4. Handshake cost with and without pooling
+5. Idle reaping and health checks
+"""
+
+import asyncio
+import json
+import time
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+from lep_py.driver.base import BackendError
+from lep_py.driver.pool import ConnectionPool
+from lep_py.driver.simulator import MainframeSimulator, TCPDriver
+
+
+async def main():
+    print("=" * 60)
+    print("Backend Connection Pool - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    # The "mainframe" runs the in-process COBOL programs of a second adapter
+    host_programs = COBOLMainframeAdapter("localhost", 0, "")
+    simulator = MainframeSimulator(
+        handler=lambda command, payload: host_programs._dispatch_skill(payload["skill_name"], payload["parameters"]),
+        handshake_latency=0.05,
+        latency=0.005,
+        jitter=0.005,
+        error_rate=0.02,
+        credentials={"USER": "ADMIN", "PASSWORD": "secret"},
+        seed=7
+    )
+    await simulator.start()
+    print(f"Simulator listening on port {simulator.port}")
+    print()
+
+    # Test 1: Warm-up through the adapter
+    print("Test 1: Pool Warm-up")
+    print("-" * 60)
+    adapter = COBOLMainframeAdapter(
+        mainframe_host="127.0.0.1",
+        mainframe_port=simulator.port,
+        connection_string="USER=ADMIN;PASSWORD=secret;POOL_MIN=4;POOL_MAX=8"
+    )
+    started = time.perf_counter()
+    pool = await adapter.connect_backend(max_concurrency_per_connection=4)
+    print(f"Warmed {pool.size} connections in {time.perf_counter() - started:.3f}s "
+          f"(handshakes run concurrently)")
+    assert pool.size == 4
+    print()
+
+    # Test 2: Concurrent calls
+    print("Test 2: Concurrent Skill Calls")
+    print("-" * 60)
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(adapter.call_skill_impl("getAccountInfo", {"account_id": "ACC002"}) for _ in range(200)),
+        return_exceptions=True
+    )
+    errors = [r for r in results if isinstance(r, BackendError)]
+    print(f"200 calls in {time.perf_counter() - started:.3f}s, "
+          f"{len(errors)} injected errors, pool stats: {json.dumps(pool.stats())}")
+    assert all(isinstance(r, (dict, BackendError)) for r in results)
+    assert pool.stats()["commands"] == 200 and pool.stats()["size"] <= 8
+    print()
+
+    # Test 3: Pooled vs connect-per-call
+    print("Test 3: Handshake Cost")
+    print("-" * 60)
+    driver = TCPDriver("127.0.0.1", simulator.port, {"USER": "ADMIN", "PASSWORD": "secret"})
+    started = time.perf_counter()
+    for _ in range(10):
+        connection = await driver.connect()
+        await connection.ping()
+        await connection.close()
+    unpooled = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(10):
+        await pool.execute("PING")
+    pooled = time.perf_counter() - started
+    print(f"10 sequential pings: connect-per-call {unpooled:.3f}s, pooled {pooled:.3f}s")
+    assert pooled < unpooled
+    print()
+
+    # Test 4: Idle reaping and health checks
+    print("Test 4: Idle Reaping and Health Checks")
+    print("-" * 60)
+    burst_pool = ConnectionPool(driver, min_size=1, max_size=6, max_idle_time=0.05, health_check_interval=0)
+    await burst_pool.start()
+    await asyncio.gather(*(burst_pool.execute("PING") for _ in range(12)))
+    burst_size = burst_pool.size
+    print(f"After burst: {burst_size} connections")
+    assert 1 < burst_size <= 6
+    await asyncio.sleep(0.1)
+    await burst_pool.run_maintenance()
+    print(f"After maintenance: {burst_pool.size} connections, reaped={burst_pool.stats_counters['reaped']}")
+    assert burst_pool.size == 1 and burst_pool.stats_counters["reaped"] == burst_size - 1
+    await burst_pool.close()
+
+    hung_pool = ConnectionPool(driver, min_size=2, max_size=2, health_check_interval=0, health_check_timeout=0.1)
+    await hung_pool.start()
+    hung = hung_pool._connections[0].connection
+
+    async def never_answers():
+        await asyncio.Event().wait()
+    hung.ping = never_answers
+    started = time.perf_counter()
+    await hung_pool.run_maintenance()
+    replaced = hung not in [p.connection for p in hung_pool._connections]
+    print(f"Maintenance with a hung connection: {time.perf_counter() - started:.2f}s, "
+          f"health_failures={hung_pool.stats_counters['health_failures']}, replaced: {replaced}, "
+          f"{hung_pool.size} connections")
+    assert replaced and hung_pool.stats_counters["health_failures"] == 1 and hung_pool.size == 2
+    await hung_pool.close()
+    print()
+
+    await adapter.disconnect_backend()
+    await simulator.stop()
+    print(f"Simulator stats: {json.dumps(simulator.stats)}")
+    print()
+
+    print("=" * 60)
+    print("All backend pool tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
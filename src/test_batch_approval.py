@@ -0,0 +1,151 @@
+"""
+Test script for batch approval tokens.
+
+This script demonstrates:
+1. One approval covering an envelope of 10,000 balance corrections
+2. Spends outside the envelope being refused
+3. An approval for an explicit list of operations
+4. Asynchronous batch approval through the approval queue
+5. Individual audit entries for every spend
+"""
+
+import asyncio
+import json
+import logging
+import time
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+
+
+async def call(adapter, method, params, request_id=1):
+    response = json.loads(await adapter.handle_request(json.dumps({
+        "jsonrpc": "2.0", "method": method, "params": params, "id": request_id
+    })))
+    if response.get("error"):
+        raise Exception(response["error"]["message"])
+    return response["result"]
+
+
+async def main():
+    print("=" * 60)
+    print("Batch Approval Tokens - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    logging.getLogger("lep_py.adapter.cobol_mainframe_adapter").setLevel(logging.WARNING)
+    adapter = COBOLMainframeAdapter("localhost", 23, "USER=ADMIN")
+
+    # Test 1: Envelope approval
+    print("Test 1: Envelope Approval for 10,000 Corrections")
+    print("-" * 60)
+    approval = await call(adapter, "security/requestBatchApproval", {
+        "envelope": {
+            "skills": ["updateAccountBalance"],
+            "accounts": ["ACC001", "ACC002", "ACC003"],
+            "max_total_amount": 1000.0,
+            "max_uses": 20000
+        },
+        "reason": "Year-end rounding corrections"
+    })
+    token = approval["approval_token"]
+    print(f"One approval: {approval['decision_id']} ({approval['state']})")
+    assert approval["state"] == "approved" and token
+    started = time.perf_counter()
+    for i in range(10000):
+        await call(adapter, "legacy/callSkill", {
+            "skill_name": "updateAccountBalance",
+            "parameters": {"account_id": f"ACC00{i % 3 + 1}", "amount": 0.05, "reason": "Rounding"},
+            "approval_token": token
+        })
+    usage = adapter.active_approvals[token]["grant"].usage()
+    print(f"10,000 corrections in {time.perf_counter() - started:.2f}s, usage: {json.dumps(usage)}")
+    assert usage["uses"] == 10000 and abs(usage["total_amount"] - 500.0) < 1e-6
+    print()
+
+    # Test 2: Outside the envelope
+    print("Test 2: Spends Outside the Envelope")
+    print("-" * 60)
+    for skill_name, parameters in [
+        ("updateAccountBalance", {"account_id": "ACC001", "amount": 600.0, "reason": "Over total"}),
+        ("updateAccountBalance", {"account_id": "ACC999", "amount": 0.01, "reason": "Other account"}),
+        ("transferFunds", {"from_account": "ACC001", "to_account": "ACC002", "amount": 0.01}),
+    ]:
+        try:
+            await call(adapter, "legacy/callSkill", {
+                "skill_name": skill_name, "parameters": parameters, "approval_token": token
+            })
+        except Exception as e:
+            print(f"  {skill_name}: {e}")
+            assert "Batch approval refused" in str(e)
+        else:
+            raise AssertionError(f"{skill_name} outside the envelope was executed")
+    print()
+
+    # Test 3: Explicit operations
+    print("Test 3: Explicit Operation List")
+    print("-" * 60)
+    operations = [
+        {"skill_name": "transferFunds", "parameters": {"from_account": "ACC003", "to_account": "ACC001", "amount": 250.0}},
+        {"skill_name": "updateAccountBalance", "parameters": {"account_id": "ACC002", "amount": -75.0, "reason": "Fee"}},
+    ]
+    approval = await call(adapter, "security/requestBatchApproval", {"operations": operations, "reason": "Ticket 4411"})
+    token = approval["approval_token"]
+    for op in operations:
+        await call(adapter, "legacy/callSkill", {**op, "approval_token": token})
+    print(f"Executed {len(operations)} listed operations; token retired: {token not in adapter.active_approvals}")
+    assert token not in adapter.active_approvals
+    try:
+        await call(adapter, "legacy/callSkill", {**operations[0], "approval_token": token})
+    except Exception as e:
+        print(f"Replay refused: {e}")
+        assert "Invalid or expired approval token" in str(e)
+    else:
+        raise AssertionError("a retired batch token was replayed")
+    print()
+
+    # Test 4: Asynchronous batch approval
+    print("Test 4: Asynchronous Batch Approval")
+    print("-" * 60)
+    pending = await call(adapter, "security/requestBatchApproval", {
+        "envelope": {"skills": ["updateAccountBalance"], "accounts": ["ACC001"], "max_uses": 2},
+        "reason": "Two corrections",
+        "async": True
+    })
+    print(f"Request: {pending['state']} ({pending['decision_id']})")
+    assert pending["state"] == "pending"
+    await adapter.invoke_operator("security/decideApproval", {"decision_id": pending["decision_id"], "approved": True})
+    for _ in range(2):
+        await call(adapter, "legacy/callSkill", {
+            "skill_name": "updateAccountBalance",
+            "parameters": {"account_id": "ACC001", "amount": 1.0, "reason": "Correction"},
+            "decision_id": pending["decision_id"],
+            "claim_token": pending["claim_token"]
+        })
+    print("Two operations executed against the decision")
+    try:
+        await call(adapter, "legacy/callSkill", {
+            "skill_name": "updateAccountBalance",
+            "parameters": {"account_id": "ACC001", "amount": 1.0, "reason": "Correction"},
+            "decision_id": pending["decision_id"],
+            "claim_token": pending["claim_token"]
+        })
+    except Exception as e:
+        print(f"Third operation refused: {e}")
+    else:
+        raise AssertionError("a third operation was executed against a two-use approval")
+    print()
+
+    # Test 5: Audit
+    print("Test 5: Audit Trail")
+    print("-" * 60)
+    events = [e.event_type for e in adapter.audit_trail]
+    print(f"Audit: {json.dumps({t: events.count(t) for t in sorted(set(events)) if not t.startswith('mainframe_')})}")
+    assert events.count("skill_executed") == events.count("batch_approval_spent") == 10004
+    print()
+
+    print("=" * 60)
+    print("All batch approval tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
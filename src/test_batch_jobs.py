@@ -0,0 +1,163 @@
+"""
+Test script for batch job submission on the COBOL mainframe adapter.
+
+This script demonstrates:
+1. Submitting a JCL job through legacy/callSkill and getting a job ID at once
+2. Polling job status and progress while the job runs
+3. Priority lanes (CLASS=A jobs start before queued CLASS=C jobs)
+4. Cancelling queued and running jobs, and resuming a cancelled interest run
+5. Batch job entries in the audit trail
+"""
+
+import asyncio
+import json
+import time
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+
+
+def rpc(method, params, request_id=1):
+    return json.dumps({"jsonrpc": "2.0", "method": method, "params": params, "id": request_id})
+
+
+async def call(adapter, skill_name, parameters):
+    """Request approval for a skill and execute it with the issued token."""
+    approval = json.loads(await adapter.handle_request(rpc("security/requestApproval", {
+        "skill_name": skill_name,
+        "parameters": parameters,
+        "reason": "Scheduled batch processing"
+    })))
+    approval_token = approval["result"]["approval_token"]
+    response = json.loads(await adapter.handle_request(rpc("legacy/callSkill", {
+        "skill_name": skill_name,
+        "parameters": parameters,
+        "approval_token": approval_token
+    })))
+    if response.get("error"):
+        raise Exception(response["error"]["message"])
+    return response["result"]
+
+
+EOD_JCL = """
+//EODJOB   JOB (ACCT),'END OF DAY',CLASS=B
+//* Post monthly interest, then produce statements
+//STEP1    EXEC PGM=INTCALC,PARM='RATE=0.0125'
+//STEP2    EXEC PGM=STMTGEN
+//SYSOUT   DD SYSOUT=*
+"""
+
+
+async def main():
+    print("=" * 60)
+    print("Batch Job Queue - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    adapter = COBOLMainframeAdapter("localhost", 23, "USER=ADMIN")
+    for i in range(4, 2004):
+        adapter.accounts[f"ACC{i:05d}"] = {"name": f"Customer {i}", "balance": 1000.0 + i, "status": "active"}
+        adapter.ledger.add_account(f"ACC{i:05d}", 1000.0 + i, "active")
+    adapter.batch_chunk_size = 200
+    adapter.batch_chunk_delay = 0.01
+    progress = []
+    adapter.job_queue.add_progress_listener(lambda job, update: progress.append(update.progress_percentage))
+
+    # Test 1: Submit returns immediately
+    print("Test 1: Submit Batch Job")
+    print("-" * 60)
+    started = time.perf_counter()
+    submitted = await call(adapter, "submitBatchJob", {"jcl": EOD_JCL})
+    print(f"Submitted in {(time.perf_counter() - started) * 1000:.1f}ms: {json.dumps(submitted)}")
+    assert submitted["state"] == "queued"
+    print()
+
+    # Test 2: Poll until finished
+    print("Test 2: Poll Job Status")
+    print("-" * 60)
+    job_id = submitted["job_id"]
+    while True:
+        status = await call(adapter, "getJobStatus", {"job_id": job_id})
+        print(f"  {status['state']:<10} {status['progress_percentage']:5.1f}%  {status['status_message']}")
+        if status["state"] in ("completed", "failed", "cancelled"):
+            break
+        await asyncio.sleep(0.05)
+    result = await call(adapter, "getJobResult", {"job_id": job_id})
+    for step in result["result"]["steps"]:
+        print(f"  {step['step']} {step['program']} RC={step['return_code']} {json.dumps(step['output'])}")
+    print(f"Progress notifications: {len(progress)}, "
+          f"ACC001 balance now {adapter.accounts['ACC001']['balance']:,.2f}")
+    assert status["state"] == "completed" and [s["program"] for s in result["result"]["steps"]] == ["INTCALC", "STMTGEN"]
+    assert result["result"]["steps"][0]["output"]["accounts_posted"] == len(adapter.accounts)
+    assert progress and progress == sorted(progress)
+    print()
+
+    # Test 3: Priority lanes
+    print("Test 3: Priority Lanes")
+    print("-" * 60)
+    low = [await call(adapter, "submitBatchJob", {"jcl": f"//LOW{i} JOB CLASS=C\n//S1 EXEC PGM=STMTGEN"})
+           for i in range(3)]
+    high = await call(adapter, "submitBatchJob", {"jcl": "//URGENT JOB CLASS=A\n//S1 EXEC PGM=STMTGEN"})
+    for job in low + [high]:
+        await adapter.job_queue.wait(job["job_id"], timeout=10)
+    order = sorted(low + [high], key=lambda j: adapter.job_queue.get(j["job_id"]).started_at)
+    print(f"Start order: {[j['job_name'] for j in order]}")
+    assert order.index(high) < order.index(low[-1])
+    print()
+
+    # Test 4: Cancellation
+    print("Test 4: Cancellation")
+    print("-" * 60)
+    running = [await call(adapter, "submitBatchJob", {"jcl": f"//BIG{i} JOB CLASS=B\n//S1 EXEC PGM=STMTGEN"})
+               for i in range(3)]
+    await asyncio.sleep(0.03)
+    for job in running:
+        cancelled = await call(adapter, "cancelBatchJob", {"job_id": job["job_id"]})
+        print(f"  {cancelled['job_id']} {cancelled['name']}: {cancelled['status_message']}")
+    await asyncio.sleep(0.01)
+    print(f"States: {[adapter.job_queue.get(j['job_id']).state.value for j in running]}")
+    assert all(adapter.job_queue.get(j["job_id"]).state.value == "cancelled" for j in running)
+    failed = await call(adapter, "submitBatchJob", {"jcl": "//BADJOB JOB CLASS=A\n//S1 EXEC PGM=NOSUCH"})
+    await adapter.job_queue.wait(failed["job_id"], timeout=5)
+    failure = await call(adapter, "getJobResult", {"job_id": failed["job_id"]})
+    print(f"Unknown program: {failure['error']}")
+    assert failure["state"] == "failed" and "S806" in failure["error"]
+    interest = await call(adapter, "submitBatchJob", {"jcl": "//INT1 JOB CLASS=A\n//S1 EXEC PGM=INTCALC,PARM='RATE=0.01'"})
+    await asyncio.sleep(0.035)
+    await call(adapter, "cancelBatchJob", {"job_id": interest["job_id"]})
+    await adapter.job_queue.wait(interest["job_id"], timeout=5)
+    partial = await call(adapter, "getJobResult", {"job_id": interest["job_id"]})
+    committed = partial["checkpoint"]["committed"]
+    postings = sum(1 for t in adapter.transactions if t["reason"] == f"Interest {interest['job_id']}")
+    print(f"Cancelled INTCALC {partial['state']}: step {partial['checkpoint']['step']}, "
+          f"{committed['accounts_posted']} accounts posted up to {committed['last_account_id']} "
+          f"({postings} postings recorded)")
+    assert partial["state"] == "cancelled" and committed["accounts_posted"] == postings
+    resumed = await call(adapter, "submitBatchJob", {
+        "jcl": f"//INT2 JOB CLASS=A\n//S1 EXEC PGM=INTCALC,PARM='RATE=0.01,AFTER={committed['last_account_id']}'"
+    })
+    await adapter.job_queue.wait(resumed["job_id"], timeout=10)
+    rest = (await call(adapter, "getJobResult", {"job_id": resumed["job_id"]}))["result"]["steps"][0]["output"]
+    posted_once = sum(1 for t in adapter.transactions
+                      if t["reason"] in (f"Interest {interest['job_id']}", f"Interest {resumed['job_id']}"))
+    eligible = sum(1 for a in adapter.accounts.values() if a["status"] == "active" and a["balance"] > 0)
+    print(f"Resumed after {committed['last_account_id']}: {rest['accounts_posted']} more, "
+          f"{posted_once} postings for {eligible} eligible accounts")
+    assert committed["accounts_posted"] + rest["accounts_posted"] == posted_once == eligible
+    print()
+
+    # Test 5: Audit trail
+    print("Test 5: Audit Trail")
+    print("-" * 60)
+    events = [e.event_type for e in adapter.audit_trail if e.event_type.startswith("mainframe_job")]
+    print(f"Job audit events: {json.dumps({t: events.count(t) for t in sorted(set(events))})}")
+    assert events.count("mainframe_job_cancelled") == 4 and events.count("mainframe_job_failed") == 1
+    print()
+
+    await adapter.shutdown_jobs()
+
+    print("=" * 60)
+    print("All batch job tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+"""
+Test script for the microbenchmark suite.
+
+This script demonstrates:
+1. Listing the benchmark cases
+2. A quick run at the smallest data sizes
+3. How each case scales with its data size
+4. Comparing with the stored baseline
+5. Catching an injected regression
+"""
+
+import copy
+import hashlib
+import json
+import os
+import tempfile
+from benchmarks import run as runner
+from benchmarks.cases import CASES
+from benchmarks.harness import compare, format_comparison, format_result, load_baseline, run, save_baseline
+from lep_py.adapter.base_adapter import BaseLEPAdapter
+
+
+def select(*names):
+    return [case for case in CASES if case.name in names]
+
+
+def main():
+    print("=" * 60)
+    print("Microbenchmark Suite - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    # Test 1: Cases
+    print("Test 1: Benchmark Cases")
+    print("-" * 60)
+    for case in CASES:
+        print(f"  {case.name:<30} sizes {', '.join(map(str, case.sizes))}")
+        assert list(case.sizes) == sorted(case.sizes)
+    assert len({case.name for case in CASES}) == len(CASES)
+    print()
+
+    # Test 2: Quick run
+    print("Test 2: Quick Run at the Smallest Sizes")
+    print("-" * 60)
+    smallest = {key: timing for case in CASES
+                for key, timing in run([case], sizes=[case.sizes[0]], min_time=0.02, repeats=3).items()}
+    for key, timing in smallest.items():
+        print(f"  {format_result(key, timing)}")
+        assert timing["min_us"] > 0
+    assert set(smallest) == {f"{case.name}[{case.sizes[0]}]" for case in CASES}
+    print()
+
+    # Test 3: Scaling
+    print("Test 3: Scaling with Data Size")
+    print("-" * 60)
+    scaling = run(select("audit.append", "audit.query", "approval.token_cycle", "cobol.account_report"),
+                  min_time=0.05, repeats=3)
+    growth = {}
+    for case in select("audit.append", "audit.query", "approval.token_cycle", "cobol.account_report"):
+        low, high = case.sizes[0] or 1, case.sizes[-1]
+        first = scaling[f"{case.name}[{case.sizes[0]}]"]["min_us"]
+        last = scaling[f"{case.name}[{case.sizes[-1]}]"]["min_us"]
+        print(f"  {case.name:<24} x{high // low:<5} data -> x{last / first:6.1f} time")
+        growth[case.name] = last / first
+    assert growth["audit.append"] < 10 < growth["audit.query"]
+    print()
+
+    # Test 4: Stored baseline
+    print("Test 4: Comparing with the Stored Baseline")
+    print("-" * 60)
+    baseline = load_baseline(runner.BASELINE_PATH)
+    environment = baseline["environment"]
+    print(f"Baseline: {len(baseline['results'])} results, recorded {environment['recorded_at']} "
+          f"on {environment['machine']} with Python {environment['python']}")
+    current = {**smallest, **scaling}
+    rows = [row for row in compare(current, baseline, threshold=0.25) if row["status"] != "missing"]
+    statuses = {}
+    for row in rows:
+        statuses[row["status"]] = statuses.get(row["status"], 0) + 1
+    print(f"{len(rows)} cases compared (quick timings, so informational): {json.dumps(statuses)}")
+    assert rows and set(statuses) <= {"ok", "improved", "regressed", "new"}
+    print()
+
+    # Test 5: Injected regression
+    print("Test 5: Catching an Injected Regression")
+    print("-" * 60)
+    directory = tempfile.mkdtemp(prefix="lep-bench-")
+    path = os.path.join(directory, "baseline.json")
+    cases = select("audit.append")
+    save_baseline(path, run(cases, min_time=0.05, repeats=3))
+    original = BaseLEPAdapter._log_audit_event
+
+    def hashed_audit_event(self, event_type, decision_id, skill_name, parameters, result):
+        # A plausible change: copy and fingerprint the parameters of every event
+        parameters = copy.deepcopy(parameters)
+        hashlib.sha256(json.dumps(parameters, sort_keys=True).encode()).hexdigest()
+        original(self, event_type, decision_id, skill_name, parameters, result)
+
+    BaseLEPAdapter._log_audit_event = hashed_audit_event
+    try:
+        rows = compare(run(cases, min_time=0.05, repeats=3), load_baseline(path), threshold=0.25)
+        print(format_comparison(rows))
+        print(f"Regressions flagged: {sum(row['status'] == 'regressed' for row in rows)} of {len(rows)}")
+        assert rows and all(row["status"] == "regressed" for row in rows)
+        print()
+        code = runner.main(["--filter", "audit.append", "--sizes", "1000", "--quick", "--compare",
+                            "--baseline", path])
+        print(f"Runner exit code with the regression: {code}")
+        assert code == 1
+    finally:
+        BaseLEPAdapter._log_audit_event = original
+    os.remove(path)
+    os.rmdir(directory)
+    print()
+
+    print("=" * 60)
+    print("All benchmark tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Test script for legacy/callSkills (several skill invocations per request).
+
+This script demonstrates:
+1. Best-effort execution with concurrent reads and per-operation results
+2. All-or-nothing execution that succeeds
+3. All-or-nothing execution that fails and compensates completed writes
+4. Refusing all-or-nothing batches with writes that cannot be undone
+5. Compensating when an operation is cancelled mid-batch
+"""
+
+import asyncio
+import json
+import logging
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+
+
+async def call(adapter, method, params, request_id=1):
+    response = json.loads(await adapter.handle_request(json.dumps({
+        "jsonrpc": "2.0", "method": method, "params": params, "id": request_id
+    })))
+    if response.get("error"):
+        raise Exception(response["error"]["message"])
+    return response["result"]
+
+
+async def approved(adapter, op_id, skill_name, parameters):
+    """Build a write operation carrying its own approval token."""
+    approval = await call(adapter, "security/requestApproval", {
+        "skill_name": skill_name, "parameters": parameters, "reason": "Agent task"
+    })
+    return {"id": op_id, "skill_name": skill_name, "parameters": parameters,
+            "approval_token": approval["approval_token"]}
+
+
+def balances(adapter):
+    return {account_id: round(account["balance"], 2) for account_id, account in adapter.accounts.items()}
+
+
+def show(reply):
+    print(f"succeeded={reply['succeeded']} rolled_back={reply['rolled_back']}")
+    for entry in reply["results"]:
+        detail = entry.get("error") or entry.get("compensation_error") or ""
+        print(f"  {entry['id']:<10} {entry['status']:<20} {detail}")
+
+
+async def main():
+    print("=" * 60)
+    print("legacy/callSkills - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    logging.getLogger("lep_py.adapter.cobol_mainframe_adapter").setLevel(logging.WARNING)
+    adapter = COBOLMainframeAdapter("localhost", 23, "USER=ADMIN")
+
+    # Test 1: Best effort
+    print("Test 1: Best Effort")
+    print("-" * 60)
+    reply = await call(adapter, "legacy/callSkills", {
+        "operations": [
+            {"id": "alice", "skill_name": "getAccountInfo", "parameters": {"account_id": "ACC001"}},
+            {"id": "bob", "skill_name": "getAccountInfo", "parameters": {"account_id": "ACC002"}},
+            {"id": "ghost", "skill_name": "getAccountInfo", "parameters": {"account_id": "ACC404"}},
+            await approved(adapter, "pay", "transferFunds",
+                           {"from_account": "ACC001", "to_account": "ACC002", "amount": 100.0}),
+            {"id": "after", "skill_name": "getAccountInfo", "parameters": {"account_id": "ACC002"}},
+        ]
+    })
+    show(reply)
+    print(f"Bob after transfer: {reply['results'][4]['result']['balance']:,.2f}")
+    assert [entry["status"] for entry in reply["results"]] == ["ok", "ok", "error", "ok", "ok"]
+    assert reply["results"][4]["result"]["balance"] == reply["results"][1]["result"]["balance"] + 100.0
+    print()
+
+    # Test 2: All or nothing, success
+    print("Test 2: All or Nothing (success)")
+    print("-" * 60)
+    reply = await call(adapter, "legacy/callSkills", {
+        "mode": "all_or_nothing",
+        "operations": [
+            await approved(adapter, "fee", "updateAccountBalance",
+                           {"account_id": "ACC003", "amount": -25.0, "reason": "Wire fee"}),
+            await approved(adapter, "wire", "transferFunds",
+                           {"from_account": "ACC003", "to_account": "ACC001", "amount": 1000.0}),
+        ]
+    })
+    show(reply)
+    assert reply["succeeded"] and [entry["status"] for entry in reply["results"]] == ["ok", "ok"]
+    print()
+
+    # Test 3: All or nothing, failure and compensation
+    print("Test 3: All or Nothing (failure)")
+    print("-" * 60)
+    before = balances(adapter)
+    reply = await call(adapter, "legacy/callSkills", {
+        "mode": "all_or_nothing",
+        "operations": [
+            await approved(adapter, "credit", "updateAccountBalance",
+                           {"account_id": "ACC001", "amount": 500.0, "reason": "Refund"}),
+            await approved(adapter, "move", "transferFunds",
+                           {"from_account": "ACC001", "to_account": "ACC003", "amount": 300.0}),
+            await approved(adapter, "overdraw", "transferFunds",
+                           {"from_account": "ACC002", "to_account": "ACC001", "amount": 10000000.0}),
+            {"id": "report", "skill_name": "getAccountInfo", "parameters": {"account_id": "ACC001"}},
+        ]
+    })
+    show(reply)
+    print(f"Balances restored: {balances(adapter) == before}")
+    assert [entry["status"] for entry in reply["results"]] == ["compensated", "compensated", "error", "skipped"]
+    assert reply["rolled_back"] and balances(adapter) == before
+    print()
+
+    # Test 4: Writes without compensation
+    print("Test 4: Writes Without Compensation")
+    print("-" * 60)
+    try:
+        await call(adapter, "legacy/callSkills", {
+            "mode": "all_or_nothing",
+            "operations": [
+                await approved(adapter, "job", "submitBatchJob", {"jcl": "//J JOB\n//S EXEC PGM=STMTGEN"}),
+                {"id": "read", "skill_name": "getAccountInfo", "parameters": {"account_id": "ACC001"}},
+            ]
+        })
+    except Exception as e:
+        print(f"Refused: {e}")
+        assert "cannot be compensated" in str(e)
+    else:
+        raise AssertionError("an all-or-nothing batch with an irreversible write was run")
+    print()
+
+    # Test 5: An operation cancelled under the batch
+    print("Test 5: Cancelled Operation")
+    print("-" * 60)
+    skill_impl = adapter.call_skill_impl
+
+    async def dropped_connection(skill_name, parameters):
+        if skill_name == "getAccountInfo":
+            raise asyncio.CancelledError()
+        return await skill_impl(skill_name, parameters)
+
+    adapter.call_skill_impl = dropped_connection
+    before = balances(adapter)
+    reply = await call(adapter, "legacy/callSkills", {
+        "mode": "all_or_nothing",
+        "operations": [
+            await approved(adapter, "credit", "updateAccountBalance",
+                           {"account_id": "ACC002", "amount": 75.0, "reason": "Goodwill"}),
+            {"id": "check", "skill_name": "getAccountInfo", "parameters": {"account_id": "ACC002"}},
+        ]
+    })
+    adapter.call_skill_impl = skill_impl
+    show(reply)
+    print(f"Balances restored: {balances(adapter) == before}")
+    assert reply["rolled_back"] and reply["results"][0]["status"] == "compensated"
+    assert balances(adapter) == before
+    print()
+
+    events = [e.event_type for e in adapter.audit_trail if not e.event_type.startswith("mainframe_")]
+    print(f"Audit: {json.dumps({t: events.count(t) for t in sorted(set(events))})}")
+    assert events.count("skill_compensated") == 3 and events.count("skills_batch_executed") == 4
+    print()
+
+    await adapter.shutdown_jobs()
+
+    print("=" * 60)
+    print("All callSkills tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
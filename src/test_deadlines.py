@@ -0,0 +1,137 @@
+"""
+Test script for request deadlines and per-skill timeouts.
+
+This script demonstrates:
+1. Bounding calls to a mainframe with stuck sessions
+2. Per-skill default timeouts
+3. An approval token surviving a timed-out write
+4. Deadlines on MCP tool calls and multi-operation batches
+5. Cancellation reaching the backend
+"""
+
+import asyncio
+import json
+import logging
+import time
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+from lep_py.bridge.lep_mcp_bridge import LEPMCPBridge
+from lep_py.driver.simulator import MainframeSimulator
+
+
+async def rpc(adapter, method, params, request_id=1):
+    return json.loads(await adapter.handle_request(json.dumps({
+        "jsonrpc": "2.0", "method": method, "params": params, "id": request_id
+    })))
+
+
+async def main():
+    print("=" * 60)
+    print("Request Deadlines - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    logging.getLogger("lep_py.adapter.cobol_mainframe_adapter").setLevel(logging.WARNING)
+    host_programs = COBOLMainframeAdapter("localhost", 0, "")
+    simulator = MainframeSimulator(
+        handler=lambda command, payload: host_programs._dispatch_skill(payload["skill_name"], payload["parameters"]),
+        handshake_latency=0.01, latency=0.005, hang_rate=0.2, seed=11
+    )
+    await simulator.start()
+    adapter = COBOLMainframeAdapter("127.0.0.1", simulator.port, "POOL_MIN=4;POOL_MAX=8")
+    pool = await adapter.connect_backend(max_concurrency_per_connection=8)
+
+    # Test 1: Request timeouts
+    print("Test 1: Stuck Mainframe Sessions")
+    print("-" * 60)
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(rpc(adapter, "legacy/callSkill", {
+        "skill_name": "getAccountInfo", "parameters": {"account_id": "ACC001"}, "timeout": 0.2
+    }, i) for i in range(100)))
+    elapsed = time.perf_counter() - started
+    expired = [r["error"] for r in responses if r.get("error") and r["error"]["code"] == -32005]
+    print(f"100 calls with a 0.2s timeout: {100 - len(expired)} answered, {len(expired)} expired, "
+          f"all done in {elapsed:.2f}s")
+    print(f"Error: {expired[0]['message']}")
+    print(f"Pool after: {pool.stats()['in_flight']} in flight")
+    assert 0 < len(expired) < 100 and elapsed < 1.0
+    assert "exceeded its deadline of 0.2s" in expired[0]["message"] and pool.stats()["in_flight"] == 0
+    print()
+
+    # Test 2: Per-skill default
+    print("Test 2: Per-skill Default Timeout")
+    print("-" * 60)
+    adapter.skill_timeouts["getAccountInfo"] = 0.1
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(rpc(adapter, "legacy/callSkill", {
+        "skill_name": "getAccountInfo", "parameters": {"account_id": "ACC002"}
+    }, i) for i in range(50)))
+    expired = sum(1 for r in responses if r.get("error"))
+    elapsed = time.perf_counter() - started
+    print(f"50 calls without a request timeout: {expired} expired at the 0.1s skill default, "
+          f"done in {elapsed:.2f}s")
+    assert 0 < expired < 50 and elapsed < 1.0
+    print()
+
+    # Test 3: Approval token after a timeout
+    print("Test 3: Timed-out Write Keeps Its Approval")
+    print("-" * 60)
+    call = {"skill_name": "updateAccountBalance",
+            "parameters": {"account_id": "ACC003", "amount": 10.0, "reason": "Test"}}
+    approval = await adapter._handle_request_approval({**call, "reason": "Test"})
+    simulator.hang_rate = 1.0
+    first = await rpc(adapter, "legacy/callSkill", {**call, "approval_token": approval["approval_token"], "timeout": 0.1})
+    simulator.hang_rate = 0.0
+    retry = await rpc(adapter, "legacy/callSkill", {**call, "approval_token": approval["approval_token"]})
+    print(f"First attempt: {first['error']['message']}")
+    print(f"Retry with the same token: balance {retry['result']['account']['balance']:,.2f}")
+    print(f"Audited timeouts: {sum(1 for e in adapter.audit_trail if e.event_type == 'skill_timed_out')}")
+    assert "exceeded its deadline of 0.1s" in first["error"]["message"]
+    assert retry["result"]["account"]["balance"] == 120010.0
+    assert any(e.event_type == "skill_timed_out" and e.skill_name == "updateAccountBalance"
+               for e in adapter.audit_trail)
+    print()
+
+    # Test 4: Bridge and batch deadlines
+    print("Test 4: MCP Tool Call and Batch Deadlines")
+    print("-" * 60)
+    bridge = LEPMCPBridge(adapter)
+    await bridge.handle_mcp_request(json.dumps({"jsonrpc": "2.0", "method": "initialize", "params": {}, "id": 1}))
+    simulator.hang_rate = 1.0
+    response = json.loads(await bridge.handle_mcp_request(json.dumps({
+        "jsonrpc": "2.0", "method": "tools/call", "id": 2,
+        "params": {"name": "getAccountInfo", "arguments": {"account_id": "ACC001"}, "_meta": {"timeout": 0.05}}
+    })))
+    print(f"tools/call: error {response['error']['code']}: {response['error']['message']}")
+    assert response["error"]["code"] == -32005
+    adapter.skill_timeouts.pop("getAccountInfo")
+    started = time.perf_counter()
+    batch = await adapter._handle_call_skills({
+        "operations": [{"id": f"read{i}", "skill_name": "getAccountInfo", "parameters": {"account_id": "ACC001"}}
+                       for i in range(3)],
+        "timeout": 0.1
+    })
+    elapsed = time.perf_counter() - started
+    print(f"callSkills with a 0.1s batch timeout: {[r['status'] for r in batch['results']]} "
+          f"in {elapsed:.2f}s")
+    assert [r["status"] for r in batch["results"]] == ["error"] * 3 and elapsed < 1.0
+    simulator.hang_rate = 0.0
+    print()
+
+    # Test 5: Backend cancellation
+    print("Test 5: Cancellation at the Backend")
+    print("-" * 60)
+    await asyncio.sleep(0.05)
+    print(f"Simulator stats: {json.dumps(simulator.stats)}")
+    assert simulator.stats["cancelled"] > 0 and simulator.stats["errors"] == 0
+    print()
+
+    await adapter.close()
+    await simulator.stop()
+
+    print("=" * 60)
+    print("All deadline tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,290 @@
+"""
+Test script for the MCP streamable HTTP server.
+
+This script demonstrates:
+1. Opening sessions with initialize, one LEP handshake, and Origin checks
+2. Keep-alive connections versus a connection per request
+3. SSE streaming of a tool call's progress and result
+4. Routing job notifications to the session that submitted the job
+5. The concurrency limit under a burst of slow calls
+6. Hundreds of clients served by one bridge process
+7. Approval decisions and spilled results scoped to their session
+8. Ending a session and stopping the server
+"""
+
+import asyncio
+import json
+import logging
+import time
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+from lep_py.adapter.example_adapter import CustomerDatabaseAdapter
+from lep_py.bridge.http_server import HTTPMCPServer
+from lep_py.bridge.lep_mcp_bridge import LEPMCPBridge
+
+
+class SlowCustomerAdapter(CustomerDatabaseAdapter):
+    """Customer adapter whose reads take a while, like a busy legacy host."""
+
+    async def call_skill_impl(self, skill_name, parameters):
+        if skill_name == "getCustomerInfo":
+            await asyncio.sleep(0.3)
+        return await super().call_skill_impl(skill_name, parameters)
+
+
+class HTTPClient:
+    """Minimal keep-alive HTTP/1.1 client for the MCP endpoint."""
+
+    def __init__(self, port, session_id=None):
+        self.port = port
+        self.session_id = session_id
+        self.reader = self.writer = None
+        self.next_id = 0
+
+    async def send(self, method, message=None, accept="application/json, text/event-stream", origin=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+        body = json.dumps(message).encode() if message is not None else b""
+        headers = [f"{method} /mcp HTTP/1.1", "Host: localhost", f"Accept: {accept}",
+                   "Content-Type: application/json", f"Content-Length: {len(body)}"]
+        if self.session_id:
+            headers.append(f"Mcp-Session-Id: {self.session_id}")
+        if origin:
+            headers.append(f"Origin: {origin}")
+        self.writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + body)
+        status = int((await self.reader.readline()).split()[1])
+        response_headers = {}
+        while True:
+            line = (await self.reader.readline()).decode().strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            response_headers[name.lower()] = value.strip()
+        self.session_id = response_headers.get("mcp-session-id", self.session_id)
+        return status, response_headers
+
+    async def events(self):
+        """Yield the JSON messages of a chunked SSE response until it ends."""
+        while True:
+            size = int((await self.reader.readline()).strip(), 16)
+            if size == 0:
+                await self.reader.readline()
+                return
+            chunk = (await self.reader.readexactly(size + 2)).decode()
+            for line in chunk.splitlines():
+                if line.startswith("data: "):
+                    yield json.loads(line[6:])
+
+    async def call(self, method, params=None, notify=False, **kwargs):
+        message = {"jsonrpc": "2.0", "method": method, "params": params or {}}
+        if not notify:
+            self.next_id += 1
+            message["id"] = self.next_id
+        status, headers = await self.send("POST", message, **kwargs)
+        if headers.get("content-type") == "text/event-stream":
+            return status, [event async for event in self.events()]
+        body = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        return status, json.loads(body) if body and status == 200 else body.decode()
+
+    async def initialize(self, name):
+        return await self.call("initialize", {"clientInfo": {"name": name}})
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+async def main():
+    print("=" * 60)
+    print("MCP HTTP Server - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    logging.getLogger("lep_py.adapter.cobol_mainframe_adapter").setLevel(logging.WARNING)
+    bridge = LEPMCPBridge({"cobol": COBOLMainframeAdapter("localhost", 23, "USER=ADMIN"),
+                           "crm": SlowCustomerAdapter()})
+    server = HTTPMCPServer(bridge, max_concurrency=4, queue_timeout=0.5, sse_ping_interval=0.2)
+    await server.start()
+
+    # Test 1: Sessions
+    print("Test 1: Sessions")
+    print("-" * 60)
+    alice, bob = HTTPClient(server.port), HTTPClient(server.port)
+    _, info = await alice.initialize("Alice")
+    await bob.initialize("Bob")
+    print(f"Server: {info['result']['serverInfo']['name']}")
+    print(f"Alice session {alice.session_id[:8]}..., Bob session {bob.session_id[:8]}..., "
+          f"distinct: {alice.session_id != bob.session_id}")
+    assert info["result"]["serverInfo"]["name"] == "LEP Bridge (cobol, crm)"
+    assert alice.session_id != bob.session_id
+    status, _ = await HTTPClient(server.port).call("tools/list")
+    print(f"Request without a session: HTTP {status}")
+    assert status == 400
+    handshakes = {ns: sum(1 for e in adapter.audit_trail if e.event_type == "session_initialized")
+                  for ns, adapter in bridge.adapters.items()}
+    print(f"LEP handshakes after two initializes: {handshakes}")
+    assert handshakes == {"cobol": 1, "crm": 1}
+    for origin in ("http://localhost:3000", "http://evil.example.com", "http://127.0.0.1.evil.example.com"):
+        status, _ = await alice.call("ping", origin=origin)
+        print(f"Origin {origin}: HTTP {status}")
+        assert status == (200 if origin == "http://localhost:3000" else 403)
+    for length in ("abc", "-5"):
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        writer.write(f"POST /mcp HTTP/1.1\r\nHost: localhost\r\nContent-Length: {length}\r\n\r\n".encode())
+        status = int((await reader.readline()).split()[1])
+        writer.close()
+        print(f"Content-Length {length!r}: HTTP {status}")
+        assert status == 400
+    print()
+
+    # Test 2: Keep-alive
+    print("Test 2: Keep-alive")
+    print("-" * 60)
+    started = time.perf_counter()
+    for _ in range(200):
+        await alice.call("ping")
+    kept = time.perf_counter() - started
+    started = time.perf_counter()
+    for _ in range(200):
+        client = HTTPClient(server.port, alice.session_id)
+        await client.call("ping")
+        client.close()
+    fresh = time.perf_counter() - started
+    print(f"200 pings: one connection {kept * 1000:.0f}ms, connection per request {fresh * 1000:.0f}ms")
+    assert kept < fresh
+    print()
+
+    # Test 3: SSE tool call
+    print("Test 3: Streaming a Tool Call")
+    print("-" * 60)
+    _, events = await alice.call("tools/call", {
+        "name": "cobol__updateAccountBalance",
+        "arguments": {"account_id": "ACC001", "amount": 100.0, "reason": "Test"},
+        "_meta": {"progressToken": "update-1"}
+    })
+    assert [e.get("method") for e in events[:-1]] == ["notifications/progress"] * (len(events) - 1)
+    assert json.loads(events[-1]["result"]["content"][0]["text"])["account"]["balance"] == 50100.0
+    for event in events:
+        if event.get("method") == "notifications/progress":
+            print(f"  progress {event['params']['progress']}/{event['params']['total']}: {event['params']['message']}")
+        else:
+            print(f"  result: {event['result']['content'][0]['text']}")
+    print()
+
+    # Test 4: Notification routing
+    print("Test 4: Session Notification Routing")
+    print("-" * 60)
+    alice_stream, bob_stream = HTTPClient(server.port, alice.session_id), HTTPClient(server.port, bob.session_id)
+    received = {"alice": [], "bob": []}
+
+    async def listen(client, name):
+        await client.send("GET", accept="text/event-stream")
+        async for event in client.events():
+            received[name].append(event)
+    listeners = [asyncio.create_task(listen(alice_stream, "alice")), asyncio.create_task(listen(bob_stream, "bob"))]
+    _, submitted = await alice.call("tools/call", {
+        "name": "cobol__submitBatchJob",
+        "arguments": {"jcl": "//STMTS JOB CLASS=A\n//S1 EXEC PGM=STMTGEN"}
+    }, accept="application/json")
+    job_id = json.loads(submitted["result"]["content"][0]["text"])["job_id"]
+    for _ in range(50):
+        if any(e["params"]["data"].get("state") == "completed" for e in received["alice"]):
+            break
+        await asyncio.sleep(0.05)
+    states = [e["params"]["data"]["state"] for e in received["alice"] if e["params"]["data"].get("job_id") == job_id]
+    print(f"Alice's stream: {job_id} {' -> '.join(dict.fromkeys(states))}")
+    print(f"Bob's stream: {len(received['bob'])} notifications")
+    assert states and states[-1] == "completed" and not received["bob"]
+    print()
+
+    # Test 5: Concurrency limit
+    print("Test 5: Concurrency Limit")
+    print("-" * 60)
+    burst = [HTTPClient(server.port, bob.session_id) for _ in range(20)]
+    started = time.perf_counter()
+    results = await asyncio.gather(*(client.call("tools/call", {
+        "name": "crm__getCustomerInfo", "arguments": {"customer_id": "CUST001"}
+    }, accept="application/json") for client in burst))
+    busy = sum(1 for _, body in results if (body.get("error") or {}).get("message") == "Server busy")
+    print(f"20 calls of 0.3s with 4 slots and a 0.5s queue limit: {20 - busy} served, {busy} told "
+          f"the server is busy, in {time.perf_counter() - started:.2f}s")
+    assert busy > 0 and 20 - busy >= 4
+    assert all("result" in body for _, body in results if (body.get("error") or {}).get("message") != "Server busy")
+    for client in burst:
+        client.close()
+    print()
+
+    # Test 6: Many clients
+    print("Test 6: Many Clients")
+    print("-" * 60)
+    clients = [HTTPClient(server.port) for _ in range(300)]
+    started = time.perf_counter()
+
+    async def session(client, i):
+        await client.initialize(f"Agent {i}")
+        _, body = await client.call("tools/call", {
+            "name": "cobol__getAccountInfo", "arguments": {"account_id": "ACC002"}
+        }, accept="application/json")
+        return "result" in body
+    ok = await asyncio.gather(*(session(client, i) for i, client in enumerate(clients)))
+    print(f"{sum(ok)} of 300 clients initialized and called a tool in {time.perf_counter() - started:.2f}s, "
+          f"{len(server.sessions)} sessions open")
+    assert all(ok) and len(server.sessions) == 302
+    for client in clients:
+        client.close()
+    print()
+
+    # Test 7: Session-scoped decisions and spilled results
+    print("Test 7: Session-Scoped Decisions and Results")
+    print("-" * 60)
+    crm = bridge.adapters["crm"]
+    crm.async_approvals = True
+    update = {"name": "crm__updateCustomerBalance", "arguments": {"customer_id": "CUST001", "new_balance": 56000.00}}
+    _, body = await alice.call("tools/call", update, accept="application/json")
+    pending = json.loads(body["result"]["content"][0]["text"])
+    await crm.invoke_operator("security/decideApproval", {"decision_id": pending["decision_id"], "approved": True})
+    _, body = await bob.call("tools/call", {**update, "_meta": {"decision_id": pending["decision_id"]}}, accept="application/json")
+    print(f"Bob redeems Alice's {pending['decision_id']}: {body['error']['message']}")
+    assert "Unknown decision" in body["error"]["message"]
+    _, body = await alice.call("tools/call", {**update, "_meta": {"decision_id": pending["decision_id"]}}, accept="application/json")
+    print(f"Alice redeems it: {body['result']['content'][0]['text']}")
+    assert json.loads(body["result"]["content"][0]["text"])["new_balance"] == 56000.0
+    crm.async_approvals = False
+    bridge.max_result_bytes = 64
+    _, body = await alice.call("tools/call", {
+        "name": "cobol__getAccountInfo", "arguments": {"account_id": "ACC002"}
+    }, accept="application/json")
+    bridge.max_result_bytes = 64 * 1024
+    uri = body["result"]["content"][1]["uri"]
+    _, body = await bob.call("resources/read", {"uri": uri})
+    print(f"Bob reads Alice's {uri}: {body['error']['message']}")
+    assert "not found" in body["error"]["message"]
+    _, body = await alice.call("resources/read", {"uri": uri})
+    print(f"Alice reads it: {len(body['result']['contents'][0]['text'])} characters")
+    assert body["result"]["contents"][0]["text"]
+    print()
+
+    # Test 8: Ending sessions and stopping
+    print("Test 8: Session End and Shutdown")
+    print("-" * 60)
+    status, _ = await bob.send("DELETE")
+    status_after, _ = await bob.call("ping")
+    print(f"DELETE: HTTP {status}, then ping: HTTP {status_after}")
+    assert (status, status_after) == (200, 404)
+    await server.stop()
+    await asyncio.gather(*listeners, return_exceptions=True)
+    print(f"Server stopped: {json.dumps(server.stats)}")
+    assert server.stats["rejected"] == busy
+    shutdowns = [sum(1 for e in adapter.audit_trail if e.event_type == "session_shutdown")
+                 for adapter in bridge.adapters.values()]
+    print(f"LEP sessions shut down: {shutdowns}")
+    assert shutdowns == [1, 1]
+    print()
+
+    print("=" * 60)
+    print("All HTTP server tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,189 @@
+"""
+Test script for the JSON-RPC interceptor chain.
+
+This script demonstrates:
+1. Observing method, params, result, error and timing
+2. Short-circuiting reads with a caching interceptor
+3. Answering with a JSON-RPC error from an interceptor
+4. Method-scoped chains and their per-call cost
+5. Adapter interceptors seeing calls made through the MCP bridge
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+from lep_py.bridge.lep_mcp_bridge import LEPMCPBridge
+from lep_py.core.middleware import RPCError
+from lep_py.models.protocol import LEPErrorCode, OperationType
+
+
+def rpc(method, params, request_id=1):
+    return json.dumps({"jsonrpc": "2.0", "method": method, "params": params, "id": request_id})
+
+
+class CallLog:
+    """Records every call: method, skill, outcome and time."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def __call__(self, call, call_next):
+        try:
+            result = await call_next(call)
+            self.calls.append((call.method, call.params.get("skill_name"), "ok", call.elapsed))
+            return result
+        except Exception as e:
+            self.calls.append((call.method, call.params.get("skill_name"), f"error: {e}", call.elapsed))
+            raise
+
+
+class ReadCache:
+    """Answers repeated read skill calls from memory."""
+
+    def __init__(self, adapter):
+        self.adapter = adapter
+        self.entries = {}
+        self.hits = 0
+
+    async def __call__(self, call, call_next):
+        skill_name = call.params.get("skill_name")
+        if self.adapter.get_operation_type(skill_name) != OperationType.READ:
+            return await call_next(call)
+        key = (skill_name, json.dumps(call.params.get("parameters", {}), sort_keys=True))
+        if key in self.entries:
+            self.hits += 1
+            return self.entries[key]
+        result = self.entries[key] = await call_next(call)
+        return result
+
+
+async def operators_only(call, call_next):
+    if call.params.get("decided_by") not in ("alice", "bob"):
+        raise RPCError(LEPErrorCode.PERMISSION_DENIED, "Only operators may decide approvals")
+    return await call_next(call)
+
+
+async def passthrough(call, call_next):
+    return await call_next(call)
+
+
+async def main():
+    print("=" * 60)
+    print("Interceptor Chain - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    logging.getLogger("lep_py.adapter.cobol_mainframe_adapter").setLevel(logging.WARNING)
+    adapter = COBOLMainframeAdapter("localhost", 23, "USER=ADMIN")
+
+    # Test 1: Observing calls
+    print("Test 1: Observing Calls")
+    print("-" * 60)
+    log = CallLog()
+    adapter.rpc_handler.add_interceptor(log)
+    await adapter.handle_request(rpc("legacy/listSkills", {}))
+    await adapter.handle_request(rpc("legacy/callSkill", {"skill_name": "getAccountInfo",
+                                                          "parameters": {"account_id": "ACC001"}}))
+    await adapter.handle_request(rpc("legacy/callSkill", {"skill_name": "getAccountInfo",
+                                                          "parameters": {"account_id": "NOPE"}}))
+    for method, skill_name, outcome, elapsed in log.calls:
+        print(f"  {method:<18} {skill_name or '-':<16} {elapsed * 1e6:7.1f}us  {outcome}")
+    assert [(m, s, o.split(":")[0]) for m, s, o, _ in log.calls] == [
+        ("legacy/listSkills", None, "ok"), ("legacy/callSkill", "getAccountInfo", "ok"),
+        ("legacy/callSkill", "getAccountInfo", "error")]
+    print()
+
+    # Test 2: Short-circuiting reads
+    print("Test 2: Caching Interceptor")
+    print("-" * 60)
+    cache = ReadCache(adapter)
+    adapter.rpc_handler.add_interceptor(cache, methods=["legacy/callSkill"])
+    backend_calls = defaultdict(int)
+    call_skill_impl = adapter.call_skill_impl
+
+    async def counted(skill_name, parameters):
+        backend_calls[skill_name] += 1
+        return await call_skill_impl(skill_name, parameters)
+    adapter.call_skill_impl = counted
+    for i in range(100):
+        await adapter.handle_request(rpc("legacy/callSkill", {"skill_name": "getAccountInfo",
+                                                              "parameters": {"account_id": f"ACC00{i % 3 + 1}"}}))
+    print(f"100 reads of 3 accounts: {backend_calls['getAccountInfo']} reached the adapter, {cache.hits} cache hits")
+    assert backend_calls["getAccountInfo"] == 3 and cache.hits == 97
+    adapter.rpc_handler.remove_interceptor(cache)
+    adapter.call_skill_impl = call_skill_impl
+    print()
+
+    # Test 3: Errors from interceptors
+    print("Test 3: Short-circuit With an Error")
+    print("-" * 60)
+    adapter.async_approvals = True
+    adapter.operator_handler.add_interceptor(operators_only, methods=["security/decideApproval"])
+    pending = json.loads(await adapter.handle_request(rpc("security/requestApproval", {
+        "skill_name": "updateAccountBalance",
+        "parameters": {"account_id": "ACC001", "amount": 10.0, "reason": "Test"},
+        "reason": "Test"
+    })))["result"]
+    outcomes = []
+    for decided_by in ("mallory", "alice"):
+        response = json.loads(await adapter.handle_operator_request(rpc("security/decideApproval", {
+            "decision_id": pending["decision_id"], "approved": True, "decided_by": decided_by
+        })))
+        outcome = response["error"] or response["result"]["state"]
+        print(f"  decided_by={decided_by:<8} -> {json.dumps(outcome)}")
+        outcomes.append(outcome)
+    assert outcomes[0]["message"] == "Only operators may decide approvals" and outcomes[1] == "approved"
+    print()
+
+    # Test 4: Method-scoped chains
+    print("Test 4: Chain Composition and Cost")
+    print("-" * 60)
+    chains = {}
+    for handler, method in ((adapter.rpc_handler, "legacy/callSkill"), (adapter.rpc_handler, "legacy/listSkills"),
+                            (adapter.rpc_handler, "session/initialize"),
+                            (adapter.operator_handler, "security/decideApproval")):
+        names = [getattr(i, "__qualname__", type(i).__name__) for i in handler.interceptors_for(method)]
+        print(f"  {method:<24} {' -> '.join(names)}")
+        chains[method] = names
+    assert chains["legacy/callSkill"][-2:] == ["CallLog", "AdmissionController.intercept"]
+    assert chains["session/initialize"][-1] == "CallLog"
+    assert chains["security/decideApproval"][-1] == "operators_only"
+    request = rpc("legacy/callSkill", {"skill_name": "getAccountInfo", "parameters": {"account_id": "ACC001"}})
+    fresh = COBOLMainframeAdapter("localhost", 23, "USER=ADMIN")
+    fresh.rpc_handler.admission = None
+    for count in (1, 8):
+        for _ in range(count - len(fresh.rpc_handler.interceptors_for("legacy/callSkill"))):
+            fresh.rpc_handler.add_interceptor(passthrough)
+        started = time.perf_counter()
+        for _ in range(3000):
+            await fresh.handle_request(request)
+        assert len(fresh.rpc_handler.interceptors_for("legacy/callSkill")) >= count
+        print(f"  {len(fresh.rpc_handler.interceptors_for('legacy/callSkill'))} interceptors: "
+              f"{(time.perf_counter() - started) / 3000 * 1e6:.1f}us per request")
+    print()
+
+    # Test 5: Through the bridge
+    print("Test 5: Calls Through the MCP Bridge")
+    print("-" * 60)
+    log.calls.clear()
+    bridge = LEPMCPBridge(adapter)
+    await bridge.handle_mcp_request(json.dumps({"jsonrpc": "2.0", "method": "initialize", "params": {}, "id": 1}))
+    await bridge.handle_mcp_request(json.dumps({
+        "jsonrpc": "2.0", "method": "tools/call", "id": 2,
+        "params": {"name": "getAccountInfo", "arguments": {"account_id": "ACC002"}}
+    }))
+    print(f"Adapter interceptor saw: {', '.join(f'{m}({s})' if s else m for m, s, _, _ in log.calls)}")
+    assert [(m, s) for m, s, _, _ in log.calls] == [
+        ("session/initialize", None), ("legacy/listSkills", None), ("legacy/callSkill", "getAccountInfo")]
+    print()
+
+    print("=" * 60)
+    print("All interceptor tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
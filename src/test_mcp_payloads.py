@@ -0,0 +1,100 @@
+"""
+Test script for compact encoding and oversized results in the MCP bridge.
+
+This script demonstrates:
+1. Compact versus pretty-printed result encoding
+2. Spilling an oversized tool result into paginated resource links
+3. Reading the pages back and reassembling the result
+4. Per-method response size metrics
+"""
+
+import asyncio
+import json
+import logging
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+from lep_py.bridge.lep_mcp_bridge import LEPMCPBridge
+
+
+async def mcp(bridge, method, params, request_id=1):
+    response = json.loads(await bridge.handle_mcp_request(json.dumps({
+        "jsonrpc": "2.0", "method": method, "params": params, "id": request_id
+    })))
+    if response.get("error"):
+        raise Exception(response["error"]["message"])
+    return response["result"]
+
+
+async def main():
+    print("=" * 60)
+    print("MCP Payload Encoding - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    logging.getLogger("lep_py.adapter.cobol_mainframe_adapter").setLevel(logging.WARNING)
+    adapter = COBOLMainframeAdapter("localhost", 23, "USER=ADMIN")
+    for i in range(4, 5004):
+        adapter.ledger.add_account(f"ACC{i:05d}", 100.0 * i, "active" if i % 7 else "frozen")
+    scan = {"name": "scanBalanceThreshold", "arguments": {"min_balance": 0}}
+
+    # Test 1: Compact vs pretty
+    print("Test 1: Compact vs Pretty Encoding")
+    print("-" * 60)
+    sizes = {}
+    for compact in (False, True):
+        bridge = LEPMCPBridge(adapter, compact=compact, max_result_bytes=None)
+        await mcp(bridge, "initialize", {"clientInfo": {"name": "Test Client"}})
+        await mcp(bridge, "tools/call", scan)
+        sizes[compact] = bridge.payload_stats.snapshot("response")["max_bytes"]
+    print(f"5003 accounts: pretty {sizes[False]:,} bytes, compact {sizes[True]:,} bytes "
+          f"({100 - 100 * sizes[True] // sizes[False]}% smaller)")
+    assert sizes[True] < sizes[False]
+    print()
+
+    # Test 2: Spilling
+    print("Test 2: Oversized Result Spilled to Resource Links")
+    print("-" * 60)
+    bridge = LEPMCPBridge(adapter, max_result_bytes=32 * 1024)
+    await mcp(bridge, "initialize", {"clientInfo": {"name": "Test Client"}})
+    result = await mcp(bridge, "tools/call", scan)
+    summary = json.loads(result["content"][0]["text"])
+    links = [item["uri"] for item in result["content"] if item["type"] == "resource_link"]
+    print(f"Summary: {summary['status']}, {summary['pages']} pages, {summary['total_bytes']:,} bytes")
+    print(f"First link: {links[0]}")
+    assert summary["status"] == "spilled" and len(links) == summary["pages"] > 1
+    print()
+
+    # Test 3: Reassembly
+    print("Test 3: Reading Pages Back")
+    print("-" * 60)
+    accounts = []
+    largest = 0
+    for uri in links:
+        text = (await mcp(bridge, "resources/read", {"uri": uri}))["contents"][0]["text"]
+        largest = max(largest, len(text))
+        accounts.extend(json.loads(text))
+    expected = await adapter.call_skill_impl("scanBalanceThreshold", {"min_balance": 0})
+    print(f"Reassembled {len(accounts)} accounts, largest page {largest:,} bytes, "
+          f"matches direct call: {accounts == expected}")
+    assert accounts == expected and largest <= 32 * 1024
+    small = await mcp(bridge, "tools/call", {"name": "getAccountInfo", "arguments": {"account_id": "ACC001"}})
+    print(f"Small result stays inline: {small['content'][0]['text']}")
+    assert len(small["content"]) == 1 and json.loads(small["content"][0]["text"])["account_id"] == "ACC001"
+    print()
+
+    # Test 4: Metrics
+    print("Test 4: Response Size Metrics")
+    print("-" * 60)
+    snapshot = bridge.payload_stats.snapshot()
+    for method, stats in snapshot.items():
+        print(f"  {method:<15} {json.dumps(stats)}")
+    assert snapshot["tools/call"]["spilled"] == 1
+    assert snapshot["resources/read"]["responses"] == len(links)
+    print()
+
+    print("=" * 60)
+    print("All MCP payload tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,151 @@
+"""
+Test script for MCP resource discovery and reads through the bridge.
+
+This script demonstrates:
+1. Paginated resources/list over the COBOL adapter's accounts
+2. resources/templates/list
+3. Template and query-string parameters in resources/read
+4. Result caching and invalidation after writes, with cached reads audited
+"""
+
+import asyncio
+import json
+import logging
+import time
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+from lep_py.adapter.example_adapter import CustomerDatabaseAdapter
+from lep_py.bridge.lep_mcp_bridge import LEPMCPBridge
+
+
+async def mcp(bridge, method, params, request_id=1):
+    response = json.loads(await bridge.handle_mcp_request(json.dumps({
+        "jsonrpc": "2.0", "method": method, "params": params, "id": request_id
+    })))
+    if response.get("error"):
+        raise Exception(response["error"]["message"])
+    return response["result"]
+
+
+async def main():
+    print("=" * 60)
+    print("MCP Resources - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    logging.getLogger("lep_py.adapter.cobol_mainframe_adapter").setLevel(logging.WARNING)
+    cobol = COBOLMainframeAdapter("localhost", 23, "USER=ADMIN")
+    for i in range(4, 204):
+        cobol.accounts[f"ACC{i:03d}"] = {"name": f"Customer {i}", "balance": 1000.0 * i, "status": "active"}
+        cobol.ledger.add_account(f"ACC{i:03d}", 1000.0 * i, "active")
+    bridge = LEPMCPBridge({"cobol": cobol, "crm": CustomerDatabaseAdapter()})
+    await mcp(bridge, "initialize", {"clientInfo": {"name": "Test Client"}})
+
+    # Test 1: Paginated listing
+    print("Test 1: Paginated resources/list")
+    print("-" * 60)
+    cursor, pages, resources = None, 0, []
+    while True:
+        page = await mcp(bridge, "resources/list", {"cursor": cursor} if cursor else {})
+        resources.extend(page["resources"])
+        pages += 1
+        cursor = page.get("nextCursor")
+        if not cursor:
+            break
+    print(f"{len(resources)} resources in {pages} pages")
+    uris = [resource["uri"] for resource in resources]
+    assert len(set(uris)) == len(uris) and "lep://cobol/accounts/ACC203" in uris
+    try:
+        await mcp(bridge, "resources/list", {"cursor": "not-a-cursor"})
+    except Exception as e:
+        print(f"Invalid cursor: {e}")
+        assert "Invalid cursor" in str(e)
+    else:
+        raise AssertionError("invalid cursor accepted")
+    for resource in resources[:3] + resources[-2:]:
+        print(f"  {resource['uri']:<32} {resource['name']}")
+    print()
+
+    # Test 2: Templates
+    print("Test 2: resources/templates/list")
+    print("-" * 60)
+    templates = (await mcp(bridge, "resources/templates/list", {}))["resourceTemplates"]
+    for template in templates:
+        print(f"  {template['uriTemplate']:<36} {template['name']}")
+    assert [template["uriTemplate"] for template in templates] == [
+        "lep://cobol/accounts/{account_id}", "lep://crm/customer/{customer_id}"]
+    print()
+
+    # Test 3: Reads with parameters
+    print("Test 3: Template and Query Parameters")
+    print("-" * 60)
+    approval = await cobol._handle_request_approval({
+        "skill_name": "transferFunds",
+        "parameters": {"from_account": "ACC001", "to_account": "ACC002", "amount": 250.0},
+        "reason": "Test"
+    })
+    await cobol._handle_call_skill({
+        "skill_name": "transferFunds",
+        "parameters": {"from_account": "ACC001", "to_account": "ACC002", "amount": 250.0},
+        "approval_token": approval["approval_token"]
+    })
+    reads = {}
+    for uri in ["lep://cobol/accounts/ACC002", "lep://cobol/transactions?account_id=ACC002&limit=1",
+                "lep://crm/customer/CUST003"]:
+        content = (await mcp(bridge, "resources/read", {"uri": uri}))["contents"][0]
+        print(f"  {uri}\n    {json.dumps(json.loads(content['text']))[:100]}")
+        reads[uri] = json.loads(content["text"])
+    assert reads["lep://cobol/accounts/ACC002"]["balance"] == 75250.0
+    transactions = reads["lep://cobol/transactions?account_id=ACC002&limit=1"]
+    assert len(transactions) == 1 and transactions[0]["type"] == "transfer"
+    assert reads["lep://crm/customer/CUST003"]["name"] == "Initech LLC"
+    print()
+
+    # Test 4: Caching
+    print("Test 4: Caching and Invalidation")
+    print("-" * 60)
+    started = time.perf_counter()
+    for _ in range(1000):
+        await mcp(bridge, "resources/read", {"uri": "lep://cobol/accounts/ACC150"})
+    elapsed = time.perf_counter() - started
+    print(f"1000 reads in {elapsed * 1000:.1f}ms, cache hits={bridge.resources.cache_hits}, "
+          f"misses={bridge.resources.cache_misses}")
+    audited = sum(1 for event in cobol.audit_trail
+                  if event.event_type == "get_resource" and event.parameters.get("account_id") == "ACC150")
+    print(f"Audited reads of ACC150: {audited}")
+    assert bridge.resources.cache_hits >= 999 and audited == 1000
+    before = json.loads((await mcp(bridge, "resources/read", {"uri": "lep://cobol/accounts/ACC150"}))["contents"][0]["text"])
+    await mcp(bridge, "tools/call", {
+        "name": "cobol__updateAccountBalance",
+        "arguments": {"account_id": "ACC150", "amount": 1.0, "reason": "Test"}
+    })
+    after = json.loads((await mcp(bridge, "resources/read", {"uri": "lep://cobol/accounts/ACC150"}))["contents"][0]["text"])
+    print(f"Balance before write {before['balance']:,.2f}, after {after['balance']:,.2f}")
+    assert after["balance"] == before["balance"] + 1.0
+
+    # A read racing a slow write must not re-cache the pre-write balance
+    call_skill_impl = cobol.call_skill_impl
+
+    async def slow_write(skill_name, parameters):
+        await asyncio.sleep(0.05)
+        return await call_skill_impl(skill_name, parameters)
+    cobol.call_skill_impl = slow_write
+    write = asyncio.create_task(mcp(bridge, "tools/call", {
+        "name": "cobol__updateAccountBalance",
+        "arguments": {"account_id": "ACC150", "amount": 1.0, "reason": "Test"}
+    }))
+    await asyncio.sleep(0.01)
+    during = json.loads((await mcp(bridge, "resources/read", {"uri": "lep://cobol/accounts/ACC150"}))["contents"][0]["text"])
+    await write
+    cobol.call_skill_impl = call_skill_impl
+    final = json.loads((await mcp(bridge, "resources/read", {"uri": "lep://cobol/accounts/ACC150"}))["contents"][0]["text"])
+    print(f"Read during a write {during['balance']:,.2f}, after it {final['balance']:,.2f}")
+    assert final["balance"] == after["balance"] + 1.0
+    print()
+
+    print("=" * 60)
+    print("All MCP resource tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
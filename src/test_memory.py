@@ -0,0 +1,165 @@
+"""
+Test script for memory accounting of adapter state.
+
+This script demonstrates:
+1. The admin/memory report of a fresh adapter
+2. Attributing growth to the structures that hold it
+3. Estimate accuracy against allocation tracing
+4. Finding growth outside the adapter with an allocation diff
+5. A bridge-wide report, and the cost of a report over a large store
+"""
+
+import asyncio
+import json
+import logging
+import time
+import tracemalloc
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+from lep_py.adapter.example_adapter import CustomerDatabaseAdapter
+from lep_py.bridge.lep_mcp_bridge import LEPMCPBridge
+from lep_py.utils.memory import estimate_size
+
+# Stands in for a cache inside a library that nobody is watching
+_vendor_cache = []
+
+
+def vendor_lookup(key):
+    _vendor_cache.append({"key": key, "payload": f"{key}:" + "x" * 400})
+
+
+async def rpc(adapter, method, params, request_id=1):
+    return json.loads(await adapter.handle_request(json.dumps({
+        "jsonrpc": "2.0", "method": method, "params": params, "id": request_id
+    })))
+
+
+def print_structures(structures, limit=None):
+    for entry in structures[:limit]:
+        count = "-" if entry["count"] is None else entry["count"]
+        print(f"  {entry['name']:<28} {entry['type']:<16} {count:>8} {entry['bytes'] / 1024:10.1f} KiB")
+
+
+async def write(adapter, i):
+    approval = (await rpc(adapter, "security/requestApproval", {
+        "skill_name": "updateAccountBalance",
+        "parameters": {"account_id": "ACC001", "amount": 1.0, "reason": f"Posting {i}"},
+        "reason": "Test"
+    }, i))["result"]
+    await rpc(adapter, "legacy/callSkill", {
+        "skill_name": "updateAccountBalance",
+        "parameters": {"account_id": "ACC001", "amount": 1.0, "reason": f"Posting {i}"},
+        "approval_token": approval["approval_token"]
+    }, i)
+
+
+async def main():
+    print("=" * 60)
+    print("Memory Accounting - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    logging.getLogger("lep_py.adapter.cobol_mainframe_adapter").setLevel(logging.WARNING)
+
+    # Test 1: Fresh adapter
+    print("Test 1: admin/memory on a Fresh Adapter")
+    print("-" * 60)
+    adapter = COBOLMainframeAdapter("localhost", 23, "")
+    report = (await rpc(adapter, "admin/memory", {}))["result"]
+    rss = report["process"]["rss_bytes"]
+    print(f"Process RSS: {rss / 1048576:.1f} MiB" if rss else "Process RSS: not reported on this platform")
+    print(f"  {'structure':<28} {'type':<16} {'count':>8} {'size':>14}")
+    print_structures(report["structures"])
+    counts = {e["name"]: e["count"] for e in report["structures"]}
+    assert counts["ledger"] == 3 and counts["audit_trail"] == 0 and counts["transactions"] == 0
+    print()
+
+    # Test 2: Growth
+    print("Test 2: Attributing Growth")
+    print("-" * 60)
+    before = {e["name"]: e["bytes"] for e in report["structures"]}
+    for i in range(2000):
+        await write(adapter, i)
+    for i in range(3000):
+        await rpc(adapter, "legacy/callSkill", {"skill_name": "getAccountInfo",
+                                                "parameters": {"account_id": "ACC002"}}, i)
+    report = (await rpc(adapter, "admin/memory", {}))["result"]
+    print("After 2000 approved writes and 3000 reads:")
+    print_structures(report["structures"], 4)
+    grown = max(report["structures"], key=lambda e: e["bytes"] - before.get(e["name"], 0))
+    print(f"Largest growth: {grown['name']} (+{(grown['bytes'] - before[grown['name']]) / 1024:.0f} KiB, "
+          f"{grown['count']} entries)")
+    counts = {e["name"]: e["count"] for e in report["structures"]}
+    assert grown["name"] == "audit_trail" and counts["transactions"] == 2000
+    print()
+
+    # Test 3: Accuracy
+    print("Test 3: Estimates Against Allocation Tracing")
+    print("-" * 60)
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    records = [{"id": f"TXN{i:08d}", "amount": i * 1.5, "tags": ["posted", f"batch{i % 7}"]}
+               for i in range(20000)]
+    traced = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    for sample in (20, 100, 1000):
+        started = time.perf_counter()
+        estimate = estimate_size(records, sample=sample)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"20000 records, sample {sample:>4}: estimate {estimate / 1024:7.0f} KiB vs traced "
+              f"{traced / 1024:7.0f} KiB ({estimate / traced:.0%}) in {elapsed:.1f}ms")
+        assert 0.5 < estimate / traced < 2.0
+    print()
+
+    # Test 4: Allocation diff
+    print("Test 4: Growth the Report Cannot Attribute")
+    print("-" * 60)
+    status = (await rpc(adapter, "admin/memory", {"allocations": "start"}))["result"]
+    print(f"Allocation tracing: {status['allocation_tracing']}")
+    assert status["allocation_tracing"] is True
+    for i in range(5000):
+        vendor_lookup(i)
+        await rpc(adapter, "legacy/callSkill", {"skill_name": "getAccountInfo",
+                                                "parameters": {"account_id": "ACC003"}}, i)
+    report = (await rpc(adapter, "admin/memory", {"allocations": "diff", "top": 5}))["result"]
+    allocations = report["allocations"]
+    print(f"Growth since start: {allocations['growth_bytes'] / 1024:.0f} KiB; top locations:")
+    for stat in allocations["top"]:
+        print(f"  {stat['location'].split('/')[-1]:<30} +{stat['size_diff'] / 1024:7.0f} KiB "
+              f"in {stat['count_diff']:+} blocks")
+    vendor = [stat for stat in allocations["top"] if "test_memory.py" in stat["location"]]
+    print(f"Unattributed growth found in vendor_lookup: {bool(vendor)}")
+    assert vendor and allocations["growth_bytes"] > 0
+    status = (await rpc(adapter, "admin/memory", {"allocations": "stop"}))["result"]
+    print(f"Allocation tracing: {status['allocation_tracing']}")
+    assert status["allocation_tracing"] is False
+    error = await rpc(adapter, "admin/memory", {"allocations": "diff"})
+    print(f"Diff while stopped: {error['error']['message']}")
+    assert "Allocation tracing is not started" in error["error"]["message"]
+    print()
+
+    # Test 5: Bridge and scale
+    print("Test 5: Bridge-wide Report and a Large Store")
+    print("-" * 60)
+    crm = CustomerDatabaseAdapter()
+    crm.customers.update({f"CUST{i:06d}": {"id": f"CUST{i:06d}", "name": f"Customer {i}", "balance": float(i),
+                                           "status": "active"} for i in range(200000)})
+    bridge = LEPMCPBridge({"cobol": adapter, "crm": crm})
+    started = time.perf_counter()
+    report = bridge.memory_report()
+    elapsed = (time.perf_counter() - started) * 1000
+    print(f"{len(report['structures'])} structures in {elapsed:.1f}ms; largest:")
+    print_structures(report["structures"], 5)
+    largest = report["structures"][0]
+    assert (largest["name"], largest["count"]) == ("crm.customers", 200003)
+    assert any(e["name"] == "cobol.audit_trail" for e in report["structures"])
+    print()
+
+    await bridge.shutdown()
+
+    print("=" * 60)
+    print("All memory accounting tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,187 @@
+"""
+Test script for the metrics registry and its Prometheus exposition.
+
+This script demonstrates:
+1. Counters, gauges and fixed-bucket histograms
+2. Metrics recorded by an adapter out of the box
+3. MCP bridge metrics
+4. Serving /metrics on a local port and dumping on a signal
+5. Recording overhead
+"""
+
+import asyncio
+import io
+import json
+import logging
+import os
+import signal
+import time
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+from lep_py.bridge.lep_mcp_bridge import LEPMCPBridge
+from lep_py.core.jsonrpc import JSONRPCHandler
+from lep_py.utils.metrics import REGISTRY, MetricsRegistry, MetricsServer, dump_on_signal
+
+
+def rpc(method, params, request_id=1):
+    return json.dumps({"jsonrpc": "2.0", "method": method, "params": params, "id": request_id})
+
+
+def show(text, prefix, *contains):
+    for line in text.splitlines():
+        if line.startswith(prefix) and all(c in line for c in contains):
+            print(f"  {line}")
+
+
+async def main():
+    print("=" * 60)
+    print("Metrics - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    logging.getLogger("lep_py.adapter.cobol_mainframe_adapter").setLevel(logging.WARNING)
+
+    # Test 1: Primitives
+    print("Test 1: Counters, Gauges and Histograms")
+    print("-" * 60)
+    registry = MetricsRegistry()
+    jobs = registry.counter("demo_jobs_total", "Jobs run", ["lane"])
+    jobs.labels("A").inc()
+    jobs.labels("B").inc(3)
+    queue = []
+    registry.gauge("demo_queue_depth", "Items queued").set_function(lambda: len(queue))
+    queue.extend(range(7))
+    latency = registry.histogram("demo_seconds", "Latency", buckets=(0.01, 0.1, 1.0))
+    for value in (0.005, 0.02, 0.05, 0.5, 3.0):
+        latency.observe(value)
+    rendered = registry.render()
+    print(rendered, end="")
+    for sample in ('demo_jobs_total{lane="B"} 3', "demo_queue_depth 7", 'demo_seconds_bucket{le="0.1"} 3',
+                   'demo_seconds_bucket{le="+Inf"} 5', "demo_seconds_count 5"):
+        assert sample in rendered.splitlines(), sample
+    print()
+
+    # Test 2: Adapter metrics
+    print("Test 2: Adapter Metrics")
+    print("-" * 60)
+    adapter = COBOLMainframeAdapter("localhost", 23, "USER=ADMIN")
+    for i in range(50):
+        await adapter.handle_request(rpc("legacy/callSkill", {"skill_name": "getAccountInfo",
+                                                              "parameters": {"account_id": f"ACC00{i % 3 + 1}"}}))
+    await adapter.handle_request(rpc("legacy/callSkill", {"skill_name": "getAccountInfo",
+                                                          "parameters": {"account_id": "NOPE"}}))
+    for i in range(3):
+        await adapter.handle_request(rpc("security/requestApproval", {
+            "skill_name": "updateAccountBalance",
+            "parameters": {"account_id": "ACC001", "amount": 1.0 + i, "reason": "Test"},
+            "reason": "Test"
+        }))
+    adapter.async_approvals = True
+    pending = json.loads(await adapter.handle_request(rpc("security/requestApproval", {
+        "skill_name": "updateAccountBalance",
+        "parameters": {"account_id": "ACC002", "amount": 5.0, "reason": "Test"},
+        "reason": "Test"
+    })))["result"]
+    await asyncio.sleep(0.05)
+    await adapter.handle_operator_request(rpc("security/decideApproval", {"decision_id": pending["decision_id"],
+                                                                          "approved": True}))
+    text = REGISTRY.render()
+    label = f'"{adapter.adapter_name}"'
+    show(text, "lep_rpc_requests_total", label)
+    show(text, "lep_rpc_request_seconds_count", label)
+    show(text, "lep_skill_calls_total", label)
+    show(text, "lep_skill_seconds_bucket", label, 'le="0.001"')
+    show(text, "lep_approval_wait_seconds_count", label)
+    show(text, "lep_approval_wait_seconds_sum", label)
+    show(text, "lep_audit_events", label)
+    show(text, "lep_approval_tokens", label)
+    show(text, "lep_approvals_pending", label)
+    lines = text.splitlines()
+    handler = f'handler={label}'
+    for sample in (f'lep_rpc_requests_total{{{handler},method="legacy/callSkill",outcome="ok"}} 50',
+                   f'lep_rpc_requests_total{{{handler},method="legacy/callSkill",outcome="error"}} 1',
+                   f'lep_skill_calls_total{{adapter={label},skill="getAccountInfo",outcome="error"}} 1',
+                   f'lep_approval_wait_seconds_count{{adapter={label},state="approved"}} 4',
+                   f'lep_approvals_pending{{adapter={label}}} 0'):
+        assert sample in lines, sample
+    print()
+
+    # Test 3: Bridge metrics
+    print("Test 3: MCP Bridge Metrics")
+    print("-" * 60)
+    bridge = LEPMCPBridge(adapter)
+    await bridge.handle_mcp_request(json.dumps({"jsonrpc": "2.0", "method": "initialize", "params": {}, "id": 1}))
+    await bridge.handle_mcp_request(json.dumps({"jsonrpc": "2.0", "method": "tools/list", "params": {}, "id": 2}))
+    for i in range(5):
+        await bridge.handle_mcp_request(json.dumps({
+            "jsonrpc": "2.0", "method": "tools/call", "id": 3 + i,
+            "params": {"name": "getAccountInfo", "arguments": {"account_id": "ACC001"}}
+        }))
+    text = REGISTRY.render()
+    show(text, "lep_rpc_requests_total", 'handler="mcp"')
+    show(text, "lep_mcp_payload_bytes_count")
+    show(text, "lep_mcp_spilled")
+    lines = text.splitlines()
+    for sample in ('lep_rpc_requests_total{handler="mcp",method="tools/call",outcome="ok"} 5',
+                   'lep_mcp_payload_bytes_count{method="tools/call"} 5'):
+        assert sample in lines, sample
+    print()
+
+    # Test 4: Exposition
+    print("Test 4: /metrics Endpoint and Signal Dump")
+    print("-" * 60)
+    server = MetricsServer(REGISTRY, port=0)
+    await server.start()
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    samples = [line for line in body.decode().splitlines() if line and not line.startswith("#")]
+    print(f"GET /metrics: {head.splitlines()[0].decode()}, {len(body)} bytes, {len(samples)} samples")
+    assert head.startswith(b"HTTP/1.1 200") and samples
+    await server.stop()
+    dump = io.StringIO()
+    if dump_on_signal(REGISTRY, signal.SIGUSR1, dump):
+        os.kill(os.getpid(), signal.SIGUSR1)
+        await asyncio.sleep(0.01)
+        signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+    print(f"SIGUSR1 dump: {len(dump.getvalue().splitlines())} lines")
+    assert "# TYPE lep_rpc_requests_total counter" in dump.getvalue()
+    print()
+
+    # Test 5: Overhead
+    print("Test 5: Recording Overhead")
+    print("-" * 60)
+    counter = registry.counter("demo_ops_total", "Ops", ["method"])
+    histogram = registry.histogram("demo_op_seconds", "Op latency", ["method"])
+    n = 200000
+    started = time.perf_counter()
+    for _ in range(n):
+        counter.labels("legacy/callSkill").inc()
+    inc_ns = (time.perf_counter() - started) / n * 1e9
+    started = time.perf_counter()
+    for i in range(n):
+        histogram.labels("legacy/callSkill").observe(i * 1e-6)
+    observe_ns = (time.perf_counter() - started) / n * 1e9
+    print(f"Labelled counter inc: {inc_ns:.0f}ns, histogram observe: {observe_ns:.0f}ns")
+    assert f'demo_ops_total{{method="legacy/callSkill"}} {n}' in registry.render().splitlines()
+    async def ping(params):
+        return "pong"
+    timings = {}
+    for label, handler in (("with metrics", JSONRPCHandler(metrics=MetricsRegistry(), name="bench")),
+                           ("without metrics", JSONRPCHandler())):
+        handler.register_method("ping", ping)
+        started = time.perf_counter()
+        for _ in range(20000):
+            await handler.handle_request(rpc("ping", {}))
+        timings[label] = (time.perf_counter() - started) / 20000 * 1e6
+    print(f"JSON-RPC ping: {timings['with metrics']:.1f}us with metrics, {timings['without metrics']:.1f}us without")
+    print()
+
+    print("=" * 60)
+    print("All metrics tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
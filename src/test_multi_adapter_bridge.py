@@ -0,0 +1,130 @@
+"""
+Test script for hosting several LEP adapters behind one MCP bridge.
+
+This script demonstrates:
+1. Parallel initialize and catalog fan-out across adapters
+2. Namespaced tools routed to the right adapter
+3. Namespaced resource URIs
+4. A slow adapter and a failing adapter not affecting the others
+"""
+
+import asyncio
+import json
+import logging
+import time
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+from lep_py.adapter.example_adapter import CustomerDatabaseAdapter
+from lep_py.bridge.lep_mcp_bridge import LEPMCPBridge
+
+
+class SlowAdapter(CustomerDatabaseAdapter):
+    """An adapter whose legacy system takes a long time to answer."""
+
+    async def _handle_list_skills(self, params):
+        await asyncio.sleep(5)
+        return await super()._handle_list_skills(params)
+
+
+class BrokenAdapter(CustomerDatabaseAdapter):
+    """An adapter whose legacy system is down."""
+
+    async def _handle_initialize(self, params):
+        raise ConnectionError("Host unreachable")
+
+    async def _handle_list_skills(self, params):
+        raise ConnectionError("Host unreachable")
+
+
+async def mcp(bridge, method, params, request_id=1):
+    response = json.loads(await bridge.handle_mcp_request(json.dumps({
+        "jsonrpc": "2.0", "method": method, "params": params, "id": request_id
+    })))
+    if response.get("error"):
+        raise Exception(response["error"]["message"])
+    return response["result"]
+
+
+async def main():
+    print("=" * 60)
+    print("Multi-Adapter MCP Bridge - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    logging.getLogger("lep_py.adapter.cobol_mainframe_adapter").setLevel(logging.WARNING)
+    logging.getLogger("lep_py.bridge.lep_mcp_bridge").setLevel(logging.ERROR)
+    bridge = LEPMCPBridge({
+        "crm": CustomerDatabaseAdapter(),
+        "cobol": COBOLMainframeAdapter("localhost", 23, "USER=ADMIN"),
+        "archive": SlowAdapter(),
+        "billing": BrokenAdapter(),
+    }, adapter_timeout=0.2)
+
+    # Test 1: Initialize
+    print("Test 1: Initialize (parallel fan-out)")
+    print("-" * 60)
+    started = time.perf_counter()
+    result = await mcp(bridge, "initialize", {"clientInfo": {"name": "Test Client", "version": "1.0.0"}})
+    print(f"Server: {result['serverInfo']['name']} in {time.perf_counter() - started:.2f}s")
+    print(f"Adapter errors: {json.dumps(bridge.adapter_errors)}")
+    assert result["serverInfo"]["name"] == "LEP Bridge (crm, cobol)"
+    assert set(bridge.adapter_errors) == {"archive", "billing"}
+    print()
+
+    # Test 2: Tools list
+    print("Test 2: Namespaced Tools")
+    print("-" * 60)
+    tools = (await mcp(bridge, "tools/list", {}))["tools"]
+    by_namespace = {}
+    for tool in tools:
+        namespace = tool["name"].split("__")[0]
+        by_namespace[namespace] = by_namespace.get(namespace, 0) + 1
+    print(f"{len(tools)} tools: {json.dumps(by_namespace)}")
+    assert set(by_namespace) == {"crm", "cobol"}
+    print()
+
+    # Test 3: Routed calls
+    print("Test 3: Routed Tool Calls")
+    print("-" * 60)
+    crm, cobol = await asyncio.gather(
+        mcp(bridge, "tools/call", {"name": "crm__getCustomerInfo", "arguments": {"customer_id": "CUST002"}}),
+        mcp(bridge, "tools/call", {"name": "cobol__getAccountInfo", "arguments": {"account_id": "ACC002"}}),
+    )
+    print(f"crm:   {json.loads(crm['content'][0]['text'])['name']}")
+    print(f"cobol: {json.loads(cobol['content'][0]['text'])['name']}")
+    assert json.loads(crm['content'][0]['text'])['name'] == "Globex Industries"
+    assert json.loads(cobol['content'][0]['text'])['name'] == "Bob Smith"
+    write = await mcp(bridge, "tools/call", {
+        "name": "cobol__updateAccountBalance",
+        "arguments": {"account_id": "ACC002", "amount": 10.0, "reason": "Adjustment"}
+    })
+    print(f"cobol write: new balance {json.loads(write['content'][0]['text'])['account']['balance']:,.2f}")
+    assert json.loads(write['content'][0]['text'])['account']['balance'] == 75010.0
+    try:
+        await mcp(bridge, "tools/call", {"name": "billing__getCustomerInfo", "arguments": {}})
+    except Exception as e:
+        print(f"Unavailable adapter: {e}")
+        assert "Unknown tool: billing__getCustomerInfo" in str(e)
+    else:
+        raise AssertionError("a call to an unavailable adapter must fail")
+    print()
+
+    # Test 4: Resources
+    print("Test 4: Namespaced Resources")
+    print("-" * 60)
+    content = await mcp(bridge, "resources/read", {"uri": "lep://cobol/accounts"})
+    page = json.loads(content['contents'][0]['text'])
+    print(f"lep://cobol/accounts -> {len(page['accounts'])} accounts, next cursor {page['next_cursor']}")
+    assert len(page["accounts"]) == 3 and page["next_cursor"] is None
+    content = await mcp(bridge, "resources/read", {"uri": "lep://cobol/accounts?limit=1&cursor=ACC001"})
+    page = json.loads(content['contents'][0]['text'])
+    print(f"lep://cobol/accounts?limit=1&cursor=ACC001 -> {list(page['accounts'])}, next cursor {page['next_cursor']}")
+    assert list(page["accounts"]) == ["ACC002"] and page["next_cursor"] == "ACC002"
+    print()
+
+    print("=" * 60)
+    print("All multi-adapter bridge tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,211 @@
+"""
+Test script for JSON-RPC notifications and server-to-client messages.
+
+This script demonstrates:
+1. Notifications handled without building a response
+2. legacy/update progress for batch jobs, with and without coalescing
+3. Approval decisions pushed to the client
+4. Cancelling a running skill with legacy/cancel
+5. The bounded outbound queue
+"""
+
+import asyncio
+import json
+import logging
+import time
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+from lep_py.core.notifications import OutboundQueue, notification
+from lep_py.driver.simulator import MainframeSimulator
+
+
+def rpc(method, params, request_id=1):
+    return json.dumps({"jsonrpc": "2.0", "method": method, "params": params, "id": request_id})
+
+
+def notify(method, params):
+    return json.dumps({"jsonrpc": "2.0", "method": method, "params": params})
+
+
+async def call(adapter, method, params):
+    response = json.loads(await adapter.handle_request(rpc(method, params)))
+    if response.get("error"):
+        raise Exception(response["error"]["message"])
+    return response["result"]
+
+
+async def initialize(adapter, coalescing: bool):
+    return await call(adapter, "session/initialize", {
+        "client_name": "Test Client",
+        "client_version": "1.0.0",
+        "supported_lep_versions": ["2.0"],
+        "client_capabilities": {"notifications": True, "cancellation": True, "progress_coalescing": coalescing}
+    })
+
+
+async def run_job(adapter):
+    params = {"jcl": "//EODJOB   JOB (ACCT),'END OF DAY',CLASS=B\n//STEP1    EXEC PGM=INTCALC,PARM='RATE=0.0125'\n"}
+    approval = await call(adapter, "security/requestApproval", {
+        "skill_name": "submitBatchJob", "parameters": params, "reason": "Test"
+    })
+    job = await call(adapter, "legacy/callSkill", {
+        "skill_name": "submitBatchJob", "parameters": params, "approval_token": approval["approval_token"]
+    })
+    await adapter.job_queue.wait(job["job_id"], timeout=10)
+    return job["job_id"]
+
+
+def make_adapter():
+    adapter = COBOLMainframeAdapter("localhost", 23, "USER=ADMIN")
+    for i in range(4, 2004):
+        adapter.accounts[f"ACC{i:05d}"] = {"name": f"Customer {i}", "balance": 1000.0 + i, "status": "active"}
+        adapter.ledger.add_account(f"ACC{i:05d}", 1000.0 + i, "active")
+    adapter.batch_chunk_size = 100
+    return adapter
+
+
+async def main():
+    print("=" * 60)
+    print("Notifications - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    logging.getLogger("lep_py.adapter.cobol_mainframe_adapter").setLevel(logging.WARNING)
+
+    # Test 1: Notifications get no response
+    print("Test 1: Fire-and-forget Notifications")
+    print("-" * 60)
+    adapter = make_adapter()
+    answers = [await adapter.handle_request(notify("legacy/cancel", {"request_id": 99})),
+               await adapter.handle_request(notify("legacy/unknown", {}))]
+    print(f"legacy/cancel notification -> {answers[0]}")
+    print(f"Unknown notification        -> {answers[1]}")
+    assert answers == [None, None]
+    request, message = rpc("legacy/cancel", {"request_id": 99}), notify("legacy/cancel", {"request_id": 99})
+    timings = {}
+    for label, text in (("request", request), ("notification", message)):
+        started = time.perf_counter()
+        for _ in range(5000):
+            await adapter.handle_request(text)
+        timings[label] = (time.perf_counter() - started) / 5000 * 1e6
+    print(f"Per message: request {timings['request']:.1f}us, notification {timings['notification']:.1f}us")
+
+    async def slow_method(params):
+        await asyncio.sleep(0.2)
+        raise Exception("slow method failed")
+
+    adapter.rpc_handler.register_method("test/slow", slow_method)
+    started = time.perf_counter()
+    await adapter.handle_request(notify("test/slow", {}))
+    returned = (time.perf_counter() - started) * 1000
+    print(f"Slow notification returned after {returned:.1f}ms, handler still running in the background")
+    assert returned < 100 and adapter.rpc_handler._notification_tasks
+    await asyncio.gather(*adapter.rpc_handler._notification_tasks, return_exceptions=True)
+    await asyncio.sleep(0)
+    assert not adapter.rpc_handler._notification_tasks
+    print()
+
+    # Test 2: Batch job progress
+    print("Test 2: legacy/update Progress and Coalescing")
+    print("-" * 60)
+    await run_job(adapter)
+    print(f"Before initialize (no listener): {len(adapter.outbound)} queued")
+    assert len(adapter.outbound) == 0
+    counts = {}
+    for coalescing in (False, True):
+        adapter = make_adapter()
+        await initialize(adapter, coalescing)
+        job_id = await run_job(adapter)
+        updates = [m for m in adapter.outbound.drain() if m["method"] == "legacy/update"]
+        print(f"Coalescing {'on ' if coalescing else 'off'}: {len(updates)} legacy/update queued "
+              f"({adapter.outbound.stats['coalesced']} merged); last: {json.dumps(updates[-1]['params'])}")
+        assert updates[-1]["params"]["task_id"] == job_id and updates[-1]["params"]["progress_percentage"] == 100.0
+        counts[coalescing] = len(updates)
+    assert counts[True] == 1 < counts[False]
+    print()
+
+    # Test 3: Approval decisions
+    print("Test 3: Approval Decision Notifications")
+    print("-" * 60)
+    adapter.async_approvals = True
+    pending = await call(adapter, "security/requestApproval", {
+        "skill_name": "updateAccountBalance",
+        "parameters": {"account_id": "ACC001", "amount": 10.0, "reason": "Test"},
+        "reason": "Test"
+    })
+    await adapter.invoke_operator("security/decideApproval", {"decision_id": pending["decision_id"],
+                                                               "approved": True, "decided_by": "operator"})
+    for message in adapter.outbound.drain():
+        params = message["params"]
+        print(f"{message['method']}: {params['decision_id']} {params['state']} by {params['decided_by']}, "
+              f"token {'attached' if params['approval_token'] else 'withheld'}")
+        assert params["approval_token"] is None
+    decided = await call(adapter, "security/getApproval", {"decision_id": pending["decision_id"],
+                                                           "claim_token": pending["claim_token"]})
+    print(f"Requester fetches the token with its claim token: {decided['approval_token'] is not None}")
+    assert decided["approval_token"] is not None
+    print()
+
+    # Test 4: Cancelling a running skill
+    print("Test 4: legacy/cancel")
+    print("-" * 60)
+    host_programs = COBOLMainframeAdapter("localhost", 0, "")
+    simulator = MainframeSimulator(
+        handler=lambda command, payload: host_programs._dispatch_skill(payload["skill_name"], payload["parameters"]),
+        handshake_latency=0.01, latency=0.005, hang_rate=1.0
+    )
+    await simulator.start()
+    adapter = COBOLMainframeAdapter("127.0.0.1", simulator.port, "POOL_MIN=2;POOL_MAX=2")
+    await adapter.connect_backend()
+    calls = [asyncio.create_task(adapter.handle_request(rpc("legacy/callSkill", {
+        "skill_name": "getAccountInfo", "parameters": {"account_id": "ACC001"}
+    }, i), session=client)) for client in ("client-a", "client-b") for i in range(2)]
+    await asyncio.sleep(0.1)
+    await adapter.handle_request(notify("legacy/cancel", {"request_id": 1}), session="client-c")
+    await asyncio.sleep(0.02)
+    print(f"Cancel of request 1 from another client: {sum(c.done() for c in calls)} calls ended")
+    assert not any(c.done() for c in calls)
+    started = time.perf_counter()
+    await adapter.handle_request(notify("legacy/cancel", {"request_id": 1}), session="client-a")
+    first = json.loads(await calls[1])
+    print(f"client-a request 1 ended {(time.perf_counter() - started) * 1000:.1f}ms after the cancel")
+    print(f"Error: {first['error']['message']}")
+    print(f"Other calls still running: {sum(not c.done() for c in calls)}")
+    assert "cancelled" in first["error"]["message"]
+    assert sum(not c.done() for c in calls) == 3
+    for client, request_id in (("client-a", 0), ("client-b", 0), ("client-b", 1)):
+        await adapter.handle_request(notify("legacy/cancel", {"request_id": request_id}), session=client)
+    responses = [json.loads(r) for r in await asyncio.gather(*calls)]
+    assert all("cancelled" in r["error"]["message"] for r in responses)
+    cancelled = sum(1 for e in adapter.audit_trail if e.event_type == "skill_cancelled")
+    print(f"Audited: {cancelled} skill_cancelled")
+    assert cancelled == 4
+    await asyncio.sleep(0.05)
+    print(f"Simulator: {simulator.stats['cancelled']} commands cancelled at the backend")
+    assert simulator.stats["cancelled"] > 0
+    await adapter.close()
+    await simulator.stop()
+    print()
+
+    # Test 5: Bounded outbound queue
+    print("Test 5: Bounded Outbound Queue")
+    print("-" * 60)
+    queue = OutboundQueue(max_pending=100, coalesce=True)
+    for i in range(1000):
+        queue.put(notification("legacy/update", {"skill_name": "scan", "i": i}), coalesce_key=("scan", i % 10))
+        queue.put(notification("notifications/message", {"i": i}))
+    for i in range(5):
+        queue.put({"jsonrpc": "2.0", "id": i, "result": "ok"}, droppable=False)
+    messages = queue.drain()
+    print(f"Queued {len(messages)} of 2005: {json.dumps(queue.stats)}")
+    print(f"Responses kept: {sum(1 for m in messages if 'id' in m)}")
+    assert len(messages) == 105 and sum(1 for m in messages if "id" in m) == 5
+    assert queue.stats["dropped"] > 0
+    print()
+
+    print("=" * 60)
+    print("All notification tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
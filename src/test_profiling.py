@@ -0,0 +1,186 @@
+"""
+Test script for on-demand request profiling.
+
+This script demonstrates:
+1. Profiling requests that pass a latency threshold
+2. Profiling by method, skill and sample rate
+3. The cap on saved profiles, and profiles written to disk
+4. Turning profiling on and off over JSON-RPC
+5. Cost with profiling off, on, and off again
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from lep_py.adapter.example_adapter import CustomerDatabaseAdapter
+
+
+def score_history(customer_id, rounds=60000):
+    """Stand-in for an expensive host-side computation."""
+    total = 0
+    for i in range(rounds):
+        total += (i * 31 + len(customer_id)) % 97
+    return total
+
+
+def fast_lookup(customer_id):
+    return customer_id.upper()
+
+
+class ProfiledAdapter(CustomerDatabaseAdapter):
+    """Customer adapter whose CUST002 lookups are slow: several host waits and a CPU-heavy step."""
+
+    async def call_skill_impl(self, skill_name, parameters):
+        if parameters.get("customer_id") == "CUST002":
+            for _ in range(3):
+                await asyncio.sleep(0.05)
+                score_history("CUST002")
+        else:
+            await asyncio.sleep(0.001)
+            fast_lookup(parameters.get("customer_id", ""))
+        return await super().call_skill_impl(skill_name, parameters)
+
+
+async def rpc(adapter, method, params, request_id=1):
+    return json.loads(await adapter.handle_request(json.dumps({
+        "jsonrpc": "2.0", "method": method, "params": params, "id": request_id
+    })))
+
+
+def lookup(adapter, customer_id, request_id=1):
+    return rpc(adapter, "legacy/callSkill", {"skill_name": "getCustomerInfo",
+                                             "parameters": {"customer_id": customer_id}}, request_id)
+
+
+def top_functions(record, limit=3):
+    """Functions with the most time spent in their own code."""
+    entries = sorted(record.stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+    return [f"{func[2]} ({stats[2] * 1000:.0f}ms)" for func, stats in entries][:limit]
+
+
+async def main():
+    print("=" * 60)
+    print("Request Profiling - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    logging.getLogger("lep_py.utils.profiling").setLevel(logging.WARNING)
+
+    # Test 1: Threshold
+    print("Test 1: Slow Requests Past a Threshold")
+    print("-" * 60)
+    adapter = ProfiledAdapter()
+    adapter.enable_profiling(threshold=0.03)
+    calls = [lookup(adapter, "CUST001", i) for i in range(20)]
+    calls.insert(10, lookup(adapter, "CUST002", 99))
+    await asyncio.gather(*calls)
+    profiler = adapter.profiler
+    record = profiler.profiles[0]
+    functions = {func[2] for func in record.stats.stats}
+    print(f"21 concurrent calls, threshold 30ms: {json.dumps(profiler.stats)}")
+    print(f"Saved: {record.method} {record.skill} request {record.request_id}, reason={record.reason}, "
+          f"{record.duration_ms:.0f}ms in {record.steps} steps (longest {record.longest_step_ms:.1f}ms)")
+    print(f"Top functions: {top_functions(record)}")
+    print(f"score_history in profile: {'score_history' in functions}, "
+          f"fast_lookup from the interleaved calls: {'fast_lookup' in functions}")
+    assert profiler.stats["saved"] == 1 and (record.skill, record.request_id, record.reason) == (
+        "getCustomerInfo", 99, "threshold")
+    assert "score_history" in functions and "fast_lookup" not in functions
+    print()
+
+    # Test 2: Selection
+    print("Test 2: By Method, Skill and Sample Rate")
+    print("-" * 60)
+    adapter = ProfiledAdapter()
+    adapter.enable_profiling(threshold=None, methods=["legacy/listSkills"])
+    await rpc(adapter, "legacy/listSkills", {})
+    await lookup(adapter, "CUST001")
+    print(f"methods=[legacy/listSkills]: {[(r.method, r.reason) for r in adapter.profiler.profiles]}")
+    assert [(r.method, r.reason) for r in adapter.profiler.profiles] == [("legacy/listSkills", "method")]
+    adapter.enable_profiling(methods=[], skills=["getCustomerInfo"])
+    await lookup(adapter, "CUST003")
+    await rpc(adapter, "legacy/listSkills", {})
+    print(f"skills=[getCustomerInfo]:     {[(r.method, r.skill, r.reason) for r in adapter.profiler.profiles][1:]}")
+    assert [(r.method, r.skill, r.reason) for r in adapter.profiler.profiles][1:] == [
+        ("legacy/callSkill", "getCustomerInfo", "skill")]
+    adapter.enable_profiling(skills=[], sample_rate=0.05)
+    for i in range(200):
+        await lookup(adapter, "CUST001", i)
+    sampled = [r for r in adapter.profiler.profiles if r.reason == "sampled"]
+    print(f"sample_rate=0.05 over 200 calls: {len(sampled)} profiled")
+    assert 0 < len(sampled) < 200
+    print()
+
+    # Test 3: Cap and files
+    print("Test 3: Profile Cap and Files")
+    print("-" * 60)
+    directory = tempfile.mkdtemp()
+    adapter = ProfiledAdapter()
+    adapter.profiler.directory = directory
+    adapter.enable_profiling(threshold=None, skills=["getCustomerInfo"], max_profiles=5)
+    for i in range(12):
+        await lookup(adapter, "CUST001", i)
+    print(f"12 profiled calls, max_profiles=5: kept {len(adapter.profiler.profiles)}, "
+          f"stats {json.dumps(adapter.profiler.stats)}")
+    print(f"Request IDs kept: {[r.request_id for r in adapter.profiler.profiles]}")
+    print(f"Files on disk: {len(os.listdir(directory))} ({sorted(os.listdir(directory))[:2]} ...)")
+    assert [r.request_id for r in adapter.profiler.profiles] == [7, 8, 9, 10, 11]
+    assert adapter.profiler.stats["discarded"] == 7 and len(os.listdir(directory)) == 10
+    print()
+
+    # Test 4: Over JSON-RPC
+    print("Test 4: admin/profiling and admin/getProfile")
+    print("-" * 60)
+    adapter = ProfiledAdapter()
+    status = (await rpc(adapter, "admin/profiling", {"enabled": True, "threshold": 0.1}))["result"]
+    print(f"Enabled: {status['enabled']}, threshold {status['threshold']}s")
+    assert status["enabled"] is True and status["threshold"] == 0.1
+    await lookup(adapter, "CUST002")
+    status = (await rpc(adapter, "admin/profiling", {"enabled": False}))["result"]
+    saved = status["profiles"][0]
+    print(f"Disabled; saved profile: {saved['profile_id']} ({saved['reason']}, {saved['duration_ms']:.0f}ms)")
+    assert status["enabled"] is False and saved["reason"] == "threshold"
+    profile = (await rpc(adapter, "admin/getProfile", {"profile_id": saved["profile_id"], "limit": 5,
+                                                        "sort": "tottime"}))["result"]
+    print("Summary:")
+    for line in profile["summary"].strip().splitlines()[:12]:
+        print(f"  {line}")
+    missing = await rpc(adapter, "admin/getProfile", {"profile_id": "nope"})
+    assert "score_history" in profile["summary"]
+    print(f"Unknown profile: {missing['error']['message']}")
+    assert "Unknown profile: nope" in missing["error"]["message"]
+    print()
+
+    # Test 5: Cost
+    print("Test 5: Cost Off, On and Off Again")
+    print("-" * 60)
+    adapter = ProfiledAdapter()
+    adapter.call_skill_impl = CustomerDatabaseAdapter.call_skill_impl.__get__(adapter)
+    calls = 3000
+    for i in range(300):
+        await lookup(adapter, "CUST001", i)  # warm up
+    chains = []
+    for label, action in (("off", None), ("on (1s threshold)", adapter.enable_profiling),
+                          ("off again", adapter.disable_profiling)):
+        if action is not None:
+            action()
+        chain = len(adapter.rpc_handler.interceptors_for("legacy/callSkill"))
+        started = time.perf_counter()
+        for i in range(calls):
+            await lookup(adapter, "CUST001", i)
+        per_call = (time.perf_counter() - started) / calls * 1e6
+        print(f"Profiling {label:<18} {chain} interceptors, {per_call:6.1f}us per call")
+        chains.append(chain)
+    assert chains[1] == chains[0] + 1 and chains[2] == chains[0]
+    print()
+
+    print("=" * 60)
+    print("All profiling tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
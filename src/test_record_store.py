@@ -0,0 +1,245 @@
+"""
+Test script for the memory-mapped keyed record store (KSDS stand-in).
+
+This script demonstrates:
+1. Creating a store and bulk-loading fixed-length records
+2. Point lookups and key-range scans through the sorted index
+3. Journal recovery after a simulated crash
+4. Serving the COBOL and customer database adapters from record stores
+5. Reading back writes inside a transaction
+6. Keeping the analytics ledger in step with a store-backed adapter
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter, ACCOUNT_RECORD_LAYOUT
+from lep_py.adapter.example_adapter import CustomerDatabaseAdapter
+from lep_py.storage.ksds import KeyedRecordStore, OP_COMMIT, OP_PUT
+
+
+async def call_skill(adapter, skill_name, parameters):
+    """Request approval for a skill and execute it with the issued token."""
+    approval = json.loads(await adapter.handle_request(json.dumps({
+        "jsonrpc": "2.0",
+        "method": "security/requestApproval",
+        "params": {"skill_name": skill_name, "parameters": parameters, "reason": "Test", "estimated_impact": {}},
+        "id": 1
+    })))
+    return json.loads(await adapter.handle_request(json.dumps({
+        "jsonrpc": "2.0",
+        "method": "legacy/callSkill",
+        "params": {
+            "skill_name": skill_name,
+            "parameters": parameters,
+            "approval_token": approval["result"]["approval_token"]
+        },
+        "id": 2
+    })))
+
+
+async def main():
+    print("=" * 60)
+    print("Keyed Record Store - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    workdir = tempfile.mkdtemp(prefix="lep-ksds-")
+    path = os.path.join(workdir, "ACCTMSTR.ksds")
+    layout = ACCOUNT_RECORD_LAYOUT
+
+    # Test 1: Bulk load
+    print("Test 1: Bulk Load")
+    print("-" * 60)
+    store = KeyedRecordStore(path, record_length=layout.record_length, key_length=8, durable=False)
+    started = time.perf_counter()
+    with store.transaction():
+        for i in range(100000, 0, -1):
+            store.put(layout.encode({
+                "ACCT-ID": f"A{i:07d}",
+                "ACCT-NAME": f"Customer {i}",
+                "ACCT-BALANCE": i * 1.25,
+                "ACCT-STATUS": "active"
+            }))
+    print(f"Loaded {len(store)} records in {time.perf_counter() - started:.2f}s")
+    assert len(store) == 100000
+    print(f"Data file size: {os.path.getsize(path):,} bytes")
+    print()
+
+    # Test 2: Lookups and scans
+    print("Test 2: Point Lookups and Range Scans")
+    print("-" * 60)
+    record = layout.decode(store.get(layout.encode_field("ACCT-ID", "A0004242")))
+    print(f"Point lookup: {record['ACCT-ID']} balance={record['ACCT-BALANCE']}")
+    assert (record["ACCT-ID"], record["ACCT-BALANCE"]) == ("A0004242", 5302.5)
+    scanned = [layout.decode(r)["ACCT-ID"] for r in store.scan(
+        layout.encode_field("ACCT-ID", "A0000100"), layout.encode_field("ACCT-ID", "A0000105")
+    )]
+    print(f"Range scan [A0000100, A0000105): {scanned}")
+    assert scanned == [f"A{i:07d}" for i in range(100, 105)]
+    store.delete(layout.encode_field("ACCT-ID", "A0000102"))
+    print(f"After delete: {len(store)} records, A0000102 present: "
+          f"{layout.encode_field('ACCT-ID', 'A0000102') in store}")
+    assert len(store) == 99999 and layout.encode_field("ACCT-ID", "A0000102") not in store
+    store.close()
+    print()
+
+    # Test 3: Crash recovery
+    print("Test 3: Journal Recovery")
+    print("-" * 60)
+    store = KeyedRecordStore(path)
+    slot = store._slots[store._find(layout.encode_field("ACCT-ID", "A0000001"))[0]]
+    image = layout.encode({"ACCT-ID": "A0000001", "ACCT-NAME": "Recovered", "ACCT-BALANCE": 1.0, "ACCT-STATUS": "active"})
+    # Simulate a crash after the journal write but before the data file update
+    with open(store.journal_path, "ab") as journal:
+        journal.write(store._journal_entry(OP_PUT, slot, image) + store._journal_entry(OP_COMMIT, 0, b""))
+        journal.write(store._journal_entry(OP_PUT, slot, image)[:20])  # torn, uncommitted tail
+    store._map.close()
+    store._file.close()
+    store._journal.close()
+
+    store = KeyedRecordStore(path)
+    record = layout.decode(store.get(layout.encode_field("ACCT-ID", "A0000001")))
+    print(f"Recovered entries: {store.recovered_entries}, A0000001 name: {record['ACCT-NAME']}")
+    assert store.recovered_entries == 1 and record["ACCT-NAME"] == "Recovered"
+    store.close()
+    print()
+
+    # Test 4: Adapters backed by record stores
+    print("Test 4: Store-Backed Adapters")
+    print("-" * 60)
+    seed = COBOLMainframeAdapter("localhost", 2323, "USER=TEST")
+    adapter = COBOLMainframeAdapter(
+        "localhost", 2323, "USER=TEST", account_store_path=os.path.join(workdir, "ACCOUNTS.ksds")
+    )
+    adapter.load_account_records(seed.export_account_records())
+    transfer = {"from_account": "ACC003", "to_account": "ACC001", "amount": 2500.0}
+    approval = json.loads(await adapter.handle_request(json.dumps({
+        "jsonrpc": "2.0",
+        "method": "security/requestApproval",
+        "params": {"skill_name": "transferFunds", "parameters": transfer, "reason": "Test", "estimated_impact": {}},
+        "id": 1
+    })))
+    await adapter.handle_request(json.dumps({
+        "jsonrpc": "2.0",
+        "method": "legacy/callSkill",
+        "params": {
+            "skill_name": "transferFunds",
+            "parameters": transfer,
+            "approval_token": approval["result"]["approval_token"]
+        },
+        "id": 2
+    }))
+    print(f"ACC001 after transfer: {adapter.accounts['ACC001']}")
+    print(f"Top mover: {adapter.ledger.top_movers(n=1)}")
+    assert adapter.accounts["ACC001"]["balance"] == 52500.0
+    assert adapter.ledger.top_movers(n=1)[0]["account_id"] == "ACC001"
+    listed = [values["account_id"] for values in adapter.list_resource_instances("accounts")]
+    resumed = [values["account_id"] for values in adapter.list_resource_instances("accounts", {"account_id": "ACC001"})]
+    print(f"Account instances {listed}, after ACC001 {resumed}")
+    assert resumed == listed[1:]
+    adapter.account_page_size = 2
+    pages, cursor = [], None
+    while True:
+        page = await adapter.get_resource_impl("accounts", {"cursor": cursor} if cursor else {})
+        pages.append(list(page["accounts"]))
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    print(f"cobol://accounts in pages of 2: {pages}")
+    assert [key for keys in pages for key in keys] == listed and all(len(keys) <= 2 for keys in pages)
+
+    customers = CustomerDatabaseAdapter(customer_store_path=os.path.join(workdir, "CUSTMSTR.ksds"))
+    customers.customers["CUST001"] = {"id": "CUST001", "name": "Acme Corporation", "balance": 50000.0, "status": "active"}
+    request = json.dumps({
+        "jsonrpc": "2.0",
+        "method": "legacy/getResource",
+        "params": {"resource_name": "customer", "parameters": {"customer_id": "CUST001"}},
+        "id": 1
+    })
+    response = await customers.handle_request(request)
+    print(f"Customer from store: {response}")
+    assert json.loads(response)["result"]["name"] == "Acme Corporation"
+    print()
+
+    # Test 5: Reads inside a transaction
+    print("Test 5: Reads Inside a Transaction")
+    print("-" * 60)
+    store = KeyedRecordStore(os.path.join(workdir, "TXN.ksds"), record_length=layout.record_length,
+                             key_length=8, durable=False)
+    key = layout.encode_field("ACCT-ID", "B0000001")
+    store.put(layout.encode({"ACCT-ID": "B0000001", "ACCT-NAME": "Before", "ACCT-BALANCE": 10.0,
+                             "ACCT-STATUS": "active"}))
+    with store.transaction():
+        store.put(layout.encode({"ACCT-ID": "B0000001", "ACCT-NAME": "During", "ACCT-BALANCE": 20.0,
+                                 "ACCT-STATUS": "active"}))
+        store.put(layout.encode({"ACCT-ID": "B0000002", "ACCT-NAME": "Inserted", "ACCT-BALANCE": 5.0,
+                                 "ACCT-STATUS": "active"}))
+        updated = layout.decode(store.get(key))
+        inserted = layout.decode(store.get(layout.encode_field("ACCT-ID", "B0000002")))
+        print(f"Updated record read back: {updated['ACCT-NAME']} balance={updated['ACCT-BALANCE']}")
+        print(f"Inserted record read back: {inserted['ACCT-NAME']} balance={inserted['ACCT-BALANCE']}")
+        print(f"Scan inside the transaction: {[layout.decode(r)['ACCT-NAME'] for r in store.scan()]}")
+        assert (updated["ACCT-NAME"], inserted["ACCT-NAME"]) == ("During", "Inserted")
+        assert [layout.decode(r)["ACCT-NAME"] for r in store.scan()] == ["During", "Inserted"]
+    try:
+        with store.transaction():
+            store.put(layout.encode({"ACCT-ID": "B0000001", "ACCT-NAME": "Rolled back", "ACCT-BALANCE": 0.0,
+                                     "ACCT-STATUS": "active"}))
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    print(f"After a rolled-back transaction: {layout.decode(store.get(key))['ACCT-NAME']}")
+    assert layout.decode(store.get(key))["ACCT-NAME"] == "During"
+    store.close()
+
+    accounts = adapter.accounts
+    opening = accounts["ACC002"]["balance"]
+    with accounts.transaction():
+        accounts["ACC002"]["balance"] += 100.0
+        accounts["ACC002"]["balance"] += 100.0
+    print(f"Two increments of 100 in one transaction: ACC002 balance {accounts['ACC002']['balance']}")
+    assert accounts["ACC002"]["balance"] == opening + 200.0
+    print()
+
+    # Test 6: Ledger and store in step
+    print("Test 6: Ledger and Store in Step")
+    print("-" * 60)
+    ledgered = COBOLMainframeAdapter(
+        "localhost", 2323, "USER=TEST", account_store_path=os.path.join(workdir, "LEDGER.ksds")
+    )
+    ledgered.load_account_records(seed.export_account_records())
+    print(f"Ledger built at startup: {ledgered._ledger is not None}")
+    assert ledgered._ledger is None
+    await call_skill(ledgered, "updateAccountBalance", {"account_id": "ACC001", "amount": 100.0, "reason": "Test"})
+    print(f"Top mover, ledger built on first query: {ledgered.ledger.top_movers(n=1)}")
+    ledgered.accounts["ACC004"] = {"name": "Dan Brown", "balance": 1000.0, "status": "active"}
+    response = await call_skill(ledgered, "updateAccountBalance",
+                                {"account_id": "ACC004", "amount": 250.0, "reason": "Test"})
+    print(f"Write to an account inserted after the ledger was built: {response['result']['account']['balance']}")
+    assert response["result"]["account"]["balance"] == 1250.0
+    response = await call_skill(ledgered, "transferFunds",
+                                {"from_account": "ACC004", "to_account": "ACC002", "amount": 50.0})
+    ledger = ledgered.ledger
+    mismatched = [account_id for account_id, account in ledgered.accounts.items()
+                  if abs(ledger.balances[ledger._index[account_id]] - account["balance"]) > 0.005]
+    print(f"Accounts in store: {len(ledgered.accounts)}, in ledger: {len(ledger)}, "
+          f"balances that disagree: {mismatched}")
+    assert len(ledgered.accounts) == len(ledger) and not mismatched
+    print()
+
+    adapter.accounts.store.close()
+    ledgered.accounts.store.close()
+    customers.customers.store.close()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    print("=" * 60)
+    print("All record store tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
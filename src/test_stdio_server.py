@@ -0,0 +1,194 @@
+"""
+Test script for the MCP stdio server.
+
+This script starts the server as a subprocess, the way an MCP client does,
+and demonstrates:
+1. Startup time and the initialize handshake
+2. Concurrent tools/call requests
+3. Cancelling an in-flight request
+4. Forwarded batch job notifications
+5. JSON-RPC batches
+6. Graceful shutdown with calls still in flight
+"""
+
+import asyncio
+import json
+import sys
+import time
+from lep_py.adapter.example_adapter import CustomerDatabaseAdapter
+
+
+class SlowCustomerAdapter(CustomerDatabaseAdapter):
+    """Customer adapter whose reads take a while, like a busy legacy host."""
+
+    async def call_skill_impl(self, skill_name, parameters):
+        if skill_name == "getCustomerInfo":
+            await asyncio.sleep(0.3)
+        return await super().call_skill_impl(skill_name, parameters)
+
+
+class StdioClient:
+    """Minimal MCP client speaking newline-delimited JSON-RPC to a subprocess."""
+
+    def __init__(self, *adapters):
+        self.adapters = adapters
+        self.pending = {}
+        self.notifications = []
+        self.arrays = []
+        self.next_id = 0
+
+    async def start(self):
+        args = [arg for adapter in self.adapters for arg in ("--adapter", adapter)]
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "lep_py.bridge.stdio_server", *args, "--log-level", "WARNING",
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        self.reader = asyncio.create_task(self._read())
+
+    async def _read(self):
+        async for line in self.process.stdout:
+            message = json.loads(line)
+            if isinstance(message, list):
+                self.arrays.append(message)
+            elif "id" in message and message["id"] in self.pending:
+                self.pending.pop(message["id"]).set_result(message)
+            elif "method" in message:
+                self.notifications.append(message)
+
+    def send(self, method, params=None, notify=False):
+        message = {"jsonrpc": "2.0", "method": method, "params": params or {}}
+        future = None
+        if not notify:
+            self.next_id += 1
+            message["id"] = self.next_id
+            future = self.pending[self.next_id] = asyncio.get_running_loop().create_future()
+        self.process.stdin.write(json.dumps(message).encode() + b"\n")
+        return future
+
+    def send_raw(self, message):
+        self.process.stdin.write(json.dumps(message).encode() + b"\n")
+
+    async def call(self, method, params=None):
+        return (await self.send(method, params))["result"]
+
+    async def close(self):
+        self.process.stdin.close()
+        code = await self.process.wait()
+        await self.reader
+        return code
+
+
+async def main():
+    print("=" * 60)
+    print("MCP stdio Server - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    # Test 1: Startup
+    print("Test 1: Startup and Initialize")
+    print("-" * 60)
+    client = None
+    for adapters in [("example",), ("cobol=cobol", "crm=test_stdio_server:SlowCustomerAdapter")]:
+        if client is not None:
+            await client.close()
+        started = time.perf_counter()
+        client = StdioClient(*adapters)
+        await client.start()
+        info = await client.call("initialize", {"clientInfo": {"name": "Test Client"}})
+        elapsed = time.perf_counter() - started
+        print(f"{' '.join(adapters):<50} initialized in {elapsed * 1000:.0f}ms: {info['serverInfo']['name']}")
+    assert info["serverInfo"]["name"] == "LEP Bridge (cobol, crm)"
+    client.send("notifications/initialized", notify=True)
+    print()
+
+    # Test 2: Concurrency
+    print("Test 2: Concurrent Tool Calls")
+    print("-" * 60)
+    started = time.perf_counter()
+    calls = [client.send("tools/call", {"name": "crm__getCustomerInfo", "arguments": {"customer_id": "CUST001"}})
+             for _ in range(10)]
+    ping = client.send("ping")
+    await ping
+    ping_time = time.perf_counter() - started
+    pending = sum(1 for call in calls if not call.done())
+    responses = await asyncio.gather(*calls)
+    elapsed = time.perf_counter() - started
+    print(f"10 calls of 0.3s each answered in {elapsed:.2f}s, "
+          f"ping answered after {ping_time * 1000:.0f}ms, errors: {sum(1 for r in responses if r.get('error'))}")
+    assert pending == 10 and elapsed < 2.0
+    assert not any(r.get("error") for r in responses)
+    print()
+
+    # Test 3: Cancellation
+    print("Test 3: Cancellation")
+    print("-" * 60)
+    slow = client.send("tools/call", {"name": "crm__getCustomerInfo", "arguments": {"customer_id": "CUST002"}})
+    client.send("notifications/cancelled", {"requestId": client.next_id, "reason": "User aborted"}, notify=True)
+    await asyncio.sleep(0.5)
+    print(f"Cancelled request answered: {slow.done()}")
+    assert not slow.done()
+    print()
+
+    # Test 4: Notifications
+    print("Test 4: Forwarded Job Notifications")
+    print("-" * 60)
+    submitted = await client.call("tools/call", {
+        "name": "cobol__submitBatchJob",
+        "arguments": {"jcl": "//STMTS JOB CLASS=A\n//S1 EXEC PGM=STMTGEN"}
+    })
+    job_id = json.loads(submitted["content"][0]["text"])["job_id"]
+    for _ in range(50):
+        states = [n["params"]["data"]["state"] for n in client.notifications
+                  if n["params"].get("logger") == "cobol.jobs" and n["params"]["data"]["job_id"] == job_id]
+        if "completed" in states:
+            break
+        await asyncio.sleep(0.05)
+    print(f"{job_id} notifications: {' -> '.join(dict.fromkeys(states))}")
+    assert states and states[-1] == "completed"
+    print()
+
+    # Test 5: Batches
+    print("Test 5: JSON-RPC Batches")
+    print("-" * 60)
+    client.send_raw([
+        {"jsonrpc": "2.0", "method": "ping", "id": "b1"},
+        {"jsonrpc": "2.0", "method": "tools/call", "id": "b2",
+         "params": {"name": "crm__getCustomerInfo", "arguments": {"customer_id": "CUST001"}}},
+        {"jsonrpc": "2.0", "method": "notifications/progress", "params": {}},
+        42
+    ])
+    empty = client.send("ping")
+    client.send_raw([])
+    for _ in range(50):
+        if client.arrays:
+            break
+        await asyncio.sleep(0.05)
+    batch = client.arrays[0]
+    print(f"Batch of 2 requests, 1 notification and 1 invalid entry: {len(batch)} responses "
+          f"({', '.join(str(r['id']) for r in batch)})")
+    assert {r["id"] for r in batch} == {"b1", "b2", None}
+    assert "result" in next(r for r in batch if r["id"] == "b2")
+    assert next(r for r in batch if r["id"] is None)["error"]["code"] == -32600
+    await empty
+    print(f"Empty batch: {len(client.arrays)} array replies")
+    assert len(client.arrays) == 1
+    print()
+
+    # Test 6: Graceful shutdown
+    print("Test 6: Graceful Shutdown")
+    print("-" * 60)
+    in_flight = [client.send("tools/call", {"name": "crm__getCustomerInfo", "arguments": {"customer_id": "CUST003"}})
+                 for _ in range(3)]
+    code = await client.close()
+    answered = sum(1 for f in in_flight if f.done() and "result" in f.result())
+    print(f"Closed stdin with 3 calls in flight: {answered} answered, exit code {code}")
+    assert answered == 3 and code == 0
+    print()
+
+    print("=" * 60)
+    print("All stdio server tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
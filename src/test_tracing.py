@@ -0,0 +1,165 @@
+"""
+Test script for end-to-end request tracing.
+
+This script demonstrates:
+1. The span tree of an MCP tools/call, down to the backend
+2. Continuing a caller's trace from _meta.traceparent
+3. Sampling
+4. The JSONL exporter
+5. Overhead with tracing off and on
+"""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+from lep_py.bridge.lep_mcp_bridge import LEPMCPBridge
+from lep_py.driver.simulator import MainframeSimulator
+from lep_py.utils.tracing import TRACER, InMemoryExporter, JSONLExporter, configure_tracing
+
+
+def print_tree(spans):
+    children = {}
+    for span in spans:
+        children.setdefault(span.parent_id, []).append(span)
+    ids = {span.span_id for span in spans}
+
+    def walk(span, depth):
+        attrs = {k: v for k, v in span.attributes.items() if k != "handler"}
+        print(f"  {'  ' * depth}{span.name:<{40 - 2 * depth}} {span.duration * 1000:8.2f}ms  {attrs or ''}")
+        for event in span.events:
+            print(f"  {'  ' * depth}  * {event['name']} {event.get('event_type', '')} at +{event['offset_ms']}ms")
+        for child in children.get(span.span_id, []):
+            walk(child, depth + 1)
+
+    for root in (s for s in spans if s.parent_id not in ids):
+        walk(root, 0)
+
+
+async def tools_call(bridge, name, arguments, request_id=1, meta=None):
+    params = {"name": name, "arguments": arguments}
+    if meta:
+        params["_meta"] = meta
+    return json.loads(await bridge.handle_mcp_request(json.dumps({
+        "jsonrpc": "2.0", "method": "tools/call", "params": params, "id": request_id
+    })))
+
+
+async def main():
+    print("=" * 60)
+    print("Request Tracing - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    logging.getLogger("lep_py.adapter.cobol_mainframe_adapter").setLevel(logging.WARNING)
+    host_programs = COBOLMainframeAdapter("localhost", 0, "")
+    simulator = MainframeSimulator(
+        handler=lambda command, payload: host_programs._dispatch_skill(payload["skill_name"], payload["parameters"]),
+        handshake_latency=0.01, latency=0.005
+    )
+    await simulator.start()
+    adapter = COBOLMainframeAdapter("127.0.0.1", simulator.port, "POOL_MIN=2;POOL_MAX=4")
+    await adapter.connect_backend()
+    bridge = LEPMCPBridge(adapter)
+    await bridge.handle_mcp_request(json.dumps({"jsonrpc": "2.0", "method": "initialize", "params": {}, "id": 0}))
+
+    # Test 1: Span tree
+    print("Test 1: Span Tree of a Write Tool Call")
+    print("-" * 60)
+    exporter = InMemoryExporter()
+    configure_tracing(exporter)
+    response = await tools_call(bridge, "updateAccountBalance",
+                                {"account_id": "ACC001", "amount": 25.0, "reason": "Tracing demo"})
+    traceparent = response["result"]["_meta"]["traceparent"]
+    trace_id = traceparent.split("-")[1]
+    spans = exporter.trace(trace_id)
+    print(f"Result _meta.traceparent: {traceparent}")
+    print(f"{len(spans)} spans in trace {trace_id}:")
+    print_tree(spans)
+    assert [span.name for span in spans if span.parent_id is None] == ["tools/call"]
+    assert {"security/requestApproval", "approval.human", "legacy/callSkill", "skill.execute",
+            "backend.execute"} <= {span.name for span in spans}
+    print()
+
+    # Test 2: Remote parent
+    print("Test 2: Continuing the Caller's Trace")
+    print("-" * 60)
+    caller = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+    response = await tools_call(bridge, "getAccountInfo", {"account_id": "ACC002"}, 2, {"traceparent": caller})
+    spans = exporter.trace("0af7651916cd43dd8448eb211c80319c")
+    print(f"Caller traceparent: {caller}")
+    print(f"Result traceparent: {response['result']['_meta']['traceparent']}")
+    print(f"Root span parent:   {spans[0].parent_id} (the caller's span)")
+    print_tree(spans)
+    assert response["result"]["_meta"]["traceparent"].split("-")[1] == "0af7651916cd43dd8448eb211c80319c"
+    assert spans[0].name == "tools/call" and spans[0].parent_id == "b7ad6b7169203331"
+    unsampled = await tools_call(bridge, "getAccountInfo", {"account_id": "ACC002"}, 3,
+                                 {"traceparent": caller[:-2] + "00"})
+    print(f"Caller flags 00 (not sampled): result _meta = {unsampled['result'].get('_meta')}")
+    assert unsampled["result"].get("_meta") is None
+    print()
+
+    # Test 3: Sampling
+    print("Test 3: Sampling")
+    print("-" * 60)
+    exporter = InMemoryExporter()
+    configure_tracing(exporter, sample_rate=0.1)
+    TRACER.stats.update(traces=0, sampled=0, spans=0)
+    for i in range(200):
+        await tools_call(bridge, "getAccountInfo", {"account_id": "ACC003"}, i)
+    traces = {span.trace_id for span in exporter.spans}
+    print(f"200 calls at sample rate 0.1: {json.dumps(TRACER.stats)}")
+    print(f"Complete traces kept: {len(traces)}, spans per trace: {len(exporter.spans) / max(1, len(traces)):.0f}")
+    assert TRACER.stats["traces"] == 200 and 0 < TRACER.stats["sampled"] < 200
+    assert len(traces) == TRACER.stats["sampled"] and len(exporter.spans) == TRACER.stats["spans"]
+    print()
+
+    # Test 4: JSONL exporter
+    print("Test 4: JSONL Exporter")
+    print("-" * 60)
+    path = os.path.join(tempfile.mkdtemp(), "traces.jsonl")
+    configure_tracing(JSONLExporter(path, batch_size=10))
+    for i in range(5):
+        await tools_call(bridge, "getAccountInfo", {"account_id": "ACC001"}, i)
+    TRACER.flush()
+    with open(path) as f:
+        lines = f.readlines()
+    print(f"{len(lines)} spans written to {os.path.basename(path)}; first line:")
+    print(f"  {lines[0].strip()}")
+    assert len(lines) == 20 and len({json.loads(line)["trace_id"] for line in lines}) == 5
+    configure_tracing(None)
+    print()
+
+    # Test 5: Overhead
+    print("Test 5: Overhead")
+    print("-" * 60)
+    # The in-process simulation, so the per-call cost is not hidden by backend latency
+    local = LEPMCPBridge(COBOLMainframeAdapter("localhost", 23, ""))
+    calls = 2000
+    for i in range(200):
+        await tools_call(local, "getAccountInfo", {"account_id": "ACC001"}, i)  # warm up
+    for label, exporter, rate in (("off", None, 1.0), ("on, 1% sampled", InMemoryExporter(), 0.01),
+                                  ("on, all sampled", InMemoryExporter(), 1.0)):
+        configure_tracing(exporter, rate)
+        started = time.perf_counter()
+        for i in range(calls):
+            await tools_call(local, "getAccountInfo", {"account_id": "ACC001"}, i)
+        per_call = (time.perf_counter() - started) / calls * 1e6
+        print(f"Tracing {label:<16} {per_call:7.1f}us per tools/call")
+    configure_tracing(None)
+    await local.shutdown()
+    print()
+
+    await bridge.shutdown()
+    await simulator.stop()
+
+    print("=" * 60)
+    print("All tracing tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+"""
+Test script for the event loop watchdog.
+
+This script demonstrates:
+1. Lag of a healthy loop
+2. Catching a blocking report with its stack
+3. Catching a blocking json.dumps of a large resource
+4. The same work moved off the loop
+5. Lag histograms in the metrics registry
+"""
+
+import asyncio
+import json
+import logging
+import time
+from lep_py.adapter.cobol_mainframe_adapter import COBOLMainframeAdapter
+from lep_py.utils.metrics import MetricsRegistry
+from lep_py.utils.watchdog import LoopWatchdog
+
+
+async def rpc(adapter, method, params, request_id=1):
+    return json.loads(await adapter.handle_request(json.dumps({
+        "jsonrpc": "2.0", "method": method, "params": params, "id": request_id
+    })))
+
+
+async def ticker(seconds, period=0.01):
+    """Another session's work: how late do its timers fire?"""
+    worst = 0.0
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        expected = time.monotonic() + period
+        await asyncio.sleep(period)
+        worst = max(worst, time.monotonic() - expected)
+    return worst
+
+
+def show_stall(event):
+    frames = [line.strip().splitlines()[0] for line in event["stack"]]
+    print(f"  Blocked {event['duration_ms']:.0f}ms in task {event['task']}; innermost frames:")
+    for frame in frames[-3:]:
+        print(f"    {frame}")
+
+
+async def main():
+    print("=" * 60)
+    print("Event Loop Watchdog - Test Demonstration")
+    print("=" * 60)
+    print()
+
+    logging.getLogger("lep_py.adapter.cobol_mainframe_adapter").setLevel(logging.WARNING)
+    logging.getLogger("lep_py.utils.watchdog").setLevel(logging.ERROR)
+    adapter = COBOLMainframeAdapter("localhost", 23, "")
+    adapter.transactions.extend(
+        {"transaction_id": f"TXN{i:08d}", "account_id": f"ACC00{i % 3 + 1}", "amount": 10.0,
+         "type": "credit", "timestamp": "2026-01-01T00:00:00"}
+        for i in range(600000)
+    )
+    registry = MetricsRegistry()
+    watchdog = LoopWatchdog(threshold=0.05, interval=0.01, registry=registry)
+    await watchdog.start()
+
+    # Test 1: Healthy loop
+    print("Test 1: Healthy Loop")
+    print("-" * 60)
+    worst = await ticker(0.5)
+    print(f"0.5s of timers: worst delay {worst * 1000:.1f}ms, "
+          f"watchdog max lag {watchdog.stats['max_lag'] * 1000:.1f}ms, stalls {watchdog.stats['blocked']}")
+    assert watchdog.stats["blocked"] == 0 and watchdog.stats["beats"] > 0
+    print()
+
+    # Test 2: Blocking report
+    print("Test 2: Blocking Report Generation")
+    print("-" * 60)
+    other = asyncio.create_task(ticker(0.6))
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    await rpc(adapter, "legacy/callSkill", {"skill_name": "generateAccountReport",
+                                            "parameters": {"account_id": "ACC001"}})
+    print(f"generateAccountReport over 600000 transactions: {(time.perf_counter() - started) * 1000:.0f}ms")
+    late = await other
+    print(f"Another session's timer was late by up to {late * 1000:.0f}ms")
+    assert late > watchdog.threshold
+    report = watchdog.report()
+    show_stall(report["blocked"][-1])
+    print(f"Report generation named in stack: "
+          f"{any('_generate_account_report' in line for line in report['blocked'][-1]['stack'])}")
+    assert any("_generate_account_report" in line for line in report["blocked"][-1]["stack"])
+    print()
+
+    # Test 3: Blocking json.dumps
+    print("Test 3: Blocking json.dumps of a Large Resource")
+    print("-" * 60)
+    blocked_before = watchdog.stats["blocked"]
+    big = {"transactions": adapter.transactions[:100000]}
+    text = json.dumps(big, indent=2)
+    await asyncio.sleep(0.05)
+    print(f"json.dumps(indent=2) of {len(text) // 1048576} MiB: {watchdog.stats['blocked'] - blocked_before} stall")
+    show_stall(watchdog.report()["blocked"][-1])
+    assert watchdog.stats["blocked"] - blocked_before == 1
+    assert any("json" in line for line in watchdog.report()["blocked"][-1]["stack"])
+    print()
+
+    # Test 4: Off the loop
+    print("Test 4: The Same Work Off the Loop")
+    print("-" * 60)
+    blocked_before = watchdog.stats["blocked"]
+    other = asyncio.create_task(ticker(0.6))
+    await asyncio.sleep(0.05)
+    await asyncio.to_thread(adapter._generate_account_report, "ACC001")
+    worst = await other
+    print(f"Report in a worker thread: {watchdog.stats['blocked'] - blocked_before} stalls, "
+          f"other session's timer late by up to {worst * 1000:.0f}ms (GIL contention only)")
+    assert watchdog.stats["blocked"] == blocked_before
+    print()
+
+    # Test 5: Metrics
+    print("Test 5: Lag Histograms")
+    print("-" * 60)
+    await watchdog.stop()
+    for line in registry.render().splitlines():
+        if line.startswith(("lep_event_loop_blocked_total", "lep_event_loop_lag_seconds_count")) or \
+                ('le="0.005"' in line or 'le="0.1"' in line or 'le="+Inf"' in line):
+            print(f"  {line}")
+    print(f"Watchdog stats: {json.dumps({k: round(v, 4) for k, v in watchdog.stats.items()})}")
+    rendered = registry.render().splitlines()
+    assert f"lep_event_loop_blocked_total {watchdog.stats['blocked']}" in rendered
+    assert f"lep_event_loop_lag_seconds_count {watchdog.stats['beats']}" in rendered
+    print()
+
+    await adapter.close()
+
+    print("=" * 60)
+    print("All watchdog tests completed successfully!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())